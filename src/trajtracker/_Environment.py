@@ -29,6 +29,7 @@ class Environment(object):
     def __init__(self):
         self._mouse = None
         self._default_log_level = 4
+        self._validate_arguments = True
 
     #------------------------------------------
     @property
@@ -66,6 +67,32 @@ class Environment(object):
         self._default_log_level = value
 
 
+    #------------------------------------------
+    @property
+    def validate_arguments(self):
+        """
+        Whether TrajTracker's per-frame methods validate their arguments: update_xyt() of all objects, check_xy(),
+        get_color_at(), overlapping_with_position() and get_traj_point().
+
+        Validation helps detecting errors while you develop the experiment. Once the experiment is debugged,
+        you can set this to False to save time in each frame ("production mode"). The methods are then replaced
+        by lean versions that skip the validation, so there is no cost for checking this setting on each call.
+
+        :type: bool
+        """
+        return self._validate_arguments
+
+    @validate_arguments.setter
+    def validate_arguments(self, value):
+        if not isinstance(value, bool):
+            raise Exception("trajtracker error: Invalid validate_arguments ({:})".format(value))
+
+        # noinspection PyProtectedMember
+        from trajtracker import _utils
+        _utils.set_validate_arguments(value)
+        self._validate_arguments = value
+
+
     #------------------------------------------
     # noinspection PyProtectedMember
     @property
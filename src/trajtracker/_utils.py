@@ -107,7 +107,7 @@ def validate_attr_type(obj, attr_name, value, attr_type, none_allowed=False, typ
         validate_attr_is_coord(obj, attr_name, value)
 
     elif attr_type == ttrk.TYPE_CALLABLE:
-        if "__call__" not in dir(value):
+        if not is_callable(value):
             raise ttrk.TypeError(
                 "{:}.{:} was set to a non-callable value ({:})".format(get_type_name(obj), attr_name, value))
 
@@ -160,7 +160,7 @@ def _is_rgb(value, accept_single_num=False, none_allowed=False):
     if value is None:
         return None, none_allowed
 
-    if isinstance(value, xpy.misc.Colour):
+    if get_type_capabilities(value).colour:
         return value, True
 
     if accept_single_num and isinstance(value, int) and 0 <= value < 2**24:
@@ -184,7 +184,7 @@ def validate_attr_is_coord(obj, attr_name, value, change_none_to_0=False, allow_
     if value is None and change_none_to_0:
         return 0, 0
 
-    if isinstance(value, geometry.XYPoint):
+    if get_type_capabilities(value).xypoint:
         value = (value.x, value.y)
 
     validate_attr_is_collection(obj, attr_name, value, 2, 2)
@@ -248,6 +248,9 @@ def validate_attr_positive(obj, attr_name, value):
 #-------------------------------------------------------------------------
 def validate_func_arg_type(obj, func_name, arg_name, value, arg_type, none_allowed=False, type_name=None):
 
+    if arg_type is numbers.Number and is_number(value):
+        return
+
     if arg_type == ttrk.TYPE_COORD:
         validate_func_arg_is_coord(obj, func_name, arg_name, value)
 
@@ -255,7 +258,7 @@ def validate_func_arg_type(obj, func_name, arg_name, value, arg_type, none_allow
         validate_func_type_rgb(obj, func_name, arg_name, value)
 
     elif arg_type == ttrk.TYPE_CALLABLE:
-        if "__call__" not in dir(value):
+        if not is_callable(value):
             raise ttrk.TypeError("{:}() was called with a non-callable {:} ({:})".format(
                 _get_func_name(obj, func_name), arg_name, value))
 
@@ -307,9 +310,15 @@ def validate_func_arg_is_coord(obj, func_name, arg_name, value, change_none_to_0
     if value is None and change_none_to_0:
         return 0, 0
 
-    if isinstance(value, geometry.XYPoint):
+    caps = get_type_capabilities(value)
+
+    if caps.xypoint:
         value = (value.x, value.y)
 
+    elif allow_float and caps.sequence and len(value) == 2 and is_number(value[0]) and is_number(value[1]):
+        #-- The common case
+        return value
+
     validate_func_arg_is_collection(obj, func_name, arg_name, value, 2, 2)
 
     if allow_float:
@@ -349,6 +358,34 @@ def validate_func_type_rgb(obj, func_name, arg_name, value, accept_single_num=Fa
                                     format(get_type_name(obj), func_name, arg_name, value))
 
 
+#--------------------------------------------------------------------------------------
+def validate_func_arg_xyt_arrays(obj, func_name, times, x_coords, y_coords, times_should_increase=True):
+    """
+    Validate the arrays of a recorded trajectory (one entry per sample), and return them as float arrays
+    """
+
+    arrays = []
+    for arg_name, value in ("times", times), ("x_coords", x_coords), ("y_coords", y_coords):
+        validate_func_arg_is_collection(obj, func_name, arg_name, value)
+        value = np.asarray(value, dtype=float)
+        if value.ndim != 1:
+            raise ttrk.TypeError("{:}() was called with a non-1-dimensional {:}".format(_get_func_name(obj, func_name), arg_name))
+        arrays.append(value)
+
+    times, x_coords, y_coords = arrays
+
+    if not (len(times) == len(x_coords) == len(y_coords)):
+        raise ttrk.ValueError("{:}() was called with arrays of different lengths (times={:}, x_coords={:}, y_coords={:})".format(
+            _get_func_name(obj, func_name), len(times), len(x_coords), len(y_coords)))
+
+    if times_should_increase and len(times) > 1 and (np.diff(times) < 0).any():
+        i = int(np.flatnonzero(np.diff(times) < 0)[0]) + 1
+        raise ttrk.InvalidStateError("{:}(): times[{:}]={:} is earlier than the previous sample's time ({:})".format(
+            _get_func_name(obj, func_name), i, times[i], times[i-1]))
+
+    return times, x_coords, y_coords
+
+
 #--------------------------------------------------------------------------------------
 DONT_VALIDATE = "DONT_VALIDATE"
 def update_xyt_validate_and_log(self, position, time_in_trial=DONT_VALIDATE, time_in_session=DONT_VALIDATE):
@@ -357,15 +394,116 @@ def update_xyt_validate_and_log(self, position, time_in_trial=DONT_VALIDATE, tim
 
     validate_func_arg_is_coord(self, "update_xyt", "position", position, allow_float=True)
 
-    if time_in_trial != DONT_VALIDATE:
+    if time_in_trial is not DONT_VALIDATE:
         validate_func_arg_type(self, "update_xyt", "time_in_trial", time_in_trial, numbers.Number)
         validate_func_arg_not_negative(self, "update_xyt", "time_in_trial", time_in_trial)
 
-    if time_in_session != DONT_VALIDATE:
+    if time_in_session is not DONT_VALIDATE:
         validate_func_arg_type(self, "update_xyt", "time_in_session", time_in_session, numbers.Number)
         validate_func_arg_not_negative(self, "update_xyt", "time_in_session", time_in_session)
 
 
+#============================================================================
+#   Lean methods: used instead of the argument-validating methods when
+#   trajtracker.env.validate_arguments = False
+#============================================================================
+
+#-- Each entry: (class, method name, validating function, lean function)
+_lean_methods = []
+_validate_arguments = True
+
+
+#--------------------------------------
+def register_lean_method(cls, method_name, lean_method_name):
+    """
+    Register a method that has a lean version, i.e. a version that does not validate its arguments.
+    The class's method is replaced by the lean version whenever argument validation is turned off.
+    """
+    validating_func = cls.__dict__[method_name]
+    lean_func = cls.__dict__[lean_method_name]
+    _lean_methods.append((cls, method_name, validating_func, lean_func))
+
+    if not _validate_arguments:
+        setattr(cls, method_name, lean_func)
+
+
+#--------------------------------------
+def get_lean_method(obj, method_name):
+    """
+    Get a method of the object that does not validate its arguments, if possible.
+
+    The lean version (registered with register_lean_method) is used only if the object's method is the one that
+    was registered - i.e., a subclass did not override it. Otherwise, the object's method itself is returned,
+    so the subclass's code is not skipped.
+
+    :return: A bound method
+    """
+    func = getattr(type(obj), method_name, None)
+    for cls, name, validating_func, lean_func in _lean_methods:
+        if name == method_name and func in (validating_func, lean_func):
+            #-- Use the lean method by name, in case a subclass overrode the lean method itself
+            return getattr(obj, lean_func.__name__)
+
+    return getattr(obj, method_name)
+
+
+#--------------------------------------
+def set_validate_arguments(validate):
+    """
+    Switch all registered methods to their validating version (validate=True) or to their lean version
+    """
+    global _validate_arguments
+    _validate_arguments = validate
+
+    for cls, method_name, validating_func, lean_func in _lean_methods:
+        setattr(cls, method_name, validating_func if validate else lean_func)
+
+
+#============================================================================
+#   Type capabilities: what can be done with values of a certain type.
+#   Computed once per type and cached, so that repeated checks on values
+#   of the same type cost a dict lookup.
+#============================================================================
+
+class TypeCapabilities(object):
+
+    def __init__(self, t):
+        attrs = dir(t)
+        self.collection = "__len__" in attrs and "__iter__" in attrs and not issubclass(t, str)
+        self.sequence = self.collection and "__getitem__" in attrs
+        self.callable = "__call__" in attrs
+        self.number = issubclass(t, numbers.Number)
+        self.xypoint = issubclass(t, geometry.XYPoint)
+        self.colour = issubclass(t, xpy.misc.Colour)
+
+
+#-- type -> TypeCapabilities
+_type_capabilities = {}
+
+
+#--------------------------------------
+def get_type_capabilities(value):
+    """
+    Get the :class:`TypeCapabilities` of the value's type
+    """
+    t = type(value)
+    caps = _type_capabilities.get(t)
+    if caps is None:
+        caps = TypeCapabilities(t)
+        _type_capabilities[t] = caps
+    return caps
+
+
+#--------------------------------------
+def is_number(value):
+    return get_type_capabilities(value).number
+
+
+#--------------------------------------
+def is_callable(value):
+    return get_type_capabilities(value).callable
+
+
 #============================================================================
 #   Misc
 #============================================================================
@@ -373,22 +511,22 @@ def update_xyt_validate_and_log(self, position, time_in_trial=DONT_VALIDATE, tim
 
 #--------------------------------------
 def is_collection(value, allow_set=True):
-    val_methods = dir(value)
-    return "__len__" in val_methods and "__iter__" in val_methods and \
-           (allow_set or "__getitem__" in val_methods) and not isinstance(value, str)
+    caps = get_type_capabilities(value)
+    return caps.collection and (allow_set or caps.sequence)
 
 
 #--------------------------------------
 def is_coord(value, allow_float=False):
 
-    if isinstance(value, geometry.XYPoint):
+    caps = get_type_capabilities(value)
+    if caps.xypoint:
         return True
 
-    if not is_collection(value) or len(value) != 2:
+    if not caps.collection or len(value) != 2:
         return False
 
     if allow_float:
-        return isinstance(value[0], numbers.Number) and isinstance(value[1], numbers.Number)
+        return is_number(value[0]) and is_number(value[1])
     else:
         return is_whole_number(value[0]) and is_whole_number(value[1])
 
@@ -0,0 +1,217 @@
+"""
+
+Background file writer: format and write data in a dedicated thread
+
+@author: Dror Dotan
+@copyright: Copyright (c) 2017, Dror Dotan
+
+This file is part of TrajTracker.
+
+TrajTracker is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+TrajTracker is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with TrajTracker.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import threading
+
+try:
+    import queue
+except ImportError:
+    # noinspection PyPep8Naming,PyUnresolvedReferences
+    import Queue as queue
+
+import trajtracker as ttrk
+import trajtracker._utils as _u
+from trajtracker.io import SessionFileWriter
+
+
+class BackgroundFileWriter(ttrk.TTrkObject):
+    """
+    Runs write operations on a :class:`~trajtracker.io.SessionFileWriter` in a dedicated thread,
+    so that formatting the data and writing it to disk do not delay the experiment.
+
+    Each operation is a function, which is called in the writer thread. Operations are executed one by one,
+    in the order they were submitted.
+    """
+
+    #: The default maximal number of operations that can wait in the queue
+    default_queue_size = 16
+
+
+    #------------------------------------------------
+    def __init__(self, writer, queue_size=None):
+        """
+        Constructor - invoked when you create a new object by writing BackgroundFileWriter()
+
+        :param writer: The :class:`~trajtracker.io.SessionFileWriter` to write to. After creating the
+                       BackgroundFileWriter, do not access the writer directly.
+        :param queue_size: The maximal number of operations that can wait in the queue. When the queue is full,
+                           :func:`~trajtracker.io.BackgroundFileWriter.submit` blocks until the writer thread
+                           catches up.
+        """
+
+        super(BackgroundFileWriter, self).__init__()
+
+        if queue_size is None:
+            queue_size = self.default_queue_size
+
+        _u.validate_func_arg_type(self, "__init__", "writer", writer, SessionFileWriter)
+        _u.validate_func_arg_type(self, "__init__", "queue_size", queue_size, int)
+        _u.validate_func_arg_positive(self, "__init__", "queue_size", queue_size)
+
+        self._writer = writer
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._error = None
+
+        self._thread = threading.Thread(target=self._run, name="BackgroundFileWriter({:})".format(writer.filename))
+        self._thread.daemon = True
+        self._thread.start()
+
+
+    #========================================================================
+    #   API
+    #========================================================================
+
+    #------------------------------------------------
+    def submit(self, func, *args):
+        """
+        Add an operation to the queue. If the queue is full, wait until there is place in it.
+
+        If a previous operation failed, its exception is raised now (and the new operation is not submitted).
+
+        :param func: A function that will be called in the writer thread. It is called with the
+                     given args, and should write to :attr:`~trajtracker.io.BackgroundFileWriter.writer`
+        """
+
+        self._validate_open("submit")
+        self._raise_pending_error()
+
+        self._queue.put((func, args))
+
+
+    #------------------------------------------------
+    def flush(self):
+        """
+        Wait until all submitted operations were executed, and then flush the file.
+
+        If an operation failed, its exception is raised.
+        """
+
+        self._validate_open("flush")
+
+        self._queue.join()
+        self._raise_pending_error()
+
+        #-- The writer thread is idle now, so it's safe to access the writer from this thread
+        self._writer.flush()
+
+
+    #------------------------------------------------
+    def wait(self):
+        """
+        Same as :func:`~trajtracker.io.BackgroundFileWriter.flush`
+        """
+        self.flush()
+
+
+    #------------------------------------------------
+    def close(self):
+        """
+        Wait until all submitted operations were executed, stop the writer thread, and close the file.
+        Calling close() more than once has no effect.
+
+        If an operation failed, its exception is raised.
+        """
+
+        if self._thread is None:
+            return
+
+        self._queue.put(None)
+        self._thread.join()
+        self._thread = None
+
+        try:
+            self._raise_pending_error()
+        finally:
+            self._writer.close()
+
+
+    #------------------------------------------------
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+    #========================================================================
+    #   Writer thread
+    #========================================================================
+
+    #------------------------------------------------
+    def _run(self):
+
+        while True:
+
+            job = self._queue.get()
+
+            try:
+                if job is None:
+                    return
+
+                #-- After a failure, skip all operations until the error was reported
+                if self._error is None:
+                    func, args = job
+                    func(*args)
+
+            except BaseException as e:
+                self._error = e
+
+            finally:
+                self._queue.task_done()
+
+
+    #------------------------------------------------
+    def _raise_pending_error(self):
+        err = self._error
+        if err is not None:
+            self._error = None
+            raise err
+
+
+    #------------------------------------------------
+    def _validate_open(self, func_name):
+        if self._thread is None:
+            raise ttrk.InvalidStateError("{:}.{:}() was called after the writer was closed".format(_u.get_type_name(self), func_name))
+
+
+    #========================================================================
+    #   Properties
+    #========================================================================
+
+    #------------------------------------------------
+    @property
+    def writer(self):
+        """ The :class:`~trajtracker.io.SessionFileWriter` that this object writes to (read-only) """
+        return self._writer
+
+    #------------------------------------------------
+    @property
+    def closed(self):
+        """ Whether the writer was already closed (read-only) """
+        return self._thread is None
+
+    #------------------------------------------------
+    @property
+    def n_pending(self):
+        """ The (approximate) number of operations that were submitted but not executed yet (read-only) """
+        return self._queue.unfinished_tasks
@@ -0,0 +1,316 @@
+"""
+
+Background mouse sampler: sample the mouse position in a dedicated thread, at a fixed rate
+
+@author: Dror Dotan
+@copyright: Copyright (c) 2017, Dror Dotan
+
+This file is part of TrajTracker.
+
+TrajTracker is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+TrajTracker is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with TrajTracker.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+from __future__ import division
+
+import numbers
+import threading
+import time
+
+import numpy as np
+
+import trajtracker as ttrk
+import trajtracker._utils as _u
+import trajtracker.utils as u
+
+
+# noinspection PyAttributeOutsideInit
+class BackgroundMouseSampler(ttrk.TTrkObject):
+    """
+    Samples the mouse position in a dedicated thread, at a fixed rate (e.g. 500 or 1000 Hz), so the sampling rate
+    does not depend on the display's frame rate or on how long it takes to present each frame.
+
+    Each sample is timestamped with :func:`trajtracker.utils.get_time` and stored in a preallocated ring buffer.
+    The main loop takes the samples from the buffer, once per frame, with
+    :func:`~trajtracker.io.BackgroundMouseSampler.drain`.
+
+    The buffer has a single writer (the sampler thread) and a single reader (the thread that calls drain()),
+    and needs no locks: the writer only advances the write counter and the reader only advances the read counter.
+    If the buffer is full, new samples are dropped (this is an "overrun"; see
+    :func:`~trajtracker.io.BackgroundMouseSampler.get_statistics`).
+
+    The mouse object is read from the sampler thread, so it must be thread-safe: reading its position must not
+    process the window system's events, and must return an up-to-date position even when the main loop is
+    busy. Expyriment's mouse and :class:`~trajtracker.io.Mouse` are not thread-safe: they call
+    pygame.event.pump(), which may be called only from the main thread, and pygame updates the mouse position
+    only when the main loop processes the event queue. This is why the sampler does not use
+    :attr:`trajtracker.env.mouse <trajtracker.Environment.mouse>`. The mouse object must declare that it is
+    thread-safe, by having a *thread_safe* attribute whose value is True.
+
+    For the system mouse, use :class:`~trajtracker.io.ThreadSafeMouse`. Note that it returns the last position
+    known to pygame, which is updated only when the main loop processes the events - so it does not increase
+    the temporal resolution beyond the main loop's rate. For a higher resolution, you need a mouse object that reads
+    the device directly (e.g., a driver for a touch device that runs its own thread); any object with a
+    *position* property and thread_safe=True can be used.
+    """
+
+    #: The default capacity of the ring buffer (number of samples)
+    default_capacity = 4096
+
+
+    #------------------------------------------------
+    def __init__(self, mouse, rate=500, capacity=None):
+        """
+        Constructor - invoked when you create a new object by writing BackgroundMouseSampler()
+
+        :param mouse: The mouse object to sample: an object with a *position* property and a *thread_safe*
+                      attribute whose value is True (see the class documentation)
+        :param rate: See :attr:`~trajtracker.io.BackgroundMouseSampler.rate`
+        :param capacity: The number of samples in the ring buffer
+        """
+
+        super(BackgroundMouseSampler, self).__init__()
+
+        if capacity is None:
+            capacity = self.default_capacity
+
+        if getattr(mouse, "thread_safe", False) is not True:
+            raise ttrk.TypeError(("{:}.__init__(): the mouse ({:}) is not declared as thread-safe, so it cannot be sampled " +
+                                  "from the sampler thread").format(_u.get_type_name(self), _u.get_type_name(mouse)))
+
+        _u.validate_func_arg_type(self, "__init__", "capacity", capacity, int)
+        _u.validate_func_arg_positive(self, "__init__", "capacity", capacity)
+
+        self.rate = rate
+        self._mouse = mouse
+
+        self._buffer = np.zeros((capacity, 3), dtype=np.float64)
+        self._n_written = 0
+        self._n_read = 0
+
+        self._thread = None
+        self._stop_requested = False
+
+        self.reset_statistics()
+
+
+    #========================================================================
+    #   Start / stop
+    #========================================================================
+
+    #------------------------------------------------
+    def start(self):
+        """
+        Start sampling (in a new thread)
+        """
+
+        if self._thread is not None:
+            raise ttrk.InvalidStateError("{:}.start() was called, but the sampler is already running".format(_u.get_type_name(self)))
+
+        self._stop_requested = False
+        self._thread = threading.Thread(target=self._run, args=(self._mouse, ), name="BackgroundMouseSampler")
+        self._thread.daemon = True
+        self._thread.start()
+
+        self._log_write_if(ttrk.log_debug, "Started sampling the mouse at {:} Hz".format(self._rate), True)
+
+
+    #------------------------------------------------
+    def stop(self):
+        """
+        Stop sampling. Samples that were not drained yet remain in the buffer.
+        Calling stop() when the sampler is not running has no effect.
+        """
+
+        if self._thread is None:
+            return
+
+        self._stop_requested = True
+        self._thread.join()
+        self._thread = None
+
+        self._log_write_if(ttrk.log_debug, "Stopped sampling the mouse", True)
+
+
+    #------------------------------------------------
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+
+    #========================================================================
+    #   Sampler thread
+    #========================================================================
+
+    #------------------------------------------------
+    def _run(self, mouse):
+
+        next_time = u.get_time()
+
+        while not self._stop_requested:
+
+            now = u.get_time()
+            if now < next_time:
+                time.sleep(next_time - now)
+
+            x, y = mouse.position
+            sample_time = u.get_time()
+            self._add_sample(x, y, sample_time)
+
+            next_time += self._interval
+            if sample_time > next_time:
+                #-- We're late by more than one interval: skip the missed ticks rather than sampling in a burst
+                self._n_missed_ticks += int((sample_time - next_time) // self._interval) + 1
+                next_time = sample_time + self._interval
+
+
+    #------------------------------------------------
+    # Called only from the sampler thread
+    #
+    def _add_sample(self, x, y, sample_time):
+
+        if self._last_sample_time is not None:
+            interval = sample_time - self._last_sample_time
+            self._n_intervals += 1
+            self._sum_intervals += interval
+            self._sum_sq_intervals += interval ** 2
+            self._max_interval = max(self._max_interval, interval)
+        self._last_sample_time = sample_time
+
+        n_written = self._n_written
+        if n_written - self._n_read >= len(self._buffer):
+            self._n_overruns += 1
+            return
+
+        self._buffer[n_written % len(self._buffer)] = x, y, sample_time
+
+        #-- Publish the sample only after it was written
+        self._n_written = n_written + 1
+
+
+    #========================================================================
+    #   Read samples
+    #========================================================================
+
+    #------------------------------------------------
+    def drain(self):
+        """
+        Get all samples that were collected since the previous call, and remove them from the buffer.
+        Call this from one thread only (typically, once per frame in the main loop).
+
+        :return: (N,3) array with columns x, y, time (the time is as returned by :func:`trajtracker.utils.get_time`),
+                 oldest first
+        """
+
+        n_read = self._n_read
+        n_written = self._n_written
+        capacity = len(self._buffer)
+
+        start = n_read % capacity
+        end = start + (n_written - n_read)
+        if end <= capacity:
+            samples = self._buffer[start:end].copy()
+        else:
+            samples = np.concatenate([self._buffer[start:], self._buffer[:end - capacity]])
+
+        #-- Release the space only after the samples were copied
+        self._n_read = n_written
+
+        return samples
+
+
+    #========================================================================
+    #   Statistics
+    #========================================================================
+
+    #------------------------------------------------
+    def get_statistics(self):
+        """
+        Get statistics about the sampling since the sampler was created (or since reset_statistics() was called).
+
+        :return: A dict with these entries:
+
+                 - n_samples: the number of samples taken (including dropped samples)
+                 - n_overruns: the number of samples dropped because the buffer was full
+                 - n_missed_ticks: the number of times the sampler thread was too late, and skipped a sample
+                 - mean_interval: the mean interval between samples (seconds)
+                 - jitter: the standard deviation of the intervals between samples (seconds)
+                 - max_interval: the longest interval between samples (seconds)
+        """
+
+        n = self._n_intervals
+        mean = self._sum_intervals / n if n > 0 else None
+        jitter = np.sqrt(max(0, self._sum_sq_intervals / n - mean ** 2)) if n > 0 else None
+
+        return dict(n_samples=n + (0 if self._last_sample_time is None else 1),
+                    n_overruns=self._n_overruns,
+                    n_missed_ticks=self._n_missed_ticks,
+                    mean_interval=mean,
+                    jitter=jitter,
+                    max_interval=self._max_interval if n > 0 else None)
+
+
+    #------------------------------------------------
+    def reset_statistics(self):
+        """
+        Restart the statistics of :func:`~trajtracker.io.BackgroundMouseSampler.get_statistics`
+        """
+        self._last_sample_time = None
+        self._n_intervals = 0
+        self._sum_intervals = 0
+        self._sum_sq_intervals = 0
+        self._max_interval = 0
+        self._n_overruns = 0
+        self._n_missed_ticks = 0
+
+
+    #========================================================================
+    #   Properties
+    #========================================================================
+
+    #------------------------------------------------
+    @property
+    def rate(self):
+        """
+        The sampling rate (samples per second)
+        """
+        return self._rate
+
+    @rate.setter
+    def rate(self, value):
+        _u.validate_attr_type(self, "rate", value, numbers.Number)
+        _u.validate_attr_positive(self, "rate", value)
+        self._rate = value
+        self._interval = 1 / value
+        self._log_property_changed("rate")
+
+    #------------------------------------------------
+    @property
+    def running(self):
+        """ Whether the sampler thread is running (read-only) """
+        return self._thread is not None
+
+    #------------------------------------------------
+    @property
+    def capacity(self):
+        """ The number of samples in the ring buffer (read-only) """
+        return len(self._buffer)
+
+    #------------------------------------------------
+    @property
+    def n_pending(self):
+        """ The number of samples waiting in the buffer (read-only) """
+        return self._n_written - self._n_read
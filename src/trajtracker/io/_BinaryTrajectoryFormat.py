@@ -0,0 +1,145 @@
+"""
+
+Binary trajectory file format: an append-only file with typed columns
+
+@author: Dror Dotan
+@copyright: Copyright (c) 2017, Dror Dotan
+
+This file is part of TrajTracker.
+
+TrajTracker is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+TrajTracker is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with TrajTracker.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import struct
+
+import numpy as np
+
+import trajtracker as ttrk
+import trajtracker._utils as _u
+
+
+class BinaryTrajectoryFormat(object):
+    """
+    Encodes trajectory data in TrajTracker's binary format.
+
+    The file starts with a 16-byte header, followed by chunks - one chunk per saved trial.
+    Each chunk has an 8-byte header (the chunk signature and the number of rows), followed by 4 columns:
+    trial (int32), time (float64), x and y. The data type of x and y depends on the precision:
+    int16 for precision 0, float32 for precision 1-3, and float64 for higher precision.
+    Each column is padded to a multiple of 8 bytes. All numbers are little-endian.
+
+    Use :class:`~trajtracker.io.BinaryTrajectoryReader` to read such files.
+    """
+
+    file_signature = b"TTRKTRJ\x00"
+    chunk_signature = b"CHNK"
+    version = 1
+
+    #-- signature, version, xy type code, reserved, xy_precision, time_precision
+    header_struct = struct.Struct("<8sHBBhh")
+
+    #-- signature, number of rows
+    chunk_header_struct = struct.Struct("<4sI")
+
+    xy_dtypes = {1: np.dtype("<i2"), 2: np.dtype("<f4"), 3: np.dtype("<f8")}
+    trial_dtype = np.dtype("<i4")
+    time_dtype = np.dtype("<f8")
+
+
+    #------------------------------------------------
+    def __init__(self, xy_precision=5, time_precision=3):
+        """
+        Constructor - invoked when you create a new object by writing BinaryTrajectoryFormat()
+
+        :param xy_precision: The number of digits after the decimal point for x,y coordinates
+        :param time_precision: The number of digits after the decimal point for time
+        """
+
+        _u.validate_func_arg_type(self, "__init__", "xy_precision", xy_precision, int)
+        _u.validate_func_arg_not_negative(self, "__init__", "xy_precision", xy_precision)
+        _u.validate_func_arg_type(self, "__init__", "time_precision", time_precision, int)
+        _u.validate_func_arg_not_negative(self, "__init__", "time_precision", time_precision)
+
+        self._xy_precision = xy_precision
+        self._time_precision = time_precision
+        self._xy_type_code = self.xy_type_code_for_precision(xy_precision)
+
+
+    #------------------------------------------------
+    @staticmethod
+    def xy_type_code_for_precision(xy_precision):
+        """
+        Get the code of the x,y column data type (a key in BinaryTrajectoryFormat.xy_dtypes)
+        """
+        if xy_precision == 0:
+            return 1
+        elif xy_precision <= 3:
+            return 2
+        else:
+            return 3
+
+
+    #------------------------------------------------
+    @property
+    def xy_dtype(self):
+        """ The NumPy data type of the x,y columns """
+        return self.xy_dtypes[self._xy_type_code]
+
+
+    #------------------------------------------------
+    def encode_header(self):
+        """
+        Get the file header (bytes)
+        """
+        return self.header_struct.pack(self.file_signature, self.version, self._xy_type_code, 0,
+                                       self._xy_precision, self._time_precision)
+
+
+    #------------------------------------------------
+    def encode_trial(self, trial_num, xyt):
+        """
+        Get the chunk (bytes) with one trial's data
+
+        :param trial_num: The trial number
+        :param xyt: (N,3) array with columns x, y, time
+        """
+
+        xyt = np.asarray(xyt, dtype=np.float64)
+        n_rows = len(xyt)
+
+        xy = np.round(xyt[:, :2], self._xy_precision)
+        if self._xy_type_code == 1:
+            int16_range = np.iinfo(np.int16)
+            if n_rows > 0 and (xy.min() < int16_range.min or xy.max() > int16_range.max):
+                raise ttrk.ValueError("{:}: x,y coordinates are out of the int16 range; use a higher xy_precision".format(
+                    _u.get_type_name(self)))
+
+        columns = [np.full(n_rows, trial_num, dtype=self.trial_dtype),
+                   np.round(xyt[:, 2], self._time_precision).astype(self.time_dtype),
+                   xy[:, 0].astype(self.xy_dtype),
+                   xy[:, 1].astype(self.xy_dtype)]
+
+        parts = [self.chunk_header_struct.pack(self.chunk_signature, n_rows)]
+        for col in columns:
+            data = col.tobytes()
+            parts.append(data)
+            parts.append(b"\x00" * padding_size(len(data)))
+
+        return b"".join(parts)
+
+
+#------------------------------------------------
+def padding_size(n_bytes):
+    """ The number of bytes required for padding n_bytes to a multiple of 8 """
+    return -n_bytes % 8
@@ -0,0 +1,243 @@
+"""
+
+Read trajectory files saved in TrajTracker's binary format
+
+@author: Dror Dotan
+@copyright: Copyright (c) 2017, Dror Dotan
+
+This file is part of TrajTracker.
+
+TrajTracker is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+TrajTracker is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with TrajTracker.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+from collections import OrderedDict
+
+import numpy as np
+
+import trajtracker as ttrk
+import trajtracker._utils as _u
+from trajtracker.io._BinaryTrajectoryFormat import BinaryTrajectoryFormat, padding_size
+
+
+class BinaryTrajectoryReader(ttrk.TTrkObject):
+    """
+    Reads a trajectory file that was saved in binary format (see :class:`~trajtracker.io.BinaryTrajectoryFormat`).
+
+    The file is memory-mapped, and the data of each trial is returned as NumPy arrays that are views of
+    the mapped file - the data is not copied and not parsed.
+
+    An incomplete chunk at the end of the file (e.g., if the experiment crashed while the file was being written)
+    is ignored.
+    """
+
+    #------------------------------------------------
+    def __init__(self, filename):
+        """
+        Constructor - invoked when you create a new object by writing BinaryTrajectoryReader()
+
+        :param filename: The file to read
+        """
+
+        super(BinaryTrajectoryReader, self).__init__()
+
+        _u.validate_func_arg_type(self, "__init__", "filename", filename, str)
+
+        self._filename = filename
+        self._mmap = np.memmap(filename, dtype=np.uint8, mode="r")
+
+        try:
+            self._parse_header()
+            self._chunks = self._parse_chunks()
+        except:
+            self.close()
+            raise
+
+
+    #------------------------------------------------
+    def _parse_header(self):
+
+        header_struct = BinaryTrajectoryFormat.header_struct
+        if len(self._mmap) < header_struct.size:
+            raise ttrk.BadFormatError("{:}: {:} is not a binary trajectory file (too short)".format(
+                _u.get_type_name(self), self._filename))
+
+        signature, version, xy_type_code, _, xy_precision, time_precision = \
+            header_struct.unpack(self._mmap[:header_struct.size].tobytes())
+
+        if signature != BinaryTrajectoryFormat.file_signature:
+            raise ttrk.BadFormatError("{:}: {:} is not a binary trajectory file".format(_u.get_type_name(self), self._filename))
+        if version != BinaryTrajectoryFormat.version:
+            raise ttrk.BadFormatError("{:}: unsupported version ({:}) of binary trajectory file {:}".format(
+                _u.get_type_name(self), version, self._filename))
+        if xy_type_code not in BinaryTrajectoryFormat.xy_dtypes:
+            raise ttrk.BadFormatError("{:}: invalid x,y data type ({:}) in {:}".format(
+                _u.get_type_name(self), xy_type_code, self._filename))
+
+        self._xy_dtype = BinaryTrajectoryFormat.xy_dtypes[xy_type_code]
+        self._xy_precision = xy_precision
+        self._time_precision = time_precision
+
+
+    #------------------------------------------------
+    # Find all chunks in the file. Returns an ordered dict: trial number -> list of chunks.
+    # Each chunk is a (trial, time, x, y) tuple of arrays.
+    #
+    def _parse_chunks(self):
+
+        chunk_header_struct = BinaryTrajectoryFormat.chunk_header_struct
+        col_dtypes = BinaryTrajectoryFormat.trial_dtype, BinaryTrajectoryFormat.time_dtype, self._xy_dtype, self._xy_dtype
+
+        chunks = OrderedDict()
+        file_size = len(self._mmap)
+        offset = BinaryTrajectoryFormat.header_struct.size
+
+        while offset + chunk_header_struct.size <= file_size:
+
+            signature, n_rows = chunk_header_struct.unpack(self._mmap[offset:offset + chunk_header_struct.size].tobytes())
+            if signature != BinaryTrajectoryFormat.chunk_signature:
+                raise ttrk.BadFormatError("{:}: invalid chunk at offset {:} of {:}".format(
+                    _u.get_type_name(self), offset, self._filename))
+
+            col_offset = offset + chunk_header_struct.size
+            columns = []
+            for dtype in col_dtypes:
+                n_bytes = n_rows * dtype.itemsize
+                columns.append((col_offset, n_bytes, dtype))
+                col_offset += n_bytes + padding_size(n_bytes)
+
+            if col_offset > file_size:
+                #-- Incomplete chunk
+                break
+
+            trial, times, x, y = [self._mmap[start:start + n_bytes].view(dtype) for start, n_bytes, dtype in columns]
+
+            trial_num = int(trial[0]) if n_rows > 0 else None
+            if trial_num is not None:
+                chunks.setdefault(trial_num, []).append((times, x, y))
+
+            offset = col_offset
+
+        return chunks
+
+
+    #========================================================================
+    #   API
+    #========================================================================
+
+    #------------------------------------------------
+    def get_trial(self, trial_num):
+        """
+        Get the data of one trial.
+
+        The arrays are read-only views of the file. If the trial was saved more than once to the same file,
+        the data of all saves is concatenated (in this case, the arrays are copies).
+
+        :param trial_num: The trial number
+        :return: A tuple with 3 arrays: times, x, y
+        """
+
+        self._validate_open("get_trial")
+
+        if trial_num not in self._chunks:
+            raise ttrk.ValueError("{:}.get_trial(): trial #{:} does not exist in {:}".format(
+                _u.get_type_name(self), trial_num, self._filename))
+
+        chunks = self._chunks[trial_num]
+        if len(chunks) == 1:
+            return chunks[0]
+
+        return tuple(np.concatenate(col) for col in zip(*chunks))
+
+
+    #------------------------------------------------
+    def iter_trials(self):
+        """
+        Iterate over all trials in the file, in the order they were saved.
+
+        :return: An iterator of (trial_num, times, x, y) tuples
+        """
+        self._validate_open("iter_trials")
+        for trial_num in self._chunks:
+            times, x, y = self.get_trial(trial_num)
+            yield trial_num, times, x, y
+
+
+    #------------------------------------------------
+    def close(self):
+        """
+        Release the memory-mapped file. Arrays previously returned by this object must not be used after close().
+        Calling close() more than once has no effect.
+        """
+        if self._mmap is None:
+            return
+
+        mm = self._mmap._mmap
+        self._mmap = None
+        self._chunks = None
+        if mm is not None:
+            try:
+                mm.close()
+            except BufferError:
+                #-- Some arrays still refer to the file; it will be unmapped when they are deleted
+                pass
+
+
+    #------------------------------------------------
+    def _validate_open(self, func_name):
+        if self._mmap is None:
+            raise ttrk.InvalidStateError("{:}.{:}() was called after the reader was closed".format(_u.get_type_name(self), func_name))
+
+
+    #------------------------------------------------
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+    #========================================================================
+    #   Properties
+    #========================================================================
+
+    #------------------------------------------------
+    @property
+    def filename(self):
+        """ The name of the file being read (read-only) """
+        return self._filename
+
+    #------------------------------------------------
+    @property
+    def trial_nums(self):
+        """ The numbers of all trials in the file, in the order they were saved (read-only) """
+        self._validate_open("trial_nums")
+        return list(self._chunks.keys())
+
+    #------------------------------------------------
+    @property
+    def xy_precision(self):
+        """ The xy_precision with which the file was saved (read-only) """
+        return self._xy_precision
+
+    #------------------------------------------------
+    @property
+    def time_precision(self):
+        """ The time_precision with which the file was saved (read-only) """
+        return self._time_precision
+
+    #------------------------------------------------
+    @property
+    def xy_dtype(self):
+        """ The NumPy data type of the x and y columns (read-only) """
+        return self._xy_dtype
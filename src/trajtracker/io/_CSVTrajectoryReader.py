@@ -0,0 +1,429 @@
+"""
+
+Random-access reader for the trajectory CSV files saved by TrajectoryTracker
+
+@author: Dror Dotan
+@copyright: Copyright (c) 2017, Dror Dotan
+
+This file is part of TrajTracker.
+
+TrajTracker is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+TrajTracker is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with TrajTracker.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import os
+from collections import OrderedDict
+
+import numpy as np
+
+import trajtracker as ttrk
+import trajtracker._utils as _u
+
+
+class CSVTrajectoryReader(ttrk.TTrkObject):
+    """
+    Reads specific trials from a trajectory CSV file (with columns trial,time,x,y), without reading the whole file.
+
+    The reader uses a sidecar index file (by default, the CSV file name + ".idx"), which
+    :class:`~trajtracker.movement.TrajectoryTracker` writes if you call *init_output_file(save_index=True)*.
+    Each index line specifies a chunk of consecutive rows in the CSV file: trial number, byte offset, number
+    of bytes and number of rows.
+
+    If there is no index file, or if the CSV file contains rows that are not in the index, the missing part
+    of the index is built in a single pass over the file. The index file is then created/updated, if possible.
+    An index file that does not match the CSV file (e.g., left over from an earlier file with the same name) is
+    ignored and rebuilt.
+
+    To read the whole file, use :func:`~trajtracker.io.CSVTrajectoryReader.read_all` or
+    :func:`~trajtracker.io.CSVTrajectoryReader.iter_trials` - these do not need the index. Each block of the
+    file is split into its fields with a single bytes.split() call, and all fields are converted to float by
+    one NumPy call. This still creates a short-lived bytes object per field, but avoids the per-row work of
+    the csv module (a list of strings and a float() call per value).
+    """
+
+    #: The default number of bytes read at a time by :func:`~trajtracker.io.CSVTrajectoryReader.iter_trials`
+    default_block_size = 1 << 20
+
+    #: The column names in the trajectory CSV file
+    csv_header = "trial,time,x,y"
+
+    #: The column names in the index file
+    index_header = "trial,offset,n_bytes,n_rows"
+
+
+    #------------------------------------------------
+    def __init__(self, filename, index_filename=None):
+        """
+        Constructor - invoked when you create a new object by writing CSVTrajectoryReader()
+
+        :param filename: The trajectory CSV file
+        :param index_filename: The index file (default: filename + ".idx")
+        """
+
+        super(CSVTrajectoryReader, self).__init__()
+
+        _u.validate_func_arg_type(self, "__init__", "filename", filename, str)
+        _u.validate_func_arg_type(self, "__init__", "index_filename", index_filename, str, none_allowed=True)
+
+        self._filename = filename
+        self._index_filename = filename + ".idx" if index_filename is None else index_filename
+        self._index = None
+
+
+    #========================================================================
+    #   Index
+    #========================================================================
+
+    #------------------------------------------------
+    def _get_index(self):
+        if self._index is None:
+            self._index = self._load_index()
+        return self._index
+
+
+    #------------------------------------------------
+    # Load the index file, and index any part of the CSV file that is not covered by it.
+    # Returns an ordered dict: trial number -> list of (offset, n_bytes, n_rows)
+    #
+    def _load_index(self):
+
+        file_size = os.path.getsize(self._filename)
+
+        index = OrderedDict()
+        indexed_end = None
+
+        if os.path.exists(self._index_filename):
+            entries = self._read_index_file()
+
+            #-- Ignore entries that refer to data that was not written (e.g., after a crash)
+            entries = [e for e in entries if e[1] + e[2] <= file_size]
+
+            if self._index_matches_file(entries):
+                for trial_num, offset, n_bytes, n_rows in entries:
+                    index.setdefault(trial_num, []).append((offset, n_bytes, n_rows))
+                    indexed_end = offset + n_bytes
+            else:
+                self._log_write_if(ttrk.log_warn, "The index file {:} does not match {:} - rebuilding it".format(
+                    self._index_filename, self._filename), True)
+
+        if indexed_end is None:
+            indexed_end = self._get_data_offset()
+
+        if indexed_end < file_size:
+            new_entries = self._scan(indexed_end)
+            for trial_num, offset, n_bytes, n_rows in new_entries:
+                index.setdefault(trial_num, []).append((offset, n_bytes, n_rows))
+            self._save_index(index, len(new_entries))
+
+        return index
+
+
+    #------------------------------------------------
+    def _read_index_file(self):
+
+        with open(self._index_filename, "r") as fh:
+            header = fh.readline().strip()
+            if header != self.index_header:
+                raise ttrk.BadFormatError("{:}: invalid header in index file {:}".format(_u.get_type_name(self), self._index_filename))
+
+            entries = []
+            for line in fh:
+                fields = line.strip().split(",")
+                if len(fields) != 4:
+                    #-- An incomplete line at the end of the file
+                    break
+                entries.append(tuple(int(f) for f in fields))
+
+        return entries
+
+
+    #------------------------------------------------
+    # Check that the index entries match the CSV file: each chunk must start at the beginning of a row of its
+    # trial, and end at the end of a row. An index that does not match was created for another file with the
+    # same name (e.g., by an earlier run).
+    #
+    def _index_matches_file(self, entries):
+
+        if len(entries) == 0:
+            return True
+
+        data_offset = self._get_data_offset()
+
+        with open(self._filename, "rb") as fh:
+            for trial_num, offset, n_bytes, n_rows in entries:
+                if offset < data_offset or n_bytes <= 0 or n_rows <= 0:
+                    return False
+
+                prefix = b"%d," % trial_num
+                fh.seek(offset - 1)
+                if fh.read(1 + len(prefix)) != b"\n" + prefix:
+                    return False
+
+                fh.seek(offset + n_bytes - 1)
+                if fh.read(1) != b"\n":
+                    return False
+
+        return True
+
+
+    #------------------------------------------------
+    # The offset of the first data row in the CSV file (after the header line)
+    #
+    def _get_data_offset(self):
+        with open(self._filename, "rb") as fh:
+            header = fh.readline()
+        if header.strip().decode("ascii", "replace").lower() != self.csv_header:
+            raise ttrk.BadFormatError("{:}: {:} is not a trajectory file (expecting the columns {:})".format(
+                _u.get_type_name(self), self._filename, self.csv_header))
+        return len(header)
+
+
+    #------------------------------------------------
+    # Index the CSV file, starting from the given offset. Each run of consecutive rows with the same trial
+    # number becomes an index entry.
+    #
+    def _scan(self, offset):
+
+        entries = []
+        curr_trial = None
+        chunk_offset = offset
+        n_rows = 0
+
+        with open(self._filename, "rb") as fh:
+            fh.seek(offset)
+            for line in fh:
+                if not line.endswith(b"\n"):
+                    #-- An incomplete line at the end of the file
+                    break
+
+                trial_num = int(line[:line.index(b",")])
+                if trial_num != curr_trial:
+                    if curr_trial is not None:
+                        entries.append((curr_trial, chunk_offset, offset - chunk_offset, n_rows))
+                    curr_trial = trial_num
+                    chunk_offset = offset
+                    n_rows = 0
+
+                n_rows += 1
+                offset += len(line)
+
+        if curr_trial is not None:
+            entries.append((curr_trial, chunk_offset, offset - chunk_offset, n_rows))
+
+        return entries
+
+
+    #------------------------------------------------
+    # Rewrite the index file. If it can't be written (e.g., a read-only directory), the index is kept only in memory.
+    #
+    def _save_index(self, index, n_new_entries):
+
+        entries = sorted((offset, n_bytes, n_rows, trial_num)
+                         for trial_num, chunks in index.items() for offset, n_bytes, n_rows in chunks)
+        lines = [self.index_header + "\n"] + ["%d,%d,%d,%d\n" % (trial_num, offset, n_bytes, n_rows)
+                                              for offset, n_bytes, n_rows, trial_num in entries]
+
+        try:
+            with open(self._index_filename, "w") as fh:
+                fh.write("".join(lines))
+        except (IOError, OSError) as e:
+            self._log_write_if(ttrk.log_warn, "Could not save the index file {:}: {:}".format(self._index_filename, e), True)
+            return
+
+        self._log_write_if(ttrk.log_debug, "Added {:} entries to the index file {:}".format(n_new_entries, self._index_filename), True)
+
+
+    #========================================================================
+    #   API
+    #========================================================================
+
+    #------------------------------------------------
+    def get_trial(self, trial_num):
+        """
+        Read the data of one trial
+
+        :param trial_num: The trial number
+        :return: A tuple with 3 float64 arrays: times, x, y
+        """
+        return self.get_trials([trial_num])[trial_num]
+
+
+    #------------------------------------------------
+    def get_trials(self, trial_nums):
+        """
+        Read the data of several trials. The file is read in the order of the trials in the file.
+
+        :param trial_nums: A list of trial numbers
+        :return: A dict: trial number -> tuple with 3 float64 arrays (times, x, y)
+        """
+
+        _u.validate_func_arg_is_collection(self, "get_trials", "trial_nums", trial_nums, allow_set=True)
+
+        index = self._get_index()
+
+        missing = [t for t in trial_nums if t not in index]
+        if len(missing) > 0:
+            raise ttrk.ValueError("{:}.get_trials(): trial #{:} does not exist in {:}".format(
+                _u.get_type_name(self), missing[0], self._filename))
+
+        chunks = sorted((offset, n_bytes, trial_num) for trial_num in set(trial_nums) for offset, n_bytes, n_rows in index[trial_num])
+
+        data = {}
+        with open(self._filename, "rb") as fh:
+            for offset, n_bytes, trial_num in chunks:
+                fh.seek(offset)
+                data.setdefault(trial_num, []).append(_parse_rows(fh.read(n_bytes)))
+
+        result = {}
+        for trial_num, trial_chunks in data.items():
+            rows = trial_chunks[0] if len(trial_chunks) == 1 else np.concatenate(trial_chunks)
+            result[trial_num] = rows[:, 1], rows[:, 2], rows[:, 3]
+
+        return result
+
+
+    #------------------------------------------------
+    def read_columns(self):
+        """
+        Read the whole file into NumPy columns.
+        An incomplete line at the end of the file (e.g., if the experiment crashed) is ignored.
+
+        :return: A tuple with 4 float64 arrays: trial, times, x, y - in the order of the rows in the file
+        """
+
+        with open(self._filename, "rb") as fh:
+            fh.seek(self._get_data_offset())
+            data = fh.read()
+
+        rows = _parse_rows(data[:data.rfind(b"\n") + 1])
+        return rows[:, 0], rows[:, 1], rows[:, 2], rows[:, 3]
+
+
+    #------------------------------------------------
+    def read_all(self):
+        """
+        Read the whole file, and split it into trials.
+
+        The per-trial arrays are views of 3 large arrays (one per column), so there is no copying per trial.
+        If a trial was saved more than once, its rows are merged (in the order they appear in the file).
+
+        :return: An OrderedDict: trial number -> tuple with 3 float64 arrays (times, x, y), sorted by trial number
+        """
+
+        trials, times, x, y = self.read_columns()
+
+        if (np.diff(trials) < 0).any():
+            order = np.argsort(trials, kind="stable")
+            trials, times, x, y = trials[order], times[order], x[order], y[order]
+
+        trial_nums, starts = np.unique(trials, return_index=True)
+        ends = np.append(starts[1:], len(trials))
+
+        return OrderedDict((int(trial_num), (times[start:end], x[start:end], y[start:end]))
+                           for trial_num, start, end in zip(trial_nums, starts, ends))
+
+
+    #------------------------------------------------
+    def iter_trials(self, block_size=None):
+        """
+        Iterate over the file trial by trial, without loading the whole file into memory.
+
+        The file is read and parsed in blocks of *block_size* bytes. Each run of consecutive rows with the same
+        trial number is returned as one trial; so if a trial was saved more than once (not consecutively),
+        it is returned more than once.
+
+        :param block_size: The number of bytes to read at a time (default: 1 MB)
+        :return: An iterator of (trial_num, times, x, y) tuples, in the order of the trials in the file
+        """
+
+        if block_size is None:
+            block_size = self.default_block_size
+        _u.validate_func_arg_type(self, "iter_trials", "block_size", block_size, int)
+        _u.validate_func_arg_positive(self, "iter_trials", "block_size", block_size)
+
+        #-- The rows of the last trial in the previous blocks (it may continue in the next block)
+        pending = []
+
+        with open(self._filename, "rb") as fh:
+            fh.seek(self._get_data_offset())
+            remainder = b""
+
+            while True:
+                block = fh.read(block_size)
+                if len(block) == 0:
+                    break
+
+                data = remainder + block
+                end = data.rfind(b"\n") + 1
+                remainder = data[end:]
+                if end == 0:
+                    continue
+
+                rows = _parse_rows(data[:end])
+
+                #-- The indices where a new trial starts
+                starts = np.flatnonzero(rows[1:, 0] != rows[:-1, 0]) + 1
+                if len(pending) > 0 and pending[-1][-1, 0] != rows[0, 0]:
+                    starts = np.append(0, starts)
+
+                prev = 0
+                for start in starts.tolist():
+                    pending.append(rows[prev:start])
+                    yield _trial_tuple(pending)
+                    pending = []
+                    prev = start
+
+                pending.append(rows[prev:])
+
+        if len(pending) > 0:
+            yield _trial_tuple(pending)
+
+
+    #========================================================================
+    #   Properties
+    #========================================================================
+
+    #------------------------------------------------
+    @property
+    def filename(self):
+        """ The trajectory CSV file (read-only) """
+        return self._filename
+
+    #------------------------------------------------
+    @property
+    def index_filename(self):
+        """ The index file (read-only) """
+        return self._index_filename
+
+    #------------------------------------------------
+    @property
+    def trial_nums(self):
+        """ The numbers of all trials in the file, in the order they appear in the file (read-only) """
+        return list(self._get_index().keys())
+
+
+#------------------------------------------------
+# Parse rows of the trajectory CSV file (bytes) into an (N,4) array.
+# bytes.split() creates one bytes object per field; they are converted by a single NumPy call.
+#
+def _parse_rows(data):
+    values = data.replace(b"\r", b"").replace(b"\n", b",").split(b",")[:-1]
+    return np.array(values, dtype=np.float64).reshape(-1, 4)
+
+
+#------------------------------------------------
+# (trial_num, times, x, y) from the parts of one trial's (N,4) rows
+#
+def _trial_tuple(parts):
+    rows = parts[0] if len(parts) == 1 else np.concatenate(parts)
+    return int(rows[0, 0]), rows[:, 1], rows[:, 2], rows[:, 3]
@@ -0,0 +1,279 @@
+"""
+
+Compressed trajectory file format: delta-encoded, varint-encoded and zlib-compressed
+
+@author: Dror Dotan
+@copyright: Copyright (c) 2017, Dror Dotan
+
+This file is part of TrajTracker.
+
+TrajTracker is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+TrajTracker is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with TrajTracker.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import struct
+import zlib
+
+import numpy as np
+
+import trajtracker as ttrk
+import trajtracker._utils as _u
+
+
+class CompressedTrajectoryFormat(object):
+    """
+    Encodes and decodes trajectory data in TrajTracker's compressed format.
+
+    Time is quantized to *time_precision* digits after the decimal point, and x,y to *xy_precision* digits
+    (just like in the CSV format), so the compression is lossless with respect to the CSV file.
+
+    The file starts with a 16-byte header, followed by one chunk per saved trial. Each chunk has a 16-byte header
+    (signature, trial number, number of rows, payload size) and a zlib-compressed payload. The payload has
+    3 columns - time, x, y - one after the other. Each column is encoded as the differences between subsequent
+    values, zigzag-encoded (so small negative numbers become small positive numbers) and written as varints
+    (7 bits per byte).
+
+    Encoding and decoding are vectorized (no Python loop per sample).
+    """
+
+    file_signature = b"TTRKTRZ\x00"
+    chunk_signature = b"CTRZ"
+    version = 1
+
+    #-- signature, version, reserved, xy_precision, time_precision
+    header_struct = struct.Struct("<8sHHhh")
+
+    #-- signature, trial number, number of rows, payload size
+    chunk_header_struct = struct.Struct("<4siII")
+
+
+    #------------------------------------------------
+    def __init__(self, xy_precision=5, time_precision=3, compression_level=6):
+        """
+        Constructor - invoked when you create a new object by writing CompressedTrajectoryFormat()
+
+        :param xy_precision: The number of digits after the decimal point for x,y coordinates
+        :param time_precision: The number of digits after the decimal point for time
+        :param compression_level: zlib compression level (0-9)
+        """
+
+        _u.validate_func_arg_type(self, "__init__", "xy_precision", xy_precision, int)
+        _u.validate_func_arg_not_negative(self, "__init__", "xy_precision", xy_precision)
+        _u.validate_func_arg_type(self, "__init__", "time_precision", time_precision, int)
+        _u.validate_func_arg_not_negative(self, "__init__", "time_precision", time_precision)
+        _u.validate_func_arg_type(self, "__init__", "compression_level", compression_level, int)
+        if not (0 <= compression_level <= 9):
+            raise ttrk.ValueError("{:}.__init__(): invalid compression_level ({:})".format(_u.get_type_name(self), compression_level))
+
+        self._xy_precision = xy_precision
+        self._time_precision = time_precision
+        self._compression_level = compression_level
+
+
+    #========================================================================
+    #   Encode
+    #========================================================================
+
+    #------------------------------------------------
+    def encode_header(self):
+        """
+        Get the file header (bytes)
+        """
+        return self.header_struct.pack(self.file_signature, self.version, 0, self._xy_precision, self._time_precision)
+
+
+    #------------------------------------------------
+    def encode_trial(self, trial_num, xyt):
+        """
+        Get the chunk (bytes) with one trial's data
+
+        :param trial_num: The trial number
+        :param xyt: (N,3) array with columns x, y, time
+        """
+
+        xyt = np.asarray(xyt, dtype=np.float64).reshape(-1, 3)
+
+        xy_scale = 10 ** self._xy_precision
+        time_scale = 10 ** self._time_precision
+
+        columns = [np.round(xyt[:, 2] * time_scale), np.round(xyt[:, 0] * xy_scale), np.round(xyt[:, 1] * xy_scale)]
+        encoded = [varint_encode(zigzag_encode(np.diff(col.astype(np.int64), prepend=0))) for col in columns]
+
+        payload = zlib.compress(b"".join(encoded), self._compression_level)
+
+        return self.chunk_header_struct.pack(self.chunk_signature, trial_num, len(xyt), len(payload)) + payload
+
+
+    #========================================================================
+    #   Decode
+    #========================================================================
+
+    #------------------------------------------------
+    @classmethod
+    def read_file(cls, filename):
+        """
+        Read a compressed trajectory file.
+
+        An incomplete chunk at the end of the file (e.g., if the experiment crashed while the file was being written)
+        is ignored.
+
+        :param filename: The file to read
+        :return: An iterator of (trial_num, times, x, y) tuples - one per saved trial, in the order they were saved
+        """
+
+        _u.validate_func_arg_type(None, "CompressedTrajectoryFormat.read_file", "filename", filename, str)
+
+        with open(filename, "rb") as fh:
+            data = fh.read()
+
+        xy_precision, time_precision = cls.decode_header(data)
+
+        offset = cls.header_struct.size
+        while offset + cls.chunk_header_struct.size <= len(data):
+
+            signature, trial_num, n_rows, payload_size = cls.chunk_header_struct.unpack_from(data, offset)
+            if signature != cls.chunk_signature:
+                raise ttrk.BadFormatError("CompressedTrajectoryFormat: invalid chunk at offset {:} of {:}".format(offset, filename))
+
+            payload_offset = offset + cls.chunk_header_struct.size
+            if payload_offset + payload_size > len(data):
+                #-- Incomplete chunk
+                break
+
+            payload = data[payload_offset:payload_offset + payload_size]
+            times, x, y = cls.decode_payload(payload, n_rows, xy_precision, time_precision)
+            yield trial_num, times, x, y
+
+            offset = payload_offset + payload_size
+
+
+    #------------------------------------------------
+    @classmethod
+    def decode_header(cls, data):
+        """
+        Decode the file header
+
+        :param data: The file contents (bytes), or at least its first 16 bytes
+        :return: tuple (xy_precision, time_precision)
+        """
+
+        if len(data) < cls.header_struct.size:
+            raise ttrk.BadFormatError("CompressedTrajectoryFormat: not a compressed trajectory file (too short)")
+
+        signature, version, _, xy_precision, time_precision = cls.header_struct.unpack_from(data, 0)
+        if signature != cls.file_signature:
+            raise ttrk.BadFormatError("CompressedTrajectoryFormat: not a compressed trajectory file")
+        if version != cls.version:
+            raise ttrk.BadFormatError("CompressedTrajectoryFormat: unsupported version ({:})".format(version))
+
+        return xy_precision, time_precision
+
+
+    #------------------------------------------------
+    @staticmethod
+    def decode_payload(payload, n_rows, xy_precision, time_precision):
+        """
+        Decode the (compressed) payload of one chunk
+
+        :return: tuple with 3 float64 arrays: times, x, y
+        """
+
+        values = varint_decode(np.frombuffer(zlib.decompress(payload), dtype=np.uint8))
+        if len(values) != 3 * n_rows:
+            raise ttrk.BadFormatError("CompressedTrajectoryFormat: invalid chunk (expecting {:} values, found {:})".format(
+                3 * n_rows, len(values)))
+
+        columns = np.cumsum(zigzag_decode(values).reshape(3, n_rows), axis=1)
+
+        xy_scale = 10 ** xy_precision
+        time_scale = 10 ** time_precision
+
+        return columns[0] / time_scale, columns[1] / xy_scale, columns[2] / xy_scale
+
+
+#========================================================================
+#   Zigzag & varint encoding (vectorized)
+#========================================================================
+
+#------------------------------------------------
+def zigzag_encode(values):
+    """
+    Map signed int64 values to uint64: 0, -1, 1, -2, 2, ... become 0, 1, 2, 3, 4, ...
+    """
+    values = np.asarray(values, dtype=np.int64)
+    return ((values << 1) ^ (values >> 63)).astype(np.uint64)
+
+
+#------------------------------------------------
+def zigzag_decode(values):
+    """
+    The inverse of :func:`zigzag_encode`
+    """
+    values = np.asarray(values, dtype=np.uint64)
+    return (values >> np.uint64(1)).astype(np.int64) ^ -(values & np.uint64(1)).astype(np.int64)
+
+
+#------------------------------------------------
+def varint_encode(values):
+    """
+    Encode uint64 values as varints (LEB128): 7 bits per byte, least significant first; the high bit of each
+    byte is set if more bytes follow.
+
+    :return: bytes
+    """
+
+    values = np.asarray(values, dtype=np.uint64)
+    if len(values) == 0:
+        return b""
+
+    #-- Number of bytes per value: 1 + the number of 7-bit groups after the first one
+    n_bytes = np.ones(len(values), dtype=np.int64)
+    remaining = values >> np.uint64(7)
+    while remaining.any():
+        n_bytes += remaining > 0
+        remaining >>= np.uint64(7)
+
+    max_bytes = int(n_bytes.max())
+    shifts = np.arange(max_bytes, dtype=np.uint64) * np.uint64(7)
+    groups = ((values[:, None] >> shifts) & np.uint64(0x7f)).astype(np.uint8)
+
+    byte_index = np.arange(max_bytes)
+    groups[byte_index < (n_bytes - 1)[:, None]] |= 0x80
+
+    return groups[byte_index < n_bytes[:, None]].tobytes()
+
+
+#------------------------------------------------
+def varint_decode(data):
+    """
+    The inverse of :func:`varint_encode`
+
+    :param data: uint8 array
+    :return: uint64 array
+    """
+
+    data = np.asarray(data, dtype=np.uint8)
+    if len(data) == 0:
+        return np.zeros(0, dtype=np.uint64)
+
+    is_last = data < 0x80
+    if not is_last[-1]:
+        raise ttrk.BadFormatError("Invalid varint data (the last value is incomplete)")
+
+    #-- The index of each value's first byte, and the position of each byte within its value
+    starts = np.flatnonzero(np.concatenate(([True], is_last[:-1])))
+    value_index = np.cumsum(np.concatenate(([0], is_last[:-1])))
+    byte_pos = np.arange(len(data)) - starts[value_index]
+
+    parts = (data & 0x7f).astype(np.uint64) << (byte_pos.astype(np.uint64) * np.uint64(7))
+    return np.bitwise_or.reduceat(parts, starts)
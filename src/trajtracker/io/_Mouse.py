@@ -19,6 +19,9 @@ GNU General Public License for more details.
 You should have received a copy of the GNU General Public License
 along with TrajTracker.  If not, see <http://www.gnu.org/licenses/>.
 """
+from __future__ import division
+
+import pygame
 
 import trajtracker
 import trajtracker._utils as  _u
@@ -71,3 +74,37 @@ class Mouse(trajtracker.TTrkObject):
         :return: (x, y) coordinates 
         """
         return self._xpy_mouse.position
+
+
+    #-----------------------------------------------------
+    def get_interpolated_motion_samples(self, prev_time, curr_time):
+        """
+        Get all the positions of the mouse pointer since the last call - i.e., at a higher temporal resolution
+        than once per display frame.
+
+        All mouse-motion events that are waiting in pygame's event queue are removed from the queue (other
+        events remain in the queue).
+
+        **The samples' times are interpolated, not measured:** pygame does not provide the time of each event,
+        so the events' times are spread evenly between *prev_time* and *curr_time* (the last event gets
+        *curr_time*). The positions are real, but their order is the only real temporal information: don't use
+        these times for precise timing analyses (e.g., of speed or acceleration within a frame).
+
+        Feed the samples to the trajectory tracker, validators etc. with
+        :func:`trajtracker.utils.update_xyt_batch`.
+
+        :param prev_time: The time when the previous samples were obtained (e.g., the previous frame)
+        :param curr_time: The current time
+        :return: A list of (x, y, interpolated_time) tuples, oldest first; an empty list if the mouse did not move.
+        """
+
+        events = pygame.event.get(pygame.MOUSEMOTION)
+        if len(events) == 0:
+            return []
+
+        #-- Convert to TrajTracker's coordinates (0,0 = middle of the screen), like Expyriment's mouse does
+        width, height = pygame.display.get_surface().get_size()
+        interval = (curr_time - prev_time) / len(events)
+
+        return [(event.pos[0] - width // 2, -event.pos[1] + height // 2, prev_time + interval * (i + 1))
+                for i, event in enumerate(events)]
@@ -0,0 +1,250 @@
+"""
+
+Multi-file loader: load many session files in parallel, using a pool of processes
+
+@author: Dror Dotan
+@copyright: Copyright (c) 2017, Dror Dotan
+
+This file is part of TrajTracker.
+
+TrajTracker is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+TrajTracker is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with TrajTracker.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import csv
+import glob
+import os
+from collections import namedtuple, OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+import trajtracker as ttrk
+import trajtracker._utils as _u
+from trajtracker.io._BinaryTrajectoryFormat import BinaryTrajectoryFormat
+from trajtracker.io._BinaryTrajectoryReader import BinaryTrajectoryReader
+from trajtracker.io._CompressedTrajectoryFormat import CompressedTrajectoryFormat
+from trajtracker.io._CSVTrajectoryReader import CSVTrajectoryReader
+
+
+class MultiFileLoader(ttrk.TTrkObject):
+    """
+    Loads many files (e.g., all the session files of a study) in parallel, using a pool of worker processes.
+
+    - :func:`~trajtracker.io.MultiFileLoader.load_trajectory_files` loads trajectory files saved by
+      :class:`~trajtracker.movement.TrajectoryTracker` (CSV, binary or compressed format - detected automatically)
+    - :func:`~trajtracker.io.MultiFileLoader.load_csv_files` loads general CSV files, e.g. the trials files
+
+    Each file is parsed in a worker process, and sent back as NumPy columns (which are much faster to transfer
+    between processes than a list of dicts).
+
+    The results are returned in the order of the files, regardless of the order in which the workers finished.
+    A file that could not be loaded does not stop the loading of the other files: its error is reported in
+    its result (see :attr:`~trajtracker.io.MultiFileLoader.Result`).
+    """
+
+    #: The result of loading one file. *data* is None if the file could not be loaded; *error* is the exception
+    #: that occurred while loading the file (or None, if the file was loaded successfully).
+    Result = namedtuple("Result", ["filename", "data", "error"])
+
+
+    #------------------------------------------------
+    def __init__(self, max_workers=None):
+        """
+        Constructor - invoked when you create a new object by writing MultiFileLoader()
+
+        :param max_workers: See :attr:`~trajtracker.io.MultiFileLoader.max_workers`
+        """
+        super(MultiFileLoader, self).__init__()
+        self.max_workers = max_workers
+
+
+    #========================================================================
+    #   API
+    #========================================================================
+
+    #------------------------------------------------
+    def load_trajectory_files(self, filenames):
+        """
+        Load trajectory files. The format of each file (CSV, binary or compressed) is detected automatically.
+
+        :param filenames: A list of file names, or a glob pattern (e.g. "/data/*_trajectory.csv")
+        :return: A list of :attr:`~trajtracker.io.MultiFileLoader.Result` - one per file, in the order of *filenames*
+                 (or sorted by name, if a glob pattern was specified). The *data* of each result is a tuple with
+                 4 arrays: trial (int32), times, x, y (float64) - one entry per sample, in the order of the file.
+        """
+        filenames = self._get_filenames("load_trajectory_files", filenames)
+        return self._load(_load_trajectory_file, [(f, ) for f in filenames])
+
+
+    #------------------------------------------------
+    def load_csv_files(self, filenames, column_types=None, case_sensitive_col_names=False):
+        """
+        Load general CSV files (with a header line), such as the trials files of
+        :class:`~trajtracker.io.CSVLoader`.
+
+        :param filenames: A list of file names, or a glob pattern (e.g. "/data/*_trials.csv")
+        :param column_types: A dict: column name -> NumPy dtype (e.g. float, int, str). The types of columns that are
+                             not specified are detected automatically: float if all values are numeric, otherwise str.
+        :param case_sensitive_col_names: If False, column names are converted to lower case
+        :return: A list of :attr:`~trajtracker.io.MultiFileLoader.Result` - one per file, in the order of *filenames*
+                 (or sorted by name, if a glob pattern was specified). The *data* of each result is an OrderedDict:
+                 column name -> array (in the order of the columns in the file).
+        """
+        filenames = self._get_filenames("load_csv_files", filenames)
+        _u.validate_func_arg_type(self, "load_csv_files", "column_types", column_types, dict, none_allowed=True)
+        _u.validate_func_arg_type(self, "load_csv_files", "case_sensitive_col_names", case_sensitive_col_names, bool)
+
+        column_types = dict(column_types or {})
+        if not case_sensitive_col_names:
+            column_types = {name.lower(): dtype for name, dtype in column_types.items()}
+
+        return self._load(_load_csv_file, [(f, column_types, case_sensitive_col_names) for f in filenames])
+
+
+    #------------------------------------------------
+    def _get_filenames(self, func_name, filenames):
+        if isinstance(filenames, str):
+            return sorted(glob.glob(filenames))
+
+        _u.validate_func_arg_is_collection(self, func_name, "filenames", filenames)
+        for f in filenames:
+            _u.validate_func_arg_type(self, func_name, "filenames[*]", f, str)
+        return list(filenames)
+
+
+    #------------------------------------------------
+    # Run the load function on all files, and collect the results in the order of the files
+    #
+    def _load(self, load_func, args_per_file):
+
+        n_workers = self._get_n_workers(len(args_per_file))
+
+        self._log_write_if(ttrk.log_debug, "Loading {:} files with {:} worker processes".format(len(args_per_file), n_workers), True)
+
+        if n_workers <= 1:
+            return [_run_safely(load_func, args) for args in args_per_file]
+
+        with ProcessPoolExecutor(max_workers=n_workers) as executor:
+            futures = [executor.submit(load_func, *args) for args in args_per_file]
+            results = []
+            for args, future in zip(args_per_file, futures):
+                try:
+                    results.append(self.Result(args[0], future.result(), None))
+                except Exception as e:
+                    results.append(self.Result(args[0], None, e))
+
+        return results
+
+
+    #------------------------------------------------
+    def _get_n_workers(self, n_files):
+        n_workers = self._max_workers if self._max_workers is not None else (os.cpu_count() or 1)
+        return max(1, min(n_workers, n_files))
+
+
+    #========================================================================
+    #   Properties
+    #========================================================================
+
+    #------------------------------------------------
+    @property
+    def max_workers(self):
+        """
+        The maximal number of worker processes (int). If None (default), the number of CPUs is used.
+        If 1, the files are loaded in the current process, without a process pool.
+        """
+        return self._max_workers
+
+    @max_workers.setter
+    def max_workers(self, value):
+        _u.validate_attr_type(self, "max_workers", value, int, none_allowed=True)
+        if value is not None:
+            _u.validate_attr_positive(self, "max_workers", value)
+        self._max_workers = value
+        self._log_property_changed("max_workers")
+
+
+#========================================================================
+#   Worker functions (these run in the worker processes)
+#========================================================================
+
+#------------------------------------------------
+def _run_safely(load_func, args):
+    try:
+        return MultiFileLoader.Result(args[0], load_func(*args), None)
+    except Exception as e:
+        return MultiFileLoader.Result(args[0], None, e)
+
+
+#------------------------------------------------
+def _load_trajectory_file(filename):
+
+    with open(filename, "rb") as fh:
+        signature = fh.read(len(BinaryTrajectoryFormat.file_signature))
+
+    if signature == BinaryTrajectoryFormat.file_signature:
+        with BinaryTrajectoryReader(filename) as reader:
+            #-- _concat_trials() copies the data from the memory-mapped file, so it can be closed
+            return _concat_trials([(np.full(len(times), trial_num, dtype=np.int32), times, x, y)
+                                   for trial_num, times, x, y in reader.iter_trials()])
+
+    if signature == CompressedTrajectoryFormat.file_signature:
+        return _concat_trials([(np.full(len(times), trial_num, dtype=np.int32), times, x, y)
+                               for trial_num, times, x, y in CompressedTrajectoryFormat.read_file(filename)])
+
+    trial, times, x, y = CSVTrajectoryReader(filename).read_columns()
+    return trial.astype(np.int32), times.copy(), x.copy(), y.copy()
+
+
+#------------------------------------------------
+def _concat_trials(trials):
+    if len(trials) == 0:
+        return np.zeros(0, dtype=np.int32), np.zeros(0), np.zeros(0), np.zeros(0)
+
+    trial, times, x, y = [np.concatenate(col) for col in zip(*trials)]
+    return trial, times.astype(np.float64), x.astype(np.float64), y.astype(np.float64)
+
+
+#------------------------------------------------
+def _load_csv_file(filename, column_types, case_sensitive_col_names):
+
+    with open(filename, "r") as fh:
+        reader = csv.reader(fh)
+        try:
+            fieldnames = next(reader)
+        except StopIteration:
+            raise ttrk.BadFormatError("{:} is empty".format(filename))
+        rows = [row for row in reader if len(row) > 0]
+
+    if not case_sensitive_col_names:
+        fieldnames = [name.lower() for name in fieldnames]
+
+    for i, row in enumerate(rows):
+        if len(row) != len(fieldnames):
+            raise ttrk.BadFormatError("Invalid line {:} in {:}: expecting {:} values, found {:}".format(
+                i + 2, filename, len(fieldnames), len(row)))
+
+    columns = list(zip(*rows)) if len(rows) > 0 else [()] * len(fieldnames)
+
+    result = OrderedDict()
+    for name, values in zip(fieldnames, columns):
+        if name in column_types:
+            result[name] = np.array(values, dtype=column_types[name])
+        else:
+            try:
+                result[name] = np.array(values, dtype=np.float64)
+            except ValueError:
+                result[name] = np.array(values, dtype=str)
+
+    return result
@@ -0,0 +1,236 @@
+"""
+
+SQLite trial store: save trajectories and trial results in a single, queryable database file
+
+@author: Dror Dotan
+@copyright: Copyright (c) 2017, Dror Dotan
+
+This file is part of TrajTracker.
+
+TrajTracker is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+TrajTracker is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with TrajTracker.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import numbers
+import re
+import sqlite3
+
+import numpy as np
+
+import trajtracker as ttrk
+import trajtracker._utils as _u
+
+
+class SQLiteTrialStore(ttrk.TTrkObject):
+    """
+    Saves the trajectories and results of the session's trials in an SQLite database file, which can be
+    queried with SQL.
+
+    The database has two tables:
+
+    - *samples* (trial, time, x, y): the trajectory samples. Indexed by trial+time and by time.
+    - *trials* (trial, ...): one row per trial. The columns, except *trial*, are created by
+      :func:`~trajtracker.io.SQLiteTrialStore.add_trial_results` according to the names of the results.
+
+    Each trial is written in a single transaction. The database uses write-ahead logging (WAL), so it remains
+    consistent even if the experiment crashes.
+
+    To save the trajectories automatically, register the store with
+    :func:`TrajectoryTracker.add_trial_store() <trajtracker.movement.TrajectoryTracker.add_trial_store>`.
+    """
+
+    _valid_column_name = re.compile("^[A-Za-z_][A-Za-z0-9_]*$")
+
+
+    #------------------------------------------------
+    def __init__(self, filename):
+        """
+        Constructor - invoked when you create a new object by writing SQLiteTrialStore().
+        If the database file exists, new data is added to it.
+
+        :param filename: The database file
+        """
+
+        super(SQLiteTrialStore, self).__init__()
+
+        _u.validate_func_arg_type(self, "__init__", "filename", filename, str)
+
+        self._filename = filename
+        self._conn = sqlite3.connect(filename)
+
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+
+        with self._conn:
+            self._conn.execute("CREATE TABLE IF NOT EXISTS samples (trial INTEGER NOT NULL, time REAL, x REAL, y REAL)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS samples_trial_time ON samples (trial, time)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS samples_time ON samples (time)")
+            self._conn.execute("CREATE TABLE IF NOT EXISTS trials (trial INTEGER PRIMARY KEY)")
+
+        #-- SQLite column names are case-insensitive, so they are kept in lower case
+        self._trial_columns = set(row[1].lower() for row in self._conn.execute("PRAGMA table_info(trials)"))
+
+        self._log_write_if(ttrk.log_debug, "Opened SQLite trial store {:}".format(filename), True)
+
+
+    #========================================================================
+    #   Write
+    #========================================================================
+
+    #------------------------------------------------
+    def add_trial(self, trial_num, xyt):
+        """
+        Save a trial's trajectory. If the trial's trajectory was already saved, it is replaced.
+
+        :param trial_num: The trial number (int)
+        :param xyt: (N,3) array with columns x, y, time
+        """
+
+        self._validate_open("add_trial")
+        _u.validate_func_arg_type(self, "add_trial", "trial_num", trial_num, int)
+
+        xyt = np.asarray(xyt, dtype=np.float64).reshape(-1, 3)
+        rows = np.column_stack([np.full(len(xyt), trial_num), xyt[:, 2], xyt[:, 0], xyt[:, 1]]).tolist()
+
+        with self._conn:
+            self._conn.execute("DELETE FROM samples WHERE trial=?", (trial_num,))
+            self._conn.executemany("INSERT INTO samples (trial, time, x, y) VALUES (?, ?, ?, ?)", rows)
+
+
+    #------------------------------------------------
+    def add_trial_results(self, trial_num, results):
+        """
+        Save the results of one trial (e.g., response, response time, success/error) in the *trials* table.
+        If some results of this trial were already saved, they are updated.
+
+        :param trial_num: The trial number (int)
+        :param results: A dict: result name -> value. Each result name becomes a column in the *trials* table.
+                        Names must be valid SQL identifiers (letters, digits, underscore). As in SQL, names
+                        are case-insensitive: "RT" and "rt" are the same column.
+                        Values must be numbers, strings, bool or None.
+        """
+
+        self._validate_open("add_trial_results")
+        _u.validate_func_arg_type(self, "add_trial_results", "trial_num", trial_num, int)
+        _u.validate_func_arg_type(self, "add_trial_results", "results", results, dict)
+
+        for name, value in results.items():
+            if not isinstance(name, str) or self._valid_column_name.match(name) is None or name.lower() == "trial":
+                raise ttrk.ValueError("{:}.add_trial_results(): invalid result name ({:})".format(_u.get_type_name(self), name))
+            if value is not None and not isinstance(value, (numbers.Number, str)):
+                raise ttrk.TypeError("{:}.add_trial_results(): invalid value for result '{:}' ({:})".format(
+                    _u.get_type_name(self), name, value))
+
+        names = sorted(results.keys())
+        if len(set(name.lower() for name in names)) != len(names):
+            raise ttrk.ValueError("{:}.add_trial_results(): result names must differ not only in upper/lower case ({:})".format(
+                _u.get_type_name(self), ", ".join(names)))
+
+        with self._conn:
+            for name in names:
+                if name.lower() not in self._trial_columns:
+                    self._conn.execute('ALTER TABLE trials ADD COLUMN "{:}"'.format(name))
+                    self._trial_columns.add(name.lower())
+
+            self._conn.execute("INSERT OR IGNORE INTO trials (trial) VALUES (?)", (trial_num,))
+            if len(names) > 0:
+                assignments = ", ".join('"{:}"=?'.format(name) for name in names)
+                self._conn.execute("UPDATE trials SET {:} WHERE trial=?".format(assignments),
+                                   [_sql_value(results[name]) for name in names] + [trial_num])
+
+
+    #========================================================================
+    #   Read
+    #========================================================================
+
+    #------------------------------------------------
+    def get_trial(self, trial_num):
+        """
+        Get a trial's trajectory
+
+        :return: (N,3) array with columns x, y, time, sorted by time
+        """
+
+        self._validate_open("get_trial")
+
+        rows = self._conn.execute("SELECT x, y, time FROM samples WHERE trial=? ORDER BY time", (trial_num,)).fetchall()
+        return np.array(rows, dtype=np.float64).reshape(-1, 3)
+
+
+    #------------------------------------------------
+    def query(self, sql, params=()):
+        """
+        Run an SQL query on the database
+
+        :param sql: The query, e.g. "SELECT trial FROM trials WHERE response_time > ?"
+        :param params: Values for the query's "?" placeholders
+        :return: A list of rows (tuples)
+        """
+
+        self._validate_open("query")
+        return self._conn.execute(sql, params).fetchall()
+
+
+    #------------------------------------------------
+    def close(self):
+        """
+        Close the database. Calling close() more than once has no effect.
+        """
+
+        if self._conn is None:
+            return
+
+        self._conn.close()
+        self._conn = None
+
+        self._log_write_if(ttrk.log_debug, "Closed SQLite trial store {:}".format(self._filename), True)
+
+
+    #------------------------------------------------
+    def _validate_open(self, func_name):
+        if self._conn is None:
+            raise ttrk.InvalidStateError("{:}.{:}() was called after the store was closed".format(_u.get_type_name(self), func_name))
+
+
+    #------------------------------------------------
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+    #========================================================================
+    #   Properties
+    #========================================================================
+
+    #------------------------------------------------
+    @property
+    def filename(self):
+        """ The database file (read-only) """
+        return self._filename
+
+    #------------------------------------------------
+    @property
+    def closed(self):
+        """ Whether the store was already closed (read-only) """
+        return self._conn is None
+
+
+#------------------------------------------------
+# Convert NumPy scalars to values that sqlite3 accepts
+#
+def _sql_value(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
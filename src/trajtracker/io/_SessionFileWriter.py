@@ -0,0 +1,254 @@
+"""
+
+Session file writer: keep an output file open during the whole session, and write to it in large chunks
+
+@author: Dror Dotan
+@copyright: Copyright (c) 2017, Dror Dotan
+
+This file is part of TrajTracker.
+
+TrajTracker is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+TrajTracker is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with TrajTracker.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+from enum import Enum
+
+import trajtracker as ttrk
+import trajtracker._utils as _u
+
+
+# noinspection PyAttributeOutsideInit
+class SessionFileWriter(ttrk.TTrkObject):
+    """
+    Writes data to a file that remains open until :func:`~trajtracker.io.SessionFileWriter.close` is called.
+    The data is accumulated in memory and is written to the file according to the flush policy.
+    """
+
+    FlushPolicy = Enum("FlushPolicy", "EveryTrial EveryNTrials EveryNBytes OnClose")
+
+    _policies_with_interval = (FlushPolicy.EveryNTrials, FlushPolicy.EveryNBytes)
+
+
+    #------------------------------------------------
+    def __init__(self, filename, mode='w', flush_policy=FlushPolicy.EveryTrial, flush_interval=None, open_file=None,
+                 on_flush=None):
+        """
+        Constructor - invoked when you create a new object by writing SessionFileWriter()
+
+        :param filename: The file to write to
+        :param mode: The mode for opening the file ('w' or 'a'; add 'b' for binary files)
+        :param flush_policy: See :attr:`~trajtracker.io.SessionFileWriter.flush_policy`
+        :param flush_interval: See :attr:`~trajtracker.io.SessionFileWriter.flush_interval`
+        :param open_file: A function (filename, mode) that opens the file. By default, Python's open() is used.
+        :param on_flush: A function (with no arguments) that is called after each flush, i.e. when all the data
+                         written so far is in the file
+        """
+
+        super(SessionFileWriter, self).__init__()
+
+        _u.validate_func_arg_type(self, "__init__", "filename", filename, str)
+        _u.validate_func_arg_type(self, "__init__", "mode", mode, str)
+        if mode.replace("b", "") not in ("w", "a"):
+            raise ttrk.ValueError("{:}.__init__(): invalid mode ({:})".format(_u.get_type_name(self), mode))
+        if open_file is not None:
+            _u.validate_func_arg_type(self, "__init__", "open_file", open_file, ttrk.TYPE_CALLABLE)
+        if on_flush is not None:
+            _u.validate_func_arg_type(self, "__init__", "on_flush", on_flush, ttrk.TYPE_CALLABLE)
+
+        self._filename = filename
+        self._binary = "b" in mode
+        self._on_flush = on_flush
+
+        self._flush_policy = None
+        self.flush_interval = flush_interval
+        self.flush_policy = flush_policy
+
+        self._pending = []
+        self._n_pending_bytes = 0
+        self._n_pending_trials = 0
+        self._n_flushed_bytes = 0
+
+        self._fh = (open if open_file is None else open_file)(filename, mode)
+
+        #-- When appending, offsets are counted from the current end of file
+        if "a" in mode and hasattr(self._fh, "tell"):
+            self._n_flushed_bytes = self._fh.tell()
+
+        self._log_write_if(ttrk.log_debug, "Opened {:} (mode={:})".format(filename, mode), True)
+
+
+    #========================================================================
+    #   Write
+    #========================================================================
+
+    #------------------------------------------------
+    def write(self, data):
+        """
+        Write data to the file. The data is kept in memory until the next flush.
+
+        :param data: str (or bytes, if the file was opened in binary mode)
+        """
+
+        self._validate_open("write")
+
+        self._pending.append(data)
+        self._n_pending_bytes += len(data)
+
+        if self._flush_policy == self.FlushPolicy.EveryNBytes and self._n_pending_bytes >= self._flush_interval:
+            self.flush()
+
+
+    #------------------------------------------------
+    def write_trial(self, data):
+        """
+        Write the data of one trial, and flush the file if the flush policy says so
+
+        :param data: str (or bytes, if the file was opened in binary mode)
+        """
+        self.write(data)
+        self.end_trial()
+
+
+    #------------------------------------------------
+    def end_trial(self):
+        """
+        Indicate that all the data of one trial was written. The file is flushed if the flush policy says so.
+        """
+
+        self._validate_open("end_trial")
+
+        self._n_pending_trials += 1
+
+        if self._flush_policy == self.FlushPolicy.EveryTrial or \
+                (self._flush_policy == self.FlushPolicy.EveryNTrials and self._n_pending_trials >= self._flush_interval):
+            self.flush()
+
+
+    #------------------------------------------------
+    def flush(self):
+        """
+        Write all pending data to the file, and flush the file
+        """
+
+        self._validate_open("flush")
+
+        if len(self._pending) > 0:
+            self._fh.write((b"" if self._binary else "").join(self._pending))
+            self._n_flushed_bytes += self._n_pending_bytes
+
+        self._fh.flush()
+
+        self._pending = []
+        self._n_pending_bytes = 0
+        self._n_pending_trials = 0
+
+        if self._on_flush is not None:
+            self._on_flush()
+
+
+    #------------------------------------------------
+    def close(self):
+        """
+        Flush all pending data and close the file. Calling close() more than once has no effect.
+        """
+
+        if self._fh is None:
+            return
+
+        self.flush()
+        self._fh.close()
+        self._fh = None
+
+        self._log_write_if(ttrk.log_debug, "Closed {:}".format(self._filename), True)
+
+
+    #------------------------------------------------
+    def _validate_open(self, func_name):
+        if self._fh is None:
+            raise ttrk.InvalidStateError("{:}.{:}() was called after the file was closed".format(_u.get_type_name(self), func_name))
+
+
+    #------------------------------------------------
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+    #========================================================================
+    #   Properties
+    #========================================================================
+
+    #------------------------------------------------
+    @property
+    def filename(self):
+        """ The name of the file being written (read-only) """
+        return self._filename
+
+    #------------------------------------------------
+    @property
+    def closed(self):
+        """ Whether the file was already closed (read-only) """
+        return self._fh is None
+
+    #------------------------------------------------
+    @property
+    def position(self):
+        """
+        The number of characters (or bytes, in binary mode) written so far, including data that was not
+        flushed yet. This is the file offset where the next write() will start (read-only).
+        """
+        return self._n_flushed_bytes + self._n_pending_bytes
+
+    #------------------------------------------------
+    @property
+    def flush_policy(self):
+        """
+        When to actually write the data to the file:
+
+        - FlushPolicy.EveryTrial: whenever a trial ends (:func:`~trajtracker.io.SessionFileWriter.end_trial`)
+        - FlushPolicy.EveryNTrials: every :attr:`~trajtracker.io.SessionFileWriter.flush_interval` trials
+        - FlushPolicy.EveryNBytes: whenever the pending data exceeds :attr:`~trajtracker.io.SessionFileWriter.flush_interval` bytes
+        - FlushPolicy.OnClose: only when the file is closed (or when you call flush() explicitly)
+
+        :type: SessionFileWriter.FlushPolicy
+        """
+        return self._flush_policy
+
+    @flush_policy.setter
+    def flush_policy(self, value):
+        _u.validate_attr_type(self, "flush_policy", value, self.FlushPolicy)
+        if value in self._policies_with_interval and self._flush_interval is None:
+            raise ttrk.ValueError("{:}.flush_policy cannot be set to {:} when flush_interval is None".format(
+                _u.get_type_name(self), value))
+        self._flush_policy = value
+        self._log_property_changed("flush_policy")
+
+    #------------------------------------------------
+    @property
+    def flush_interval(self):
+        """
+        The number of trials (for FlushPolicy.EveryNTrials) or bytes (for FlushPolicy.EveryNBytes) between flushes.
+        For other flush policies, this value is ignored.
+
+        :type: int
+        """
+        return self._flush_interval
+
+    @flush_interval.setter
+    def flush_interval(self, value):
+        _u.validate_attr_type(self, "flush_interval", value, int, none_allowed=self._flush_policy not in self._policies_with_interval)
+        _u.validate_attr_positive(self, "flush_interval", value)
+        self._flush_interval = value
+        self._log_property_changed("flush_interval")
@@ -0,0 +1,77 @@
+"""
+
+Thread-safe mouse: read the mouse position from any thread, without processing the window system's events
+
+@author: Dror Dotan
+@copyright: Copyright (c) 2017, Dror Dotan
+
+This file is part of TrajTracker.
+
+TrajTracker is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+TrajTracker is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with TrajTracker.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import pygame
+
+import trajtracker as ttrk
+import trajtracker._utils as _u
+
+
+class ThreadSafeMouse(ttrk.TTrkObject):
+    """
+    A mouse whose position can be read from any thread - e.g., by
+    :class:`~trajtracker.io.BackgroundMouseSampler`.
+
+    The position is read with pygame.mouse.get_pos(), which returns the last position known to pygame, and
+    does not process the window system's events (unlike Expyriment's mouse and :class:`~trajtracker.io.Mouse`,
+    which call pygame.event.pump() - this may be called only from the main thread).
+
+    **Limitation:** pygame learns about mouse movements only when the main thread processes the event queue
+    (e.g., when presenting a frame, or when calling pygame.event.get() or pygame.event.pump()). Between these
+    calls, the position does not change - so sampling this mouse at a rate higher than the rate in which the main
+    loop processes the events yields repeated positions, not a higher temporal resolution. The samples' times are
+    the times they were read, not the times of the movements.
+    """
+
+    #: Whether the position may be read from any thread (see :class:`~trajtracker.io.BackgroundMouseSampler`)
+    thread_safe = True
+
+
+    #-----------------------------------------------------
+    def __init__(self):
+        """
+        Create a ThreadSafeMouse object. Call this from the main thread, after the display was initialized.
+        """
+        super(ThreadSafeMouse, self).__init__()
+
+        surface = pygame.display.get_surface()
+        if surface is None:
+            raise ttrk.InvalidStateError("{:}.__init__(): the display was not initialized".format(_u.get_type_name(self)))
+
+        #-- The screen size is needed to convert pygame's coordinates to TrajTracker's coordinates (0,0 = middle
+        #-- of the screen), like Expyriment's mouse does. It is obtained here, in the main thread.
+        width, height = surface.get_size()
+        self._half_width = width // 2
+        self._half_height = height // 2
+
+
+    #-----------------------------------------------------
+    @property
+    def position(self):
+        """
+        Get the last position of the mouse pointer that is known to pygame (see the class documentation)
+
+        :return: (x, y) coordinates
+        """
+        x, y = pygame.mouse.get_pos()
+        return x - self._half_width, -y + self._half_height
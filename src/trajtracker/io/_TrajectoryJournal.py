@@ -0,0 +1,279 @@
+"""
+
+Trajectory journal: a crash-safe, memory-mapped record of the current trial's samples
+
+@author: Dror Dotan
+@copyright: Copyright (c) 2017, Dror Dotan
+
+This file is part of TrajTracker.
+
+TrajTracker is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+TrajTracker is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with TrajTracker.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import os
+import struct
+
+import numpy as np
+
+import trajtracker as ttrk
+import trajtracker._utils as _u
+
+
+#-- File layout: header (64 bytes), followed by a ring of (x, y, time) float64 samples
+_signature = b"TTRKJRN\x00"
+_version = 1
+_header_struct = struct.Struct("<8sII")
+_counters_offset = 16
+_data_offset = 64
+
+#-- Indices in the counters array
+_CNT_LAST_SAVED_TRIAL = 0
+_CNT_N_SAMPLES = 1
+_CNT_STATE = 2
+
+#-- Journal states
+_STATE_IDLE = 0
+_STATE_RECORDING = 1
+_STATE_SAVED = 2
+
+
+class TrajectoryJournal(ttrk.TTrkObject):
+    """
+    Records the samples of the current trial in a memory-mapped file, so they can be recovered if the
+    experiment crashes before the trial was saved.
+
+    The file is preallocated, and the samples are written into a ring: when more samples than
+    :attr:`~trajtracker.io.TrajectoryJournal.capacity` are recorded in one trial, the oldest samples are
+    overwritten. Appending a sample only writes to memory; the operating system writes the memory pages to
+    the disk. This survives a crash of the experiment process. To survive a power loss too, use *sync_interval*
+    (this makes appending slower).
+
+    After a crash, call :func:`TrajectoryJournal.recover() <trajtracker.io.TrajectoryJournal.recover>`
+    to get the samples of the trial that was not saved.
+    """
+
+    #: The default number of samples in the ring (65 seconds at 1000 Hz)
+    default_capacity = 65536
+
+
+    #------------------------------------------------
+    def __init__(self, filename, capacity=None, sync_interval=None, overwrite_unsaved=False):
+        """
+        Constructor - invoked when you create a new object by writing TrajectoryJournal().
+        This creates the journal file (or overwrites it, if it exists).
+
+        :param filename: The journal file
+        :param capacity: The maximal number of samples per trial that can be recovered
+        :param sync_interval: If specified, the file is synchronized to the disk every *sync_interval* samples
+        :param overwrite_unsaved: If the file already contains unsaved samples (i.e., the previous session crashed),
+                                  this constructor fails, unless overwrite_unsaved=True
+        """
+
+        super(TrajectoryJournal, self).__init__()
+
+        if capacity is None:
+            capacity = self.default_capacity
+
+        _u.validate_func_arg_type(self, "__init__", "filename", filename, str)
+        _u.validate_func_arg_type(self, "__init__", "capacity", capacity, int)
+        _u.validate_func_arg_positive(self, "__init__", "capacity", capacity)
+        _u.validate_func_arg_type(self, "__init__", "sync_interval", sync_interval, int, none_allowed=True)
+        if sync_interval is not None:
+            _u.validate_func_arg_positive(self, "__init__", "sync_interval", sync_interval)
+        _u.validate_func_arg_type(self, "__init__", "overwrite_unsaved", overwrite_unsaved, bool)
+
+        if not overwrite_unsaved and os.path.exists(filename) and self.recover(filename) is not None:
+            raise ttrk.InvalidStateError(
+                "{:}: the journal file {:} contains unsaved samples. Call TrajectoryJournal.recover() to get them, or use overwrite_unsaved=True".format(
+                    _u.get_type_name(self), filename))
+
+        self._filename = filename
+        self._capacity = capacity
+        self._sync_interval = sync_interval
+
+        self._mmap = np.memmap(filename, dtype=np.uint8, mode="w+", shape=(_data_offset + capacity * 3 * 8,))
+        self._mmap[:_header_struct.size] = np.frombuffer(_header_struct.pack(_signature, _version, capacity), dtype=np.uint8)
+        self._counters = self._mmap[_counters_offset:_data_offset].view("<i8")
+        self._data = self._mmap[_data_offset:].view("<f8").reshape(capacity, 3)
+
+        self._counters[_CNT_LAST_SAVED_TRIAL] = -1
+        self._n_samples = 0
+        self._counters[_CNT_N_SAMPLES] = 0
+        self._counters[_CNT_STATE] = _STATE_IDLE
+        self._mmap.flush()
+
+        self._log_write_if(ttrk.log_debug, "Created journal {:} (capacity={:})".format(filename, capacity), True)
+
+
+    #========================================================================
+    #   Recording
+    #========================================================================
+
+    #------------------------------------------------
+    def begin_trial(self):
+        """
+        Start recording a new trial. Samples of the previous trial are discarded.
+        """
+
+        self._validate_open("begin_trial")
+
+        self._n_samples = 0
+        self._counters[_CNT_N_SAMPLES] = 0
+        self._counters[_CNT_STATE] = _STATE_RECORDING
+
+
+    #------------------------------------------------
+    def append(self, x, y, time):
+        """
+        Record one sample
+        """
+
+        n = self._n_samples
+        self._data[n % self._capacity] = (x, y, time)
+
+        #-- The counter is updated only after the sample was written, so a crash never exposes a partial sample
+        n += 1
+        self._n_samples = n
+        self._counters[_CNT_N_SAMPLES] = n
+
+        if self._sync_interval is not None and n % self._sync_interval == 0:
+            self._mmap.flush()
+
+
+    #------------------------------------------------
+    def trial_saved(self, trial_num):
+        """
+        Indicate that the current trial was saved, so its samples no longer need to be recovered
+
+        :param trial_num: The number of the trial that was saved
+        """
+
+        self._validate_open("trial_saved")
+
+        self._counters[_CNT_LAST_SAVED_TRIAL] = trial_num
+        self._counters[_CNT_STATE] = _STATE_SAVED
+
+        if self._sync_interval is not None:
+            self._mmap.flush()
+
+
+    #------------------------------------------------
+    def close(self):
+        """
+        Synchronize the journal file to the disk and close it. Calling close() more than once has no effect.
+        The file is not deleted.
+        """
+
+        if self._mmap is None:
+            return
+
+        self._mmap.flush()
+        self._counters = None
+        self._data = None
+        self._mmap = None
+
+
+    #------------------------------------------------
+    def _validate_open(self, func_name):
+        if self._mmap is None:
+            raise ttrk.InvalidStateError("{:}.{:}() was called after the journal was closed".format(_u.get_type_name(self), func_name))
+
+
+    #------------------------------------------------
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+    #========================================================================
+    #   Recovery
+    #========================================================================
+
+    #------------------------------------------------
+    @staticmethod
+    def recover(filename):
+        """
+        Get the samples of the trial that was being recorded when the journal was last used,
+        if that trial was not saved.
+
+        :param filename: The journal file
+        :return: None if there are no unsaved samples. Otherwise, a tuple (last_saved_trial, xyt, n_lost):
+                 last_saved_trial is the number of the last trial that was saved (-1 if none), xyt is an (N,3) array
+                 with x, y, time in chronological order, and n_lost is the number of samples that were
+                 overwritten because the trial was longer than the journal's capacity.
+        """
+
+        _u.validate_func_arg_type(None, "TrajectoryJournal.recover", "filename", filename, str)
+
+        with open(filename, "rb") as fh:
+            header = fh.read(_data_offset)
+            if len(header) < _data_offset:
+                raise ttrk.BadFormatError("TrajectoryJournal.recover(): {:} is not a journal file (too short)".format(filename))
+
+            signature, version, capacity = _header_struct.unpack(header[:_header_struct.size])
+            if signature != _signature or version != _version:
+                raise ttrk.BadFormatError("TrajectoryJournal.recover(): {:} is not a journal file".format(filename))
+
+            counters = np.frombuffer(header[_counters_offset:], dtype="<i8")
+            last_saved_trial, n_samples, state = [int(c) for c in counters[:3]]
+            if state != _STATE_RECORDING or n_samples == 0:
+                return None
+
+            data = np.frombuffer(fh.read(capacity * 3 * 8), dtype="<f8")
+
+        if len(data) < capacity * 3:
+            raise ttrk.BadFormatError("TrajectoryJournal.recover(): {:} is truncated".format(filename))
+
+        data = data.reshape(capacity, 3)
+
+        if n_samples <= capacity:
+            xyt = data[:n_samples].copy()
+            n_lost = 0
+        else:
+            start = n_samples % capacity
+            xyt = np.concatenate([data[start:], data[:start]])
+            n_lost = n_samples - capacity
+
+        return last_saved_trial, xyt, n_lost
+
+
+    #========================================================================
+    #   Properties
+    #========================================================================
+
+    #------------------------------------------------
+    @property
+    def filename(self):
+        """ The journal file (read-only) """
+        return self._filename
+
+    #------------------------------------------------
+    @property
+    def capacity(self):
+        """ The maximal number of samples per trial that can be recovered (read-only) """
+        return self._capacity
+
+    #------------------------------------------------
+    @property
+    def n_samples(self):
+        """ The number of samples recorded in the current trial (read-only) """
+        return self._n_samples
+
+    #------------------------------------------------
+    @property
+    def closed(self):
+        """ Whether the journal was already closed (read-only) """
+        return self._mmap is None
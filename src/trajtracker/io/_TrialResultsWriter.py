@@ -0,0 +1,212 @@
+"""
+
+Trial results writer: save one row of results per trial to a CSV file
+
+@author: Dror Dotan
+@copyright: Copyright (c) 2017, Dror Dotan
+
+This file is part of TrajTracker.
+
+TrajTracker is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+TrajTracker is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with TrajTracker.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import numbers
+
+import numpy as np
+
+import trajtracker as ttrk
+import trajtracker._utils as _u
+from trajtracker.io import SessionFileWriter
+
+
+class TrialResultsWriter(ttrk.TTrkObject):
+    """
+    Saves the results of each trial (e.g., error code, response, movement time) as one row in a CSV file.
+
+    Each trial's results are specified as a dict: column name -> value. The columns (the schema of the file) are
+    either specified when creating the object, or taken from the first trial's results. The results of later
+    trials are validated against the schema: a result that is not one of the file's columns is an error; a column
+    with no result is left empty.
+
+    The rows are kept in memory and written to the file in batches, according to the flush policy - the same
+    flush policies as :class:`~trajtracker.movement.TrajectoryTracker` (see
+    :attr:`SessionFileWriter.flush_policy <trajtracker.io.SessionFileWriter.flush_policy>`).
+
+    Values are formatted as follows: None is saved as an empty value; an
+    :class:`~trajtracker.validators.ExperimentError` is saved as its error code; bool is saved as 1/0;
+    floats are saved with *float_precision* digits after the decimal point.
+    """
+
+    #: The default number of trials written in each batch
+    default_flush_interval = 10
+
+
+    #------------------------------------------------
+    def __init__(self, filename, columns=None, float_precision=5,
+                 flush_policy=SessionFileWriter.FlushPolicy.EveryNTrials, flush_interval=None):
+        """
+        Constructor - invoked when you create a new object by writing TrialResultsWriter()
+
+        :param filename: The CSV file (an existing file is overwritten)
+        :param columns: The column names (list of str). If not specified, they are taken from the first trial's results.
+        :param float_precision: The number of digits after the decimal point for non-integer numbers
+        :param flush_policy: When to write the rows to the file (see :attr:`SessionFileWriter.flush_policy <trajtracker.io.SessionFileWriter.flush_policy>`).
+                             By default, every *flush_interval* trials.
+        :param flush_interval: See :attr:`SessionFileWriter.flush_interval <trajtracker.io.SessionFileWriter.flush_interval>`.
+                               For FlushPolicy.EveryNTrials, the default is 10.
+        """
+
+        super(TrialResultsWriter, self).__init__()
+
+        _u.validate_func_arg_type(self, "__init__", "float_precision", float_precision, int)
+        _u.validate_func_arg_not_negative(self, "__init__", "float_precision", float_precision)
+        if columns is not None:
+            columns = self._validate_columns("__init__", columns)
+
+        if flush_interval is None and flush_policy == SessionFileWriter.FlushPolicy.EveryNTrials:
+            flush_interval = self.default_flush_interval
+
+        self._float_format = "%%.%df" % float_precision
+        self._columns = None
+        self._writer = SessionFileWriter(filename, 'w', flush_policy=flush_policy, flush_interval=flush_interval)
+
+        if columns is not None:
+            self._set_columns(columns)
+
+
+    #------------------------------------------------
+    def _validate_columns(self, func_name, columns):
+        _u.validate_func_arg_is_collection(self, func_name, "columns", columns, min_length=1)
+        columns = list(columns)
+        for col in columns:
+            _u.validate_func_arg_type(self, func_name, "columns[*]", col, str)
+        if len(set(columns)) != len(columns):
+            raise ttrk.ValueError("{:}.{:}(): duplicate column names in {:}".format(_u.get_type_name(self), func_name, columns))
+        return columns
+
+
+    #------------------------------------------------
+    def _set_columns(self, columns):
+        self._columns = columns
+        self._column_set = set(columns)
+        self._writer.write(",".join(_quote(col) for col in columns) + "\n")
+        self._log_write_if(ttrk.log_debug, "Columns of {:}: {:}".format(self._writer.filename, ",".join(columns)), True)
+
+
+    #========================================================================
+    #   Write
+    #========================================================================
+
+    #------------------------------------------------
+    def write_trial(self, results):
+        """
+        Add the results of one trial to the file. The row is written to the file according to the flush policy.
+
+        :param results: A dict: column name -> value. Use an OrderedDict to control the columns' order when
+                        the columns are taken from the first trial.
+        """
+
+        _u.validate_func_arg_type(self, "write_trial", "results", results, dict)
+
+        if self._columns is None:
+            self._set_columns(self._validate_columns("write_trial", list(results.keys())))
+
+        else:
+            unknown = [name for name in results if name not in self._column_set]
+            if len(unknown) > 0:
+                raise ttrk.ValueError("{:}.write_trial(): invalid result name ({:}) - {:} has only these columns: {:}".format(
+                    _u.get_type_name(self), unknown[0], self._writer.filename, ",".join(self._columns)))
+
+        row = ",".join(self._format_value(results.get(col)) for col in self._columns)
+        self._writer.write_trial(row + "\n")
+
+
+    #------------------------------------------------
+    def _format_value(self, value):
+
+        if value is None:
+            return ""
+
+        if isinstance(value, ttrk.validators.ExperimentError):
+            value = value.err_code
+
+        if isinstance(value, np.generic):
+            value = value.item()
+
+        if isinstance(value, bool):
+            return "1" if value else "0"
+
+        if isinstance(value, numbers.Integral):
+            return "%d" % value
+
+        if isinstance(value, numbers.Real):
+            return self._float_format % value
+
+        return _quote(str(value))
+
+
+    #------------------------------------------------
+    def flush(self):
+        """
+        Write all pending rows to the file
+        """
+        self._writer.flush()
+
+
+    #------------------------------------------------
+    def close(self):
+        """
+        Write all pending rows and close the file. Calling close() more than once has no effect.
+        """
+        self._writer.close()
+
+
+    #------------------------------------------------
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+    #========================================================================
+    #   Properties
+    #========================================================================
+
+    #------------------------------------------------
+    @property
+    def filename(self):
+        """ The CSV file (read-only) """
+        return self._writer.filename
+
+    #------------------------------------------------
+    @property
+    def columns(self):
+        """ The file's column names (read-only). None if they were not specified and no trial was written yet. """
+        return None if self._columns is None else list(self._columns)
+
+    #------------------------------------------------
+    @property
+    def closed(self):
+        """ Whether the file was already closed (read-only) """
+        return self._writer.closed
+
+
+#------------------------------------------------
+# Quote a CSV value, if needed
+#
+def _quote(s):
+    if any(c in s for c in ',"\n\r'):
+        return '"' + s.replace('"', '""') + '"'
+    return s
@@ -23,5 +23,17 @@ along with TrajTracker.  If not, see <http://www.gnu.org/licenses/>.
 
 from ._CSVLoader import CSVLoader
 from ._Mouse import Mouse
+from ._SessionFileWriter import SessionFileWriter
+from ._BackgroundFileWriter import BackgroundFileWriter
+from ._BackgroundMouseSampler import BackgroundMouseSampler
+from ._ThreadSafeMouse import ThreadSafeMouse
+from ._BinaryTrajectoryFormat import BinaryTrajectoryFormat
+from ._BinaryTrajectoryReader import BinaryTrajectoryReader
+from ._CompressedTrajectoryFormat import CompressedTrajectoryFormat
+from ._CSVTrajectoryReader import CSVTrajectoryReader
+from ._MultiFileLoader import MultiFileLoader
+from ._SQLiteTrialStore import SQLiteTrialStore
+from ._TrajectoryJournal import TrajectoryJournal
+from ._TrialResultsWriter import TrialResultsWriter
 
 import trajtracker.io.csv_formats
@@ -79,9 +79,19 @@ class LocationColorMap(trajtracker.TTrkObject):
 
         self._available_colors = set()
 
-        for row in self._image:
-            for cell in row:
-                self._available_colors.add(cell)
+        #-- Also index the colors, for get_colors_at(): each pixel's index in self._indexed_colors
+        self._indexed_colors = []
+        color_to_index = {}
+        self._color_index_image = np.zeros((self._height, self._width), dtype=np.int32)
+
+        for row_num, row in enumerate(self._image):
+            for col_num, cell in enumerate(row):
+                if cell not in color_to_index:
+                    color_to_index[cell] = len(self._indexed_colors)
+                    self._indexed_colors.append(cell)
+                self._color_index_image[row_num, col_num] = color_to_index[cell]
+
+        self._available_colors.update(self._indexed_colors)
 
 
     # -------------------------------------------------
@@ -229,6 +239,15 @@ class LocationColorMap(trajtracker.TTrkObject):
         _u.validate_func_arg_type(self, "get_color_at", "y_coord", y_coord, int)
         _u.validate_func_arg_type(self, "get_color_at", "use_mapping", use_mapping, numbers.Number, none_allowed=True)
 
+        return self._get_color_at_impl(x_coord, y_coord, use_mapping)
+
+
+    #-------------------------------------------------
+    # get_color_at() without validating the arguments.
+    # Replaces get_color_at() when trajtracker.env.validate_arguments = False
+    #
+    def _get_color_at_impl(self, x_coord, y_coord, use_mapping=None):
+
         if use_mapping is None:
             use_mapping = self._use_mapping
 
@@ -246,3 +265,49 @@ class LocationColorMap(trajtracker.TTrkObject):
         v = self._image[-(y_coord+1)][x_coord]
 
         return self._color_to_code[v] if use_mapping else v
+
+
+    #-------------------------------------------------
+    def get_colors_at(self, x_coords, y_coords, use_mapping=None):
+        """
+        Return the colors at several coordinates (a vectorized version of
+        :func:`~trajtracker.misc.LocationColorMap.get_color_at`)
+
+        :param x_coords: Array of x coordinates
+        :param y_coords: Array of y coordinates (same length)
+        :param use_mapping: See :func:`~trajtracker.misc.LocationColorMap.get_color_at`
+        :return: Array (dtype=object) with the color in each coordinate, or None if the coordinate is out of the image range
+        """
+
+        if use_mapping is None:
+            use_mapping = self._use_mapping
+
+        if self._color_to_code is None and use_mapping:
+            raise trajtracker.ValueError("a call to %s.get_colors_at(use_mapping=True) is invalid because color_codes were not specified" % self.__class__)
+
+        color_per_index = np.empty(len(self._indexed_colors) + 1, dtype=object)
+        for i, color in enumerate(self._indexed_colors):
+            color_per_index[i] = self._color_to_code[color] if use_mapping else color
+
+        return color_per_index[self._get_color_indices_at(x_coords, y_coords)]
+
+
+    #-------------------------------------------------
+    # For each coordinate, get the color's index in self._indexed_colors;
+    # coordinates out of the image range get the index len(self._indexed_colors)
+    #
+    def _get_color_indices_at(self, x_coords, y_coords):
+
+        cols = np.asarray(x_coords).astype(np.int64) - self._top_left_x
+        rows = np.asarray(y_coords).astype(np.int64) - self._top_left_y
+
+        in_image = (cols >= 0) & (cols < self._width) & (rows >= 0) & (rows < self._height)
+
+        indices = np.full(len(cols), len(self._indexed_colors), dtype=np.int32)
+        #-- The image's rows are upside down (see get_color_at)
+        indices[in_image] = self._color_index_image[self._height - 1 - rows[in_image], cols[in_image]]
+
+        return indices
+
+
+_u.register_lean_method(LocationColorMap, "get_color_at", "_get_color_at_impl")
@@ -0,0 +1,270 @@
+"""
+
+Session trajectory store: keep the trajectories of all trials in the session
+
+@author: Dror Dotan
+@copyright: Copyright (c) 2017, Dror Dotan
+
+This file is part of TrajTracker.
+
+TrajTracker is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+TrajTracker is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with TrajTracker.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import os
+import tempfile
+from collections import OrderedDict
+
+import numpy as np
+
+import trajtracker as ttrk
+import trajtracker._utils as _u
+
+
+class SessionTrajectoryStore(object):
+    """
+    Keeps the trajectories of the trials in the session, keyed by trial number, so that they can be used
+    during the session (e.g., for adaptive procedures).
+
+    The trajectories of the last *max_trials_in_memory* trials are kept in memory. Older trials are moved
+    to a memory-mapped file ("spilled"); this is transparent - they can be accessed just like the other trials.
+
+    To fill the store automatically, register it with
+    :func:`TrajectoryTracker.add_trial_store() <trajtracker.movement.TrajectoryTracker.add_trial_store>`.
+    """
+
+    #: The default number of trials kept in memory
+    default_max_trials_in_memory = 100
+
+
+    #-------------------------------------------------
+    def __init__(self, max_trials_in_memory=None, spill_filename=None):
+        """
+        Constructor - invoked when you create a new object by writing SessionTrajectoryStore()
+
+        :param max_trials_in_memory: The number of (most recent) trials kept in memory
+        :param spill_filename: The file to which older trials are moved. If not specified, a temporary file
+                               is created when needed, and deleted when the store is closed.
+        """
+
+        if max_trials_in_memory is None:
+            max_trials_in_memory = self.default_max_trials_in_memory
+
+        _u.validate_func_arg_type(self, "__init__", "max_trials_in_memory", max_trials_in_memory, int)
+        _u.validate_func_arg_not_negative(self, "__init__", "max_trials_in_memory", max_trials_in_memory)
+        _u.validate_func_arg_type(self, "__init__", "spill_filename", spill_filename, str, none_allowed=True)
+
+        self._max_trials_in_memory = max_trials_in_memory
+        self._spill_filename = spill_filename
+        self._delete_spill_file = False
+
+        #-- trial number -> (N,3) array
+        self._in_memory = OrderedDict()
+
+        #-- trial number -> (first row, number of rows) in the spill file
+        self._spilled = {}
+        self._spill_fh = None
+        self._n_spilled_rows = 0
+        self._spill_mmap = None
+
+        self._closed = False
+
+
+    #========================================================================
+    #   Add trials
+    #========================================================================
+
+    #-------------------------------------------------
+    def add_trial(self, trial_num, xyt):
+        """
+        Add a trial's trajectory to the store. If the trial already exists, it is replaced.
+
+        :param trial_num: The trial number (int)
+        :param xyt: (N,3) array with columns x, y, time. The data is copied.
+        """
+
+        self._validate_open("add_trial")
+        _u.validate_func_arg_type(self, "add_trial", "trial_num", trial_num, int)
+
+        xyt = np.array(xyt, dtype=np.float64).reshape(-1, 3)
+        xyt.flags.writeable = False
+
+        self._in_memory.pop(trial_num, None)
+        self._spilled.pop(trial_num, None)
+        self._in_memory[trial_num] = xyt
+
+        while len(self._in_memory) > self._max_trials_in_memory:
+            self._spill(*self._in_memory.popitem(last=False))
+
+
+    #-------------------------------------------------
+    def _spill(self, trial_num, xyt):
+
+        if self._spill_fh is None:
+            if self._spill_filename is None:
+                fd, self._spill_filename = tempfile.mkstemp(prefix="ttrk_trajectories_", suffix=".bin")
+                os.close(fd)
+                self._delete_spill_file = True
+            self._spill_fh = open(self._spill_filename, "w+b")
+
+        self._spill_fh.write(xyt.tobytes())
+        self._spilled[trial_num] = self._n_spilled_rows, len(xyt)
+        self._n_spilled_rows += len(xyt)
+
+        #-- The memory map no longer covers the whole file
+        self._spill_mmap = None
+
+
+    #-------------------------------------------------
+    def _get_spill_mmap(self):
+        if self._spill_mmap is None:
+            self._spill_fh.flush()
+            self._spill_mmap = np.memmap(self._spill_filename, dtype=np.float64, mode="r",
+                                         shape=(self._n_spilled_rows, 3))
+        return self._spill_mmap
+
+
+    #========================================================================
+    #   Access trials
+    #========================================================================
+
+    #-------------------------------------------------
+    def get_trial(self, trial_num):
+        """
+        Get a trial's trajectory
+
+        :return: A read-only (N,3) array with columns x, y, time
+        """
+
+        self._validate_open("get_trial")
+
+        if trial_num in self._in_memory:
+            return self._in_memory[trial_num]
+
+        if trial_num in self._spilled:
+            first_row, n_rows = self._spilled[trial_num]
+            if n_rows == 0:
+                return np.zeros((0, 3))
+            return self._get_spill_mmap()[first_row:first_row + n_rows]
+
+        raise ttrk.ValueError("{:}.get_trial(): trial #{:} is not in the store".format(_u.get_type_name(self), trial_num))
+
+
+    #-------------------------------------------------
+    def get_trials(self, first_trial, last_trial):
+        """
+        Get the trajectories of all trials in a range of trial numbers
+
+        :param first_trial: The first trial number in the range
+        :param last_trial: The last trial number in the range (inclusive)
+        :return: An OrderedDict: trial number -> (N,3) array, sorted by trial number
+        """
+
+        self._validate_open("get_trials")
+
+        trial_nums = sorted(t for t in self.trial_nums if first_trial <= t <= last_trial)
+        return OrderedDict((t, self.get_trial(t)) for t in trial_nums)
+
+
+    #-------------------------------------------------
+    def to_array(self):
+        """
+        Get the data of all trials as one array, sorted by trial number
+
+        :return: (N,4) array with columns trial, x, y, time
+        """
+
+        self._validate_open("to_array")
+
+        trial_nums = sorted(self.trial_nums)
+        trials = [self.get_trial(t) for t in trial_nums]
+
+        result = np.empty((sum(len(xyt) for xyt in trials), 4), dtype=np.float64)
+        row = 0
+        for trial_num, xyt in zip(trial_nums, trials):
+            result[row:row + len(xyt), 0] = trial_num
+            result[row:row + len(xyt), 1:] = xyt
+            row += len(xyt)
+
+        return result
+
+
+    #-------------------------------------------------
+    def __len__(self):
+        return len(self._in_memory) + len(self._spilled)
+
+    def __contains__(self, trial_num):
+        return trial_num in self._in_memory or trial_num in self._spilled
+
+
+    #-------------------------------------------------
+    @property
+    def trial_nums(self):
+        """
+        The numbers of all trials in the store (read-only)
+        """
+        return list(self._spilled.keys()) + list(self._in_memory.keys())
+
+
+    #-------------------------------------------------
+    @property
+    def n_trials_in_memory(self):
+        """
+        The number of trials kept in memory (i.e., not spilled to the file) (read-only)
+        """
+        return len(self._in_memory)
+
+
+    #========================================================================
+    #   Close
+    #========================================================================
+
+    #-------------------------------------------------
+    def close(self):
+        """
+        Forget all trials and close the spill file. A temporary spill file is deleted.
+        Arrays previously returned by this object must not be used after close().
+        Calling close() more than once has no effect.
+        """
+
+        if self._closed:
+            return
+
+        self._closed = True
+        self._in_memory.clear()
+        self._spilled.clear()
+        self._spill_mmap = None
+
+        if self._spill_fh is not None:
+            self._spill_fh.close()
+            self._spill_fh = None
+            if self._delete_spill_file:
+                try:
+                    os.remove(self._spill_filename)
+                except OSError:
+                    #-- e.g., on Windows, if an array returned by get_trial() still maps the file
+                    pass
+
+
+    #-------------------------------------------------
+    def _validate_open(self, func_name):
+        if self._closed:
+            raise ttrk.InvalidStateError("{:}.{:}() was called after the store was closed".format(_u.get_type_name(self), func_name))
+
+
+    #-------------------------------------------------
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
@@ -0,0 +1,151 @@
+"""
+
+A growable, preallocated storage for (x, y, time) samples
+
+@author: Dror Dotan
+@copyright: Copyright (c) 2017, Dror Dotan
+
+This file is part of TrajTracker.
+
+TrajTracker is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+TrajTracker is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with TrajTracker.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import numpy as np
+
+import trajtracker._utils as _u
+
+
+class TrajectoryBuffer(object):
+    """
+    Stores (x, y, time) samples in a preallocated NumPy array, which grows by doubling its
+    capacity whenever it gets full. Appending a sample does not create any Python list/tuple objects
+    that need to be garbage-collected later.
+
+    For each sample, the buffer also remembers whether the x and y coordinates were provided as int,
+    so that they can be formatted as ints when saved to a file.
+    """
+
+    #: The default number of samples for which memory is preallocated
+    default_capacity = 2048
+
+    #-------------------------------------------------
+    def __init__(self, initial_capacity=None):
+        """
+        Constructor - invoked when you create a new object by writing TrajectoryBuffer()
+
+        :param initial_capacity: The number of samples for which memory is preallocated
+        """
+
+        if initial_capacity is None:
+            initial_capacity = self.default_capacity
+
+        _u.validate_func_arg_type(self, "__init__", "initial_capacity", initial_capacity, int)
+        _u.validate_func_arg_positive(self, "__init__", "initial_capacity", initial_capacity)
+
+        self._data = np.empty((initial_capacity, 3), dtype=np.float64)
+        self._xy_is_int = np.empty((initial_capacity, 2), dtype=bool)
+        self._n_samples = 0
+
+
+    #-------------------------------------------------
+    def append(self, x, y, time):
+        """
+        Add a sample to the buffer (grow the buffer if needed)
+        """
+
+        n = self._n_samples
+        if n == len(self._data):
+            self._grow()
+
+        self._data[n] = (x, y, time)
+        self._xy_is_int[n] = (isinstance(x, int), isinstance(y, int))
+        self._n_samples = n + 1
+
+
+    #-------------------------------------------------
+    def _grow(self):
+        capacity = len(self._data) * 2
+
+        data = np.empty((capacity, 3), dtype=np.float64)
+        data[:self._n_samples] = self._data[:self._n_samples]
+        self._data = data
+
+        xy_is_int = np.empty((capacity, 2), dtype=bool)
+        xy_is_int[:self._n_samples] = self._xy_is_int[:self._n_samples]
+        self._xy_is_int = xy_is_int
+
+
+    #-------------------------------------------------
+    def clear(self):
+        """
+        Forget all samples. The allocated memory is kept for reuse.
+        """
+        self._n_samples = 0
+
+
+    #-------------------------------------------------
+    def __len__(self):
+        return self._n_samples
+
+
+    #-------------------------------------------------
+    @property
+    def capacity(self):
+        """
+        The number of samples that can be stored before the buffer needs to grow again
+        """
+        return len(self._data)
+
+
+    #-------------------------------------------------
+    @property
+    def xyt(self):
+        """
+        A read-only (N,3) float64 array with the x, y, time of each sample.
+
+        This is a view of the buffer's memory, not a copy: it becomes invalid when the buffer is
+        cleared or when it grows. If you need to keep the data, copy it.
+        """
+        view = self._data[:self._n_samples]
+        view.flags.writeable = False
+        return view
+
+
+    #-------------------------------------------------
+    @property
+    def xy_is_int(self):
+        """
+        A read-only (N,2) bool array: whether the x / y coordinate of each sample was provided as int
+        """
+        view = self._xy_is_int[:self._n_samples]
+        view.flags.writeable = False
+        return view
+
+
+    #-------------------------------------------------
+    def get_xyt(self):
+        """
+        Get a list of (x,y,time) tuples - one per sample. Coordinates that were provided as int are
+        returned as int.
+        """
+
+        n = self._n_samples
+        rows = self._data[:n].tolist()
+
+        xy_is_int = self._xy_is_int[:n]
+        if not xy_is_int.any():
+            return [tuple(row) for row in rows]
+
+        return [(int(x) if x_is_int else x, int(y) if y_is_int else y, t)
+                for (x, y, t), (x_is_int, y_is_int) in zip(rows, xy_is_int.tolist())]
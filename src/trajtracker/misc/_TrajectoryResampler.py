@@ -0,0 +1,111 @@
+"""
+
+Streaming resampler: convert irregularly-timed (x, y, time) samples into a fixed-rate series
+
+@author: Dror Dotan
+@copyright: Copyright (c) 2017, Dror Dotan
+
+This file is part of TrajTracker.
+
+TrajTracker is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+TrajTracker is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with TrajTracker.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+from __future__ import division
+
+import numbers
+
+import trajtracker._utils as _u
+
+
+class TrajectoryResampler(object):
+    """
+    Converts a stream of (x, y, time) samples, which may arrive at irregular intervals, into a series
+    with a fixed sampling rate.
+
+    The first resampled point is the first raw sample. Each subsequent point is at time t0 + k/rate,
+    and its x,y coordinates are linearly interpolated between the two raw samples before and after it.
+    A resampled point is produced only when the raw sample after it arrives, so raw samples after the last
+    resampled point do not appear in the output.
+    """
+
+    #-------------------------------------------------
+    def __init__(self, rate):
+        """
+        Constructor - invoked when you create a new object by writing TrajectoryResampler()
+
+        :param rate: The target sampling rate (samples per second)
+        """
+        _u.validate_func_arg_type(self, "__init__", "rate", rate, numbers.Number)
+        _u.validate_func_arg_positive(self, "__init__", "rate", rate)
+
+        self._rate = rate
+        self._interval = 1 / rate
+        self.reset()
+
+
+    #-------------------------------------------------
+    def reset(self):
+        """
+        Forget all previous samples (call this when a new trial starts)
+        """
+        self._t0 = None
+        self._n_resampled = 0
+        self._next_time = None
+        self._prev_sample = None
+
+
+    #-------------------------------------------------
+    def add_sample(self, x, y, time, consumer):
+        """
+        Add a raw sample, and produce the resampled points up to its time
+
+        :param consumer: A function (x, y, time) that is called for each resampled point
+        :return: The number of resampled points produced
+        """
+
+        if self._t0 is None:
+            self._t0 = time
+            self._prev_sample = x, y, time
+            self._n_resampled = 1
+            self._next_time = time + self._interval
+            consumer(x, y, time)
+            return 1
+
+        prev_x, prev_y, prev_time = self._prev_sample
+        self._prev_sample = x, y, time
+
+        next_time = self._next_time
+        if time < next_time:
+            return 0
+
+        dt = time - prev_time
+        n = 0
+        while next_time <= time:
+            #-- prev_time < next_time <= time, so dt > 0
+            weight = (next_time - prev_time) / dt
+            consumer(prev_x + (x - prev_x) * weight, prev_y + (y - prev_y) * weight, next_time)
+            n += 1
+            next_time = self._t0 + (self._n_resampled + n) * self._interval
+
+        self._n_resampled += n
+        self._next_time = next_time
+
+        return n
+
+
+    #-------------------------------------------------
+    @property
+    def rate(self):
+        """ The target sampling rate (samples per second; read-only) """
+        return self._rate
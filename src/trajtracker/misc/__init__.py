@@ -23,5 +23,8 @@ along with TrajTracker.  If not, see <http://www.gnu.org/licenses/>.
 
 from ._EnabledDisabledObj import EnabledDisabledObj
 from ._LocationColorMap import LocationColorMap
+from ._TrajectoryBuffer import TrajectoryBuffer
+from ._TrajectoryResampler import TrajectoryResampler
+from ._SessionTrajectoryStore import SessionTrajectoryStore
 
 import trajtracker.misc.nvshapes
@@ -64,6 +64,15 @@ class Rectangle(object):
         _u.validate_func_arg_type(self, "overlapping_with_position", "pos[0]", pos[0], numbers.Number)
         _u.validate_func_arg_type(self, "overlapping_with_position", "pos[1]", pos[1], numbers.Number)
 
+        return self._overlapping_with_position_impl(pos)
+
+
+    #---------------------------------------------------
+    # overlapping_with_position() without validating the arguments.
+    # Replaces overlapping_with_position() when trajtracker.env.validate_arguments = False
+    #
+    def _overlapping_with_position_impl(self, pos):
+
         x = pos[0] - self._position[0]
         y = pos[1] - self._position[1]
 
@@ -145,3 +154,6 @@ class Rectangle(object):
     #-------------------------------------------------
     def __str__(self):
         return "NV-Rectangle(size={:}, position={:}, rotation={:})".format(self._size, self._position, self._rotation)
+
+
+_u.register_lean_method(Rectangle, "overlapping_with_position", "_overlapping_with_position_impl")
@@ -80,6 +80,16 @@ class CircularTrajectoryGenerator(trajtracker.TTrkObject):
         """
 
         _u.validate_func_arg_type(self, "get_xy", "time", time, numbers.Number)
+
+        return self._get_traj_point_impl(time)
+
+
+    #------------------------------------------------------------
+    # get_traj_point() without validating the arguments.
+    # Replaces get_traj_point() when trajtracker.env.validate_arguments = False
+    #
+    def _get_traj_point_impl(self, time):
+
         if self._center is None:
             raise trajtracker.InvalidStateError("{:}.get_xy() was called without setting center".format(_u.get_type_name(self)))
         if self._degrees_per_sec is None:
@@ -197,3 +207,5 @@ class CircularTrajectoryGenerator(trajtracker.TTrkObject):
         self._clockwise = value
         self._log_property_changed("clockwise")
 
+
+_u.register_lean_method(CircularTrajectoryGenerator, "get_traj_point", "_get_traj_point_impl")
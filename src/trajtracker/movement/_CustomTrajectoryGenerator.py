@@ -68,11 +68,20 @@ class CustomTrajectoryGenerator(trajtracker.TTrkObject):
         :return: (x, y, visible)
         """
 
-        self.validate()
-
         _u.validate_func_arg_type(self, "get_traj_point", "time", time, numbers.Number)
         _u.validate_func_arg_not_negative(self, "get_traj_point", "time", time)
 
+        return self._get_traj_point_impl(time)
+
+
+    #---------------------------------------------------------------
+    # get_traj_point() without validating the arguments.
+    # Replaces get_traj_point() when trajtracker.env.validate_arguments = False
+    #
+    def _get_traj_point_impl(self, time):
+
+        self.validate()
+
         if self._active_traj_id is None:
             if len(self._trajectories):
                 self.active_traj_id = list(self._trajectories.keys())[0]
@@ -368,3 +377,5 @@ class CustomTrajectoryGenerator(trajtracker.TTrkObject):
         self._validation_err = None
         self._log_property_changed("cyclic")
 
+
+_u.register_lean_method(CustomTrajectoryGenerator, "get_traj_point", "_get_traj_point_impl")
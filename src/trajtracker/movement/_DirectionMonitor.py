@@ -39,17 +39,25 @@ class DirectionMonitor(ttrk.TTrkObject):
 
 
     #-------------------------------------------------------------------------
-    def __init__(self, min_distance=0, angle_units=Units.Degrees, zero_angle=0, min_angle_change_per_curve=0):
+    def __init__(self, min_distance=0, angle_units=Units.Degrees, zero_angle=0, min_angle_change_per_curve=0,
+                 kinematics=None):
         """
         Constructor - invoked when you create a new object by writing DirectionMonitor()
 
         :param min_distance: See :attr:`~trajtracker.movement.DirectionMonitor.min_distance`
+                             (ignored if *kinematics* is specified)
         :param angle_units: See :attr:`~trajtracker.movement.DirectionMonitor.angle_units`
         :param min_angle_change_per_curve: See :attr:`~trajtracker.movement.DirectionMonitor.min_angle_change_per_curve`
+        :param kinematics: A :class:`~trajtracker.movement.KinematicsState` shared with other objects. If specified,
+                           the direction is taken from its heading. The monitor does not reset the shared object.
         """
         super(DirectionMonitor, self).__init__()
 
-        self.min_distance = min_distance
+        _u.validate_func_arg_type(self, "__init__", "kinematics", kinematics, ttrk.movement.KinematicsState, none_allowed=True)
+        self._kinematics = kinematics
+
+        if kinematics is None:
+            self.min_distance = min_distance
         self.angle_units = angle_units
         self.zero_angle = zero_angle
         self.min_angle_change_per_curve = min_angle_change_per_curve
@@ -100,11 +108,22 @@ class DirectionMonitor(ttrk.TTrkObject):
         """
 
         _u.update_xyt_validate_and_log(self, position, time_in_trial)
+        return self._update_xyt_impl(position, time_in_trial, time_in_session)
+
 
-        self._remove_far_enough_recent_coords(position[0], position[1])
+    #----------------------------------------------------
+    # update_xyt() without validating the arguments. Called by TrajectoryPipeline (which validates them once),
+    # and replaces update_xyt() when trajtracker.env.validate_arguments = False
+    #
+    def _update_xyt_impl(self, position, time_in_trial, time_in_session=None):
+
+        if self._kinematics is None:
+            self._remove_far_enough_recent_coords(position[0], position[1])
+        else:
+            self._kinematics._update_xyt_impl(position, time_in_trial)
 
         # remember coordinates
-        self._recent_near_coords.append(position + (time_in_trial,))
+        self._recent_near_coords.append(tuple(position) + (time_in_trial,))
 
         last_angle = self._curr_angle
         self._calc_curr_angle()
@@ -116,12 +135,19 @@ class DirectionMonitor(ttrk.TTrkObject):
     #
     def _calc_curr_angle(self):
 
-        if self._pre_recent_coord is None:
+        if self._kinematics is not None:
+            angle = self._kinematics.heading
+
+        elif self._pre_recent_coord is None:
+            angle = None
+
+        else:
+            angle = u.get_angle(self._pre_recent_coord, self._recent_near_coords[-1])
+
+        if angle is None:
             self._curr_angle = None
             return
 
-        angle = u.get_angle(self._pre_recent_coord, self._recent_near_coords[-1])
-
         if self._angle_units == self.Units.Degrees:
             angle = angle / (np.pi * 2) * 360
 
@@ -276,13 +302,21 @@ class DirectionMonitor(ttrk.TTrkObject):
     #-------------------------------------
     @property
     def min_distance(self):
-        """ The minimal distance between points required for calculating direction """
+        """
+        The minimal distance between points required for calculating direction.
+        If the monitor uses a shared :class:`~trajtracker.movement.KinematicsState`, this is the shared object's
+        heading_min_distance.
+        """
+        if self._kinematics is not None:
+            return self._kinematics.heading_min_distance
         return self._min_distance
 
     @min_distance.setter
     def min_distance(self, value):
         _u.validate_attr_numeric(self, "min_distance", value)
         _u.validate_attr_not_negative(self, "min_distance", value)
+        if self._kinematics is not None:
+            self._kinematics.heading_min_distance = value
         self._min_distance = value
         self._log_property_changed("min_distance")
         if value < 20 and self._should_log(ttrk.log_warn):
@@ -336,3 +370,6 @@ class DirectionMonitor(ttrk.TTrkObject):
         _u.validate_attr_not_negative(self, "min_angle_change_per_curve", value)
         self._min_angle_change_per_curve = value
         self._log_property_changed("min_angle_change_per_curve")
+
+
+_u.register_lean_method(DirectionMonitor, "update_xyt", "_update_xyt_impl")
@@ -74,6 +74,15 @@ class Hotspot(ttrk.TTrkObject):
         else:
             _u.update_xyt_validate_and_log(self, position, time_in_trial, time_in_session)
 
+        return self._update_xyt_impl(position, time_in_trial, time_in_session)
+
+
+    #----------------------------------------------------------------------------
+    # update_xyt() without validating the arguments. Called by TrajectoryPipeline (which validates them once),
+    # and replaces update_xyt() when trajtracker.env.validate_arguments = False
+    #
+    def _update_xyt_impl(self, position, time_in_trial, time_in_session=None):
+
         now_touching_me = self._area.overlapping_with_position(position)
         self._log_write_if(ttrk.log_trace, "Hotspot {:}: touch detected in position {:}, this {:} hotspot".
                            format(self._name, position, "overlaps" if now_touching_me else "does not overlap"))
@@ -232,3 +241,6 @@ class Hotspot(ttrk.TTrkObject):
 
         self._on_touched_callback = value
         self._log_property_changed("on_touched_callback")
+
+
+_u.register_lean_method(Hotspot, "update_xyt", "_update_xyt_impl")
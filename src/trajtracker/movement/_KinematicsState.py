@@ -0,0 +1,349 @@
+"""
+
+Kinematics state: per-sample movement measures (distance, speed, heading, stops), shared by several objects
+
+@author: Dror Dotan
+@copyright: Copyright (c) 2017, Dror Dotan
+
+This file is part of TrajTracker.
+
+TrajTracker is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+TrajTracker is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with TrajTracker.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+from __future__ import division
+
+import numbers
+from collections import deque
+
+import numpy as np
+
+import trajtracker as ttrk
+import trajtracker._utils as _u
+import trajtracker.utils as u
+
+
+# noinspection PyAttributeOutsideInit
+class KinematicsState(ttrk.TTrkObject):
+    """
+    Maintains movement measures that several objects need - displacement, distance, speed, heading and
+    stop duration - and updates them incrementally, once per sample.
+
+    Instead of each validator keeping its own monitor and recomputing the same distances and angles,
+    create one KinematicsState and pass it to the validators (the *kinematics* argument of
+    :class:`~trajtracker.validators.InstantaneousSpeedValidator`,
+    :class:`~trajtracker.validators.MovementAngleValidator` and
+    :class:`~trajtracker.validators.NCurvesValidator`, or of
+    :class:`~trajtracker.movement.DirectionMonitor`).
+
+    Each of these objects forwards the samples it gets to the KinematicsState. A sample whose time is the same
+    as the previous sample's is ignored, so when several objects forward the same sample, the measures are
+    updated only once.
+
+    The objects sharing a KinematicsState do not reset it: call its reset() when the trial starts, or add it to
+    a :class:`~trajtracker.movement.TrajectoryPipeline` (before the objects that use it).
+
+    The speed properties have the same names as in :class:`~trajtracker.movement.SpeedMonitor`.
+    """
+
+    #-------------------------------------------------------------------------
+    def __init__(self, calculation_interval=0, heading_min_distance=None):
+        """
+        Constructor - invoked when you create a new object by writing KinematicsState()
+
+        :param calculation_interval: See :attr:`~trajtracker.movement.KinematicsState.calculation_interval`
+        :param heading_min_distance: See :attr:`~trajtracker.movement.KinematicsState.heading_min_distance`
+                                     (default: 0). Specify it if the object is shared with a
+                                     :class:`~trajtracker.validators.NCurvesValidator`.
+        """
+        super(KinematicsState, self).__init__()
+
+        self.calculation_interval = calculation_interval
+        self.heading_min_distance = 0 if heading_min_distance is None else heading_min_distance
+
+        #-- Whether heading_min_distance was specified, rather than left as the default (see NCurvesValidator)
+        self._heading_min_distance_specified = heading_min_distance is not None
+
+        self.reset()
+
+
+    #====================================================================================
+    #   Runtime API - update movement
+    #====================================================================================
+
+    #-------------------------------------------------------------------------
+    def reset(self, time0=None):
+        """
+        Called when a trial starts - forget any previous movement
+
+        :param time0: The time when the trial starts
+        """
+
+        _u.validate_func_arg_type(self, "reset", "time0", time0, numbers.Number, none_allowed=True)
+
+        self._log_func_enters("reset", [time0])
+
+        self._time0 = time0
+        self._first_xy = None
+        self._last_xyt = None
+        self._n_samples = 0
+        self._distance = 0
+
+        #-- Speed: the samples with movement in the last calculation_interval, each with the cumulative distance
+        self._recent_points = deque()
+        self._pre_recent_point = None
+        self._last_moved_time = None
+        self._last_stopped_time = None
+
+        #-- Heading
+        self._heading_points = []
+        self._heading = None
+
+
+    #-------------------------------------------------------------------------
+    # noinspection PyIncorrectDocstring
+    def update_xyt(self, position, time_in_trial, time_in_session=None):
+        """
+        Update the measures with a new sample.
+        If the time is the same as in the previous sample, the sample is ignored.
+
+        :param time_in_trial: use the same time scale provided to reset()
+        :param time_in_session: ignored
+        """
+
+        _u.update_xyt_validate_and_log(self, position, time_in_trial)
+        return self._update_xyt_impl(position, time_in_trial, time_in_session)
+
+
+    #----------------------------------------------------
+    # update_xyt() without validating the arguments. Called by the objects that share this state,
+    # and replaces update_xyt() when trajtracker.env.validate_arguments = False
+    #
+    def _update_xyt_impl(self, position, time_in_trial, time_in_session=None):
+
+        last_xyt = self._last_xyt
+
+        if last_xyt is not None and time_in_trial <= last_xyt[2]:
+            if time_in_trial == last_xyt[2]:
+                return  # The same sample was already provided (probably by another object)
+            raise ttrk.InvalidStateError(
+                "{:}.update_xyt() was called with time={:} after it was previously called with time={:}".format(
+                    _u.get_type_name(self), time_in_trial, last_xyt[2]))
+
+        if self._time0 is None:
+            self._time0 = time_in_trial
+        elif time_in_trial < self._time0:
+            raise ttrk.InvalidStateError(
+                "{:}.update_xyt() was called with time={:}, which is before the trial started (time={:})".format(
+                    _u.get_type_name(self), time_in_trial, self._time0))
+
+        x, y = position[0], position[1]
+
+        self._n_samples += 1
+        self._last_xyt = (x, y, time_in_trial)
+
+        if last_xyt is None:
+            self._first_xy = (x, y)
+
+        elif x == last_xyt[0] and y == last_xyt[1]:
+            #-- No movement: remember for how long the finger is stopped
+            self._last_stopped_time = time_in_trial
+            self._update_heading(x, y, time_in_trial)
+            return
+
+        self._update_speed(x, y, time_in_trial, last_xyt)
+        self._update_heading(x, y, time_in_trial)
+
+
+    #-------------------------------------------------------------------------
+    def _update_speed(self, x, y, time_in_trial, last_xyt):
+
+        if last_xyt is not None:
+            self._distance += np.sqrt((x - last_xyt[0]) ** 2 + (y - last_xyt[1]) ** 2)
+
+        self._last_moved_time = time_in_trial
+        self._last_stopped_time = None
+
+        #-- Forget the points older than the calculation interval, but remember the newest of them
+        recent_points = self._recent_points
+        oldest_time_to_keep = time_in_trial - self._calculation_interval
+        while len(recent_points) > 0 and recent_points[0][2] <= oldest_time_to_keep:
+            self._pre_recent_point = recent_points.popleft()
+
+        recent_points.append((x, y, time_in_trial, self._distance))
+
+
+    #-------------------------------------------------------------------------
+    # The heading is the direction from the latest point that is at least heading_min_distance away
+    # (among the points that have been far enough ever since they were sampled) to the current point
+    #
+    def _update_heading(self, x, y, time_in_trial):
+
+        points = self._heading_points
+        sq_min_distance = self._heading_min_distance ** 2
+
+        too_close_ind = len(points)
+        found_far_enough_point = False
+        for i in range(len(points)):
+            px, py, pt = points[i]
+            if (px - x) ** 2 + (py - y) ** 2 < sq_min_distance:
+                too_close_ind = i
+                break
+            found_far_enough_point = True
+
+        if too_close_ind > 1:
+            del points[:too_close_ind - 1]
+
+        points.append((x, y, time_in_trial))
+
+        x0, y0, t0 = points[0]
+        if found_far_enough_point and (x0 != x or y0 != y):
+            self._heading = u.get_angle((x0, y0), (x, y))
+        else:
+            self._heading = None
+
+
+    #====================================================================================
+    #   Runtime API - get info about movement
+    #====================================================================================
+
+    #-------------------------------------------------------------------------
+    @property
+    def n_samples(self):
+        """ The number of samples since reset() was called """
+        return self._n_samples
+
+    #-------------------------------------------------------------------------
+    @property
+    def position(self):
+        """ The (x, y) coordinates of the last sample (None if there were no samples) """
+        return None if self._last_xyt is None else self._last_xyt[:2]
+
+    #-------------------------------------------------------------------------
+    @property
+    def time_in_trial(self):
+        """
+        Time elapsed between the trial start and the last sample in which the finger/mouse moved (sec).
+        As in :class:`~trajtracker.movement.SpeedMonitor`, samples without movement are not counted.
+        """
+        if self._time0 is None or self._last_moved_time is None:
+            return None
+        return self._last_moved_time - self._time0
+
+    #-------------------------------------------------------------------------
+    @property
+    def displacement(self):
+        """ The (dx, dy) between the first sample of the trial and the last sample """
+        if self._last_xyt is None:
+            return None
+        return self._last_xyt[0] - self._first_xy[0], self._last_xyt[1] - self._first_xy[1]
+
+    #-------------------------------------------------------------------------
+    @property
+    def distance(self):
+        """ The distance traveled since the first sample of the trial (along the trajectory) """
+        return self._distance
+
+    #-------------------------------------------------------------------------
+    @property
+    def xspeed(self):
+        """ The instantaneous X speed (coords/sec), over :attr:`~trajtracker.movement.KinematicsState.calculation_interval` """
+        if self._pre_recent_point is None:
+            return None
+        return (self._recent_points[-1][0] - self._pre_recent_point[0]) / self.last_calculation_interval
+
+    #-------------------------------------------------------------------------
+    @property
+    def yspeed(self):
+        """ The instantaneous Y speed (coords/sec), over :attr:`~trajtracker.movement.KinematicsState.calculation_interval` """
+        if self._pre_recent_point is None:
+            return None
+        return (self._recent_points[-1][1] - self._pre_recent_point[1]) / self.last_calculation_interval
+
+    #-------------------------------------------------------------------------
+    @property
+    def xyspeed(self):
+        """
+        The instantaneous speed (coords/sec), over :attr:`~trajtracker.movement.KinematicsState.calculation_interval`.
+        For this calculation we consider the full distance traveled by the mouse/finger.
+        """
+        if self._pre_recent_point is None:
+            return None
+        return (self._recent_points[-1][3] - self._pre_recent_point[3]) / self.last_calculation_interval
+
+    #-------------------------------------------------------------------------
+    @property
+    def last_calculation_interval(self):
+        """ The time interval (sec) used for the last calculation of speed """
+        if self._pre_recent_point is None:
+            return None
+        return self._recent_points[-1][2] - self._pre_recent_point[2]
+
+    #-------------------------------------------------------------------------
+    @property
+    def heading(self):
+        """
+        The direction of the recent movement, in radians (0 = up; see :func:`trajtracker.utils.get_angle`).
+        None if the finger/mouse did not move at least
+        :attr:`~trajtracker.movement.KinematicsState.heading_min_distance` yet.
+        """
+        return self._heading
+
+    #-------------------------------------------------------------------------
+    @property
+    def stopped_duration(self):
+        """
+        If the finger is stopped, this tells you for how long it's been so.
+        If the finger is moving, or didn't start moving yet, this will return 0.
+        """
+        if self._last_stopped_time is None or self._last_moved_time is None:
+            return 0
+        return self._last_stopped_time - self._last_moved_time
+
+
+    #====================================================================================
+    #   Configure
+    #====================================================================================
+
+    #-------------------------------------------------------------------------
+    @property
+    def calculation_interval(self):
+        """
+        The time window (in seconds) over which speed is calculated.
+        Use shorter time period if available
+        """
+        return self._calculation_interval
+
+    @calculation_interval.setter
+    def calculation_interval(self, value):
+        _u.validate_attr_type(self, "calculation_interval", value, numbers.Number)
+        _u.validate_attr_not_negative(self, "calculation_interval", value)
+        self._calculation_interval = value
+        self._log_property_changed("calculation_interval")
+
+    #-------------------------------------------------------------------------
+    @property
+    def heading_min_distance(self):
+        """ The minimal distance between points required for calculating the heading """
+        return self._heading_min_distance
+
+    @heading_min_distance.setter
+    def heading_min_distance(self, value):
+        _u.validate_attr_type(self, "heading_min_distance", value, numbers.Number)
+        _u.validate_attr_not_negative(self, "heading_min_distance", value)
+        self._heading_min_distance = value
+        self._heading_min_distance_specified = True
+        self._log_property_changed("heading_min_distance")
+
+
+_u.register_lean_method(KinematicsState, "update_xyt", "_update_xyt_impl")
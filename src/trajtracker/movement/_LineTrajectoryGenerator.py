@@ -75,6 +75,16 @@ class LineTrajectoryGenerator(trajtracker.TTrkObject):
         """
 
         _u.validate_func_arg_type(self, "get_xy", "time", time, numbers.Number)
+
+        return self._get_traj_point_impl(time)
+
+
+    #---------------------------------------------------------------
+    # get_traj_point() without validating the arguments.
+    # Replaces get_traj_point() when trajtracker.env.validate_arguments = False
+    #
+    def _get_traj_point_impl(self, time):
+
         if self._start_point is None:
             raise trajtracker.InvalidStateError("{:}.get_xy() was called without setting start_point".format(_u.get_type_name(self)))
         if self._end_point is None:
@@ -179,3 +189,6 @@ class LineTrajectoryGenerator(trajtracker.TTrkObject):
         _u.validate_attr_type(self, "cyclic", value, bool)
         self._cyclic = value
         self._log_property_changed("cyclic")
+
+
+_u.register_lean_method(LineTrajectoryGenerator, "get_traj_point", "_get_traj_point_impl")
@@ -0,0 +1,385 @@
+"""
+
+Multi-pointer trajectory tracker: track several fingers/contact points at once
+
+@author: Dror Dotan
+@copyright: Copyright (c) 2017, Dror Dotan
+
+This file is part of TrajTracker.
+
+TrajTracker is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+TrajTracker is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with TrajTracker.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import numbers
+
+import numpy as np
+
+import trajtracker as ttrk
+# noinspection PyProtectedMember
+import trajtracker._utils as _u
+from trajtracker.misc import EnabledDisabledObj, TrajectoryBuffer
+from trajtracker.io import SessionFileWriter
+
+
+# noinspection PyAttributeOutsideInit,PyProtectedMember
+class MultiPointerTrajectoryTracker(ttrk.TTrkObject, EnabledDisabledObj):
+    """
+    Track the trajectories of several pointers (fingers, contact points) at once, and save them to a CSV file
+    with columns trial, pointer, time, x, y.
+
+    The samples of all pointers are stored together, in preallocated column arrays (pointer id, time, x, y).
+    In addition, each pointer's samples are kept in a separate (x, y, time) buffer, so
+    :func:`~trajtracker.movement.MultiPointerTrajectoryTracker.get_pointer_xyt` returns a view rather than a copy.
+    Each frame, all pointers are tracked with a single call to
+    :func:`~trajtracker.movement.MultiPointerTrajectoryTracker.update_xyt_multi`.
+    """
+
+    #: The default number of samples for which memory is preallocated
+    default_capacity = 4096
+
+
+    #----------------------------------------------------
+    def __init__(self, filename=None, enabled=False, track_if_no_movement=False, initial_capacity=None):
+        """
+        Constructor - invoked when you create a new object by writing MultiPointerTrajectoryTracker()
+
+        :param filename: The file to which the trajectory information will be saved (CSV).
+        :param enabled: See :attr:`~trajtracker.movement.MultiPointerTrajectoryTracker.enabled`
+        :param track_if_no_movement: See :attr:`~trajtracker.movement.MultiPointerTrajectoryTracker.track_if_no_movement`
+        :param initial_capacity: The number of samples (of all pointers together) for which memory is preallocated
+        """
+        ttrk.TTrkObject.__init__(self)
+        EnabledDisabledObj.__init__(self, enabled=enabled)
+
+        if initial_capacity is None:
+            initial_capacity = self.default_capacity
+        _u.validate_func_arg_type(self, "__init__", "initial_capacity", initial_capacity, int)
+        _u.validate_func_arg_positive(self, "__init__", "initial_capacity", initial_capacity)
+
+        self._pointer_ids = np.empty(initial_capacity, dtype=np.int32)
+        self._times = np.empty(initial_capacity, dtype=np.float64)
+        self._x = np.empty(initial_capacity, dtype=np.float64)
+        self._y = np.empty(initial_capacity, dtype=np.float64)
+        self._xy_is_int = np.empty((initial_capacity, 2), dtype=bool)
+        self._n_samples = 0
+        self._pointer_buffers = {}
+
+        self.reset()
+        self._filename = filename
+        self._writer = None
+        self.enabled = enabled
+        self.track_if_no_movement = track_if_no_movement
+
+
+    #==============================================================================
+    #    Properties
+    #==============================================================================
+
+    #----------------------------------------------------
+    @property
+    def track_if_no_movement(self):
+        """
+        Whether to record a pointer's x,y,t if its coordinates did not change
+        """
+        return self._track_if_no_movement
+
+    @track_if_no_movement.setter
+    def track_if_no_movement(self, value):
+        _u.validate_attr_type(self, "track_if_no_movement", value, bool)
+        self._track_if_no_movement = value
+        self._log_property_changed("track_if_no_movement")
+
+
+    #==============================================================================
+    #    Runtime API
+    #==============================================================================
+
+    #----------------------------------------------------
+    # noinspection PyUnusedLocal
+    def reset(self, time0=None):
+        """
+        Forget any previously-tracked points.
+
+        :param time0: ignored
+        """
+
+        self._log_func_enters("reset", [time0])
+
+        self._n_samples = 0
+        self._last_coords = {}
+        for buffer in self._pointer_buffers.values():
+            buffer.clear()
+
+
+    #----------------------------------------------------
+    def update_xyt_multi(self, positions, time_in_trial):
+        """
+        Track the positions of several pointers at the same time point.
+        If tracking is currently inactive, this function will do nothing.
+
+        :param positions: A dict: pointer id (int) -> (x, y). Pointers that are not currently touching the screen
+                          should not appear in the dict.
+        :param time_in_trial: The time point (in seconds)
+        """
+
+        if not self._enabled:
+            return
+
+        _u.validate_func_arg_type(self, "update_xyt_multi", "positions", positions, dict)
+        _u.validate_func_arg_type(self, "update_xyt_multi", "time_in_trial", time_in_trial, numbers.Number)
+        _u.validate_func_arg_not_negative(self, "update_xyt_multi", "time_in_trial", time_in_trial)
+
+        validated = {}
+        for pid, xy in positions.items():
+            _u.validate_func_arg_type(self, "update_xyt_multi", "pointer id", pid, int)
+            validated[pid] = _u.validate_func_arg_is_coord(self, "update_xyt_multi", "positions[{:}]".format(pid), xy,
+                                                           allow_float=True)
+
+        if self._should_log(ttrk.log_trace):
+            self._log_write("Track trajectories: time={:}, positions={:}".format(time_in_trial, positions), True)
+
+        self._update_xyt_multi_impl(validated, time_in_trial)
+
+
+    #----------------------------------------------------
+    # update_xyt_multi() without validating the arguments.
+    # Replaces update_xyt_multi() when trajtracker.env.validate_arguments = False
+    #
+    def _update_xyt_multi_impl(self, positions, time_in_trial):
+
+        if not self._enabled:
+            return
+
+        if not self._track_if_no_movement:
+            positions = {pid: xy for pid, xy in positions.items() if self._last_coords.get(pid) != tuple(xy)}
+
+        n_new = len(positions)
+        if n_new == 0:
+            return
+
+        n = self._n_samples
+        while n + n_new > len(self._times):
+            self._grow()
+
+        pointer_ids = list(positions.keys())
+        coords = list(positions.values())
+        end = n + n_new
+
+        self._pointer_ids[n:end] = pointer_ids
+        self._times[n:end] = time_in_trial
+        self._x[n:end] = [xy[0] for xy in coords]
+        self._y[n:end] = [xy[1] for xy in coords]
+        self._xy_is_int[n:end] = [(isinstance(xy[0], int), isinstance(xy[1], int)) for xy in coords]
+        self._n_samples = end
+
+        for pid, xy in zip(pointer_ids, coords):
+            self._last_coords[pid] = tuple(xy)
+            buffer = self._pointer_buffers.get(pid)
+            if buffer is None:
+                buffer = self._pointer_buffers[pid] = TrajectoryBuffer()
+            buffer.append(xy[0], xy[1], time_in_trial)
+
+
+    #----------------------------------------------------
+    def update_xyt(self, position, time_in_trial, time_in_session=None):
+        """
+        Track the position of a single pointer (pointer id = 0).
+        This allows using this object wherever a single-pointer object is expected.
+
+        :param time_in_session: ignored
+        """
+        if not self._enabled:
+            return
+
+        _u.update_xyt_validate_and_log(self, position, time_in_trial)
+        return self._update_xyt_impl(position, time_in_trial, time_in_session)
+
+
+    #----------------------------------------------------
+    # update_xyt() without validating the arguments. Called by TrajectoryPipeline (which validates them once),
+    # and replaces update_xyt() when trajtracker.env.validate_arguments = False
+    #
+    def _update_xyt_impl(self, position, time_in_trial, time_in_session=None):
+
+        if not self._enabled:
+            return
+
+        x_coord, y_coord = position
+        self._update_xyt_multi_impl({0: (x_coord, y_coord)}, time_in_trial)
+
+
+    #----------------------------------------------------
+    def _grow(self):
+        n = self._n_samples
+        capacity = len(self._times) * 2
+        for attr in "_pointer_ids", "_times", "_x", "_y", "_xy_is_int":
+            old = getattr(self, attr)
+            new = np.empty((capacity,) + old.shape[1:], dtype=old.dtype)
+            new[:n] = old[:n]
+            setattr(self, attr, new)
+
+
+    #==============================================================================
+    #    Access the tracked data
+    #==============================================================================
+
+    #----------------------------------------------------
+    def get_columns(self):
+        """
+        Get the samples of all pointers, in the order they were tracked.
+
+        The arrays are read-only views of the tracker's internal buffers (they are not copied): they
+        become invalid when reset() is called. If you need to keep the data, copy it.
+
+        :return: A tuple with 4 arrays: pointer_ids, times, x, y
+        """
+        n = self._n_samples
+        return tuple(_readonly_view(arr[:n]) for arr in (self._pointer_ids, self._times, self._x, self._y))
+
+
+    #----------------------------------------------------
+    def get_pointer_xyt(self, pointer_id):
+        """
+        Get the samples of one pointer.
+
+        The array is a read-only view of the pointer's buffer (it is not copied): it becomes invalid when reset()
+        is called or when more samples of this pointer are tracked. If you need to keep the data, copy it.
+
+        :return: (N,3) array with columns x, y, time
+        """
+        buffer = self._pointer_buffers.get(pointer_id)
+        if buffer is None:
+            return _readonly_view(np.zeros((0, 3)))
+        return buffer.xyt
+
+
+    #----------------------------------------------------
+    @property
+    def pointer_ids(self):
+        """
+        The ids of all pointers tracked since the last reset(), sorted (read-only)
+        """
+        return np.unique(self._pointer_ids[:self._n_samples]).tolist()
+
+
+    #==============================================================================
+    #    Save to file
+    #==============================================================================
+
+    #----------------------------------------------------
+    def init_output_file(self, filename=None, xy_precision=5, time_precision=3,
+                         flush_policy=SessionFileWriter.FlushPolicy.EveryTrial, flush_interval=None):
+        """
+        Initialize a new CSV output file for saving the results.
+        The file remains open until :func:`~trajtracker.movement.MultiPointerTrajectoryTracker.close_output_file`
+        is called (or until init_output_file() is called again).
+
+        :param filename: Full path
+        :param xy_precision: Precision of x,y coordinates (default: 5)
+        :param time_precision: Precision of time (default: 3)
+        :param flush_policy: When to write the data to the file (see :attr:`SessionFileWriter.flush_policy <trajtracker.io.SessionFileWriter.flush_policy>`).
+        :param flush_interval: See :attr:`SessionFileWriter.flush_interval <trajtracker.io.SessionFileWriter.flush_interval>`
+        """
+
+        if filename is not None:
+            self._filename = filename
+
+        if self._filename is None:
+            raise ttrk.ValueError("filename was not provided to {:}.init_output_file()".format(_u.get_type_name(self)))
+
+        self._xy_precision = xy_precision
+        self._time_precision = time_precision
+
+        self.close_output_file()
+
+        self._writer = SessionFileWriter(self._filename, 'w', flush_policy=flush_policy, flush_interval=flush_interval,
+                                         open_file=self._open_file)
+        self._writer.write('trial,pointer,time,x,y\n')
+        self._writer.flush()
+
+        self._log_write_if(ttrk.log_debug, "Initializing output file %s" % self._filename, True)
+
+
+    #----------------------------------------------------
+    def save_to_file(self, trial_num):
+        """
+        Save the tracked trajectories of all pointers (ever since the last reset() call) to the CSV file.
+        The rows are written in the order they were tracked.
+
+        :return: The number of rows printed to the file
+        """
+        if self._writer is None:
+            raise ttrk.InvalidStateError('{:}.save_to_file() was called before calling init_output_file()'.format(_u.get_type_name(self)))
+
+        n = self._n_samples
+        if n > 0:
+            self._writer.write_trial(self._format_csv_trial(trial_num, n))
+        else:
+            self._writer.end_trial()
+
+        self._log_write_if(ttrk.log_debug, "Saved trial #{:} (with {:} rows) to {:}".format(trial_num, n, self._filename), True)
+
+        return n
+
+
+    #----------------------------------------------------
+    # Format all rows of the trial with a single % operation (see TrajectoryTracker._format_csv_trial)
+    #
+    def _format_csv_trial(self, trial_num, n):
+
+        prefix = "%d,%%d,%%.%df," % (trial_num, self._time_precision)
+        float_fmt = "%%.%df" % self._xy_precision
+        row_formats = [prefix + x_fmt + "," + y_fmt + "\n" for x_fmt in (float_fmt, "%d") for y_fmt in (float_fmt, "%d")]
+
+        codes = self._xy_is_int[:n, 0] * 2 + self._xy_is_int[:n, 1]
+        first_code = int(codes[0])
+        if (codes == first_code).all():
+            trial_format = row_formats[first_code] * n
+        else:
+            trial_format = "".join([row_formats[c] for c in codes.tolist()])
+
+        values = np.column_stack([self._pointer_ids[:n], self._times[:n], self._x[:n], self._y[:n]])
+        return trial_format % tuple(values.ravel().tolist())
+
+
+    #----------------------------------------------------
+    def close_output_file(self):
+        """
+        Write any pending data to the output file and close it.
+        Calling this method when the file is not open has no effect.
+        """
+        if self._writer is None:
+            return
+
+        writer = self._writer
+        self._writer = None
+        writer.close()
+
+
+    #----------------------------------------------------
+    # Default implementation for opening an output file
+    #
+    def _open_file(self, filename, mode):
+        return open(filename, mode)
+
+
+#----------------------------------------------------
+def _readonly_view(arr):
+    arr = arr.view()
+    arr.flags.writeable = False
+    return arr
+
+
+_u.register_lean_method(MultiPointerTrajectoryTracker, "update_xyt", "_update_xyt_impl")
+_u.register_lean_method(MultiPointerTrajectoryTracker, "update_xyt_multi", "_update_xyt_multi_impl")
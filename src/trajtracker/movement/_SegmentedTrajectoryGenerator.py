@@ -59,6 +59,15 @@ class SegmentedTrajectoryGenerator(trajtracker.TTrkObject):
         _u.validate_func_arg_type(self, "get_traj_point", "time", time, numbers.Number)
         _u.validate_func_arg_not_negative(self, "get_traj_point", "time", time)
 
+        return self._get_traj_point_impl(time)
+
+
+    #---------------------------------------------------------------
+    # get_traj_point() without validating the arguments.
+    # Replaces get_traj_point() when trajtracker.env.validate_arguments = False
+    #
+    def _get_traj_point_impl(self, time):
+
         #-- Handle time-too-large
         total_duration = self.duration
         if self._cyclic:
@@ -131,3 +140,6 @@ class SegmentedTrajectoryGenerator(trajtracker.TTrkObject):
     @property
     def duration(self):
         return sum([s['duration'] for s in self._segments])
+
+
+_u.register_lean_method(SegmentedTrajectoryGenerator, "get_traj_point", "_get_traj_point_impl")
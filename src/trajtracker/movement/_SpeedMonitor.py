@@ -84,6 +84,15 @@ class SpeedMonitor(trajtracker.TTrkObject):
         """
 
         _u.update_xyt_validate_and_log(self, position, time_in_trial)
+        return self._update_xyt_impl(position, time_in_trial, time_in_session)
+
+
+    #----------------------------------------------------
+    # update_xyt() without validating the arguments. Called by TrajectoryPipeline (which validates them once),
+    # and replaces update_xyt() when trajtracker.env.validate_arguments = False
+    #
+    def _update_xyt_impl(self, position, time_in_trial, time_in_session=None):
+
         self._validate_time(time_in_trial)
 
         x_coord, y_coord = position
@@ -246,3 +255,6 @@ class SpeedMonitor(trajtracker.TTrkObject):
         _u.validate_attr_not_negative(self, "calculation_interval", value)
         self._calculation_interval = value
         self._log_property_changed("calculation_interval")
+
+
+_u.register_lean_method(SpeedMonitor, "update_xyt", "_update_xyt_impl")
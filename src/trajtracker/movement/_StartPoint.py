@@ -180,13 +180,22 @@ class StartPoint(ttrk.TTrkObject):
         :return: bool - whether the state was changed 
         """
 
+        _u.validate_func_arg_type(self, "check_xy", "x_coord", x_coord, numbers.Number)
+        _u.validate_func_arg_type(self, "check_xy", "y_coord", y_coord, numbers.Number)
+
+        return self._check_xy_impl(x_coord, y_coord)
+
+
+    #-----------------------------------------------------------------
+    # check_xy() without validating the arguments.
+    # Replaces check_xy() when trajtracker.env.validate_arguments = False
+    #
+    def _check_xy_impl(self, x_coord, y_coord):
+
         if x_coord == self._last_checked_coords[0] and y_coord == self._last_checked_coords[1]:
             # save time - don't retest the same coordinates
             return False
 
-        _u.validate_func_arg_type(self, "check_xy", "x_coord", x_coord, numbers.Number)
-        _u.validate_func_arg_type(self, "check_xy", "y_coord", y_coord, numbers.Number)
-
         self._log_func_enters("check_xy", [x_coord, y_coord])
 
         self._last_checked_coords = (x_coord, y_coord)
@@ -408,3 +417,6 @@ class StartPoint(ttrk.TTrkObject):
 
         self._log_func_returns("wait_until_exit", self._state)
         return None
+
+
+_u.register_lean_method(StartPoint, "check_xy", "_check_xy_impl")
@@ -0,0 +1,223 @@
+"""
+
+Trajectory pipeline: send each sample to several trajectory-sensitive objects, validating it only once
+
+@author: Dror Dotan
+@copyright: Copyright (c) 2017, Dror Dotan
+
+This file is part of TrajTracker.
+
+TrajTracker is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+TrajTracker is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with TrajTracker.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+from __future__ import division
+
+from collections import OrderedDict
+
+from expyriment.misc import geometry
+
+import trajtracker as ttrk
+import trajtracker._utils as _u
+import trajtracker.utils as u
+
+
+# noinspection PyProtectedMember
+class TrajectoryPipeline(ttrk.TTrkObject):
+    """
+    Sends each sample (position + time) to a list of trajectory-sensitive objects ("stages"), such as
+    trajectory trackers, validators and monitors - the objects whose update_xyt() you would otherwise call
+    one by one.
+
+    The sample is validated by the pipeline, and the stages are then called without repeating the validation.
+    This is not a significant optimization - validating a sample takes a small fraction of the time that the
+    stages spend on it. The stages are called in the order they were added. If a stage returns an
+    :class:`~trajtracker.validators.ExperimentError`, the remaining stages are not called and the error is returned
+    (the first error wins).
+
+    Optionally, the pipeline measures the time spent in each stage (see
+    :func:`~trajtracker.movement.TrajectoryPipeline.get_timing`).
+    """
+
+    #------------------------------------------------
+    def __init__(self, stages=(), record_timing=False):
+        """
+        Constructor - invoked when you create a new object by writing TrajectoryPipeline()
+
+        :param stages: A list of objects with an update_xyt() method
+        :param record_timing: See :attr:`~trajtracker.movement.TrajectoryPipeline.record_timing`
+        """
+
+        super(TrajectoryPipeline, self).__init__()
+
+        _u.validate_func_arg_is_collection(self, "__init__", "stages", stages)
+
+        self._stages = []
+        self._stage_names = []
+        self._update_funcs = []
+        self._timing = []
+
+        self.record_timing = record_timing
+
+        for stage in stages:
+            self.add_stage(stage)
+
+
+    #------------------------------------------------
+    def add_stage(self, stage, name=None):
+        """
+        Add a stage at the end of the pipeline
+
+        :param stage: An object with an update_xyt() method
+        :param name: The stage's name in :func:`~trajtracker.movement.TrajectoryPipeline.get_timing`
+                     (default: the object's class name, with a numeric suffix if needed)
+        """
+
+        if not hasattr(stage, "update_xyt"):
+            raise ttrk.TypeError("{:}.add_stage(): invalid stage ({:}) - it has no update_xyt() method".format(
+                _u.get_type_name(self), stage))
+        _u.validate_func_arg_type(self, "add_stage", "name", name, str, none_allowed=True)
+
+        if name is None:
+            name = _u.get_type_name(stage)
+            if name in self._stage_names:
+                name = "{:}_{:}".format(name, 1 + sum(1 for s in self._stages if _u.get_type_name(s) == name))
+
+        if name in self._stage_names:
+            raise ttrk.ValueError("{:}.add_stage(): a stage named '{:}' already exists".format(_u.get_type_name(self), name))
+
+        #-- Built-in objects are called without validating the sample again (unless a subclass overrides update_xyt)
+        update_func = _u.get_lean_method(stage, "update_xyt")
+
+        self._stages.append(stage)
+        self._stage_names.append(name)
+        self._update_funcs.append(update_func)
+        self._timing.append([0, 0.0, 0.0])
+
+        self._log_write_if(ttrk.log_debug, "Added stage '{:}'".format(name), True)
+
+
+    #========================================================================
+    #   Runtime API
+    #========================================================================
+
+    #------------------------------------------------
+    def reset(self, time0=None):
+        """
+        Call reset() on all stages that have such a method
+
+        :param time0: If specified, it is passed to the reset() method of each stage
+        """
+
+        self._log_func_enters("reset", [time0])
+
+        for stage in self._stages:
+            if hasattr(stage, "reset"):
+                if time0 is None:
+                    stage.reset()
+                else:
+                    stage.reset(time0)
+
+
+    #------------------------------------------------
+    def update_xyt(self, position, time_in_trial, time_in_session=None):
+        """
+        Send a sample to all stages
+
+        :param position: (x, y) coordinates
+        :param time_in_trial: The time (in seconds) since the trial started
+        :param time_in_session: The time (in seconds) since the session started
+        :return: The first :class:`~trajtracker.validators.ExperimentError` returned by a stage, or None
+        """
+
+        _u.update_xyt_validate_and_log(self, position, time_in_trial,
+                                       _u.DONT_VALIDATE if time_in_session is None else time_in_session)
+
+        #-- Normalize the position, so the stages get the same input type regardless of what was provided
+        if isinstance(position, geometry.XYPoint):
+            position = position.x, position.y
+        elif not isinstance(position, tuple):
+            position = position[0], position[1]
+
+        experiment_error = ttrk.validators.ExperimentError
+
+        if not self._record_timing:
+            for update_func in self._update_funcs:
+                result = update_func(position, time_in_trial, time_in_session)
+                if isinstance(result, experiment_error):
+                    return result
+            return None
+
+        for update_func, timing in zip(self._update_funcs, self._timing):
+            start = u.get_time()
+            result = update_func(position, time_in_trial, time_in_session)
+            duration = u.get_time() - start
+
+            timing[0] += 1
+            timing[1] += duration
+            timing[2] = max(timing[2], duration)
+
+            if isinstance(result, experiment_error):
+                return result
+
+        return None
+
+
+    #========================================================================
+    #   Timing
+    #========================================================================
+
+    #------------------------------------------------
+    def get_timing(self):
+        """
+        Get the time spent in each stage (only while :attr:`~trajtracker.movement.TrajectoryPipeline.record_timing`
+        was True)
+
+        :return: An OrderedDict: stage name -> dict with the entries n_calls, total_time, mean_time and
+                 max_time (in seconds)
+        """
+        return OrderedDict((name, dict(n_calls=n, total_time=total, mean_time=total / n if n > 0 else None, max_time=max_time))
+                           for name, (n, total, max_time) in zip(self._stage_names, self._timing))
+
+
+    #------------------------------------------------
+    def reset_timing(self):
+        """
+        Restart the timing statistics of all stages
+        """
+        self._timing = [[0, 0.0, 0.0] for _ in self._stages]
+
+
+    #========================================================================
+    #   Properties
+    #========================================================================
+
+    #------------------------------------------------
+    @property
+    def stages(self):
+        """ The pipeline's stages, in the order they are called (read-only) """
+        return list(self._stages)
+
+    #------------------------------------------------
+    @property
+    def record_timing(self):
+        """
+        Whether to measure the time spent in each stage (bool)
+        """
+        return self._record_timing
+
+    @record_timing.setter
+    def record_timing(self, value):
+        _u.validate_attr_type(self, "record_timing", value, bool)
+        self._record_timing = value
+        self._log_property_changed("record_timing")
@@ -22,34 +22,57 @@ along with TrajTracker.  If not, see <http://www.gnu.org/licenses/>.
 """
 
 import numbers
+import os
+from enum import Enum
 
 import expyriment
 
 import trajtracker as ttrk
 # noinspection PyProtectedMember
 import trajtracker._utils as _u
-from trajtracker.misc import EnabledDisabledObj
+import trajtracker.utils as u
+from trajtracker.misc import EnabledDisabledObj, TrajectoryBuffer, TrajectoryResampler
+from trajtracker.io import SessionFileWriter, BackgroundFileWriter, BinaryTrajectoryFormat, CompressedTrajectoryFormat, \
+    TrajectoryJournal, CSVTrajectoryReader
 
 
 # noinspection PyAttributeOutsideInit,PyProtectedMember
 class TrajectoryTracker(ttrk.TTrkObject, EnabledDisabledObj):
 
+    FileFormat = Enum("FileFormat", "CSV Binary Compressed")
 
     #----------------------------------------------------
-    def __init__(self, filename=None, enabled=False, track_if_no_movement=False):
+    def __init__(self, filename=None, enabled=False, track_if_no_movement=False, initial_capacity=None,
+                 resample_rate=None, keep_raw=False):
         """
         Constructor - invoked when you create a new object by writing TrajectoryTracker()
 
         :param filename: The file to which the trajectory information will be saved (CSV).
         :param enabled: See :attr:`~trajtracker.movement.TrajectoryTracker.enabled`
         :param track_if_no_movement: See :attr:`~trajtracker.movement.TrajectoryTracker.track_if_no_movement`
+        :param initial_capacity: The number of samples for which memory is preallocated
+                                 (see :class:`~trajtracker.misc.TrajectoryBuffer`)
+        :param resample_rate: See :attr:`~trajtracker.movement.TrajectoryTracker.resample_rate`
+        :param keep_raw: See :attr:`~trajtracker.movement.TrajectoryTracker.keep_raw`
         """
         ttrk.TTrkObject.__init__(self)
         EnabledDisabledObj.__init__(self, enabled=enabled)
 
+        self._initial_capacity = initial_capacity
+        self._trajectory = TrajectoryBuffer(initial_capacity)
+        self._raw_trajectory = None
+        self._resampler = None
+        self._journal = None
+        self._saved_since_reset = False
+        self._last_written_trial = None
+        self.resample_rate = resample_rate
+        self.keep_raw = keep_raw
         self.reset()
         self._filename = filename
-        self._out_file_initialized = False
+        self._writer = None
+        self._background_writer = None
+        self._index_writer = None
+        self._trial_stores = []
         self.enabled = enabled
         self.track_if_no_movement = track_if_no_movement
 
@@ -62,7 +85,9 @@ class TrajectoryTracker(ttrk.TTrkObject, EnabledDisabledObj):
     @property
     def track_if_no_movement(self):
         """
-        Whether to record x,y,t if the coordinates did not change
+        Whether to record x,y,t if the coordinates did not change.
+
+        This property is ignored in resampling mode (see :attr:`~trajtracker.movement.TrajectoryTracker.resample_rate`)
         """
         return self._track_if_no_movement
 
@@ -72,6 +97,48 @@ class TrajectoryTracker(ttrk.TTrkObject, EnabledDisabledObj):
         self._track_if_no_movement = value
         self._log_property_changed("track_if_no_movement")
 
+    #----------------------------------------------------
+    @property
+    def resample_rate(self):
+        """
+        If not None, the tracked points are resampled at this fixed rate (samples per second), and only the
+        resampled points are stored and saved to the output file. Each resampled point is linearly
+        interpolated between the two tracked points before and after it
+        (see :class:`~trajtracker.misc.TrajectoryResampler`).
+
+        Change this property only between trials.
+
+        :type: number
+        """
+        return None if self._resampler is None else self._resampler.rate
+
+    @resample_rate.setter
+    def resample_rate(self, value):
+        _u.validate_attr_numeric(self, "resample_rate", value, none_value=_u.NoneValues.Valid)
+        _u.validate_attr_positive(self, "resample_rate", value)
+        self._resampler = None if value is None else TrajectoryResampler(value)
+        self._log_property_changed("resample_rate")
+
+    #----------------------------------------------------
+    @property
+    def keep_raw(self):
+        """
+        In resampling mode: whether to also keep the tracked points before resampling (see
+        :func:`~trajtracker.movement.TrajectoryTracker.get_raw_xyt_array`). The raw points are not saved
+        to the output file.
+
+        Change this property only between trials.
+
+        :type: bool
+        """
+        return self._raw_trajectory is not None
+
+    @keep_raw.setter
+    def keep_raw(self, value):
+        _u.validate_attr_type(self, "keep_raw", value, bool)
+        self._raw_trajectory = TrajectoryBuffer(self._initial_capacity) if value else None
+        self._log_property_changed("keep_raw")
+
 
     #==============================================================================
     #    Runtime API
@@ -88,9 +155,23 @@ class TrajectoryTracker(ttrk.TTrkObject, EnabledDisabledObj):
 
         self._log_func_enters("reset", [time0])
 
-        self._trajectory = dict(x=[], y=[], time=[])
+        self._trajectory.clear()
         self._last_coord = None
 
+        if self._resampler is not None:
+            self._resampler.reset()
+        if self._raw_trajectory is not None:
+            self._raw_trajectory.clear()
+
+        if self._journal is not None:
+            #-- The journal keeps only the current trial: before discarding the samples of the previous trial,
+            #-- make sure that it was written to the output file
+            if self._saved_since_reset and self._writer is not None:
+                self.flush_output_file()
+            self._journal.begin_trial()
+
+        self._saved_since_reset = False
+
 
     #----------------------------------------------------
     def update_xyt(self, position, time_in_trial, time_in_session=None):
@@ -104,16 +185,32 @@ class TrajectoryTracker(ttrk.TTrkObject, EnabledDisabledObj):
             return
 
         _u.update_xyt_validate_and_log(self, position, time_in_trial)
-        x_coord, y_coord = position
+        return self._update_xyt_impl(position, time_in_trial, time_in_session)
+
+
+    #----------------------------------------------------
+    # update_xyt() without validating the arguments. Called by TrajectoryPipeline (which validates them once),
+    # and replaces update_xyt() when trajtracker.env.validate_arguments = False
+    #
+    def _update_xyt_impl(self, position, time_in_trial, time_in_session=None):
 
-        if not self._track_if_no_movement and len(self._trajectory['x']) > 0 and  \
-            self._trajectory['x'][-1] == x_coord and \
-                self._trajectory['y'][-1] == y_coord:
+        if not self._enabled:
             return
 
-        self._trajectory['x'].append(x_coord)
-        self._trajectory['y'].append(y_coord)
-        self._trajectory['time'].append(time_in_trial)
+        x_coord, y_coord = position
+
+        if self._resampler is None:
+            if not self._track_if_no_movement and self._last_coord is not None and \
+                    self._last_coord[0] == x_coord and self._last_coord[1] == y_coord:
+                return
+
+            self._store_point(x_coord, y_coord, time_in_trial)
+            self._last_coord = x_coord, y_coord
+
+        else:
+            if self._raw_trajectory is not None:
+                self._raw_trajectory.append(x_coord, y_coord, time_in_trial)
+            self._resampler.add_sample(x_coord, y_coord, time_in_trial, self._store_point)
 
         if self._should_log(ttrk.log_trace):
             self._log_write("Track trajectory: pos=({:},{:}), time={:}".format(x_coord, y_coord, time_in_trial), True)
@@ -121,68 +218,369 @@ class TrajectoryTracker(ttrk.TTrkObject, EnabledDisabledObj):
         return None
 
 
+    #----------------------------------------------------
+    def _store_point(self, x_coord, y_coord, time_in_trial):
+        self._trajectory.append(x_coord, y_coord, time_in_trial)
+        if self._journal is not None:
+            self._journal.append(x_coord, y_coord, time_in_trial)
+
+
     #----------------------------------------------------
     def get_xyt(self):
         """
         Get a list of (x,y,time) tuples - one per tracked point
         """
-        trj = self._trajectory
-        return list(zip(trj['x'], trj['y'], trj['time']))
+        return self._trajectory.get_xyt()
+
+
+    #----------------------------------------------------
+    def get_xyt_array(self):
+        """
+        Get the tracked points as an (N,3) float64 array - one row per tracked point, with columns x, y, time.
+
+        The array is a read-only view of the tracker's internal buffer (it is not copied): it does not include
+        points tracked after this call, and it becomes invalid when reset() is called. If you need to keep
+        the data, copy it.
+        """
+        return self._trajectory.xyt
+
+
+    #----------------------------------------------------
+    def get_raw_xyt_array(self):
+        """
+        Get the tracked points before resampling, as an (N,3) float64 array (see
+        :func:`~trajtracker.movement.TrajectoryTracker.get_xyt_array`).
+
+        In resampling mode, this requires :attr:`~trajtracker.movement.TrajectoryTracker.keep_raw` = True.
+        When not resampling, this is the same as get_xyt_array().
+        """
+        if self._resampler is None:
+            return self._trajectory.xyt
+
+        if self._raw_trajectory is None:
+            raise ttrk.InvalidStateError("{:}.get_raw_xyt_array() was called, but keep_raw=False".format(_u.get_type_name(self)))
+
+        return self._raw_trajectory.xyt
 
 
     #----------------------------------------------------
-    def init_output_file(self, filename=None, xy_precision=5, time_precision=3):
+    def init_output_file(self, filename=None, xy_precision=5, time_precision=3,
+                         flush_policy=SessionFileWriter.FlushPolicy.EveryTrial, flush_interval=None,
+                         save_in_background=False, queue_size=None, file_format=FileFormat.CSV, save_index=False):
         """
-        Initialize a new CSV output file for saving the results
+        Initialize a new output file for saving the results.
+
+        The file remains open until :func:`~trajtracker.movement.TrajectoryTracker.close_output_file` is called
+        (or until init_output_file() is called again). The data of each trial is kept in memory and written to
+        the file according to the flush policy.
+
+        In background-saving mode, :func:`~trajtracker.movement.TrajectoryTracker.save_to_file` only copies
+        the trial's data; the data is formatted and written to the file by a dedicated thread
+        (see :class:`~trajtracker.io.BackgroundFileWriter`). Errors that occur in that thread are raised by the
+        next call to save_to_file(), :func:`~trajtracker.movement.TrajectoryTracker.flush_output_file` or
+        :func:`~trajtracker.movement.TrajectoryTracker.close_output_file`.
 
         :param filename: Full path
-        :param xy_precision: Precision of x,y coordinates (default: 5)
+        :param xy_precision: Precision of x,y coordinates (default: 5). In binary format, this also determines
+                             the data type of the x,y columns (see :class:`~trajtracker.io.BinaryTrajectoryFormat`)
         :param time_precision: Precision of time (default: 3)
+        :param flush_policy: When to write the data to the file (see :attr:`SessionFileWriter.flush_policy <trajtracker.io.SessionFileWriter.flush_policy>`).
+                             By default, the file is flushed after each trial.
+        :param flush_interval: See :attr:`SessionFileWriter.flush_interval <trajtracker.io.SessionFileWriter.flush_interval>`
+        :param save_in_background: Whether to format and write the data in a dedicated thread (bool)
+        :param queue_size: In background-saving mode: the maximal number of trials waiting to be written.
+                           When the queue is full, save_to_file() waits.
+        :param file_format: TrajectoryTracker.FileFormat.CSV (default), TrajectoryTracker.FileFormat.Binary
+                            (can be read with :class:`~trajtracker.io.BinaryTrajectoryReader`), or
+                            TrajectoryTracker.FileFormat.Compressed (see :class:`~trajtracker.io.CompressedTrajectoryFormat`)
+        :param save_index: For CSV files: whether to maintain an index file (the CSV file name + ".idx"), with the
+                           byte offset of each trial in the CSV file. Use :class:`~trajtracker.io.CSVTrajectoryReader`
+                           to read specific trials using the index. If save_index=False, an existing index file
+                           (from an earlier file with the same name) is deleted.
         """
+        _u.validate_func_arg_type(self, "init_output_file", "save_in_background", save_in_background, bool)
+        _u.validate_func_arg_type(self, "init_output_file", "file_format", file_format, self.FileFormat)
+        _u.validate_func_arg_type(self, "init_output_file", "save_index", save_index, bool)
+        if save_index and file_format != self.FileFormat.CSV:
+            raise ttrk.ValueError("{:}.init_output_file(): save_index=True is supported only for CSV files".format(_u.get_type_name(self)))
+
         if filename is not None:
             self._filename = filename
 
         if self._filename is None:
             raise ttrk.ValueError("filename was not provided to {:}.init_output_file()".format(_u.get_type_name(self)))
 
+        #-- Close the previous file first: trials still queued for it are written with the previous settings
+        self.close_output_file()
+
         self._xy_precision = xy_precision
         self._time_precision = time_precision
 
-        fh = self._open_file(self._filename, 'w')
-        fh.write('trial,time,x,y\n')
-        fh.close()
-
-        self._out_file_initialized = True
+        if file_format == self.FileFormat.CSV:
+            self._trajectory_format = None
+            header = 'trial,time,x,y\n'
+            if save_index:
+                #-- Write the CSV file in binary mode, so the index offsets are byte offsets on all platforms
+                mode = 'wb'
+                header = header.encode('ascii')
+            else:
+                mode = 'w'
+        else:
+            format_class = BinaryTrajectoryFormat if file_format == self.FileFormat.Binary else CompressedTrajectoryFormat
+            self._trajectory_format = format_class(xy_precision, time_precision)
+            mode = 'wb'
+            header = self._trajectory_format.encode_header()
+
+        self._writer = SessionFileWriter(self._filename, mode, flush_policy=flush_policy, flush_interval=flush_interval,
+                                         open_file=self._open_file, on_flush=self._on_output_flushed)
+        self._writer.write(header)
+        self._writer.flush()
+
+        #-- An index file from an earlier run would not match the new file
+        if not save_index and os.path.exists(self._filename + '.idx'):
+            os.remove(self._filename + '.idx')
+
+        if save_index:
+            self._index_writer = SessionFileWriter(self._filename + '.idx', 'w', flush_policy=flush_policy,
+                                                   flush_interval=flush_interval, open_file=self._open_file)
+            self._index_writer.write(CSVTrajectoryReader.index_header + '\n')
+            self._index_writer.flush()
+
+        if save_in_background:
+            self._background_writer = BackgroundFileWriter(self._writer, queue_size)
 
         self._log_write_if(ttrk.log_debug, "Initializing output file %s" % self._filename, True)
 
+
     #----------------------------------------------------
-    def save_to_file(self, trial_num):
+    def save_to_file(self, trial_num, simplify_max_error=None):
         """
-        Save the tracked trajectory (ever since the last reset() call) to a CSV file
+        Save the tracked trajectory (ever since the last reset() call) to the output file.
+        The trajectory is also added to all trial stores (see :func:`~trajtracker.movement.TrajectoryTracker.add_trial_store`).
 
         :param trial_num:
+        :param simplify_max_error: If specified, the trajectory is simplified before saving: points are removed,
+                                   provided that their distance from the simplified trajectory does not exceed
+                                   this value (in pixels). See :func:`trajtracker.utils.simplify_trajectory`
         :return: The number of rows printed to the file
         """
-        if not self._out_file_initialized:
+        if self._writer is None:
             raise ttrk.InvalidStateError('TrajectoryTracker.save_to_file() was called before calling init_output_file()')
 
-        fh = self._open_file(self._filename, 'a')
+        xyt = self._trajectory.xyt
+        xy_is_int = self._trajectory.xy_is_int
+
+        for store in self._trial_stores:
+            store.add_trial(trial_num, xyt)
+
+        if simplify_max_error is not None:
+            _u.validate_func_arg_type(self, "save_to_file", "simplify_max_error", simplify_max_error, numbers.Number)
+            _u.validate_func_arg_not_negative(self, "save_to_file", "simplify_max_error", simplify_max_error)
+            retained = u.simplify_trajectory(xyt, simplify_max_error, return_indices=True)
+            xyt = xyt[retained]
+            xy_is_int = xy_is_int[retained]
+
+        if self._background_writer is None:
+            self._write_trial(trial_num, xyt, xy_is_int)
+        else:
+            #-- The writer thread gets its own (immutable) copy of the data, because the trajectory buffer
+            #-- will be overwritten in the next trial
+            self._background_writer.submit(self._write_trial, trial_num, _frozen_copy(xyt), _frozen_copy(xy_is_int))
+
+        #-- The journal is told that the trial was saved only when it reaches the file (see _on_output_flushed())
+        self._saved_since_reset = True
+
+        self._log_write_if(ttrk.log_debug, "Saved trial #{:} (with {:} rows) to {:}".format(trial_num, len(xyt), self._filename), True)
+
+        return len(xyt)
+
+
+    #----------------------------------------------------
+    # Format one trial's data and write it to the output file.
+    # In background-saving mode, this runs in the writer thread.
+    #
+    def _write_trial(self, trial_num, xyt, xy_is_int):
+
+        if self._trajectory_format is None:
+            data = self._format_csv_trial(trial_num, xyt, xy_is_int)
+        else:
+            data = self._trajectory_format.encode_trial(trial_num, xyt)
 
-        rows = self.get_xyt()
-        for x, y, t in rows:
-            x = ('%d' % x) if isinstance(x, int) else '%.*f' % (self._xy_precision, x)
-            y = ('%d' % y) if isinstance(y, int) else '%.*f' % (self._xy_precision, y)
-            fh.write("%d,%.*f,%s,%s\n" % (trial_num, self._time_precision, t, x, y))
+        self._last_written_trial = trial_num
 
-        fh.close()
+        if self._index_writer is None:
+            self._writer.write_trial(data)
 
-        self._log_write_if(ttrk.log_debug, "Saved trial #{:} (with {:} rows) to {:}".format(trial_num, len(rows), self._filename), True)
+        else:
+            data = data.encode('ascii')
+            offset = self._writer.position
+            self._writer.write_trial(data)
+            self._index_writer.write_trial("%d,%d,%d,%d\n" % (trial_num, offset, len(data), len(xyt)))
+
+
+    #----------------------------------------------------
+    # Called by the output file's writer after each flush (in background-saving mode, this may run in the writer
+    # thread). The last trial written is now in the file, so its samples no longer need to be kept in the journal.
+    #
+    def _on_output_flushed(self):
+
+        trial_num = self._last_written_trial
+        self._last_written_trial = None
+
+        journal = self._journal
+        if trial_num is not None and journal is not None and not journal.closed:
+            journal.trial_saved(trial_num)
+
+
+    #----------------------------------------------------
+    # Format all rows of one trial at once: build a format string for the whole trial, and apply it to all values
+    # with a single % operation. Coordinates that were provided as int are formatted as int.
+    #
+    def _format_csv_trial(self, trial_num, xyt, xy_is_int):
+
+        n_rows = len(xyt)
+        if n_rows == 0:
+            return ""
+
+        time_fmt = "%d,%%.%df," % (trial_num, self._time_precision)
+        float_fmt = "%%.%df" % self._xy_precision
+
+        #-- Row formats for each combination of (x_is_int, y_is_int)
+        row_formats = [time_fmt + x_fmt + "," + y_fmt + "\n" for x_fmt in (float_fmt, "%d") for y_fmt in (float_fmt, "%d")]
+
+        codes = xy_is_int[:, 0] * 2 + xy_is_int[:, 1]
+        first_code = int(codes[0])
+        if (codes == first_code).all():
+            trial_format = row_formats[first_code] * n_rows
+        else:
+            trial_format = "".join([row_formats[c] for c in codes.tolist()])
+
+        return trial_format % tuple(xyt[:, (2, 0, 1)].ravel().tolist())
+
+
+    #----------------------------------------------------
+    def flush_output_file(self):
+        """
+        Write any pending data to the output file. In background-saving mode, this waits until all
+        trials passed to save_to_file() were written.
+        """
+        if self._writer is None:
+            raise ttrk.InvalidStateError('TrajectoryTracker.flush_output_file() was called before calling init_output_file()')
+
+        if self._background_writer is None:
+            self._writer.flush()
+        else:
+            self._background_writer.flush()
+
+        #-- The index is flushed after the data, so it never refers to data that is not in the file yet
+        if self._index_writer is not None:
+            self._index_writer.flush()
+
+
+    #----------------------------------------------------
+    def close_output_file(self):
+        """
+        Write any pending data to the output file and close it.
+        Calling this method when the file is not open has no effect.
+        """
+        if self._writer is None:
+            return
+
+        #-- The references are cleared only after closing: in background-saving mode, close() first writes the
+        #-- queued trials, and they use the writers
+        try:
+            (self._background_writer or self._writer).close()
+        finally:
+            try:
+                if self._index_writer is not None:
+                    self._index_writer.close()
+            finally:
+                self._writer = None
+                self._background_writer = None
+                self._index_writer = None
+
+        self._log_write_if(ttrk.log_debug, "Closed output file %s" % self._filename, True)
+
+
+    #----------------------------------------------------
+    def add_trial_store(self, store):
+        """
+        Register a trial store: whenever :func:`~trajtracker.movement.TrajectoryTracker.save_to_file` is called,
+        the trial's full trajectory (not simplified) is added to the store.
+
+        :param store: An object with a method add_trial(trial_num, xyt), where xyt is an (N,3) array with columns
+                      x, y, time. The method must copy the data if it needs to keep it.
+                      For example, :class:`~trajtracker.misc.SessionTrajectoryStore`.
+        """
+        _u.validate_func_arg_type(self, "add_trial_store", "store.add_trial", getattr(store, "add_trial", None), ttrk.TYPE_CALLABLE)
+        self._trial_stores.append(store)
+
+
+    #----------------------------------------------------
+    @property
+    def trial_stores(self):
+        """
+        The trial stores registered with :func:`~trajtracker.movement.TrajectoryTracker.add_trial_store` (read-only)
+        """
+        return tuple(self._trial_stores)
+
+
+    #----------------------------------------------------
+    def init_journal(self, filename, capacity=None, sync_interval=None, overwrite_unsaved=False):
+        """
+        Start journal mode: each tracked point is also recorded in a memory-mapped journal file, so the
+        points of the current trial can be recovered if the experiment crashes before save_to_file() is called.
+        See :class:`~trajtracker.io.TrajectoryJournal` for details.
+
+        Recording a point in the journal takes 1-2 microseconds, so journal mode can easily keep up with
+        1000 Hz input (see utils/benchmark_trajectory_journal.py).
+
+        A trial is marked as saved in the journal only when its data was actually written to the output file.
+        If the output file is not flushed after each trial (a flush policy other than EveryTrial), the next
+        reset() flushes it, because the journal keeps only the samples of one trial.
+
+        :param filename: The journal file
+        :param capacity: See :class:`~trajtracker.io.TrajectoryJournal`
+        :param sync_interval: See :class:`~trajtracker.io.TrajectoryJournal`
+        :param overwrite_unsaved: See :class:`~trajtracker.io.TrajectoryJournal`
+        """
+
+        self.close_journal()
+
+        self._journal = TrajectoryJournal(filename, capacity=capacity, sync_interval=sync_interval,
+                                          overwrite_unsaved=overwrite_unsaved)
+        self._journal.begin_trial()
+        for x, y, t in self._trajectory.xyt.tolist():
+            self._journal.append(x, y, t)
+
+        self._log_write_if(ttrk.log_debug, "Initializing journal %s" % filename, True)
+
+
+    #----------------------------------------------------
+    def close_journal(self):
+        """
+        Stop journal mode and close the journal file.
+        Calling this method when journal mode is not active has no effect.
+        """
+        if self._journal is None:
+            return
+
+        self._journal.close()
+        self._journal = None
 
-        return len(rows)
 
     #----------------------------------------------------
     # Default implementation for opening an output file
     #
     def _open_file(self, filename, mode):
         return open(filename, mode)
+
+
+#----------------------------------------------------
+def _frozen_copy(arr):
+    arr = arr.copy()
+    arr.flags.writeable = False
+    return arr
+
+
+_u.register_lean_method(TrajectoryTracker, "update_xyt", "_update_xyt_impl")
@@ -30,7 +30,10 @@ from ._Hotspot import Hotspot
 from ._LineTrajectoryGenerator import LineTrajectoryGenerator
 from ._SegmentedTrajectoryGenerator import SegmentedTrajectoryGenerator
 from ._SpeedMonitor import SpeedMonitor
+from ._KinematicsState import KinematicsState
 from ._StartPoint import StartPoint
 from ._RectStartPoint import RectStartPoint
 from ._StimulusAnimator import StimulusAnimator
 from ._TrajectoryTracker import TrajectoryTracker
+from ._MultiPointerTrajectoryTracker import MultiPointerTrajectoryTracker
+from ._TrajectoryPipeline import TrajectoryPipeline
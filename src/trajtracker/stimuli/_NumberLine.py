@@ -465,6 +465,15 @@ class NumberLine(ttrk.TTrkObject, ttrk.events.OnsetOffsetObj):
         """
 
         _u.update_xyt_validate_and_log(self, position)
+        return self._update_xyt_impl(position, time_in_trial, time_in_session)
+
+
+    #----------------------------------------------------
+    # update_xyt() without validating the arguments. Called by TrajectoryPipeline (which validates them once),
+    # and replaces update_xyt() when trajtracker.env.validate_arguments = False
+    #
+    def _update_xyt_impl(self, position, time_in_trial=None, time_in_session=None):
+
         x_coord, y_coord = position
 
         if self._response_relative_coord is not None:
@@ -1238,3 +1247,5 @@ class NumberLine(ttrk.TTrkObject, ttrk.events.OnsetOffsetObj):
         self._touch_directioned = value
         self._log_property_changed("touch_directioned")
 
+
+_u.register_lean_method(NumberLine, "update_xyt", "_update_xyt_impl")
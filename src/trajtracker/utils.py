@@ -71,6 +71,34 @@ def get_angle(xy1, xy2, as_degrees=False):
     return angle
 
 
+#--------------------------------------------------------------------------
+def get_angles(x1, y1, x2, y2, as_degrees=False):
+    """
+    Get the direction of several finger movements (a vectorized version of :func:`~trajtracker.utils.get_angle`)
+
+    :param x1: Array of x coordinates in time point #1
+    :param y1: Array of y coordinates in time point #1
+    :param x2: Array of x coordinates in a later time point
+    :param y2: Array of y coordinates in a later time point
+    :param as_degrees: Whether the angles should be returned as degrees or radians
+    :return: Array of angles (0 = upwards)
+    """
+
+    dx = np.asarray(x2, dtype=float) - np.asarray(x1, dtype=float)
+    dy = np.asarray(y2, dtype=float) - np.asarray(y1, dtype=float)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        slope_angle = np.arctan(- dy / dx)
+
+    angle = np.where(dx > 0, slope_angle + np.pi / 2, slope_angle + np.pi * 3 / 2)
+    angle = np.where(dx == 0, np.where(dy > 0, 0, np.pi), angle)
+
+    if as_degrees:
+        angle *= 360 / (np.pi*2)
+
+    return angle
+
+
 #--------------------------------------------------------------------------
 def color_rgb_to_num(rgb):
     """
@@ -96,7 +124,11 @@ def is_rgb(rgb):
     """
     Check if the given value is a valid RGB color (3 integers, each 0-255)
     """
-    return _is_rgb(rgb)
+    if _is_rgb(rgb)[1]:
+        return True
+
+    return is_collection(rgb, allow_set=False) and len(rgb) == 3 and \
+        all(isinstance(c, numbers.Number) and 0 <= c <= 255 for c in rgb)
 
 
 #--------------------------------------
@@ -141,6 +173,117 @@ def rotate_coord(coord, angle, origin=(0, 0), is_radians=False):
     return x1 + origin[0], y1 + origin[1]
 
 
+#--------------------------------------------------------------------------
+def simplify_trajectory(xyt, max_error, return_indices=False):
+    """
+    Simplify a trajectory by removing points, such that the distance of each removed point from the
+    simplified trajectory is at most max_error (the Ramer-Douglas-Peucker algorithm).
+    The retained points keep their original timestamps.
+
+    The algorithm is iterative (no recursion) and vectorized: in each iteration, all segments that still need
+    to be split are processed together with NumPy.
+
+    :param xyt: (N,3) array (or list of tuples) with columns x, y, time
+    :param max_error: The maximal distance (in pixels) between a removed point and the simplified trajectory
+    :param return_indices: If True, return the indices of the retained points rather than the points
+    :return: (M,3) array with the retained points; or, if return_indices=True, a sorted array of their indices
+    """
+
+    xyt = np.asarray(xyt, dtype=np.float64)
+    if xyt.ndim != 2 or xyt.shape[1] != 3:
+        raise ValueError("trajtracker.utils.simplify_trajectory(): xyt must be an (N,3) array")
+    if not isinstance(max_error, numbers.Number) or max_error < 0:
+        raise ValueError("trajtracker.utils.simplify_trajectory(): invalid max_error ({:})".format(max_error))
+
+    n = len(xyt)
+    keep = np.zeros(n, dtype=bool)
+    if n > 0:
+        keep[0] = keep[-1] = True
+
+    x = xyt[:, 0]
+    y = xyt[:, 1]
+    max_error2 = max_error * max_error
+
+    #-- The segments that may need to be split (first & last point of each segment)
+    seg_first = np.array([0], dtype=np.int64) if n > 2 else np.zeros(0, dtype=np.int64)
+    seg_last = seg_first + n - 1
+
+    while len(seg_first) > 0:
+
+        #-- The inner points of all segments, concatenated
+        n_inner = seg_last - seg_first - 1
+        inner_offsets = np.cumsum(n_inner) - n_inner
+        seg_of_point = np.repeat(np.arange(len(seg_first)), n_inner)
+        points = np.arange(len(seg_of_point)) - inner_offsets[seg_of_point] + seg_first[seg_of_point] + 1
+
+        #-- Distance of each inner point from its segment
+        x0 = x[seg_first][seg_of_point]
+        y0 = y[seg_first][seg_of_point]
+        seg_x = (x[seg_last] - x[seg_first])[seg_of_point]
+        seg_y = (y[seg_last] - y[seg_first])[seg_of_point]
+        px = x[points] - x0
+        py = y[points] - y0
+        seg_len2 = seg_x * seg_x + seg_y * seg_y
+        nonzero = seg_len2 > 0
+        proj = np.zeros(len(points))
+        proj[nonzero] = np.clip((px[nonzero] * seg_x[nonzero] + py[nonzero] * seg_y[nonzero]) / seg_len2[nonzero], 0, 1)
+        px -= proj * seg_x
+        py -= proj * seg_y
+        dist2 = px * px + py * py
+
+        #-- The farthest point of each segment
+        seg_max = np.maximum.reduceat(dist2, inner_offsets)
+        is_max = np.flatnonzero(dist2 == seg_max[seg_of_point])
+        split_seg, first_max = np.unique(seg_of_point[is_max], return_index=True)
+        split_point = points[is_max[first_max]]
+
+        to_split = seg_max[split_seg] > max_error2
+        split_seg = split_seg[to_split]
+        split_point = split_point[to_split]
+        keep[split_point] = True
+
+        #-- Split segments in two; segments without inner points need no further processing
+        seg_first = np.concatenate([seg_first[split_seg], split_point])
+        seg_last = np.concatenate([split_point, seg_last[split_seg]])
+        has_inner = seg_last - seg_first > 1
+        seg_first = seg_first[has_inner]
+        seg_last = seg_last[has_inner]
+
+    indices = np.flatnonzero(keep)
+    return indices if return_indices else xyt[indices]
+
+
+#--------------------------------------------------------------------------
+def update_xyt_batch(objects, samples, trial_start_time=None):
+    """
+    Feed several samples (e.g., all the mouse positions since the last display frame - see
+    :func:`Mouse.get_interpolated_motion_samples() <trajtracker.io.Mouse.get_interpolated_motion_samples>`) to several objects,
+    e.g. a :class:`~trajtracker.movement.TrajectoryTracker` and validators.
+
+    The samples are processed in order. For each sample, update_xyt() is called on all objects.
+    If an object returns an :class:`~trajtracker.validators.ExperimentError`, the remaining samples are not processed.
+
+    :param objects: A list of objects with an update_xyt() method
+    :param samples: A list of (x, y, time_in_trial) tuples, or an (N,3) array
+    :param trial_start_time: The session time when the trial started. If specified, it is used to compute
+                             the time_in_session argument of update_xyt().
+    :return: The ExperimentError, or None if there was no error
+    """
+
+    import trajtracker.validators
+
+    update_funcs = [obj.update_xyt for obj in objects]
+
+    for x, y, time_in_trial in samples:
+        time_in_session = None if trial_start_time is None else trial_start_time + time_in_trial
+        for update_xyt in update_funcs:
+            result = update_xyt((x, y), time_in_trial, time_in_session)
+            if isinstance(result, trajtracker.validators.ExperimentError):
+                return result
+
+    return None
+
+
 #--------------------------------------------------------------------------
 def get_time():
     """
@@ -0,0 +1,368 @@
+"""
+
+Adaptive validator group: call several validators, the cheapest and most-often-failing first
+
+@author: Dror Dotan
+@copyright: Copyright (c) 2017, Dror Dotan
+
+This file is part of TrajTracker.
+
+TrajTracker is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+TrajTracker is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with TrajTracker.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+from __future__ import division
+
+import numbers
+from collections import OrderedDict
+
+from expyriment.misc import geometry
+
+import trajtracker as ttrk
+import trajtracker._utils as _u
+import trajtracker.utils as u
+from trajtracker.validators._ExperimentError import ExperimentError
+
+
+# noinspection PyProtectedMember
+class AdaptiveValidatorGroup(ttrk.TTrkObject):
+    """
+    Validates each sample with several validators, and returns the first error - like calling the validators
+    one by one and stopping at the first error, but the validators are called in an order that minimizes
+    the expected cost.
+
+    The group measures, for each validator, the mean duration of an update_xyt() call and how often it fails.
+    At the beginning of each trial (in reset()), the validators are reordered: validators that are cheap and
+    often fail are called first, because once a validator fails, the remaining validators need not be called.
+
+    **The reported error is deterministic:** it does not depend on the evaluation order. Each validator belongs
+    to a tier; the tiers are evaluated in ascending order, and the validators are reordered only within their tier.
+    When several validators fail on the same sample, the error is reported by the validator in the lowest tier,
+    and within a tier - by the validator that was added first. To ensure this, when a validator fails, the group
+    also calls the validators in its tier that precede it and were not called yet.
+
+    The statistics can be exported with :func:`~trajtracker.validators.AdaptiveValidatorGroup.get_statistics`
+    (e.g., to save them as JSON at the end of a session), and loaded into a new group with
+    :func:`~trajtracker.validators.AdaptiveValidatorGroup.load_statistics`.
+    """
+
+    #------------------------------------------------
+    def __init__(self, validators=(), adaptive=True):
+        """
+        Constructor - invoked when you create a new object by writing AdaptiveValidatorGroup()
+
+        :param validators: A list of validators (objects with an update_xyt() method), all in tier 0
+        :param adaptive: See :attr:`~trajtracker.validators.AdaptiveValidatorGroup.adaptive`
+        """
+
+        super(AdaptiveValidatorGroup, self).__init__()
+
+        _u.validate_func_arg_is_collection(self, "__init__", "validators", validators)
+
+        self._validators = []
+        self._names = []
+        self._tiers = []
+        self._update_funcs = []
+        self._stats = []
+        self._order = []
+
+        self.adaptive = adaptive
+
+        for validator in validators:
+            self.add_validator(validator)
+
+
+    #------------------------------------------------
+    def add_validator(self, validator, name=None, tier=0):
+        """
+        Add a validator to the group
+
+        :param validator: An object with an update_xyt() method
+        :param name: The validator's name in :func:`~trajtracker.validators.AdaptiveValidatorGroup.get_statistics`
+                     (default: the object's class name, with a numeric suffix if needed)
+        :param tier: Validators in lower tiers are called first, and their errors take precedence over errors
+                     of validators in higher tiers (int)
+        """
+
+        if not hasattr(validator, "update_xyt"):
+            raise ttrk.TypeError("{:}.add_validator(): invalid validator ({:}) - it has no update_xyt() method".format(
+                _u.get_type_name(self), validator))
+        _u.validate_func_arg_type(self, "add_validator", "name", name, str, none_allowed=True)
+        _u.validate_func_arg_type(self, "add_validator", "tier", tier, int)
+
+        if name is None:
+            name = _u.get_type_name(validator)
+            if name in self._names:
+                name = "{:}_{:}".format(name, 1 + sum(1 for v in self._validators if _u.get_type_name(v) == name))
+
+        if name in self._names:
+            raise ttrk.ValueError("{:}.add_validator(): a validator named '{:}' already exists".format(_u.get_type_name(self), name))
+
+        #-- Built-in objects are called without validating the sample again (unless a subclass overrides update_xyt)
+        update_func = _u.get_lean_method(validator, "update_xyt")
+
+        self._validators.append(validator)
+        self._names.append(name)
+        self._tiers.append(tier)
+        self._update_funcs.append(update_func)
+        self._stats.append([0, 0.0, 0])
+
+        self.update_order()
+
+        self._log_write_if(ttrk.log_debug, "Added validator '{:}' (tier {:})".format(name, tier), True)
+
+
+    #========================================================================
+    #   Runtime API
+    #========================================================================
+
+    #------------------------------------------------
+    def reset(self, time0=None):
+        """
+        Call reset() on all validators that have such a method, and (if
+        :attr:`~trajtracker.validators.AdaptiveValidatorGroup.adaptive`) reorder the validators according to
+        the statistics collected so far.
+
+        :param time0: If specified, it is passed to the reset() method of each validator
+        """
+
+        self._log_func_enters("reset", [time0])
+
+        for validator in self._validators:
+            if hasattr(validator, "reset"):
+                if time0 is None:
+                    validator.reset()
+                else:
+                    validator.reset(time0)
+
+        if self._adaptive:
+            self.update_order()
+
+
+    #------------------------------------------------
+    def update_xyt(self, position, time_in_trial, time_in_session=None):
+        """
+        Validate a sample with the validators in the group
+
+        :param position: (x, y) coordinates
+        :param time_in_trial: The time (in seconds) since the trial started
+        :param time_in_session: The time (in seconds) since the session started
+        :return: An :class:`~trajtracker.validators.ExperimentError` (see the class documentation for which
+                 validator's error is returned when several validators fail), or None
+        """
+
+        _u.update_xyt_validate_and_log(self, position, time_in_trial,
+                                       _u.DONT_VALIDATE if time_in_session is None else time_in_session)
+        return self._update_xyt_impl(position, time_in_trial, time_in_session)
+
+
+    #------------------------------------------------
+    # update_xyt() without validating the arguments. Called by TrajectoryPipeline (which validates them once),
+    # and replaces update_xyt() when trajtracker.env.validate_arguments = False
+    #
+    def _update_xyt_impl(self, position, time_in_trial, time_in_session=None):
+
+        #-- Normalize the position, so the validators get the same input type regardless of what was provided
+        if isinstance(position, geometry.XYPoint):
+            position = position.x, position.y
+        elif not isinstance(position, tuple):
+            position = position[0], position[1]
+
+        order = self._order
+        for k in range(len(order)):
+            i = order[k]
+            result = self._call(i, position, time_in_trial, time_in_session)
+            if result is not None:
+                return self._get_preceding_error(k, i, result, position, time_in_trial, time_in_session)
+
+        return None
+
+
+    #------------------------------------------------
+    # Call one validator and update its statistics. Returns the error, or None
+    #
+    def _call(self, i, position, time_in_trial, time_in_session):
+
+        start = u.get_time()
+        result = self._update_funcs[i](position, time_in_trial, time_in_session)
+        stats = self._stats[i]
+        stats[0] += 1
+        stats[1] += u.get_time() - start
+
+        if isinstance(result, ExperimentError):
+            stats[2] += 1
+            return result
+
+        return None
+
+
+    #------------------------------------------------
+    # Validator order[k] (= i) failed. Call the validators in the same tier that precede it and were not called
+    # yet, and return the error of the first of them that fails (in the order the validators were added)
+    #
+    def _get_preceding_error(self, k, i, result, position, time_in_trial, time_in_session):
+
+        order = self._order
+        tier = self._tiers[i]
+        first_failed = i
+
+        for j in order[k+1:]:
+            if self._tiers[j] != tier:
+                break
+            if j < first_failed:
+                other_result = self._call(j, position, time_in_trial, time_in_session)
+                if other_result is not None:
+                    first_failed = j
+                    result = other_result
+
+        return result
+
+
+    #========================================================================
+    #   Evaluation order
+    #========================================================================
+
+    #------------------------------------------------
+    def update_order(self):
+        """
+        Reorder the validators according to the statistics collected so far. Within each tier, the validators are
+        sorted by the ratio between the mean call duration and the failure probability (cheap and often-failing
+        validators first). This is done automatically by reset() when
+        :attr:`~trajtracker.validators.AdaptiveValidatorGroup.adaptive` is True.
+        """
+
+        if self._adaptive:
+            key = lambda i: (self._tiers[i], self._expected_cost_ratio(i), i)
+        else:
+            key = lambda i: (self._tiers[i], i)
+
+        self._order = sorted(range(len(self._validators)), key=key)
+
+
+    #------------------------------------------------
+    # Mean cost per call, divided by the probability to fail (with Laplace smoothing).
+    # A validator that was never called gets 0, so it is called first and its statistics are collected.
+    #
+    def _expected_cost_ratio(self, i):
+        n_calls, total_time, n_failures = self._stats[i]
+        if n_calls == 0:
+            return 0
+        return (total_time / n_calls) / ((n_failures + 1) / (n_calls + 2))
+
+
+    #------------------------------------------------
+    @property
+    def evaluation_order(self):
+        """ The names of the validators, in the order they are currently called (read-only) """
+        return [self._names[i] for i in self._order]
+
+
+    #========================================================================
+    #   Statistics
+    #========================================================================
+
+    #------------------------------------------------
+    def get_statistics(self):
+        """
+        Get the statistics of each validator (since the group was created, or since reset_statistics() was called).
+        The result contains only numbers and strings, so it can be saved e.g. as JSON.
+
+        :return: An OrderedDict: validator name -> dict with the entries tier, n_calls, n_failures, failure_rate,
+                 total_time, mean_time (in seconds). The validators are in the order they were added.
+        """
+        result = OrderedDict()
+        for name, tier, (n_calls, total_time, n_failures) in zip(self._names, self._tiers, self._stats):
+            result[name] = dict(tier=tier, n_calls=n_calls, n_failures=n_failures,
+                                failure_rate=n_failures / n_calls if n_calls > 0 else None,
+                                total_time=total_time, mean_time=total_time / n_calls if n_calls > 0 else None)
+        return result
+
+
+    #------------------------------------------------
+    def load_statistics(self, statistics):
+        """
+        Load statistics, e.g. from a previous session, and reorder the validators accordingly.
+        Only the n_calls, n_failures and total_time entries are used.
+
+        :param statistics: A dict: validator name -> dict, as returned by
+                           :func:`~trajtracker.validators.AdaptiveValidatorGroup.get_statistics`.
+                           Validators that do not appear in it keep their current statistics.
+        """
+
+        _u.validate_func_arg_type(self, "load_statistics", "statistics", statistics, dict)
+
+        new_stats = {}
+        for name, stats in statistics.items():
+            if name not in self._names:
+                raise ttrk.ValueError("{:}.load_statistics(): there is no validator named '{:}'".format(
+                    _u.get_type_name(self), name))
+            _u.validate_func_arg_type(self, "load_statistics", "statistics[*]", stats, dict)
+
+            try:
+                n_calls, n_failures, total_time = stats["n_calls"], stats["n_failures"], stats["total_time"]
+            except KeyError as e:
+                raise ttrk.ValueError("{:}.load_statistics(): the statistics of '{:}' have no '{:}' entry".format(
+                    _u.get_type_name(self), name, e.args[0]))
+
+            _u.validate_func_arg_type(self, "load_statistics", "n_calls", n_calls, int)
+            _u.validate_func_arg_type(self, "load_statistics", "n_failures", n_failures, int)
+            _u.validate_func_arg_type(self, "load_statistics", "total_time", total_time, numbers.Number)
+            if not 0 <= n_failures <= n_calls:
+                raise ttrk.ValueError("{:}.load_statistics(): invalid statistics of '{:}' (n_calls={:}, n_failures={:})".format(
+                    _u.get_type_name(self), name, n_calls, n_failures))
+
+            new_stats[name] = [n_calls, total_time, n_failures]
+
+        for name, stats in new_stats.items():
+            self._stats[self._names.index(name)] = stats
+
+        self.update_order()
+
+
+    #------------------------------------------------
+    def reset_statistics(self):
+        """
+        Forget the statistics of all validators
+        """
+        self._stats = [[0, 0.0, 0] for _ in self._validators]
+
+
+    #========================================================================
+    #   Properties
+    #========================================================================
+
+    #------------------------------------------------
+    @property
+    def validators(self):
+        """ The validators, in the order they were added (read-only) """
+        return list(self._validators)
+
+    #------------------------------------------------
+    @property
+    def adaptive(self):
+        """
+        Whether to reorder the validators according to their statistics (bool). If False, the validators are
+        called in the order of their tiers, and within each tier - in the order they were added.
+        The statistics are collected either way.
+        """
+        return self._adaptive
+
+    @adaptive.setter
+    def adaptive(self, value):
+        _u.validate_attr_type(self, "adaptive", value, bool)
+        self._adaptive = value
+        self._log_property_changed("adaptive")
+        self.update_order()
+
+
+_u.register_lean_method(AdaptiveValidatorGroup, "update_xyt", "_update_xyt_impl")
@@ -20,6 +20,8 @@ You should have received a copy of the GNU General Public License
 along with TrajTracker.  If not, see <http://www.gnu.org/licenses/>.
 """
 
+from collections import OrderedDict
+
 import trajtracker as ttrk
 import trajtracker._utils as _u
 
@@ -66,3 +68,44 @@ def create_experiment_error(self, err_code, message, err_args=None):
 
     return ExperimentError(err_code, message, self, err_args)
 
+
+
+#--------------------------------------------------------------------
+def collect_validator_outcomes(validators, position, time_in_trial, time_in_session=None):
+    """
+    Validate the current position with several validators in one call.
+
+    Unlike calling the validators one by one and stopping at the first error, all validators are called,
+    so the outcome of each of them is known (e.g., for saving it with
+    :class:`~trajtracker.io.TrialResultsWriter`).
+
+    This function *replaces* the per-frame validation loop - it does not complement it: each validator's
+    update_xyt() is called, so the sample is added to the validator's state. Don't call the validators again
+    for the same sample. The error that the loop would have reported (the first one, in the order of the
+    validators) is the first outcome that is not None::
+
+        outcomes = collect_validator_outcomes(validators, position, time_in_trial)
+        err = next((e for e in outcomes.values() if e is not None), None)
+
+    :param validators: A list of validators (objects with an update_xyt() method), or a dict: name -> validator
+    :param position: The current (x, y) coordinates
+    :param time_in_trial: The time (in seconds) since the trial started
+    :param time_in_session: The time (in seconds) since the session started
+    :return: An OrderedDict: name -> :class:`~trajtracker.validators.ExperimentError` (or None if the validator
+             found no error). If *validators* is a list, the names are the validators' class names
+             (with a numeric suffix if several validators have the same class).
+    """
+
+    if isinstance(validators, dict):
+        named_validators = list(validators.items())
+    else:
+        _u.validate_func_arg_is_collection(None, "collect_validator_outcomes", "validators", validators)
+        names = [_u.get_type_name(v) for v in validators]
+        named_validators = [(name if names.count(name) == 1 else "{:}_{:}".format(name, names[:i].count(name) + 1), v)
+                            for i, (name, v) in enumerate(zip(names, validators))]
+
+    outcomes = OrderedDict()
+    for name, validator in named_validators:
+        outcomes[name] = validator.update_xyt(position, time_in_trial, time_in_session)
+
+    return outcomes
@@ -197,6 +197,15 @@ class GlobalSpeedValidator(trajtracker.TTrkObject, EnabledDisabledObj):
         """
 
         _u.update_xyt_validate_and_log(self, position, time_in_trial)
+        return self._update_xyt_impl(position, time_in_trial, time_in_session)
+
+
+    #----------------------------------------------------
+    # update_xyt() without validating the arguments. Called by TrajectoryPipeline (which validates them once),
+    # and replaces update_xyt() when trajtracker.env.validate_arguments = False
+    #
+    def _update_xyt_impl(self, position, time_in_trial, time_in_session=None):
+
         self._assert_initialized(self._origin_coord, "origin_coord")
         self._assert_initialized(self._end_coord, "end_coord")
         self._assert_initialized(self._max_movement_time, "max_movement_time")
@@ -248,9 +257,81 @@ class GlobalSpeedValidator(trajtracker.TTrkObject, EnabledDisabledObj):
 
         return None
 
-    def _assert_initialized(self, value, attr_name):
+    def _assert_initialized(self, value, attr_name, func_name="update_xyt"):
         if value is None:
-            raise trajtracker.InvalidStateError("{:}.update_xyt() was called before {:} was initalized".format(_u.get_type_name(self), attr_name))
+            raise trajtracker.InvalidStateError("{:}.{:}() was called before {:} was initalized".format(_u.get_type_name(self), func_name, attr_name))
+
+
+    #-----------------------------------------------------------------------------------
+    def validate_trajectory(self, times, x_coords, y_coords, time0=None, return_mask=False):
+        """
+        Validate a recorded trajectory (e.g., from archived data) at once.
+        The result is the same as calling movement_started(time0) and then update_xyt() for each sample, but the
+        calculation is vectorized, and the validator's runtime state is not used or changed. The speed guide is not
+        updated.
+
+        :param times: Array with the time of each sample
+        :param x_coords: Array with the x coordinate of each sample
+        :param y_coords: Array with the y coordinate of each sample
+        :param time0: The time when the movement started (default: the time of the first sample)
+        :param return_mask: See below
+        :return: If return_mask=False: a tuple with the index of the first sample that failed validation, and its
+                 :class:`~trajtracker.validators.ExperimentError` (or (None, None) if all samples are valid).
+                 If return_mask=True: a bool array, indicating for each sample whether update_xyt() would have returned an error
+        """
+
+        times, x_coords, y_coords = _u.validate_func_arg_xyt_arrays(self, "validate_trajectory", times, x_coords, y_coords,
+                                                                    times_should_increase=False)
+        _u.validate_func_arg_type(self, "validate_trajectory", "time0", time0, numbers.Number, none_allowed=True)
+
+        self._assert_initialized(self._origin_coord, "origin_coord", "validate_trajectory")
+        self._assert_initialized(self._end_coord, "end_coord", "validate_trajectory")
+        self._assert_initialized(self._max_movement_time, "max_movement_time", "validate_trajectory")
+
+        n = len(times)
+        if n == 0 or not self._enabled:
+            return np.zeros(n, dtype=bool) if return_mask else (None, None)
+
+        if time0 is None:
+            time0 = times[0]
+        elif times.min() < time0:
+            raise trajtracker.InvalidStateError("{:}.validate_trajectory() was called with time={:}, but the movement started at time={:}".format(
+                _u.get_type_name(self), times.min(), time0))
+
+        times = times - time0
+
+        #-- Get the expected and actual coordinates
+        coords = x_coords if self._axis == ValidationAxis.x else y_coords
+        expected_coords = np.trunc(self._get_expected_coords_at_times(times))
+        d_coords = coords - expected_coords
+
+        #-- Actual coordinate must be ahead of the expected minimum (except in the grace period)
+        errors = (times > self._grace_period) & (d_coords != 0) & (np.sign(d_coords) != np.sign(self._end_coord - self._origin_coord))
+
+        if return_mask:
+            return errors
+
+        if not errors.any():
+            return None, None
+
+        i = int(np.flatnonzero(errors)[0])
+        return i, trajtracker.validators.create_experiment_error(self, self.err_too_slow, "You moved too slowly",
+                                                                 {self.arg_expected_coord: int(expected_coords[i]),
+                                                                  self.arg_actual_coord: float(coords[i])})
+
+
+    #----------------------------------------------------------------------------------
+    # A vectorized version of get_expected_coord_at_time(): the expected coordinate is a piecewise-linear
+    # function of the time, with one segment per milestone
+    #
+    def _get_expected_coords_at_times(self, times):
+
+        total_distance = self._end_coord - self._origin_coord
+
+        segment_end_times = np.cumsum([0] + [ms.time_percentage * self._max_movement_time for ms in self._milestones])
+        segment_end_coords = self._origin_coord + np.cumsum([0] + [ms.distance_percentage * total_distance for ms in self._milestones])
+
+        return np.interp(times, segment_end_times, segment_end_coords)
 
     #----------------------------------------------------------------------------------
     # Get the coordinate expected
@@ -679,3 +760,6 @@ class GlobalSpeedGuide(trajtracker.TTrkObject):
         self._line_width = value
         self._create_guide_line()
         self._log_property_changed("line_width")
+
+
+_u.register_lean_method(GlobalSpeedValidator, "update_xyt", "_update_xyt_impl")
@@ -24,9 +24,11 @@ from __future__ import division
 
 import numbers
 
+import numpy as np
+
 import trajtracker._utils as _u
 import trajtracker.validators
-from trajtracker.movement import SpeedMonitor
+from trajtracker.movement import SpeedMonitor, KinematicsState
 from trajtracker.misc import EnabledDisabledObj
 from trajtracker.validators import ValidationAxis, ExperimentError
 
@@ -42,7 +44,8 @@ class InstantaneousSpeedValidator(trajtracker.TTrkObject, EnabledDisabledObj):
 
     #-----------------------------------------------------------------------------------
     def __init__(self, axis=ValidationAxis.y, enabled=True, min_speed=None, max_speed=None,
-                 max_stop_duration=None, grace_period=0, calculation_interval=0, movement_monitor=None):
+                 max_stop_duration=None, grace_period=0, calculation_interval=0, movement_monitor=None,
+                 kinematics=None):
         """
         Constructor - invoked when you create a new object by writing InstantaneousSpeedValidator()
 
@@ -53,23 +56,35 @@ class InstantaneousSpeedValidator(trajtracker.TTrkObject, EnabledDisabledObj):
         :param max_stop_duration: See :attr:`~trajtracker.validators.InstantaneousSpeedValidator.max_stop_duration`
         :param grace_period: See :attr:`~trajtracker.validators.InstantaneousSpeedValidator.grace_period`
         :param calculation_interval: See :attr:`~trajtracker.validators.InstantaneousSpeedValidator.calculation_interval`
+                                     (ignored if *kinematics* is specified)
+        :param kinematics: A :class:`~trajtracker.movement.KinematicsState` shared with other objects. If specified,
+                           the speed is taken from it (and is calculated over its calculation_interval).
+                           The validator does not reset the shared object.
         """
 
         trajtracker.TTrkObject.__init__(self)
         EnabledDisabledObj.__init__(self, enabled=enabled)
 
-        if movement_monitor is None:
+        self._kinematics = kinematics
+
+        if kinematics is not None:
+            _u.validate_func_arg_type(self, "__init__", "kinematics", kinematics, KinematicsState)
+            self._speed_monitor = kinematics
+        elif movement_monitor is None:
             self._speed_monitor = SpeedMonitor(calculation_interval)
         elif isinstance(movement_monitor, SpeedMonitor):
             self._speed_monitor = movement_monitor
         else:
             raise trajtracker.ValueError(_u.ErrMsg.invalid_method_arg_type(self.__class__, "__init__", "movement_monitor", "InstMovementMonitor", movement_monitor))
 
+        self._update_speed_monitor = _u.get_lean_method(self._speed_monitor, "update_xyt")
+
         self.axis = axis
         self.min_speed = min_speed
         self.max_speed = max_speed
         self.grace_period = grace_period
-        self.calculation_interval = calculation_interval
+        if kinematics is None:
+            self.calculation_interval = calculation_interval
         self.max_stop_duration = max_stop_duration
 
         self.reset()
@@ -90,7 +105,8 @@ class InstantaneousSpeedValidator(trajtracker.TTrkObject, EnabledDisabledObj):
 
         self._log_func_enters("reset", [time0])
 
-        self._speed_monitor.reset(time0)
+        if self._kinematics is None:
+            self._speed_monitor.reset(time0)
 
 
     #-----------------------------------------------------------------------------------
@@ -108,9 +124,21 @@ class InstantaneousSpeedValidator(trajtracker.TTrkObject, EnabledDisabledObj):
             return None
 
         _u.update_xyt_validate_and_log(self, position, time_in_trial)
+        return self._update_xyt_impl(position, time_in_trial, time_in_session)
+
+
+    #----------------------------------------------------
+    # update_xyt() without validating the arguments. Called by TrajectoryPipeline (which validates them once),
+    # and replaces update_xyt() when trajtracker.env.validate_arguments = False
+    #
+    def _update_xyt_impl(self, position, time_in_trial, time_in_session=None):
 
-        self._speed_monitor.update_xyt(position, time_in_trial)
+        if not self._enabled:
+            return None
 
+        #-- The arguments were already validated, so the speed monitor (or the shared kinematics) is updated
+        #-- without validating them again
+        self._update_speed_monitor(position, time_in_trial)
 
         #-- Calculate speed, if possible
         if self._speed_monitor.time_in_trial is not None and \
@@ -143,6 +171,96 @@ class InstantaneousSpeedValidator(trajtracker.TTrkObject, EnabledDisabledObj):
         return None
 
 
+    #-----------------------------------------------------------------------------------
+    def validate_trajectory(self, times, x_coords, y_coords, time0=None, return_mask=False):
+        """
+        Validate a recorded trajectory (e.g., from archived data) at once.
+        The result is the same as calling reset(time0) and then update_xyt() for each sample, but the calculation is
+        vectorized, and the validator's runtime state is not used or changed (nor is its shared
+        :class:`~trajtracker.movement.KinematicsState`, if any).
+        A sample with the same time as the previous sample is ignored.
+
+        :param times: Array with the time of each sample (non-decreasing)
+        :param x_coords: Array with the x coordinate of each sample
+        :param y_coords: Array with the y coordinate of each sample
+        :param time0: The time when the trial started (default: the time of the first sample)
+        :param return_mask: See below
+        :return: If return_mask=False: a tuple with the index of the first sample that failed validation, and its
+                 :class:`~trajtracker.validators.ExperimentError` (or (None, None) if all samples are valid).
+                 If return_mask=True: a bool array, indicating for each sample whether update_xyt() would have returned an error
+        """
+
+        times, x_coords, y_coords = _u.validate_func_arg_xyt_arrays(self, "validate_trajectory", times, x_coords, y_coords)
+        _u.validate_func_arg_type(self, "validate_trajectory", "time0", time0, numbers.Number, none_allowed=True)
+
+        n = len(times)
+        if n == 0 or not self._enabled or self._axis not in (ValidationAxis.x, ValidationAxis.y, ValidationAxis.xy):
+            return np.zeros(n, dtype=bool) if return_mask else (None, None)
+
+        if time0 is None:
+            time0 = times[0]
+        elif times[0] < time0:
+            raise trajtracker.InvalidStateError("{:}.validate_trajectory(): times[0]={:} is before time0 ({:})".format(
+                _u.get_type_name(self), times[0], time0))
+
+        #-- Samples with the same time as the previous sample are ignored. Each of the other samples either moved
+        #-- (compared with the previous sample) or not
+        kept = np.concatenate([[True], np.diff(times) > 0])
+        kt, kx, ky = times[kept], x_coords[kept], y_coords[kept]
+        moved = np.concatenate([[True], (np.diff(kx) != 0) | (np.diff(ky) != 0)])
+
+        mt, mx, my = kt[moved], kx[moved], ky[moved]
+        m_distance = np.concatenate([[0], np.cumsum(np.sqrt(np.diff(mx) ** 2 + np.diff(my) ** 2))])
+
+        #-- For each moved sample, the speed is calculated from the newest earlier sample that is at least
+        #-- calculation_interval old (see SpeedMonitor)
+        m_index = np.arange(len(mt))
+        pre = np.minimum(np.searchsorted(mt, mt - self.calculation_interval, side="right") - 1, m_index - 1)
+        has_speed = pre >= 0
+        pre = np.maximum(pre, 0)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            dt = mt - mt[pre]
+            if self._axis == ValidationAxis.x:
+                m_speed = (mx - mx[pre]) / dt
+            elif self._axis == ValidationAxis.y:
+                m_speed = (my - my[pre]) / dt
+            else:
+                m_speed = (m_distance - m_distance[pre]) / dt
+
+        #-- Each kept sample is validated according to the last moved sample
+        last_moved = np.cumsum(moved) - 1
+        speed = m_speed[last_moved]
+        should_validate = has_speed[last_moved] & (mt[last_moved] - time0 > self._grace_period)
+        stopped_duration = kt - mt[last_moved]
+
+        too_slow = np.zeros(len(kt), dtype=bool) if self._min_speed is None else speed < self._min_speed
+        too_fast = np.zeros(len(kt), dtype=bool) if self._max_speed is None else speed > self._max_speed
+        stopped = np.zeros(len(kt), dtype=bool) if self._max_stop_duration is None else stopped_duration > self._max_stop_duration
+        k_errors = should_validate & (too_slow | too_fast | stopped)
+
+        #-- Ignored samples get the result of the previous sample
+        k_index = np.cumsum(kept) - 1
+        errors = k_errors[k_index]
+
+        if return_mask:
+            return errors
+
+        if not errors.any():
+            return None, None
+
+        i = int(np.flatnonzero(errors)[0])
+        k = k_index[i]
+        if too_slow[k]:
+            err = trajtracker.validators.create_experiment_error(self, self.err_too_slow, "You moved too slowly, or completely stopped moving", {self.arg_speed: float(speed[k])})
+        elif too_fast[k]:
+            err = trajtracker.validators.create_experiment_error(self, self.err_too_fast, "You moved too fast", {self.arg_speed: float(speed[k])})
+        else:
+            err = trajtracker.validators.create_experiment_error(self, self.err_stopped, "You stopped moving",
+                                                                 {self.arg_stopped_duration: float(stopped_duration[k])})
+        return i, err
+
+
     #========================================================================
     #      Config
     #========================================================================
@@ -218,6 +336,8 @@ class InstantaneousSpeedValidator(trajtracker.TTrkObject, EnabledDisabledObj):
         """
         Time interval (in seconds) for testing speed: the speed is calculated according to the difference in
         (x,y) coordinates over a time interval at least this long.
+        If the validator uses a shared :class:`~trajtracker.movement.KinematicsState`, this is the shared object's
+        calculation_interval.
         """
         return self._speed_monitor.calculation_interval
 
@@ -242,3 +362,6 @@ class InstantaneousSpeedValidator(trajtracker.TTrkObject, EnabledDisabledObj):
         _u.validate_attr_positive(self, "max_stop_duration", value)
         self._max_stop_duration = value
         self._log_property_changed("max_stop_duration")
+
+
+_u.register_lean_method(InstantaneousSpeedValidator, "update_xyt", "_update_xyt_impl")
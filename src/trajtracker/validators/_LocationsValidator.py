@@ -20,6 +20,8 @@ You should have received a copy of the GNU General Public License
 along with TrajTracker.  If not, see <http://www.gnu.org/licenses/>.
 """
 
+import numpy as np
+
 # noinspection PyProtectedMember
 import trajtracker._utils as _u
 import trajtracker.utils as u
@@ -148,6 +150,14 @@ class LocationsValidator(trajtracker.TTrkObject, EnabledDisabledObj):
         :return: None if all OK, ExperimentError if error
         """
         _u.update_xyt_validate_and_log(self, position)
+        return self._update_xyt_impl(position, time_in_trial, time_in_session)
+
+
+    #----------------------------------------------------
+    # update_xyt() without validating the arguments. Called by TrajectoryPipeline (which validates them once),
+    # and replaces update_xyt() when trajtracker.env.validate_arguments = False
+    #
+    def _update_xyt_impl(self, position, time_in_trial=None, time_in_session=None):
 
         if not self._enabled:
             return None
@@ -166,3 +176,47 @@ class LocationsValidator(trajtracker.TTrkObject, EnabledDisabledObj):
                                                                   {self.arg_color: color})
 
 
+    #----------------------------------------------------------
+    def validate_trajectory(self, times, x_coords, y_coords, return_mask=False):
+        """
+        Validate a recorded trajectory (e.g., from archived data) at once.
+        The result is the same as calling update_xyt() for each sample, but vectorized.
+
+        :param times: Array with the time of each sample (ignored)
+        :param x_coords: Array with the x coordinate of each sample
+        :param y_coords: Array with the y coordinate of each sample
+        :param return_mask: See below
+        :return: If return_mask=False: a tuple with the index of the first sample that failed validation, and its
+                 :class:`~trajtracker.validators.ExperimentError` (or (None, None) if all samples are valid).
+                 If return_mask=True: a bool array, indicating for each sample whether update_xyt() would have returned an error
+        """
+
+        times, x_coords, y_coords = _u.validate_func_arg_xyt_arrays(self, "validate_trajectory", times, x_coords, y_coords,
+                                                                    times_should_increase=False)
+
+        n = len(x_coords)
+        if n == 0 or not self._enabled:
+            return np.zeros(n, dtype=bool) if return_mask else (None, None)
+
+        #-- Check each of the image's colors once (the last entry is for coordinates out of the image)
+        codes = [self._lcm.colormap[color] for color in self._lcm._indexed_colors] + [None]
+        if self._default_valid:
+            color_ok = np.array([c not in self._invalid_colors for c in codes])
+        else:
+            color_ok = np.array([c in self._valid_colors for c in codes])
+
+        color_indices = self._lcm._get_color_indices_at(x_coords, y_coords)
+        errors = ~color_ok[color_indices]
+
+        if return_mask:
+            return errors
+
+        if not errors.any():
+            return None, None
+
+        i = int(np.flatnonzero(errors)[0])
+        return i, trajtracker.validators.create_experiment_error(self, self.err_invalid_coordinates, "You moved to an invalid location",
+                                                                 {self.arg_color: codes[color_indices[i]]})
+
+
+_u.register_lean_method(LocationsValidator, "update_xyt", "_update_xyt_impl")
@@ -216,6 +216,17 @@ class MoveByGradientValidator(trajtracker.TTrkObject, EnabledDisabledObj):
             return None
 
         _u.update_xyt_validate_and_log(self, position)
+        return self._update_xyt_impl(position, time_in_trial, time_in_session)
+
+
+    #----------------------------------------------------
+    # update_xyt() without validating the arguments. Called by TrajectoryPipeline (which validates them once),
+    # and replaces update_xyt() when trajtracker.env.validate_arguments = False
+    #
+    def _update_xyt_impl(self, position, time_in_trial=None, time_in_session=None):
+
+        if not self._enabled:
+            return None
 
         color = self._lcm.get_color_at(position[0], position[1])
         if color is None:  # color N/A -- can't validate
@@ -257,3 +268,112 @@ class MoveByGradientValidator(trajtracker.TTrkObject, EnabledDisabledObj):
         return trajtracker.validators.create_experiment_error(self, self.err_gradient, "You moved in an invalid direction")
 
 
+    #-----------------------------------------------------------------
+    def validate_trajectory(self, times, x_coords, y_coords, return_mask=False):
+        """
+        Validate a recorded trajectory (e.g., from archived data) at once.
+        The result is the same as calling reset() and then update_xyt() for each sample.
+        The validator's runtime state is not used or changed.
+
+        The colors are looked up, and validated, in a vectorized manner. For a cyclic validator, this is not possible
+        (a cyclic movement changes the last color in a way that depends on the previous colors), so the color changes
+        are validated sequentially - a loop over the samples, which is not faster than calling update_xyt().
+
+        :param times: Array with the time of each sample (ignored)
+        :param x_coords: Array with the x coordinate of each sample
+        :param y_coords: Array with the y coordinate of each sample
+        :param return_mask: See below
+        :return: If return_mask=False: a tuple with the index of the first sample that failed validation, and its
+                 :class:`~trajtracker.validators.ExperimentError` (or (None, None) if all samples are valid).
+                 If return_mask=True: a bool array, indicating for each sample whether update_xyt() would have returned an error
+        """
+
+        times, x_coords, y_coords = _u.validate_func_arg_xyt_arrays(self, "validate_trajectory", times, x_coords, y_coords,
+                                                                    times_should_increase=False)
+
+        n = len(x_coords)
+        if n == 0 or not self._enabled:
+            return np.zeros(n, dtype=bool) if return_mask else (None, None)
+
+        colors = self._lcm.get_colors_at(x_coords, y_coords, use_mapping=True)
+
+        if self._cyclic and self._min_available_color is not None:
+            errors = self._validate_colors_sequentially(colors)
+        else:
+            errors = self._validate_colors(colors)
+
+        if return_mask:
+            return errors
+
+        if not errors.any():
+            return None, None
+
+        i = int(np.flatnonzero(errors)[0])
+        return i, trajtracker.validators.create_experiment_error(self, self.err_gradient, "You moved in an invalid direction")
+
+
+    #-------------------------------------
+    # Validate the color of each sample (None = N/A) when the validator is not cyclic. In this case, last_color
+    # changes only when moving in the expected direction, so it is the maximal color (per the expected direction)
+    # since the last N/A color: the whole validation is a cumulative maximum.
+    #
+    def _validate_colors(self, colors):
+
+        n = len(colors)
+        valid = np.array([c is not None for c in colors], dtype=bool)
+        errors = np.zeros(n, dtype=bool)
+        if not valid.any():
+            return errors
+
+        # casting to int64 because get_colors_at() may return uint8, and subtracting uint variables
+        # would always yield a positive value
+        expected_direction = 1 if self._rgb_should_ascend else -1
+        values = np.array([int(c) for c in colors[valid]], dtype=np.int64) * expected_direction
+
+        #-- Each sequence of consecutive valid colors is validated separately. Shifting each sequence above all previous
+        #-- ones lets a single cumulative maximum restart on each sequence.
+        first_in_seq = valid & ~np.concatenate([[False], valid[:-1]])
+        seq_num = np.cumsum(first_in_seq)[valid] - 1
+        min_value = values.min()
+        shift = seq_num * (values.max() - min_value + 1) - min_value
+        max_so_far = np.maximum.accumulate(values + shift) - shift
+
+        last_color = np.concatenate([[0], max_so_far[:-1]])
+        errors[valid] = ~first_in_seq[valid] & (values - last_color < -self._max_valid_back_movement)
+
+        return errors
+
+
+    #-------------------------------------
+    # Validate the color of each sample (None = N/A), one sample at a time, the same way as _update_xyt_impl()
+    #
+    def _validate_colors_sequentially(self, colors):
+
+        errors = np.zeros(len(colors), dtype=bool)
+        expected_direction = 1 if self._rgb_should_ascend else -1
+        color_range = self._max_available_color - self._min_available_color
+
+        last_color = None
+        for i, color in enumerate(colors):
+
+            if color is not None:
+                color = int(color)
+
+            if color is None or last_color is None:
+                last_color = color
+                continue
+
+            rgb_delta = (color - last_color) * expected_direction
+            if rgb_delta >= 0:
+                last_color = color
+            elif rgb_delta >= -self._max_valid_back_movement:
+                pass  # A slight movement in the opposite direction: don't update last_color
+            elif -rgb_delta >= self.cyclic_ratio * (color_range + rgb_delta):
+                last_color = color
+            else:
+                errors[i] = True
+
+        return errors
+
+
+_u.register_lean_method(MoveByGradientValidator, "update_xyt", "_update_xyt_impl")
@@ -44,7 +44,7 @@ class MovementAngleValidator(ttrk.TTrkObject, EnabledDisabledObj):
 
 
     def __init__(self, min_angle=None, max_angle=None, calc_angle_interval=None,
-                 grace_period=0, enabled=True):
+                 grace_period=0, enabled=True, kinematics=None):
         """
         Constructor - invoked when you create a new object by writing MovementAngleValidator()
 
@@ -53,13 +53,20 @@ class MovementAngleValidator(ttrk.TTrkObject, EnabledDisabledObj):
         :param calc_angle_interval: See :attr:`~trajtracker.movement.MovementAngleValidator.calc_angle_interval`
         :param grace_period: See :attr:`~trajtracker.movement.MovementAngleValidator.grace_period`
         :param enabled: See :attr:`~trajtracker.movement.MovementAngleValidator.enabled`
+        :param kinematics: A :class:`~trajtracker.movement.KinematicsState` shared with other objects. If specified,
+                           the movement direction is taken from its heading (and *calc_angle_interval* is ignored).
+                           The validator does not reset the shared object.
         """
         ttrk.TTrkObject.__init__(self)
         EnabledDisabledObj.__init__(self, enabled=enabled)
 
+        _u.validate_func_arg_type(self, "__init__", "kinematics", kinematics, ttrk.movement.KinematicsState, none_allowed=True)
+        self._kinematics = kinematics
+
         self.min_angle = min_angle
         self.max_angle = max_angle
-        self.calc_angle_interval = calc_angle_interval
+        if kinematics is None:
+            self.calc_angle_interval = calc_angle_interval
         self.grace_period = grace_period
 
         self.reset()
@@ -96,6 +103,21 @@ class MovementAngleValidator(ttrk.TTrkObject, EnabledDisabledObj):
             return None
 
         _u.update_xyt_validate_and_log(self, position, time_in_trial)
+        return self._update_xyt_impl(position, time_in_trial, time_in_session)
+
+
+    #----------------------------------------------------
+    # update_xyt() without validating the arguments. Called by TrajectoryPipeline (which validates them once),
+    # and replaces update_xyt() when trajtracker.env.validate_arguments = False
+    #
+    def _update_xyt_impl(self, position, time_in_trial, time_in_session=None):
+
+        if not self._enabled or self._min_angle == self._max_angle or self._min_angle is None or self._max_angle is None:
+            return None
+
+        if self._kinematics is not None:
+            return self._update_xyt_with_kinematics(position, time_in_trial)
+
         self._validate_time(time_in_trial)
 
         curr_xyt = position + (time_in_trial,)
@@ -113,19 +135,7 @@ class MovementAngleValidator(ttrk.TTrkObject, EnabledDisabledObj):
 
         if can_compute_angle and (x0, y0) != position:
             #-- Validate direction
-            angle = u.get_angle((x0, y0), position)
-            if self._angle_is_ok(angle):
-                #-- all is OK
-                return None
-
-            else:
-                #-- Error
-                angle_deg = angle / (np.pi * 2) * 360
-
-                self._log_write_if(ttrk.log_info, "InvalidAngle (%.1f degrees)" % angle_deg, prepend_self=True)
-
-                return ttrk.validators.create_experiment_error(self, self.err_invalid_angle, "You moved in an incorrect direction",
-                                                               {self.arg_angle: angle_deg})
+            return self._validate_angle(u.get_angle((x0, y0), position))
 
         else:
             #-- Direction cannot be validated - the finger hasn't moved enough yet
@@ -134,6 +144,34 @@ class MovementAngleValidator(ttrk.TTrkObject, EnabledDisabledObj):
         return None
 
 
+    #----------------
+    def _update_xyt_with_kinematics(self, position, time_in_trial):
+
+        self._kinematics._update_xyt_impl(position, time_in_trial)
+
+        angle = self._kinematics.heading
+        if time_in_trial <= self._grace_period or angle is None:
+            return None
+
+        return self._validate_angle(angle)
+
+
+    #----------------
+    def _validate_angle(self, angle):
+
+        if self._angle_is_ok(angle):
+            #-- all is OK
+            return None
+
+        #-- Error
+        angle_deg = angle / (np.pi * 2) * 360
+
+        self._log_write_if(ttrk.log_info, "InvalidAngle (%.1f degrees)" % angle_deg, prepend_self=True)
+
+        return ttrk.validators.create_experiment_error(self, self.err_invalid_angle, "You moved in an incorrect direction",
+                                                       {self.arg_angle: angle_deg})
+
+
     #----------------
     def _validate_time(self, time):
 
@@ -170,6 +208,106 @@ class MovementAngleValidator(ttrk.TTrkObject, EnabledDisabledObj):
         return found_far_enough_entry
 
 
+    #-----------------------------------------------------------------------------------
+    def validate_trajectory(self, times, x_coords, y_coords, return_mask=False):
+        """
+        Validate a recorded trajectory (e.g., from archived data) at once.
+        The result is the same as calling reset() and then update_xyt() for each sample, and the validator's
+        runtime state is not used or changed (nor is its shared :class:`~trajtracker.movement.KinematicsState`, if any).
+
+        When calc_angle_interval > 0, finding the sample from which each angle is calculated is sequential (it depends
+        on the samples chosen so far), so this part is a loop over the samples, which is not faster than calling
+        update_xyt(). Only the calculation and validation of the angles is vectorized.
+
+        :param times: Array with the time of each sample (non-decreasing)
+        :param x_coords: Array with the x coordinate of each sample
+        :param y_coords: Array with the y coordinate of each sample
+        :param return_mask: See below
+        :return: If return_mask=False: a tuple with the index of the first sample that failed validation, and its
+                 :class:`~trajtracker.validators.ExperimentError` (or (None, None) if all samples are valid).
+                 If return_mask=True: a bool array, indicating for each sample whether update_xyt() would have returned an error
+        """
+
+        times, x_coords, y_coords = _u.validate_func_arg_xyt_arrays(self, "validate_trajectory", times, x_coords, y_coords)
+
+        n = len(times)
+        if n == 0 or not self._enabled or self._min_angle == self._max_angle or self._min_angle is None or self._max_angle is None:
+            return np.zeros(n, dtype=bool) if return_mask else (None, None)
+
+        after_grace = times > self._grace_period
+
+        #-- The angle of each sample is calculated from an earlier sample (the "anchor")
+        anchors = self._find_anchors(x_coords, y_coords, after_grace)
+        has_anchor = anchors >= 0
+        anchors = np.maximum(anchors, 0)
+        x0 = x_coords[anchors]
+        y0 = y_coords[anchors]
+
+        angles = u.get_angles(x0, y0, x_coords, y_coords)
+        if self._min_angle < self._max_angle:
+            angle_ok = (self._min_angle_rad <= angles) & (angles <= self._max_angle_rad)
+        else:
+            angle_ok = ~((self._max_angle_rad < angles) & (angles < self._min_angle_rad))
+
+        errors = after_grace & has_anchor & ((x0 != x_coords) | (y0 != y_coords)) & ~angle_ok
+
+        if return_mask:
+            return errors
+
+        if not errors.any():
+            return None, None
+
+        i = int(np.flatnonzero(errors)[0])
+        angle_deg = angles[i] / (np.pi * 2) * 360
+        return i, ttrk.validators.create_experiment_error(self, self.err_invalid_angle, "You moved in an incorrect direction",
+                                                          {self.arg_angle: float(angle_deg)})
+
+
+    #-------------------------------------
+    # For each sample, find the index of the sample from which its angle is calculated (-1 = none), the same way
+    # as _remove_far_enough_prev_locations() does. The samples kept in self._prev_locations are always consecutive,
+    # so we only need to track the first of them.
+    # This is a sequential fallback, not a vectorized calculation: the anchor depends on the previous anchors, and
+    # is defined by the straight-line distance (not the distance along the path), so it cannot be found with a
+    # cumulative-distance array. As the first sample only moves forward, each iteration scans at most
+    # 2 samples more than the number of samples it drops, so the loop is linear in the number of samples.
+    #
+    def _find_anchors(self, x_coords, y_coords, after_grace):
+
+        n = len(x_coords)
+
+        if self._calc_angle_interval == 0:
+            #-- All earlier samples are far enough: the anchor is always the previous sample
+            return np.where(after_grace, np.arange(n) - 1, -1)
+
+        anchors = np.full(n, -1)
+        distance2 = self._calc_angle_interval ** 2
+        xs = x_coords.tolist()
+        ys = y_coords.tolist()
+
+        first = 0
+        for k in range(1, n):
+            if not after_grace[k]:
+                continue
+
+            x_coord, y_coord = xs[k], ys[k]
+            too_close_ind = k
+            found_far_enough_entry = False
+            for i in range(first, k):
+                if (xs[i] - x_coord) ** 2 + (ys[i] - y_coord) ** 2 < distance2:
+                    too_close_ind = i
+                    break
+                found_far_enough_entry = True
+
+            if too_close_ind - first > 1:
+                first = too_close_ind - 1
+
+            if found_far_enough_entry:
+                anchors[k] = first
+
+        return anchors
+
+
     #-------------------------------------
     def _angle_is_ok(self, angle):
         if self._min_angle < self._max_angle:
@@ -236,14 +374,20 @@ class MovementAngleValidator(ttrk.TTrkObject, EnabledDisabledObj):
     @property
     def calc_angle_interval(self):
         """
-        Time minimal distance over which a direction vector can be calculated
+        Time minimal distance over which a direction vector can be calculated.
+        If the validator uses a shared :class:`~trajtracker.movement.KinematicsState`, this is the shared object's
+        heading_min_distance.
         """
+        if self._kinematics is not None:
+            return self._kinematics.heading_min_distance
         return self._calc_angle_interval
 
     @calc_angle_interval.setter
     def calc_angle_interval(self, value):
         value = _u.validate_attr_numeric(self, "calc_angle_interval", value, _u.NoneValues.ChangeTo0)
         _u.validate_attr_not_negative(self, "calc_angle_interval", value)
+        if self._kinematics is not None:
+            self._kinematics.heading_min_distance = value
         self._calc_angle_interval = value
         self._log_property_changed("calc_angle_interval")
 
@@ -260,3 +404,5 @@ class MovementAngleValidator(ttrk.TTrkObject, EnabledDisabledObj):
         self._grace_period = value
         self._log_property_changed("grace_period")
 
+
+_u.register_lean_method(MovementAngleValidator, "update_xyt", "_update_xyt_impl")
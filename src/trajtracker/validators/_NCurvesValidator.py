@@ -40,9 +40,12 @@ class NCurvesValidator(trajtracker.TTrkObject, EnabledDisabledObj):
 
     err_too_many_curves = "TooManyCurves"
 
+    #: The min_distance of the default direction monitor
+    default_min_distance = 20
+
 
     #-----------------------------------------------------------------
-    def __init__(self, direction_monitor=None, max_curves_per_trial=None, enabled=True):
+    def __init__(self, direction_monitor=None, max_curves_per_trial=None, enabled=True, kinematics=None):
         """
         Constructor - invoked when you create a new object by writing NCurvesValidator()
 
@@ -50,15 +53,30 @@ class NCurvesValidator(trajtracker.TTrkObject, EnabledDisabledObj):
                                   If this object is not provided, a default one would be created.
         :param max_curves_per_trial: See :attr:`~trajtracker.validators.NCurvesValidator.max_curves_per_trial`
         :param enabled: See :attr:`~trajtracker.validators.NCurvesValidator.enabled`
+        :param kinematics: A :class:`~trajtracker.movement.KinematicsState` shared with other objects.
+                           If specified (and *direction_monitor* is not), the default direction monitor takes
+                           the movement direction from it. The curves then depend on the kinematics'
+                           heading_min_distance (rather than on the default min_distance of 20), so it must be
+                           specified explicitly.
         """
 
         trajtracker.TTrkObject.__init__(self)
         EnabledDisabledObj.__init__(self, enabled=enabled)
 
         if direction_monitor is None:
-            direction_monitor = trajtracker.movement.DirectionMonitor(20)
+            if kinematics is None:
+                direction_monitor = trajtracker.movement.DirectionMonitor(self.default_min_distance)
+            elif not kinematics._heading_min_distance_specified:
+                raise trajtracker.ValueError(
+                    ("{:}.__init__(): the heading_min_distance of the shared KinematicsState was not specified. " +
+                     "Specify it explicitly (the default min_distance without a shared KinematicsState is {:})").format(
+                        _u.get_type_name(self), self.default_min_distance))
+            else:
+                direction_monitor = trajtracker.movement.DirectionMonitor(kinematics=kinematics)
 
         self._direction_monitor = direction_monitor
+        #-- The sample was already validated, so the direction monitor is updated without validating it again
+        self._update_direction_monitor = _u.get_lean_method(direction_monitor, "update_xyt")
         self.max_curves_per_trial = max_curves_per_trial
 
 
@@ -96,7 +114,16 @@ class NCurvesValidator(trajtracker.TTrkObject, EnabledDisabledObj):
         """
 
         _u.update_xyt_validate_and_log(self, position, time_in_trial)
-        self._direction_monitor.update_xyt(position, time_in_trial)
+        return self._update_xyt_impl(position, time_in_trial, time_in_session)
+
+
+    #----------------------------------------------------
+    # update_xyt() without validating the arguments. Called by TrajectoryPipeline (which validates them once),
+    # and replaces update_xyt() when trajtracker.env.validate_arguments = False
+    #
+    def _update_xyt_impl(self, position, time_in_trial, time_in_session=None):
+
+        self._update_direction_monitor(position, time_in_trial)
 
         if not self.enabled:
             return None
@@ -107,6 +134,55 @@ class NCurvesValidator(trajtracker.TTrkObject, EnabledDisabledObj):
         return None
 
 
+    #-----------------------------------------------------------
+    def validate_trajectory(self, times, x_coords, y_coords, return_mask=False):
+        """
+        Validate a recorded trajectory (e.g., from archived data) at once.
+        The result is the same as calling reset() and then update_xyt() for each sample. The validator's runtime
+        state is not used or changed: the curves are counted by a new
+        :class:`~trajtracker.movement.DirectionMonitor` with the same configuration as the validator's.
+
+        This is a sequential fallback, not a vectorized validation: detecting curves is sequential by nature,
+        so the samples are sent one by one to the direction monitor, and this is not faster than calling update_xyt().
+
+        :param times: Array with the time of each sample (non-decreasing)
+        :param x_coords: Array with the x coordinate of each sample
+        :param y_coords: Array with the y coordinate of each sample
+        :param return_mask: See below
+        :return: If return_mask=False: a tuple with the index of the first sample that failed validation, and its
+                 :class:`~trajtracker.validators.ExperimentError` (or (None, None) if all samples are valid).
+                 If return_mask=True: a bool array, indicating for each sample whether update_xyt() would have returned an error
+        """
+
+        times, x_coords, y_coords = _u.validate_func_arg_xyt_arrays(self, "validate_trajectory", times, x_coords, y_coords)
+
+        n = len(times)
+        if n == 0 or not self.enabled or self._max_curves_per_trial is None:
+            return np.zeros(n, dtype=bool) if return_mask else (None, None)
+
+        #-- Detecting curves is sequential by nature (each curve depends on the previous one): count the curves
+        #-- per sample, one sample at a time
+        dm = self._direction_monitor
+        monitor = trajtracker.movement.DirectionMonitor(min_distance=dm.min_distance, angle_units=dm.angle_units,
+                                                        zero_angle=dm.zero_angle,
+                                                        min_angle_change_per_curve=dm.min_angle_change_per_curve)
+        n_curves = np.zeros(n, dtype=int)
+        for i, (x, y, t) in enumerate(zip(x_coords.tolist(), y_coords.tolist(), times.tolist())):
+            monitor._update_xyt_impl((x, y), t)
+            n_curves[i] = monitor.n_curves
+
+        errors = n_curves > self._max_curves_per_trial
+
+        if return_mask:
+            return errors
+
+        if not errors.any():
+            return None, None
+
+        i = int(np.flatnonzero(errors)[0])
+        return i, trajtracker.validators.create_experiment_error(self, self.err_too_many_curves, "Too many left-right deviations", {})
+
+
     #=================================================================
     #    Configure
     #=================================================================
@@ -155,3 +231,6 @@ class NCurvesValidator(trajtracker.TTrkObject, EnabledDisabledObj):
     def min_angle_change_per_curve(self, value):
         self._direction_monitor.min_angle_change_per_curve = value
         self._log_property_changed("min_angle_change_per_curve")
+
+
+_u.register_lean_method(NCurvesValidator, "update_xyt", "_update_xyt_impl")
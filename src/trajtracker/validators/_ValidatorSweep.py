@@ -0,0 +1,312 @@
+"""
+
+Validator sweep: evaluate many validator configurations against a corpus of recorded trajectories
+
+@author: Dror Dotan
+@copyright: Copyright (c) 2017, Dror Dotan
+
+This file is part of TrajTracker.
+
+TrajTracker is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+TrajTracker is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with TrajTracker.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+from __future__ import division
+
+import itertools
+import os
+import shutil
+import tempfile
+from collections import namedtuple, OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+import trajtracker as ttrk
+import trajtracker._utils as _u
+
+
+class ValidatorSweep(ttrk.TTrkObject):
+    """
+    Evaluates a grid of validator configurations (e.g., several values of max_movement_time and milestones)
+    against a corpus of recorded trajectories, and reports - for each configuration - how many trials would
+    have been rejected, and with which error codes. This helps choosing the validator's thresholds for a new
+    population, using pilot data.
+
+    Each trial is validated with the validator's validate_trajectory() method. The configurations are evaluated
+    in parallel, using a pool of worker processes. The trajectories are saved once to memory-mapped .npy files,
+    which all worker processes read - they are not sent to each task.
+
+    Usage example::
+
+        sweep = ValidatorSweep(GlobalSpeedValidator,
+                               ValidatorSweep.grid(max_movement_time=[1, 1.5, 2], grace_period=[0, 0.1]),
+                               fixed_args=dict(origin_coord=-300, end_coord=300))
+        for result in sweep.run(trajectories):
+            print(result.configuration, result.rejection_rate, dict(result.error_rates))
+    """
+
+    #: The result for one configuration:
+    #: *configuration* - the configuration (dict, as specified in the constructor);
+    #: *n_trials* - the number of trials in the corpus;
+    #: *n_rejected* - the number of trials that failed validation;
+    #: *rejection_rate* - n_rejected / n_trials (None if there were no trials);
+    #: *error_counts* - an OrderedDict: error code -> number of trials that failed with this error;
+    #: *error_rates* - an OrderedDict: error code -> proportion of trials that failed with this error
+    Result = namedtuple("Result", ["configuration", "n_trials", "n_rejected", "rejection_rate", "error_counts", "error_rates"])
+
+
+    #------------------------------------------------
+    def __init__(self, validator_factory, configurations, fixed_args=None, max_workers=None, tmp_dir=None):
+        """
+        Constructor - invoked when you create a new object by writing ValidatorSweep()
+
+        :param validator_factory: The validator class (e.g. GlobalSpeedValidator), or another function that creates
+                                  a validator from keyword arguments. The validator must have a validate_trajectory()
+                                  method. The factory is sent to the worker processes, so it must be picklable
+                                  (e.g., a class or a module-level function - not a lambda).
+        :param configurations: A list of configurations. Each configuration is a dict with the keyword arguments
+                               for validator_factory. See :func:`~trajtracker.validators.ValidatorSweep.grid`
+        :param fixed_args: Keyword arguments (dict) for validator_factory that are shared by all configurations
+        :param max_workers: See :attr:`~trajtracker.validators.ValidatorSweep.max_workers`
+        :param tmp_dir: See :attr:`~trajtracker.validators.ValidatorSweep.tmp_dir`
+        """
+
+        super(ValidatorSweep, self).__init__()
+
+        _u.validate_func_arg_type(self, "__init__", "validator_factory", validator_factory, ttrk.TYPE_CALLABLE)
+        _u.validate_func_arg_is_collection(self, "__init__", "configurations", configurations, min_length=1)
+        for configuration in configurations:
+            _u.validate_func_arg_type(self, "__init__", "configurations[*]", configuration, dict)
+        _u.validate_func_arg_type(self, "__init__", "fixed_args", fixed_args, dict, none_allowed=True)
+
+        self._validator_factory = validator_factory
+        self._configurations = [dict(c) for c in configurations]
+        self._fixed_args = dict(fixed_args or {})
+
+        self.max_workers = max_workers
+        self.tmp_dir = tmp_dir
+
+
+    #------------------------------------------------
+    @staticmethod
+    def grid(**param_values):
+        """
+        Create all combinations of the given parameter values (the Cartesian product).
+
+        For example, grid(min_angle=[-60, -45], max_angle=[45, 60]) returns 4 configurations:
+        {min_angle: -60, max_angle: 45}, {min_angle: -60, max_angle: 60}, etc.
+
+        :param param_values: parameter name -> list of values
+        :return: A list of dicts: parameter name -> value
+        """
+        for name, values in param_values.items():
+            _u.validate_func_arg_is_collection(None, "ValidatorSweep.grid", name, values, min_length=1)
+
+        names = sorted(param_values.keys())
+        return [dict(zip(names, values)) for values in itertools.product(*[param_values[name] for name in names])]
+
+
+    #========================================================================
+    #   Run
+    #========================================================================
+
+    #------------------------------------------------
+    def run(self, trajectories):
+        """
+        Evaluate all configurations against all trials.
+
+        :param trajectories: A list of trials. Each trial is a tuple of 3 arrays: times, x, y
+        :return: A list of :attr:`~trajtracker.validators.ValidatorSweep.Result` - one per configuration,
+                 in the order of the configurations
+        """
+
+        _u.validate_func_arg_is_collection(self, "run", "trajectories", trajectories)
+        corpus = self._create_corpus(trajectories)
+
+        #-- Create the validators here too, so invalid configurations are reported before starting the workers
+        for configuration in self._configurations:
+            validator = _create_validator(self._validator_factory, self._fixed_args, configuration)
+            if not hasattr(validator, "validate_trajectory"):
+                raise ttrk.TypeError("{:}.run(): {:} has no validate_trajectory() method".format(
+                    _u.get_type_name(self), _u.get_type_name(validator)))
+
+        n_workers = self._get_n_workers()
+
+        self._log_write_if(ttrk.log_debug, "Evaluating {:} configurations on {:} trials with {:} worker processes".format(
+            len(self._configurations), len(trajectories), n_workers), True)
+
+        if n_workers <= 1:
+            outcomes = _evaluate(corpus, self._validator_factory, self._fixed_args, self._configurations)
+
+        else:
+            corpus_dir = tempfile.mkdtemp(prefix="ttrk_sweep_", dir=self._tmp_dir)
+            try:
+                _save_corpus(corpus_dir, corpus)
+                del corpus
+
+                chunks = _split(self._configurations, n_workers * 4)
+                with ProcessPoolExecutor(max_workers=n_workers) as executor:
+                    futures = [executor.submit(_evaluate_from_files, corpus_dir, self._validator_factory, self._fixed_args, chunk)
+                               for chunk in chunks]
+                    outcomes = [outcome for future in futures for outcome in future.result()]
+
+            finally:
+                shutil.rmtree(corpus_dir, ignore_errors=True)
+
+        n_trials = len(trajectories)
+        return [self._create_result(configuration, n_trials, error_counts)
+                for configuration, error_counts in zip(self._configurations, outcomes)]
+
+
+    #------------------------------------------------
+    # Concatenate all trials into 4 arrays: times, x, y, and the offset of each trial.
+    # The arrays keep the input's dtype (e.g., float32 or int16 coordinates are not converted to float64), so
+    # the memory-mapped files are not larger than the input. The validators convert each trial as needed.
+    #
+    def _create_corpus(self, trajectories):
+
+        offsets = np.zeros(len(trajectories) + 1, dtype=np.int64)
+        for i, trial in enumerate(trajectories):
+            if not _u.is_collection(trial) or len(trial) != 3:
+                raise ttrk.TypeError("{:}.run(): invalid trajectories[{:}] - expecting a tuple of 3 arrays (times, x, y)".format(
+                    _u.get_type_name(self), i))
+            if len(trial[1]) != len(trial[0]) or len(trial[2]) != len(trial[0]):
+                raise ttrk.ValueError("{:}.run(): invalid trajectories[{:}] - times, x and y have different lengths".format(
+                    _u.get_type_name(self), i))
+            offsets[i + 1] = offsets[i] + len(trial[0])
+
+        if len(trajectories) == 0:
+            columns = [np.zeros(0)] * 3
+        else:
+            columns = [np.concatenate([np.asarray(trial[col]) for trial in trajectories]) for col in range(3)]
+
+        return columns[0], columns[1], columns[2], offsets
+
+
+    #------------------------------------------------
+    def _create_result(self, configuration, n_trials, error_counts):
+        error_counts = OrderedDict(sorted(error_counts.items()))
+        n_rejected = sum(error_counts.values())
+        return self.Result(configuration=configuration,
+                           n_trials=n_trials,
+                           n_rejected=n_rejected,
+                           rejection_rate=n_rejected / n_trials if n_trials > 0 else None,
+                           error_counts=error_counts,
+                           error_rates=OrderedDict((code, n / n_trials) for code, n in error_counts.items()))
+
+
+    #------------------------------------------------
+    def _get_n_workers(self):
+        n_workers = self._max_workers if self._max_workers is not None else (os.cpu_count() or 1)
+        return max(1, min(n_workers, len(self._configurations)))
+
+
+    #========================================================================
+    #   Properties
+    #========================================================================
+
+    #------------------------------------------------
+    @property
+    def configurations(self):
+        """ The configurations evaluated by run() (read-only) """
+        return [dict(c) for c in self._configurations]
+
+    #------------------------------------------------
+    @property
+    def max_workers(self):
+        """
+        The maximal number of worker processes (int). If None (default), the number of CPUs is used.
+        If 1, the configurations are evaluated in the current process, without a process pool.
+        """
+        return self._max_workers
+
+    @max_workers.setter
+    def max_workers(self, value):
+        _u.validate_attr_type(self, "max_workers", value, int, none_allowed=True)
+        if value is not None:
+            _u.validate_attr_positive(self, "max_workers", value)
+        self._max_workers = value
+        self._log_property_changed("max_workers")
+
+    #------------------------------------------------
+    @property
+    def tmp_dir(self):
+        """
+        The directory in which the memory-mapped trajectory files are created (str). They are deleted when
+        run() ends. If None (default), the system's temporary directory is used.
+        """
+        return self._tmp_dir
+
+    @tmp_dir.setter
+    def tmp_dir(self, value):
+        _u.validate_attr_type(self, "tmp_dir", value, str, none_allowed=True)
+        self._tmp_dir = value
+        self._log_property_changed("tmp_dir")
+
+
+#========================================================================
+#   Worker functions (these run in the worker processes)
+#========================================================================
+
+_corpus_files = "times.npy", "x.npy", "y.npy", "offsets.npy"
+
+
+#------------------------------------------------
+def _save_corpus(corpus_dir, corpus):
+    for filename, arr in zip(_corpus_files, corpus):
+        np.save(os.path.join(corpus_dir, filename), arr)
+
+
+#------------------------------------------------
+def _evaluate_from_files(corpus_dir, validator_factory, fixed_args, configurations):
+    corpus = [np.load(os.path.join(corpus_dir, filename), mmap_mode="r") for filename in _corpus_files]
+    return _evaluate(corpus, validator_factory, fixed_args, configurations)
+
+
+#------------------------------------------------
+# Validate all trials with each configuration.
+# Returns a list with one dict per configuration: error code -> number of trials
+#
+def _evaluate(corpus, validator_factory, fixed_args, configurations):
+
+    times, x, y, offsets = corpus
+    offsets = np.asarray(offsets).tolist()
+
+    results = []
+    for configuration in configurations:
+        validator = _create_validator(validator_factory, fixed_args, configuration)
+        error_counts = {}
+        for start, end in zip(offsets[:-1], offsets[1:]):
+            i, err = validator.validate_trajectory(times[start:end], x[start:end], y[start:end])
+            if err is not None:
+                error_counts[err.err_code] = error_counts.get(err.err_code, 0) + 1
+        results.append(error_counts)
+
+    return results
+
+
+#------------------------------------------------
+def _create_validator(validator_factory, fixed_args, configuration):
+    kwargs = dict(fixed_args)
+    kwargs.update(configuration)
+    return validator_factory(**kwargs)
+
+
+#------------------------------------------------
+# Split a list into (at most) n_chunks consecutive chunks of similar size
+#
+def _split(items, n_chunks):
+    n_chunks = max(1, min(n_chunks, len(items)))
+    bounds = np.linspace(0, len(items), n_chunks + 1).astype(int)
+    return [items[a:b] for a, b in zip(bounds[:-1], bounds[1:])]
@@ -27,7 +27,8 @@ from trajtracker import BadFormatError, TypeError
 
 ValidationAxis = enum.Enum('ValidationAxis', 'x y xy')
 
-from ._ExperimentError import ExperimentError, create_experiment_error
+from ._ExperimentError import ExperimentError, create_experiment_error, collect_validator_outcomes
+from ._AdaptiveValidatorGroup import AdaptiveValidatorGroup
 from ._FingerLiftedValidator import FingerLiftedValidator
 from ._GlobalSpeedValidator import GlobalSpeedValidator, GlobalSpeedGuide
 from ._InstantaneousSpeedValidator import InstantaneousSpeedValidator
@@ -35,3 +36,4 @@ from ._LocationsValidator import LocationsValidator
 from ._MovementAngleValidator import MovementAngleValidator
 from ._MoveByGradientValidator import MoveByGradientValidator
 from ._NCurvesValidator import NCurvesValidator
+from ._ValidatorSweep import ValidatorSweep
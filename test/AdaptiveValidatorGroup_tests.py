@@ -0,0 +1,159 @@
+import json
+import unittest
+
+from expyriment.misc import geometry
+
+import trajtracker
+from trajtracker.validators import AdaptiveValidatorGroup, ExperimentError, InstantaneousSpeedValidator
+
+
+class StubValidator(object):
+
+    def __init__(self, err_code, fail_at=()):
+        self.err_code = err_code
+        self.fail_at = fail_at
+        self.calls = []
+        self.n_resets = 0
+
+    def reset(self, time0=None):
+        self.n_resets += 1
+
+    def update_xyt(self, position, time_in_trial, time_in_session=None):
+        self.calls.append(time_in_trial)
+        if time_in_trial in self.fail_at:
+            return ExperimentError(self.err_code, "failed", self)
+        return None
+
+
+#------------------------------------------------------------------
+def stats(n_calls, n_failures, total_time):
+    return dict(n_calls=n_calls, n_failures=n_failures, total_time=total_time)
+
+
+class AdaptiveValidatorGroupTests(unittest.TestCase):
+
+    #------------------------------------------------------------------
+    def test_no_errors(self):
+        a, b = StubValidator("A"), StubValidator("B")
+        group = AdaptiveValidatorGroup([a, b])
+
+        self.assertIsNone(group.update_xyt((1, 2), 0.1))
+        self.assertIsNone(group.update_xyt(geometry.XYPoint(3, 4), 0.2, 5.2))
+        self.assertEqual([0.1, 0.2], a.calls)
+        self.assertEqual([0.1, 0.2], b.calls)
+
+        group.reset()
+        self.assertEqual(1, a.n_resets)
+
+    #------------------------------------------------------------------
+    def test_reorder(self):
+        a, b, c = StubValidator("A"), StubValidator("B"), StubValidator("C")
+        group = AdaptiveValidatorGroup([a, b, c])
+        self.assertEqual(["StubValidator", "StubValidator_2", "StubValidator_3"], group.evaluation_order)
+
+        #-- C is cheap and often fails; A is expensive and never fails
+        group.load_statistics(dict(StubValidator=stats(100, 0, 1.0),
+                                   StubValidator_2=stats(100, 1, 0.1),
+                                   StubValidator_3=stats(100, 50, 0.01)))
+        self.assertEqual(["StubValidator_3", "StubValidator_2", "StubValidator"], group.evaluation_order)
+
+        group.adaptive = False
+        self.assertEqual(["StubValidator", "StubValidator_2", "StubValidator_3"], group.evaluation_order)
+
+    #------------------------------------------------------------------
+    def test_deterministic_error(self):
+        a, b, c = StubValidator("A", fail_at=[1]), StubValidator("B", fail_at=[1, 2]), StubValidator("C", fail_at=[1, 2])
+        group = AdaptiveValidatorGroup()
+        group.add_validator(a, "a")
+        group.add_validator(b, "b")
+        group.add_validator(c, "c")
+        group.load_statistics(dict(a=stats(10, 0, 1.0), b=stats(10, 0, 0.5), c=stats(10, 5, 0.01)))
+        self.assertEqual(["c", "b", "a"], group.evaluation_order)
+
+        #-- C is called first and fails, but A and B precede it, so they are called too. A's error is reported.
+        self.assertEqual("A", group.update_xyt((0, 0), 1).err_code)
+        self.assertEqual([1], a.calls)
+
+        #-- C fails, then B fails; A precedes both, so it is called too (but it doesn't fail)
+        a.calls = []
+        self.assertEqual("B", group.update_xyt((0, 0), 2).err_code)
+        self.assertEqual([2], a.calls)
+
+        #-- Same results without reordering
+        group.adaptive = False
+        self.assertEqual("A", group.update_xyt((0, 0), 1).err_code)
+        self.assertEqual("B", group.update_xyt((0, 0), 2).err_code)
+
+    #------------------------------------------------------------------
+    def test_tiers(self):
+        a, b = StubValidator("A", fail_at=[1]), StubValidator("B", fail_at=[1])
+        group = AdaptiveValidatorGroup()
+        group.add_validator(a, "a", tier=1)
+        group.add_validator(b, "b", tier=0)
+        group.load_statistics(dict(a=stats(10, 9, 0.0001), b=stats(10, 0, 1.0)))
+        self.assertEqual(["b", "a"], group.evaluation_order)
+
+        #-- The error of the lower tier is reported, and the higher tier is not called
+        self.assertEqual("B", group.update_xyt((0, 0), 1).err_code)
+        self.assertEqual([], a.calls)
+
+    #------------------------------------------------------------------
+    def test_statistics(self):
+        a, b = StubValidator("A", fail_at=[0.2]), StubValidator("B")
+        group = AdaptiveValidatorGroup([a, b], adaptive=False)
+        for t in 0.1, 0.2, 0.3:
+            group.update_xyt((0, 0), t)
+
+        statistics = group.get_statistics()
+        self.assertEqual(3, statistics["StubValidator"]["n_calls"])
+        self.assertEqual(1, statistics["StubValidator"]["n_failures"])
+        self.assertAlmostEqual(1 / 3, statistics["StubValidator"]["failure_rate"])
+        self.assertEqual(2, statistics["StubValidator_2"]["n_calls"])
+        self.assertEqual(0, statistics["StubValidator_2"]["n_failures"])
+
+        #-- Export & import
+        other = AdaptiveValidatorGroup([StubValidator("A"), StubValidator("B")])
+        other.load_statistics(json.loads(json.dumps(statistics)))
+        self.assertEqual(statistics, other.get_statistics())
+
+        group.reset_statistics()
+        self.assertEqual(0, group.get_statistics()["StubValidator"]["n_calls"])
+        self.assertIsNone(group.get_statistics()["StubValidator"]["mean_time"])
+
+    #------------------------------------------------------------------
+    def test_real_validator(self):
+        validator = InstantaneousSpeedValidator(max_speed=100, calculation_interval=0)
+        group = AdaptiveValidatorGroup([validator, StubValidator("A")])
+        group.reset(0)
+        self.assertIsNone(group.update_xyt((0, 0), 0.1))
+        self.assertIsNone(group.update_xyt((0, 5), 0.2))
+        self.assertEqual(InstantaneousSpeedValidator.err_too_fast, group.update_xyt((0, 50), 0.3).err_code)
+
+    #------------------------------------------------------------------
+    def test_subclass_override_is_called(self):
+
+        class StrictSpeedValidator(InstantaneousSpeedValidator):
+            def update_xyt(self, position, time_in_trial, time_in_session=None):
+                if position[0] != 0:
+                    return ExperimentError("NotOnAxis", "failed", self)
+                return super(StrictSpeedValidator, self).update_xyt(position, time_in_trial, time_in_session)
+
+        group = AdaptiveValidatorGroup([StrictSpeedValidator(max_speed=100)])
+        self.assertIsNone(group.update_xyt((0, 0), 0.1))
+        self.assertEqual("NotOnAxis", group.update_xyt((1, 0), 0.2).err_code)
+
+    #------------------------------------------------------------------
+    def test_invalid_args(self):
+        group = AdaptiveValidatorGroup([StubValidator("A")])
+        self.assertRaises(trajtracker.TypeError, lambda: group.add_validator(1))
+        self.assertRaises(trajtracker.TypeError, lambda: group.add_validator(StubValidator("B"), tier=0.5))
+        self.assertRaises(trajtracker.ValueError, lambda: group.add_validator(StubValidator("B"), name="StubValidator"))
+        self.assertRaises(trajtracker.TypeError, lambda: AdaptiveValidatorGroup(adaptive=1))
+
+        self.assertRaises(trajtracker.ValueError, lambda: group.load_statistics(dict(X=stats(1, 0, 0))))
+        self.assertRaises(trajtracker.ValueError, lambda: group.load_statistics(dict(StubValidator=dict(n_calls=1))))
+        self.assertRaises(trajtracker.ValueError, lambda: group.load_statistics(dict(StubValidator=stats(1, 2, 0))))
+
+
+if __name__ == '__main__':
+    unittest.main()
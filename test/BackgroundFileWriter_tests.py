@@ -0,0 +1,104 @@
+import threading
+import unittest
+
+import trajtracker
+from trajtracker.io import SessionFileWriter, BackgroundFileWriter
+from ttrk_testing import DummyFileHandle
+
+
+class BackgroundFileWriterTests(unittest.TestCase):
+
+    #------------------------------------------------------------------
+    def _create_writer(self, **kwargs):
+        fh = DummyFileHandle()
+        writer = SessionFileWriter("stam", flush_policy=SessionFileWriter.FlushPolicy.OnClose,
+                                   open_file=lambda filename, mode: fh)
+        return BackgroundFileWriter(writer, **kwargs), fh
+
+
+    #------------------------------------------------------------------
+    def test_write_in_order(self):
+        bg, fh = self._create_writer()
+
+        for i in range(20):
+            bg.submit(lambda n: bg.writer.write_trial("%d;" % n), i)
+
+        bg.flush()
+        self.assertEqual("".join("%d;" % i for i in range(20)), fh.data)
+        self.assertEqual(0, bg.n_pending)
+
+        bg.close()
+        self.assertTrue(bg.closed)
+        self.assertTrue(bg.writer.closed)
+
+
+    #------------------------------------------------------------------
+    def test_error_is_raised_on_next_call(self):
+        bg, fh = self._create_writer()
+
+        def fail():
+            raise IOError("disk full")
+
+        bg.submit(fail)
+        self.assertRaises(IOError, bg.wait)
+
+        #-- The error was reported; the writer can continue
+        bg.submit(lambda: bg.writer.write("a"))
+        bg.close()
+        self.assertEqual("a", fh.data)
+
+
+    #------------------------------------------------------------------
+    def test_error_is_raised_on_close(self):
+        bg, fh = self._create_writer()
+
+        def fail():
+            raise IOError("disk full")
+
+        bg.submit(fail)
+        self.assertRaises(IOError, bg.close)
+        self.assertTrue(bg.writer.closed)
+
+
+    #------------------------------------------------------------------
+    def test_backpressure(self):
+        bg, fh = self._create_writer(queue_size=1)
+
+        release = threading.Event()
+        bg.submit(release.wait)          # blocks the writer thread
+        bg.submit(lambda: None)          # fills the queue
+
+        submitted = threading.Event()
+
+        def submit_another():
+            bg.submit(lambda: None)
+            submitted.set()
+
+        thread = threading.Thread(target=submit_another)
+        thread.start()
+
+        self.assertFalse(submitted.wait(0.1))   # the queue is full
+        release.set()
+        self.assertTrue(submitted.wait(5))
+
+        thread.join()
+        bg.close()
+
+
+    #------------------------------------------------------------------
+    def test_closed(self):
+        bg, fh = self._create_writer()
+        bg.close()
+        bg.close()
+        self.assertRaises(trajtracker.InvalidStateError, lambda: bg.submit(lambda: None))
+        self.assertRaises(trajtracker.InvalidStateError, bg.flush)
+
+
+    #------------------------------------------------------------------
+    def test_invalid_args(self):
+        self.assertRaises(trajtracker.TypeError, lambda: BackgroundFileWriter(None))
+        self.assertRaises(trajtracker.ValueError, lambda: self._create_writer(queue_size=0))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+import time
+import unittest
+
+import numpy as np
+
+import trajtracker
+from trajtracker.io import BackgroundMouseSampler
+
+
+class DummyMouse(object):
+
+    thread_safe = True
+
+    def __init__(self):
+        self.n_calls = 0
+
+    @property
+    def position(self):
+        self.n_calls += 1
+        return self.n_calls, -self.n_calls
+
+
+class BackgroundMouseSamplerTests(unittest.TestCase):
+
+    #------------------------------------------------------------------
+    def test_sampling(self):
+        mouse = DummyMouse()
+        sampler = BackgroundMouseSampler(mouse, rate=500)
+
+        with sampler:
+            self.assertTrue(sampler.running)
+            time.sleep(0.2)
+            first = sampler.drain()
+            time.sleep(0.1)
+        self.assertFalse(sampler.running)
+
+        samples = np.concatenate([first, sampler.drain()])
+        self.assertGreater(len(first), 10)
+        self.assertEqual(list(range(1, len(samples) + 1)), list(samples[:, 0]))
+        self.assertTrue((np.diff(samples[:, 2]) > 0).all())
+        self.assertEqual(0, len(sampler.drain()))
+
+        stats = sampler.get_statistics()
+        self.assertEqual(mouse.n_calls, stats["n_samples"])
+        self.assertEqual(0, stats["n_overruns"])
+        self.assertIsNotNone(stats["jitter"])
+        self.assertGreater(stats["mean_interval"], 0)
+
+
+    #------------------------------------------------------------------
+    def test_ring_buffer_wraps_around(self):
+        sampler = BackgroundMouseSampler(DummyMouse(), capacity=4)
+        for i in range(3):
+            sampler._add_sample(i, 0, i)
+        self.assertEqual([0, 1, 2], list(sampler.drain()[:, 0]))
+
+        for i in range(3, 7):
+            sampler._add_sample(i, 0, i)
+        self.assertEqual(4, sampler.n_pending)
+        self.assertEqual([3, 4, 5, 6], list(sampler.drain()[:, 0]))
+
+
+    def test_overrun(self):
+        sampler = BackgroundMouseSampler(DummyMouse(), capacity=2)
+        for i in range(5):
+            sampler._add_sample(i, 0, i * 0.5)
+
+        self.assertEqual([0, 1], list(sampler.drain()[:, 0]))
+
+        stats = sampler.get_statistics()
+        self.assertEqual(5, stats["n_samples"])
+        self.assertEqual(3, stats["n_overruns"])
+        self.assertEqual(0.5, stats["mean_interval"])
+        self.assertEqual(0, stats["jitter"])
+
+        sampler.reset_statistics()
+        self.assertEqual(0, sampler.get_statistics()["n_samples"])
+
+
+    #------------------------------------------------------------------
+    def test_invalid(self):
+        self.assertRaises(trajtracker.ValueError, lambda: BackgroundMouseSampler(DummyMouse(), rate=0))
+        sampler = BackgroundMouseSampler(DummyMouse())
+        with sampler:
+            self.assertRaises(trajtracker.InvalidStateError, sampler.start)
+
+
+    #------------------------------------------------------------------
+    def test_mouse_not_thread_safe(self):
+        self.assertRaises(trajtracker.TypeError, lambda: BackgroundMouseSampler(None))
+        self.assertRaises(trajtracker.TypeError, lambda: BackgroundMouseSampler(object()))
+
+        #-- A mouse that does not declare itself as thread-safe (like Expyriment's mouse) is refused
+        mouse = DummyMouse()
+        mouse.thread_safe = False
+        self.assertRaises(trajtracker.TypeError, lambda: BackgroundMouseSampler(mouse))
+        self.assertRaises(trajtracker.TypeError, lambda: BackgroundMouseSampler(trajtracker.io.Mouse(mouse)))
+        self.assertEqual(0, mouse.n_calls)
+
+
+if __name__ == '__main__':
+    unittest.main()
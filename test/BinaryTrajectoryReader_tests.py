@@ -0,0 +1,105 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+import trajtracker
+from trajtracker.io import BinaryTrajectoryFormat, BinaryTrajectoryReader
+
+
+class BinaryTrajectoryReaderTests(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.filename = os.path.join(self.tmpdir, "traj.bin")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def _write(self, *chunks, **kwargs):
+        fmt = BinaryTrajectoryFormat(**kwargs)
+        with open(self.filename, "wb") as fh:
+            fh.write(fmt.encode_header())
+            for trial_num, xyt in chunks:
+                fh.write(fmt.encode_trial(trial_num, xyt))
+
+
+    #------------------------------------------------------------------
+    def test_read_trials(self):
+        self._write((1, [(1, 2, 0.1), (3, 4, 0.2)]), (2, [(5, 6, 0.3)]), xy_precision=2, time_precision=3)
+
+        with BinaryTrajectoryReader(self.filename) as reader:
+            self.assertEqual([1, 2], reader.trial_nums)
+            self.assertEqual(np.float32, reader.xy_dtype)
+            self.assertEqual(2, reader.xy_precision)
+            self.assertEqual(3, reader.time_precision)
+
+            times, x, y = reader.get_trial(1)
+            self.assertEqual([0.1, 0.2], list(times))
+            self.assertEqual([1, 3], list(x))
+            self.assertEqual([2, 4], list(y))
+            self.assertFalse(times.flags.writeable)
+
+            trials = [(t, list(x)) for t, times, x, y in reader.iter_trials()]
+            self.assertEqual([(1, [1, 3]), (2, [5])], trials)
+
+
+    #------------------------------------------------------------------
+    def test_xy_dtypes(self):
+        self.assertEqual(np.int16, BinaryTrajectoryFormat(xy_precision=0).xy_dtype)
+        self.assertEqual(np.float32, BinaryTrajectoryFormat(xy_precision=3).xy_dtype)
+        self.assertEqual(np.float64, BinaryTrajectoryFormat(xy_precision=5).xy_dtype)
+
+        self._write((1, [(1.4, -2.6, 0.1)]), xy_precision=0)
+        with BinaryTrajectoryReader(self.filename) as reader:
+            times, x, y = reader.get_trial(1)
+            self.assertEqual(np.int16, x.dtype)
+            self.assertEqual([1], list(x))
+            self.assertEqual([-3], list(y))
+
+    def test_int16_overflow(self):
+        self.assertRaises(trajtracker.ValueError, lambda: BinaryTrajectoryFormat(xy_precision=0).encode_trial(1, [(40000, 0, 0)]))
+
+
+    #------------------------------------------------------------------
+    def test_trial_saved_twice(self):
+        self._write((1, [(1, 2, 0.1)]), (1, [(3, 4, 0.2)]))
+        with BinaryTrajectoryReader(self.filename) as reader:
+            self.assertEqual([1], reader.trial_nums)
+            times, x, y = reader.get_trial(1)
+            self.assertEqual([1, 3], list(x))
+
+
+    #------------------------------------------------------------------
+    def test_incomplete_chunk_is_ignored(self):
+        self._write((1, [(1, 2, 0.1)]), (2, [(3, 4, 0.2), (5, 6, 0.3)]))
+        with open(self.filename, "r+b") as fh:
+            fh.truncate(os.path.getsize(self.filename) - 4)
+
+        with BinaryTrajectoryReader(self.filename) as reader:
+            self.assertEqual([1], reader.trial_nums)
+
+
+    #------------------------------------------------------------------
+    def test_invalid_file(self):
+        with open(self.filename, "w") as fh:
+            fh.write("trial,time,x,y\n1,0.1,1,2\n")
+        self.assertRaises(trajtracker.BadFormatError, lambda: BinaryTrajectoryReader(self.filename))
+
+    def test_missing_trial(self):
+        self._write((1, [(1, 2, 0.1)]))
+        with BinaryTrajectoryReader(self.filename) as reader:
+            self.assertRaises(trajtracker.ValueError, lambda: reader.get_trial(2))
+
+    def test_closed(self):
+        self._write((1, [(1, 2, 0.1)]))
+        reader = BinaryTrajectoryReader(self.filename)
+        reader.close()
+        reader.close()
+        self.assertRaises(trajtracker.InvalidStateError, lambda: reader.get_trial(1))
+
+
+if __name__ == '__main__':
+    unittest.main()
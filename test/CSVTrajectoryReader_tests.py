@@ -0,0 +1,186 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import trajtracker
+from trajtracker.io import CSVTrajectoryReader
+from trajtracker.movement import TrajectoryTracker
+
+
+class CSVTrajectoryReaderTests(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.filename = os.path.join(self.tmpdir, "traj.csv")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def _write_session(self, trials, save_index=True):
+        tracker = TrajectoryTracker(enabled=True)
+        tracker.init_output_file(self.filename, xy_precision=1, time_precision=2, save_index=save_index)
+        for trial_num, xyt in trials:
+            tracker.reset()
+            for x, y, t in xyt:
+                tracker.update_xyt((x, y), t)
+            tracker.save_to_file(trial_num)
+        tracker.close_output_file()
+
+    def _index_lines(self):
+        with open(self.filename + ".idx") as fh:
+            return fh.read().splitlines()
+
+
+    #------------------------------------------------------------------
+    def test_index_written_by_tracker(self):
+        self._write_session([(1, [(1, 2, 0.1), (3, 4, 0.2)]), (2, [(5, 6.5, 0.3)])])
+
+        self.assertEqual(["trial,offset,n_bytes,n_rows", "1,15,22,2", "2,37,13,1"], self._index_lines())
+
+        reader = CSVTrajectoryReader(self.filename)
+        self.assertEqual([1, 2], reader.trial_nums)
+
+        times, x, y = reader.get_trial(2)
+        self.assertEqual([0.3], list(times))
+        self.assertEqual([5], list(x))
+        self.assertEqual([6.5], list(y))
+
+        trials = reader.get_trials([2, 1])
+        self.assertEqual([1, 3], list(trials[1][1]))
+        self.assertEqual([5], list(trials[2][1]))
+
+
+    #------------------------------------------------------------------
+    def test_index_built_lazily(self):
+        self._write_session([(1, [(1, 2, 0.1), (3, 4, 0.2)]), (2, [(5, 6, 0.3)])], save_index=False)
+        self.assertFalse(os.path.exists(self.filename + ".idx"))
+
+        reader = CSVTrajectoryReader(self.filename)
+        self.assertEqual([1, 3], list(reader.get_trial(1)[1]))
+        self.assertEqual(3, len(self._index_lines()))
+
+
+    #------------------------------------------------------------------
+    def test_incomplete_index(self):
+        self._write_session([(1, [(1, 2, 0.1)]), (2, [(3, 4, 0.2)]), (3, [(5, 6, 0.3)])])
+        full_index = self._index_lines()
+
+        #-- The index refers to the first trial only, and its last line is incomplete
+        with open(self.filename + ".idx", "w") as fh:
+            fh.write("\n".join(full_index[:2]) + "\n3,5")
+
+        reader = CSVTrajectoryReader(self.filename)
+        self.assertEqual([1, 2, 3], reader.trial_nums)
+        self.assertEqual([5], list(reader.get_trial(3)[1]))
+        self.assertEqual(full_index, self._index_lines())
+
+
+    #------------------------------------------------------------------
+    def test_index_beyond_end_of_file(self):
+        self._write_session([(1, [(1, 2, 0.1)]), (2, [(3, 4, 0.2)])])
+        with open(self.filename, "r+b") as fh:
+            fh.truncate(os.path.getsize(self.filename) - 3)
+
+        reader = CSVTrajectoryReader(self.filename)
+        self.assertEqual([1], reader.trial_nums)
+
+
+    #------------------------------------------------------------------
+    def test_old_index_deleted_by_tracker(self):
+        self._write_session([(1, [(1, 2, 0.1), (3, 4, 0.2)]), (2, [(5, 6, 0.3)])])
+        self._write_session([(1, [(10, 20, 0.1)]), (2, [(50, 60, 0.3), (70, 80, 0.4)])], save_index=False)
+        self.assertFalse(os.path.exists(self.filename + ".idx"))
+
+        self.assertEqual([50, 70], list(CSVTrajectoryReader(self.filename).get_trial(2)[1]))
+
+    #------------------------------------------------------------------
+    def test_stale_index(self):
+        self._write_session([(1, [(1, 2, 0.1), (3, 4, 0.2)]), (2, [(5, 6, 0.3)])])
+        with open(self.filename + ".idx") as fh:
+            old_index = fh.read()
+
+        #-- Recreate the CSV file, and restore the index of the previous file
+        self._write_session([(1, [(10, 20, 0.1)]), (2, [(50, 60, 0.3), (70, 80, 0.4)]), (3, [(1, 1, 0.5)])], save_index=False)
+        with open(self.filename + ".idx", "w") as fh:
+            fh.write(old_index)
+
+        reader = CSVTrajectoryReader(self.filename)
+        self.assertEqual([1, 2, 3], reader.trial_nums)
+        self.assertEqual([50, 70], list(reader.get_trial(2)[1]))
+        self.assertEqual(["trial,offset,n_bytes,n_rows", "1,15,13,1", "2,28,26,2", "3,54,11,1"], self._index_lines())
+
+
+    #------------------------------------------------------------------
+    def test_trial_saved_twice(self):
+        self._write_session([(1, [(1, 2, 0.1)]), (2, [(3, 4, 0.2)]), (1, [(5, 6, 0.3)])])
+        reader = CSVTrajectoryReader(self.filename)
+        self.assertEqual([1, 2], reader.trial_nums)
+        self.assertEqual([1, 5], list(reader.get_trial(1)[1]))
+
+
+    #------------------------------------------------------------------
+    def test_missing_trial(self):
+        self._write_session([(1, [(1, 2, 0.1)])])
+        reader = CSVTrajectoryReader(self.filename)
+        self.assertRaises(trajtracker.ValueError, lambda: reader.get_trial(2))
+
+    def test_not_a_trajectory_file(self):
+        with open(self.filename, "w") as fh:
+            fh.write("a,b\n1,2\n")
+        reader = CSVTrajectoryReader(self.filename)
+        self.assertRaises(trajtracker.BadFormatError, lambda: reader.trial_nums)
+
+    def test_index_only_for_csv(self):
+        tracker = TrajectoryTracker()
+        self.assertRaises(trajtracker.ValueError, lambda: tracker.init_output_file(
+            self.filename, file_format=TrajectoryTracker.FileFormat.Binary, save_index=True))
+
+
+    #------------------------------------------------------------------
+    def test_read_all(self):
+        self._write_session([(2, [(1, 2, 0.1), (3, 4, 0.2)]), (1, [(5, 6, 0.3)]), (2, [(7, 8, 0.4)])], save_index=False)
+        reader = CSVTrajectoryReader(self.filename)
+
+        trials = reader.read_all()
+        self.assertEqual([1, 2], list(trials.keys()))
+        self.assertEqual([0.1, 0.2, 0.4], list(trials[2][0]))
+        self.assertEqual([1, 3, 7], list(trials[2][1]))
+        self.assertEqual([6], list(trials[1][2]))
+
+        self.assertFalse(os.path.exists(self.filename + ".idx"))
+
+    def test_read_columns_ignores_incomplete_line(self):
+        self._write_session([(1, [(1, 2, 0.1)]), (2, [(3, 4, 0.2)])])
+        with open(self.filename, "r+b") as fh:
+            fh.truncate(os.path.getsize(self.filename) - 3)
+
+        trials, times, x, y = CSVTrajectoryReader(self.filename).read_columns()
+        self.assertEqual([1], list(trials))
+        self.assertEqual([0.1], list(times))
+
+
+    #------------------------------------------------------------------
+    def test_iter_trials(self):
+        session = [(1, [(1, 2, 0.1), (3, 4, 0.2), (5, 6, 0.3)]), (2, [(7, 8, 0.4)]), (3, [(9, 10, 0.5), (11, 12, 0.6)]),
+                   (1, [(13, 14, 0.7)])]
+        self._write_session(session)
+        reader = CSVTrajectoryReader(self.filename)
+
+        #-- Several block sizes, so that trials and lines are split between blocks
+        for block_size in 5, 16, 40, 1000:
+            trials = list(reader.iter_trials(block_size=block_size))
+            self.assertEqual([1, 2, 3, 1], [t[0] for t in trials])
+            for (trial_num, times, x, y), (_, xyt) in zip(trials, session):
+                self.assertEqual([p[0] for p in xyt], list(x))
+                self.assertEqual([p[1] for p in xyt], list(y))
+                self.assertEqual([p[2] for p in xyt], list(times))
+
+    def test_iter_trials_empty_file(self):
+        self._write_session([])
+        self.assertEqual([], list(CSVTrajectoryReader(self.filename).iter_trials()))
+        self.assertEqual(0, len(CSVTrajectoryReader(self.filename).read_all()))
+
+
+if __name__ == '__main__':
+    unittest.main()
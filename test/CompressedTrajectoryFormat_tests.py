@@ -0,0 +1,91 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+import trajtracker
+from trajtracker.io import CompressedTrajectoryFormat
+from trajtracker.io._CompressedTrajectoryFormat import zigzag_encode, zigzag_decode, varint_encode, varint_decode
+
+
+class CompressedTrajectoryFormatTests(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.filename = os.path.join(self.tmpdir, "traj.bin")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def _write(self, fmt, *chunks):
+        with open(self.filename, "wb") as fh:
+            fh.write(fmt.encode_header())
+            for trial_num, xyt in chunks:
+                fh.write(fmt.encode_trial(trial_num, xyt))
+
+
+    #------------------------------------------------------------------
+    def test_zigzag(self):
+        values = np.array([0, -1, 1, -2, 2, -2**40, 2**40], dtype=np.int64)
+        self.assertEqual([0, 1, 2, 3, 4], list(zigzag_encode(values[:5])))
+        self.assertEqual(list(values), list(zigzag_decode(zigzag_encode(values))))
+
+    def test_varint(self):
+        self.assertEqual(b"\x00\x7f\x80\x01\xac\x02", varint_encode([0, 127, 128, 300]))
+        values = np.array([0, 1, 127, 128, 300, 2**35, 2**63 + 5], dtype=np.uint64)
+        self.assertEqual(list(values), list(varint_decode(np.frombuffer(varint_encode(values), dtype=np.uint8))))
+        self.assertEqual(b"", varint_encode([]))
+        self.assertEqual(0, len(varint_decode(np.zeros(0, dtype=np.uint8))))
+
+    def test_varint_incomplete(self):
+        self.assertRaises(trajtracker.BadFormatError, lambda: varint_decode(np.array([0x80], dtype=np.uint8)))
+
+
+    #------------------------------------------------------------------
+    def test_read_write(self):
+        xyt1 = [(1, 2, 0.1), (-3.25, 4, 0.117), (-3.25, 1000.5, 0.2)]
+        self._write(CompressedTrajectoryFormat(xy_precision=2, time_precision=3), (1, xyt1), (2, []), (3, [(5, 6, 0.3)]))
+
+        trials = list(CompressedTrajectoryFormat.read_file(self.filename))
+        self.assertEqual([1, 2, 3], [t[0] for t in trials])
+
+        trial_num, times, x, y = trials[0]
+        self.assertEqual([0.1, 0.117, 0.2], list(times))
+        self.assertEqual([1, -3.25, -3.25], list(x))
+        self.assertEqual([2, 4, 1000.5], list(y))
+        self.assertEqual(0, len(trials[1][1]))
+
+
+    #------------------------------------------------------------------
+    def test_quantized_to_precision(self):
+        self._write(CompressedTrajectoryFormat(xy_precision=1, time_precision=2), (1, [(1.26, 2.04, 0.123)]))
+        trial_num, times, x, y = next(CompressedTrajectoryFormat.read_file(self.filename))
+        self.assertEqual([0.12], list(times))
+        self.assertEqual([1.3], list(x))
+        self.assertEqual([2.0], list(y))
+
+
+    #------------------------------------------------------------------
+    def test_incomplete_chunk_is_ignored(self):
+        self._write(CompressedTrajectoryFormat(), (1, [(1, 2, 0.1)]), (2, [(3, 4, 0.2)]))
+        with open(self.filename, "r+b") as fh:
+            fh.truncate(os.path.getsize(self.filename) - 2)
+
+        self.assertEqual([1], [t[0] for t in CompressedTrajectoryFormat.read_file(self.filename)])
+
+
+    #------------------------------------------------------------------
+    def test_invalid_file(self):
+        with open(self.filename, "w") as fh:
+            fh.write("trial,time,x,y\n1,0.1,1,2\n")
+        self.assertRaises(trajtracker.BadFormatError, lambda: list(CompressedTrajectoryFormat.read_file(self.filename)))
+
+    def test_invalid_args(self):
+        self.assertRaises(trajtracker.ValueError, lambda: CompressedTrajectoryFormat(xy_precision=-1))
+        self.assertRaises(trajtracker.ValueError, lambda: CompressedTrajectoryFormat(compression_level=10))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+import unittest
+
+import trajtracker
+from trajtracker.misc import nvshapes
+from trajtracker.movement import TrajectoryTracker, StartPoint, LineTrajectoryGenerator
+from trajtracker.validators import InstantaneousSpeedValidator, ValidationAxis
+
+
+class EnvironmentTests(unittest.TestCase):
+
+    def tearDown(self):
+        trajtracker.env.validate_arguments = True
+
+
+    #------------------------------------------------------------------
+    def test_validate_arguments_default(self):
+        self.assertTrue(trajtracker.env.validate_arguments)
+        tracker = TrajectoryTracker(enabled=True)
+        self.assertRaises(trajtracker.TypeError, lambda: tracker.update_xyt((0, 0), "x"))
+
+    #------------------------------------------------------------------
+    def test_invalid_value(self):
+        self.assertRaises(Exception, lambda: setattr(trajtracker.env, "validate_arguments", 1))
+
+    #------------------------------------------------------------------
+    def test_no_validation(self):
+        trajtracker.env.validate_arguments = False
+        self.assertFalse(trajtracker.env.validate_arguments)
+
+        tracker = TrajectoryTracker(enabled=True)
+        tracker.update_xyt((0, 0), -1)     # negative time - not validated
+        self.assertEqual([(0, 0, -1)], tracker.get_xyt())
+
+    #------------------------------------------------------------------
+    def test_same_results_with_and_without_validation(self):
+
+        def run():
+            validator = InstantaneousSpeedValidator(axis=ValidationAxis.y, max_speed=200, calculation_interval=0.05)
+            tracker = TrajectoryTracker(enabled=True)
+            errors = []
+            for i in range(20):
+                tracker.update_xyt((0, i * i), i * 0.1)
+                errors.append(validator.update_xyt((0, i * i), i * 0.1))
+            return tracker.get_xyt(), [None if e is None else e.err_code for e in errors]
+
+        with_validation = run()
+        trajtracker.env.validate_arguments = False
+        without_validation = run()
+
+        self.assertEqual(with_validation, without_validation)
+        self.assertIsNotNone(with_validation[1][-1])
+
+    #------------------------------------------------------------------
+    def test_other_methods(self):
+        trajtracker.env.validate_arguments = False
+
+        rect = nvshapes.Rectangle(size=(10, 10), position=(0, 0))
+        self.assertTrue(rect.overlapping_with_position((1, 1)))
+
+        gen = LineTrajectoryGenerator(start_point=(0, 0), end_point=(100, 0), duration=1)
+        self.assertEqual(50, gen.get_traj_point(0.5)['x'])
+
+        trajtracker.env.validate_arguments = True
+        self.assertRaises(trajtracker.TypeError, lambda: gen.get_traj_point("x"))
+
+    #------------------------------------------------------------------
+    def test_restore_validation(self):
+        trajtracker.env.validate_arguments = False
+        trajtracker.env.validate_arguments = True
+        tracker = TrajectoryTracker(enabled=True)
+        self.assertRaises(trajtracker.TypeError, lambda: tracker.update_xyt((0, 0), "x"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -6,7 +6,7 @@ import xml.etree.ElementTree as ET
 
 import trajtracker
 from trajtracker.validators import GlobalSpeedValidator, ValidationAxis, ExperimentError
-from ttrk_testing import DummyStimulus
+from ttrk_testing import DummyStimulus, random_trajectory, assert_same_as_streaming
 
 
 class GlobalSpeedValidatorTests(unittest.TestCase):
@@ -296,5 +296,24 @@ class DbgGlobalSpeedGuide(trajtracker.validators.GlobalSpeedGuide):
         return DummyStimulus()
 
 
+class GlobalSpeedValidateTrajectoryTests(unittest.TestCase):
+
+    #------------------------------------------
+    def test_same_as_streaming(self):
+        rand = np.random.RandomState(1)
+        for milestones in None, [(.5, .3), (.5, .7)]:
+            for grace_period in 0, 0.2:
+                for _ in range(10):
+                    times, xs, ys = random_trajectory(rand, 50, dy=(0, 6))
+                    validator = GlobalSpeedValidator(origin_coord=0, end_coord=200, max_movement_time=1,
+                                                     grace_period=grace_period, milestones=milestones)
+                    assert_same_as_streaming(self, validator, times, xs, ys, lambda: validator.movement_started(times[0]))
+
+    #------------------------------------------
+    def test_not_initialized(self):
+        validator = GlobalSpeedValidator(origin_coord=0, end_coord=200)
+        self.assertRaises(trajtracker.InvalidStateError, lambda: validator.validate_trajectory([0, 1], [0, 0], [0, 1]))
+
+
 if __name__ == '__main__':
     unittest.main()
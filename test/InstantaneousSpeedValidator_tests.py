@@ -1,11 +1,14 @@
 import unittest
 
+import numpy as np
+
 import xml.etree.ElementTree as ET
 
 import trajtracker
 
 
 from trajtracker.validators import InstantaneousSpeedValidator, ValidationAxis, ExperimentError
+from ttrk_testing import assert_same_as_streaming
 
 
 
@@ -118,6 +121,28 @@ class InstantaneousSpeedValidatorTests(unittest.TestCase):
         self.assertIsNotNone(validator.update_xyt((2.99, 4), 1))
 
 
+class InstantaneousSpeedValidateTrajectoryTests(unittest.TestCase):
+
+    #------------------------------------------
+    def test_same_as_streaming(self):
+        rand = np.random.RandomState(0)
+        for axis in ValidationAxis.x, ValidationAxis.y, ValidationAxis.xy:
+            for _ in range(10):
+                n = 60
+                times = np.round(np.cumsum(rand.uniform(0.005, 0.03, n)), 4)
+                xs = np.cumsum(rand.randint(-2, 3, n))
+                ys = np.cumsum(rand.randint(0, 4, n))
+                validator = InstantaneousSpeedValidator(axis=axis, min_speed=10, max_speed=150, max_stop_duration=0.05,
+                                                        grace_period=0.1, calculation_interval=0.05)
+                assert_same_as_streaming(self, validator, times, xs, ys, lambda: validator.reset(0), time0=0)
+
+    #------------------------------------------
+    def test_validate_trajectory_args(self):
+        validator = InstantaneousSpeedValidator(min_speed=1)
+        self.assertRaises(trajtracker.ValueError, lambda: validator.validate_trajectory([0, 1], [0, 0], [0]))
+        self.assertRaises(trajtracker.InvalidStateError, lambda: validator.validate_trajectory([0, 2, 1], [0, 0, 0], [0, 1, 2]))
+        self.assertEqual((None, None), validator.validate_trajectory([], [], []))
+
 
 if __name__ == '__main__':
     unittest.main()
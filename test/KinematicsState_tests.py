@@ -0,0 +1,200 @@
+import unittest
+
+import numpy as np
+
+import trajtracker
+from trajtracker.movement import KinematicsState, SpeedMonitor, DirectionMonitor
+from trajtracker.validators import InstantaneousSpeedValidator, MovementAngleValidator, NCurvesValidator, ValidationAxis
+
+
+class KinematicsStateTests(unittest.TestCase):
+
+    #---------------------------------------------------------
+    def test_config(self):
+        k = KinematicsState(0.1, 5)
+        self.assertEqual(0.1, k.calculation_interval)
+        self.assertEqual(5, k.heading_min_distance)
+        self.assertRaises(trajtracker.TypeError, lambda: setattr(k, "calculation_interval", ""))
+        self.assertRaises(trajtracker.ValueError, lambda: setattr(k, "heading_min_distance", -1))
+
+    #---------------------------------------------------------
+    def test_time_moves_backwards(self):
+        k = KinematicsState()
+        k.update_xyt((1, 1), 1)
+        k.update_xyt((1, 2), 2)
+        self.assertRaises(trajtracker.InvalidStateError, lambda: k.update_xyt((1, 1), 1))
+
+        k.reset(1)
+        self.assertRaises(trajtracker.InvalidStateError, lambda: k.update_xyt((1, 1), 0.5))
+
+    #---------------------------------------------------------
+    def test_same_sample_is_ignored(self):
+        k = KinematicsState()
+        k.update_xyt((0, 0), 0)
+        k.update_xyt((0, 10), 1)
+        k.update_xyt((0, 10), 1)
+        k.update_xyt((0, 20), 1)
+        self.assertEqual(2, k.n_samples)
+        self.assertEqual(10, k.distance)
+        self.assertEqual((0, 10), k.position)
+
+    #---------------------------------------------------------
+    def test_displacement_and_distance(self):
+        k = KinematicsState()
+        self.assertIsNone(k.displacement)
+        k.update_xyt((10, 10), 0)
+        k.update_xyt((13, 14), 1)
+        k.update_xyt((10, 10), 2)
+        self.assertEqual((0, 0), k.displacement)
+        self.assertEqual(10, k.distance)
+        self.assertEqual(2, k.time_in_trial)
+
+    #---------------------------------------------------------
+    def test_speed_same_as_speed_monitor(self):
+        k = KinematicsState(0.1)
+        m = SpeedMonitor(0.1)
+        k.reset(0)
+        m.reset(0)
+
+        rand = np.random.RandomState(1)
+        for i in range(1, 100):
+            xy = (int(rand.randint(0, 3)), i * 2)
+            k.update_xyt(xy, i * 0.03)
+            m.update_xyt(xy, i * 0.03)
+            self.assertEqual(m.last_calculation_interval, k.last_calculation_interval)
+            self.assertEqual(m.xspeed, k.xspeed)
+            self.assertEqual(m.yspeed, k.yspeed)
+            self.assertAlmostEqual(m.xyspeed or 0, k.xyspeed or 0)
+            self.assertEqual(m.stopped_duration, k.stopped_duration)
+
+    #---------------------------------------------------------
+    def test_stopped_duration(self):
+        k = KinematicsState()
+        k.update_xyt((0, 0), 0)
+        k.update_xyt((0, 10), 1)
+        k.update_xyt((0, 10), 2)
+        k.update_xyt((0, 10), 3.5)
+        self.assertEqual(2.5, k.stopped_duration)
+        k.update_xyt((0, 11), 4)
+        self.assertEqual(0, k.stopped_duration)
+
+    #---------------------------------------------------------
+    def test_heading(self):
+        k = KinematicsState(heading_min_distance=5)
+        k.update_xyt((0, 0), 0)
+        self.assertIsNone(k.heading)
+        k.update_xyt((0, 3), 1)
+        self.assertIsNone(k.heading)
+        k.update_xyt((0, 6), 2)
+        self.assertEqual(0, k.heading)
+        k.update_xyt((10, 6), 3)
+        self.assertAlmostEqual(np.pi / 2, k.heading)
+
+
+    #=====================================================================================
+    #           Shared by validators
+    #=====================================================================================
+
+    #---------------------------------------------------------
+    def test_speed_validator(self):
+        k = KinematicsState(0.1)
+        shared = InstantaneousSpeedValidator(axis=ValidationAxis.y, max_speed=150, kinematics=k)
+        private = InstantaneousSpeedValidator(axis=ValidationAxis.y, max_speed=150, calculation_interval=0.1)
+        self.assertEqual(0.1, shared.calculation_interval)
+
+        k.reset(0)
+        private.reset(0)
+        for i in range(1, 30):
+            xy = (0, i * i)
+            err1 = shared.update_xyt(xy, i * 0.05)
+            err2 = private.update_xyt(xy, i * 0.05)
+            self.assertEqual(err2 is None, err1 is None)
+
+        self.assertIsNotNone(err1)
+
+    #---------------------------------------------------------
+    def test_time_in_trial_same_as_speed_monitor(self):
+        k = KinematicsState()
+        m = SpeedMonitor(0)
+        k.reset(0)
+        m.reset(0)
+        for xy, t in ((0, 0), 0), ((0, 10), 0.1), ((0, 10), 0.2), ((0, 10), 0.7), ((0, 12), 0.8), ((0, 12), 0.9):
+            k.update_xyt(xy, t)
+            m.update_xyt(xy, t)
+            self.assertEqual(m.time_in_trial, k.time_in_trial)
+
+    #---------------------------------------------------------
+    def test_speed_validator_stopped_in_grace_period(self):
+        #-- The finger stops before the grace period ends: the stop is not validated, with private or shared state
+        times = [0, 0.1] + [0.2 + 0.1 * i for i in range(9)]
+        ys = [0] + [10] * 10
+
+        def create_validator(**kwargs):
+            return InstantaneousSpeedValidator(axis=ValidationAxis.y, grace_period=0.5, max_stop_duration=0.2,
+                                               calculation_interval=0, **kwargs)
+
+        private = create_validator()
+        k = KinematicsState()
+        shared = create_validator(kinematics=k)
+        private.reset(0)
+        k.reset(0)
+
+        for t, y in zip(times, ys):
+            self.assertIsNone(private.update_xyt((0, y), t))
+            self.assertIsNone(shared.update_xyt((0, y), t))
+
+        self.assertEqual((None, None), private.validate_trajectory(times, [0] * len(times), ys, time0=0))
+
+    #---------------------------------------------------------
+    def test_angle_validator(self):
+        k = KinematicsState()
+        val = MovementAngleValidator(min_angle=-90, max_angle=90, kinematics=k)
+        self.assertIsNone(val.update_xyt((0, 0), 0))
+        self.assertIsNone(val.update_xyt((0, 1), 1))
+        self.assertIsNotNone(val.update_xyt((0, 0), 2))
+
+    #---------------------------------------------------------
+    def test_several_objects_share_one_state(self):
+        k = KinematicsState(0.1, 0)
+        speed_val = InstantaneousSpeedValidator(axis=ValidationAxis.y, max_speed=100000, kinematics=k)
+        angle_val = MovementAngleValidator(min_angle=-170, max_angle=170, kinematics=k)
+        curves_val = NCurvesValidator(max_curves_per_trial=0, kinematics=k)
+
+        k.reset(0)
+        errors = []
+        for i, xy in enumerate([(0, 0), (0, 10), (10, 20), (10, 30), (0, 40), (0, 50)]):
+            for val in speed_val, angle_val, curves_val:
+                errors.append(val.update_xyt(xy, i * 0.05))
+
+        self.assertEqual(6, k.n_samples)
+        self.assertEqual(3, curves_val.direction_monitor.n_curves)
+        self.assertEqual(trajtracker.validators.NCurvesValidator.err_too_many_curves,
+                         [e for e in errors if e is not None][0].err_code)
+
+    #---------------------------------------------------------
+    def test_curves_validator_needs_heading_min_distance(self):
+        self.assertRaises(trajtracker.ValueError, lambda: NCurvesValidator(kinematics=KinematicsState()))
+
+        val = NCurvesValidator(kinematics=KinematicsState(heading_min_distance=NCurvesValidator.default_min_distance))
+        self.assertEqual(NCurvesValidator().min_distance, val.min_distance)
+
+        k = KinematicsState()
+        k.heading_min_distance = 5
+        self.assertEqual(5, NCurvesValidator(kinematics=k).min_distance)
+
+    #---------------------------------------------------------
+    def test_direction_monitor(self):
+        k = KinematicsState(heading_min_distance=0)
+        m = DirectionMonitor(kinematics=k)
+        m.update_xyt((0, 0), 0)
+        m.update_xyt((0, 10), 1)
+        self.assertEqual(0, m.curr_angle)
+        m.update_xyt((10, 10), 2)
+        self.assertAlmostEqual(90, m.curr_angle)
+
+        m.min_distance = 3
+        self.assertEqual(3, k.heading_min_distance)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -147,6 +147,18 @@ class LocationColorMapTests(unittest.TestCase):
         self.assertIsNone(lcm.get_color_at(4, 0))
         self.assertIsNone(lcm.get_color_at(4, 0, use_mapping=True))
 
+    #-------------------------------------------------------------------------
+    def test_get_colors_at(self):
+        lcm = LocationColorMap(testimage, position=(3,2))
+        xs = [x for x in range(-2, 9) for _ in range(-2, 7)]
+        ys = [y for _ in range(-2, 9) for y in range(-2, 7)]
+        expected = [lcm.get_color_at(x, y) for x, y in zip(xs, ys)]
+        self.assertEqual(expected, list(lcm.get_colors_at(xs, ys)))
+
+        lcm.colormap = dict(zip([(0, 0, c) for c in all_colors], all_colors))
+        expected = [lcm.get_color_at(x, y, use_mapping=True) for x, y in zip(xs, ys)]
+        self.assertEqual(expected, list(lcm.get_colors_at(xs, ys, use_mapping=True)))
+
 
     #-------------------------------------------------------------------------
     def test_invalid_get_color_at_args(self):
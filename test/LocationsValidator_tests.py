@@ -1,10 +1,12 @@
 import unittest
 
+import numpy as np
 import xml.etree.ElementTree as ET
 
 import trajtracker
 from trajtracker.utils import color_rgb_to_num
 from trajtracker.validators import LocationsValidator
+from ttrk_testing import random_trajectory, assert_same_as_streaming
 
 z = (0, 0, 0)
 w = (255, 255, 255)
@@ -118,5 +120,29 @@ class LocationsValidatorTests(unittest.TestCase):
         self.assertEqual(e.arg(LocationsValidator.arg_color), color_rgb_to_num(z))
 
 
+    #------------------------------------------------------------
+    def test_validate_trajectory(self):
+        rand = np.random.RandomState(5)
+        for default_valid in False, True:
+            val = LocationsValidator(testimage, default_valid=default_valid)
+            if default_valid:
+                val.invalid_colors = z
+            else:
+                val.valid_colors = w
+
+            for _ in range(10):
+                #-- Random walks that start in the image's white area and sometimes leave the image
+                times, xs, ys = random_trajectory(rand, 20, dx=(-1, 2), dy=(-1, 2))
+                xs = [x + 1 for x in xs]
+                assert_same_as_streaming(self, val, times, xs, ys, val.reset)
+
+        i, err = val.validate_trajectory([0, 1, 2], [2, 0, 1], [0, -2, 0])
+        self.assertEqual(1, i)
+        self.assertEqual(color_rgb_to_num(z), err.arg(LocationsValidator.arg_color))
+
+        val.enabled = False
+        self.assertEqual([False, False], val.validate_trajectory([0, 1], [0, 0], [-2, -2], return_mask=True).tolist())
+
+
 if __name__ == '__main__':
     unittest.main()
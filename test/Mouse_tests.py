@@ -0,0 +1,44 @@
+import os
+import unittest
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+
+from trajtracker.io import Mouse
+
+
+class MouseTests(unittest.TestCase):
+
+    def setUp(self):
+        pygame.display.init()
+        pygame.display.set_mode((200, 100))
+        pygame.event.clear()
+
+    def tearDown(self):
+        pygame.display.quit()
+
+    def _post_motion(self, pos):
+        pygame.event.post(pygame.event.Event(pygame.MOUSEMOTION, pos=pos, rel=(0, 0), buttons=(0, 0, 0)))
+
+
+    #------------------------------------------------------------------
+    def test_interpolated_motion_samples(self):
+        self._post_motion((100, 50))
+        self._post_motion((110, 40))
+        pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_a))
+        self._post_motion((120, 30))
+
+        samples = Mouse(None).get_interpolated_motion_samples(1.0, 1.3)
+        self.assertEqual([(0, 0), (10, 10), (20, 20)], [s[:2] for s in samples])
+        self.assertAlmostEqual(1.1, samples[0][2])
+        self.assertAlmostEqual(1.2, samples[1][2])
+        self.assertEqual(1.3, samples[2][2])
+
+        #-- Other events remain in the queue; motion events were drained
+        self.assertEqual([pygame.KEYDOWN], [e.type for e in pygame.event.get()])
+        self.assertEqual([], Mouse(None).get_interpolated_motion_samples(1.3, 1.4))
+
+
+if __name__ == '__main__':
+    unittest.main()
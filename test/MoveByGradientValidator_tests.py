@@ -1,9 +1,12 @@
 import unittest
 
+import numpy as np
+
 import xml.etree.ElementTree as ET
 
 import trajtracker
 from trajtracker.validators import MoveByGradientValidator, ExperimentError
+from ttrk_testing import random_trajectory, assert_same_as_streaming
 
 grad = [[(0, 0, i) for i in range(0,100)]]
 
@@ -147,6 +150,31 @@ class MoveByGradientValidatorTests(unittest.TestCase):
         self.assertIsNotNone(val.update_xyt((-20, 0))) # the color here is 30
 
 
+class MoveByGradientValidateTrajectoryTests(unittest.TestCase):
+
+    #------------------------------------------
+    def test_same_as_streaming(self):
+        rand = np.random.RandomState(4)
+        for cyclic in False, True:
+            for max_valid_back_movement in 0, 3:
+                for _ in range(10):
+                    times, xs, ys = random_trajectory(rand, 40, dx=(-3, 5), dy=(0, 1))
+                    xs = [x - 50 for x in xs]
+                    validator = MoveByGradientValidator(grad, cyclic=cyclic, max_valid_back_movement=max_valid_back_movement)
+                    assert_same_as_streaming(self, validator, times, xs, [0] * len(xs), lambda: validator.reset(0))
+
+    #------------------------------------------
+    def test_same_as_streaming_out_of_range(self):
+        rand = np.random.RandomState(5)
+        for rgb_should_ascend in True, False:
+            for max_valid_back_movement in 0, 3:
+                for _ in range(10):
+                    times, xs, ys = random_trajectory(rand, 60, dx=(-8, 9), dy=(0, 1))
+                    ys = rand.choice([0, 0, 0, 5], len(xs)).tolist()  # y=5 is out of the gradient's range
+                    validator = MoveByGradientValidator(grad, rgb_should_ascend=rgb_should_ascend,
+                                                        max_valid_back_movement=max_valid_back_movement)
+                    assert_same_as_streaming(self, validator, times, xs, ys, lambda: validator.reset(0))
+
 
 if __name__ == '__main__':
     unittest.main()
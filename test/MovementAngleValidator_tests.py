@@ -1,9 +1,12 @@
 import unittest
 
+import numpy as np
+
 import xml.etree.ElementTree as ET
 
 import trajtracker
 from trajtracker.validators import MovementAngleValidator, ExperimentError
+from ttrk_testing import random_trajectory, assert_same_as_streaming
 
 
 class DirectionValidatorTestCase(unittest.TestCase):
@@ -158,6 +161,19 @@ class DirectionValidatorTestCase(unittest.TestCase):
         self.assertIsNone(val.update_xyt((0, 1), 0.3))   # Moving back in a valid direction
 
 
+class MovementAngleValidateTrajectoryTests(unittest.TestCase):
+
+    #------------------------------------------
+    def test_same_as_streaming(self):
+        rand = np.random.RandomState(2)
+        for calc_angle_interval in 0, 5:
+            for grace_period in 0, 0.1:
+                for _ in range(10):
+                    times, xs, ys = random_trajectory(rand, 50, dx=(-3, 4), dy=(-1, 4))
+                    validator = MovementAngleValidator(min_angle=-60, max_angle=60, calc_angle_interval=calc_angle_interval,
+                                                       grace_period=grace_period)
+                    assert_same_as_streaming(self, validator, times, xs, ys, lambda: validator.reset(0))
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,117 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+import trajtracker
+from trajtracker.io import MultiFileLoader
+from trajtracker.movement import TrajectoryTracker
+
+
+class MultiFileLoaderTests(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def _write_trajectory(self, name, trials, file_format=TrajectoryTracker.FileFormat.CSV):
+        filename = os.path.join(self.tmpdir, name)
+        tracker = TrajectoryTracker(enabled=True)
+        tracker.init_output_file(filename, xy_precision=2, time_precision=3, file_format=file_format)
+        for trial_num, xyt in trials:
+            tracker.reset()
+            for x, y, t in xyt:
+                tracker.update_xyt((x, y), t)
+            tracker.save_to_file(trial_num)
+        tracker.close_output_file()
+        return filename
+
+    def _write_text(self, name, text):
+        filename = os.path.join(self.tmpdir, name)
+        with open(filename, "w") as fh:
+            fh.write(text)
+        return filename
+
+
+    #------------------------------------------------------------------
+    def test_trajectory_formats(self):
+        trials = [(1, [(1, 2, 0.1), (3.5, 4, 0.2)]), (2, [(5, 6, 0.3)])]
+        filenames = [self._write_trajectory("s.csv", trials),
+                     self._write_trajectory("s.bin", trials, TrajectoryTracker.FileFormat.Binary),
+                     self._write_trajectory("s.trz", trials, TrajectoryTracker.FileFormat.Compressed)]
+
+        results = MultiFileLoader(max_workers=1).load_trajectory_files(filenames)
+        self.assertEqual(filenames, [r.filename for r in results])
+
+        for r in results:
+            self.assertIsNone(r.error)
+            trial, times, x, y = r.data
+            self.assertEqual(np.int32, trial.dtype)
+            self.assertEqual([1, 1, 2], list(trial))
+            self.assertEqual([0.1, 0.2, 0.3], list(times))
+            self.assertEqual([1, 3.5, 5], list(x))
+            self.assertEqual([2, 4, 6], list(y))
+
+
+    #------------------------------------------------------------------
+    def test_process_pool_ordering_and_errors(self):
+        filenames = []
+        for i in range(6):
+            filenames.append(self._write_trajectory("s{:}.csv".format(i), [(i, [(i, j, 0.1 * j) for j in range(1 + i)])]))
+        filenames.insert(2, os.path.join(self.tmpdir, "missing.csv"))
+        filenames.insert(4, self._write_text("bad.csv", "a,b\n1,2\n"))
+
+        results = MultiFileLoader(max_workers=3).load_trajectory_files(filenames)
+
+        self.assertEqual(filenames, [r.filename for r in results])
+        self.assertIsInstance(results[2].error, (IOError, OSError))
+        self.assertIsInstance(results[4].error, trajtracker.BadFormatError)
+        self.assertIsNone(results[2].data)
+
+        ok = [r for r in results if r.error is None]
+        self.assertEqual(6, len(ok))
+        for i, r in enumerate(ok):
+            self.assertEqual([i] * (1 + i), list(r.data[0]))
+
+
+    #------------------------------------------------------------------
+    def test_glob_pattern(self):
+        self._write_trajectory("b_traj.csv", [(1, [(1, 2, 0.1)])])
+        self._write_trajectory("a_traj.csv", [(2, [(1, 2, 0.1)])])
+        self._write_text("other.csv", "x\n")
+
+        results = MultiFileLoader(max_workers=2).load_trajectory_files(os.path.join(self.tmpdir, "*_traj.csv"))
+        self.assertEqual(["a_traj.csv", "b_traj.csv"], [os.path.basename(r.filename) for r in results])
+        self.assertEqual([2], list(results[0].data[0]))
+
+
+    #------------------------------------------------------------------
+    def test_csv_files(self):
+        f1 = self._write_text("t1.csv", "Trial,Target,Resp\n1,50,a\n2,30.5,b\n")
+        f2 = self._write_text("t2.csv", "trial,target,resp\n")
+        f3 = self._write_text("t3.csv", "trial,target\n1\n")
+
+        results = MultiFileLoader(max_workers=1).load_csv_files([f1, f2, f3], column_types=dict(Trial=int))
+
+        data = results[0].data
+        self.assertEqual(["trial", "target", "resp"], list(data.keys()))
+        self.assertEqual(int, type(data["trial"][0].item()))
+        self.assertEqual([50, 30.5], list(data["target"]))
+        self.assertEqual(["a", "b"], list(data["resp"]))
+
+        self.assertEqual(0, len(results[1].data["target"]))
+        self.assertIsInstance(results[2].error, trajtracker.BadFormatError)
+
+
+    #------------------------------------------------------------------
+    def test_max_workers(self):
+        self.assertRaises(trajtracker.ValueError, lambda: MultiFileLoader(max_workers=0))
+        self.assertRaises(trajtracker.TypeError, lambda: MultiFileLoader(max_workers=1.5))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+import unittest
+
+import trajtracker
+from trajtracker.movement import MultiPointerTrajectoryTracker
+from ttrk_testing import DummyFileHandle
+
+
+class MultiPointerTrajectoryTrackerForTesting(MultiPointerTrajectoryTracker):
+
+    def _open_file(self, filename, mode):
+        self._file_data = DummyFileHandle()
+        return self._file_data
+
+
+class MultiPointerTrajectoryTrackerTests(unittest.TestCase):
+
+    #------------------------------------------------------------------
+    def test_track(self):
+        ttrk = MultiPointerTrajectoryTrackerForTesting(enabled=True, initial_capacity=2)
+        ttrk.init_output_file("stam", xy_precision=1, time_precision=1)
+
+        ttrk.update_xyt_multi({1: (10, 20), 2: (30, 40.5)}, 0.1)
+        ttrk.update_xyt_multi({1: (11, 21)}, 0.2)
+        ttrk.update_xyt_multi({1: (11, 21), 2: (31, 41)}, 0.3)
+
+        pointer_ids, times, x, y = ttrk.get_columns()
+        self.assertEqual([1, 2, 1, 2], list(pointer_ids))
+        self.assertEqual([0.1, 0.1, 0.2, 0.3], list(times))
+        self.assertEqual([10, 30, 11, 31], list(x))
+        self.assertFalse(x.flags.writeable)
+
+        self.assertEqual([1, 2], ttrk.pointer_ids)
+        self.assertEqual([[30, 40.5, 0.1], [31, 41, 0.3]], ttrk.get_pointer_xyt(2).tolist())
+        self.assertFalse(ttrk.get_pointer_xyt(2).flags.writeable)
+        self.assertEqual((0, 3), ttrk.get_pointer_xyt(3).shape)
+
+        self.assertEqual(4, ttrk.save_to_file(5))
+        self.assertEqual("trial,pointer,time,x,y\n5,1,0.1,10,20\n5,2,0.1,30,40.5\n5,1,0.2,11,21\n5,2,0.3,31,41\n",
+                         ttrk._file_data.data)
+
+
+    #------------------------------------------------------------------
+    def test_track_if_no_movement(self):
+        ttrk = MultiPointerTrajectoryTracker(enabled=True, track_if_no_movement=True)
+        ttrk.update_xyt_multi({1: (10, 20)}, 0.1)
+        ttrk.update_xyt_multi({1: (10, 20)}, 0.2)
+        self.assertEqual(2, len(ttrk.get_columns()[0]))
+
+
+    #------------------------------------------------------------------
+    def test_reset_and_disabled(self):
+        ttrk = MultiPointerTrajectoryTracker(enabled=True)
+        ttrk.update_xyt_multi({1: (10, 20)}, 0.1)
+        ttrk.reset()
+        self.assertEqual(0, len(ttrk.get_columns()[0]))
+
+        #-- After reset, the same position is tracked again
+        ttrk.update_xyt_multi({1: (10, 20)}, 0.1)
+        self.assertEqual(1, len(ttrk.get_columns()[0]))
+
+        ttrk.enabled = False
+        ttrk.update_xyt_multi({1: (11, 20)}, 0.2)
+        self.assertEqual(1, len(ttrk.get_columns()[0]))
+
+
+    #------------------------------------------------------------------
+    def test_single_pointer_api(self):
+        ttrk = MultiPointerTrajectoryTracker(enabled=True)
+        ttrk.update_xyt((1, 2), 0.1)
+        self.assertEqual([[1, 2, 0.1]], ttrk.get_pointer_xyt(0).tolist())
+
+
+    #------------------------------------------------------------------
+    def test_errors(self):
+        ttrk = MultiPointerTrajectoryTracker(enabled=True)
+        self.assertRaises(trajtracker.InvalidStateError, lambda: ttrk.save_to_file(1))
+        self.assertRaises(trajtracker.TypeError, lambda: ttrk.update_xyt_multi([(1, 2)], 0.1))
+        self.assertRaises(trajtracker.ValueError, lambda: ttrk.update_xyt_multi({1: (1, 2)}, -1))
+        self.assertRaises(trajtracker.TypeError, lambda: ttrk.update_xyt_multi({1: (1, "a")}, 0.1))
+        self.assertRaises(trajtracker.TypeError, lambda: ttrk.update_xyt_multi({1: (1, 2, 3)}, 0.1))
+        self.assertRaises(trajtracker.TypeError, lambda: ttrk.update_xyt_multi({"a": (1, 2)}, 0.1))
+        self.assertEqual(0, len(ttrk.get_columns()[0]))
+
+
+    #------------------------------------------------------------------
+    def test_lean_path(self):
+        trajtracker.env.validate_arguments = False
+        try:
+            ttrk = MultiPointerTrajectoryTracker(enabled=True)
+            ttrk.update_xyt((1, 2), 0.1)
+            ttrk.update_xyt_multi({0: (3, 4), 1: (5, 6)}, 0.2)
+            self.assertEqual([[1, 2, 0.1], [3, 4, 0.2]], ttrk.get_pointer_xyt(0).tolist())
+            self.assertEqual([[5, 6, 0.2]], ttrk.get_pointer_xyt(1).tolist())
+        finally:
+            trajtracker.env.validate_arguments = True
+
+        ttrk.reset()
+        self.assertEqual(0, len(ttrk.get_pointer_xyt(0)))
+
+
+if __name__ == '__main__':
+    unittest.main()
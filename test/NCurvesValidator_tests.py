@@ -1,9 +1,12 @@
 import unittest
 
+import numpy as np
+
 import xml.etree.ElementTree as ET
 
 import trajtracker
 from trajtracker.validators import NCurvesValidator, ExperimentError
+from ttrk_testing import random_trajectory, assert_same_as_streaming
 
 
 class NCurvesValidatorTests(unittest.TestCase):
@@ -59,5 +62,16 @@ class DirectionMonitorDbg(object):
         return self._n_curves
 
 
+class NCurvesValidateTrajectoryTests(unittest.TestCase):
+
+    #------------------------------------------
+    def test_same_as_streaming(self):
+        rand = np.random.RandomState(3)
+        for _ in range(20):
+            times, xs, ys = random_trajectory(rand, 80, dx=(-8, 9), dy=(0, 3))
+            validator = NCurvesValidator(max_curves_per_trial=2)
+            assert_same_as_streaming(self, validator, times, xs, ys, lambda: validator.reset(0))
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,93 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import trajtracker
+from trajtracker.io import SQLiteTrialStore
+from trajtracker.movement import TrajectoryTracker
+
+
+class SQLiteTrialStoreTests(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.filename = os.path.join(self.tmpdir, "session.db")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+
+    #------------------------------------------------------------------
+    def test_samples(self):
+        with SQLiteTrialStore(self.filename) as store:
+            store.add_trial(1, [(1, 2, 0.1), (3, 4, 0.2)])
+            store.add_trial(2, [(5, 6, 0.3)])
+
+            self.assertEqual([[1, 2, 0.1], [3, 4, 0.2]], store.get_trial(1).tolist())
+            self.assertEqual([(2,)], store.query("SELECT DISTINCT trial FROM samples WHERE time > ?", (0.25,)))
+
+            #-- Replace a trial
+            store.add_trial(1, [(7, 8, 0.5)])
+            self.assertEqual([[7, 8, 0.5]], store.get_trial(1).tolist())
+            self.assertEqual((0, 3), store.get_trial(3).shape)
+
+
+    #------------------------------------------------------------------
+    def test_trial_results(self):
+        with SQLiteTrialStore(self.filename) as store:
+            store.add_trial_results(1, dict(touch_time=1.5, response="a"))
+            store.add_trial_results(2, dict(touch_time=0.9))
+            store.add_trial_results(2, dict(success=True))
+
+            self.assertEqual([(1,)], store.query("SELECT trial FROM trials WHERE touch_time > 1.2"))
+            self.assertEqual([(1, None), (2, 1)], store.query("SELECT trial, success FROM trials ORDER BY trial"))
+
+
+    #------------------------------------------------------------------
+    def test_reopen(self):
+        with SQLiteTrialStore(self.filename) as store:
+            store.add_trial(1, [(1, 2, 0.1)])
+            store.add_trial_results(1, dict(rt=1.5))
+
+        with SQLiteTrialStore(self.filename) as store:
+            store.add_trial_results(2, dict(rt=2.5))
+            self.assertEqual([(1, 1.5), (2, 2.5)], store.query("SELECT trial, rt FROM trials ORDER BY trial"))
+            self.assertEqual(1, len(store.get_trial(1)))
+
+            #-- Column names are case-insensitive
+            store.add_trial_results(3, dict(RT=3.5))
+            self.assertEqual([(3, 3.5)], store.query("SELECT trial, rt FROM trials WHERE trial=3"))
+
+
+    #------------------------------------------------------------------
+    def test_tracker_bridge(self):
+        tracker = TrajectoryTracker(enabled=True)
+        tracker.init_output_file(os.path.join(self.tmpdir, "traj.csv"))
+        store = SQLiteTrialStore(self.filename)
+        tracker.add_trial_store(store)
+
+        tracker.update_xyt((1, 2), 0.1)
+        tracker.save_to_file(5)
+        tracker.close_output_file()
+
+        self.assertEqual([[1, 2, 0.1]], store.get_trial(5).tolist())
+        store.close()
+
+
+    #------------------------------------------------------------------
+    def test_errors(self):
+        store = SQLiteTrialStore(self.filename)
+        self.assertRaises(trajtracker.ValueError, lambda: store.add_trial_results(1, {"a b": 1}))
+        self.assertRaises(trajtracker.ValueError, lambda: store.add_trial_results(1, {"trial": 1}))
+        self.assertRaises(trajtracker.ValueError, lambda: store.add_trial_results(1, {"rt": 1, "RT": 2}))
+        self.assertRaises(trajtracker.TypeError, lambda: store.add_trial_results(1, {"a": [1]}))
+        self.assertRaises(trajtracker.TypeError, lambda: store.add_trial("a", []))
+        store.close()
+        store.close()
+        self.assertTrue(store.closed)
+        self.assertRaises(trajtracker.InvalidStateError, lambda: store.add_trial(1, []))
+
+
+if __name__ == '__main__':
+    unittest.main()
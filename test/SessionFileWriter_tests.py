@@ -0,0 +1,121 @@
+import unittest
+
+import trajtracker
+from trajtracker.io import SessionFileWriter
+from ttrk_testing import DummyFileHandle
+
+
+FlushPolicy = SessionFileWriter.FlushPolicy
+
+
+class DummyOpener(object):
+
+    def __init__(self):
+        self.fh = None
+        self.n_opened = 0
+
+    def __call__(self, filename, mode):
+        self.n_opened += 1
+        self.fh = DummyFileHandle()
+        return self.fh
+
+
+class SessionFileWriterTests(unittest.TestCase):
+
+    #------------------------------------------------------------------
+    def test_flush_every_trial(self):
+        opener = DummyOpener()
+        writer = SessionFileWriter("stam", open_file=opener)
+
+        writer.write("a")
+        self.assertEqual("", opener.fh.data)
+        writer.end_trial()
+        self.assertEqual("a", opener.fh.data)
+        writer.write_trial("b")
+        self.assertEqual("ab", opener.fh.data)
+        self.assertEqual(1, opener.n_opened)
+
+
+    #------------------------------------------------------------------
+    def test_flush_every_n_trials(self):
+        opener = DummyOpener()
+        writer = SessionFileWriter("stam", flush_policy=FlushPolicy.EveryNTrials, flush_interval=2, open_file=opener)
+
+        writer.write_trial("a")
+        self.assertEqual("", opener.fh.data)
+        writer.write_trial("b")
+        self.assertEqual("ab", opener.fh.data)
+        writer.write_trial("c")
+        self.assertEqual("ab", opener.fh.data)
+
+
+    #------------------------------------------------------------------
+    def test_flush_every_n_bytes(self):
+        opener = DummyOpener()
+        writer = SessionFileWriter("stam", flush_policy=FlushPolicy.EveryNBytes, flush_interval=3, open_file=opener)
+
+        writer.write("ab")
+        writer.end_trial()
+        self.assertEqual("", opener.fh.data)
+        writer.write("cd")
+        self.assertEqual("abcd", opener.fh.data)
+
+
+    #------------------------------------------------------------------
+    def test_flush_on_close(self):
+        opener = DummyOpener()
+        writer = SessionFileWriter("stam", flush_policy=FlushPolicy.OnClose, open_file=opener)
+
+        writer.write_trial("a")
+        writer.write_trial("b")
+        self.assertEqual("", opener.fh.data)
+        self.assertEqual(2, writer.position)
+
+        writer.close()
+        self.assertEqual("ab", opener.fh.data)
+        self.assertTrue(writer.closed)
+        writer.close()  # 2nd call has no effect
+
+        self.assertRaises(trajtracker.InvalidStateError, lambda: writer.write("c"))
+
+
+    #------------------------------------------------------------------
+    def test_on_flush(self):
+        opener = DummyOpener()
+        flushed_data = []
+        writer = SessionFileWriter("stam", flush_policy=FlushPolicy.EveryNTrials, flush_interval=2, open_file=opener,
+                                   on_flush=lambda: flushed_data.append(opener.fh.data))
+
+        writer.write_trial("a")
+        self.assertEqual([], flushed_data)
+        writer.write_trial("b")
+        self.assertEqual(["ab"], flushed_data)
+        writer.write_trial("c")
+        writer.close()
+        self.assertEqual(["ab", "abc"], flushed_data)
+
+        self.assertRaises(trajtracker.TypeError, lambda: SessionFileWriter("stam", open_file=opener, on_flush=1))
+
+
+    #------------------------------------------------------------------
+    def test_context_manager(self):
+        opener = DummyOpener()
+        with SessionFileWriter("stam", flush_policy=FlushPolicy.OnClose, open_file=opener) as writer:
+            writer.write_trial("a")
+            self.assertEqual("", opener.fh.data)
+
+        self.assertEqual("a", opener.fh.data)
+        self.assertTrue(writer.closed)
+
+
+    #------------------------------------------------------------------
+    def test_invalid_config(self):
+        opener = DummyOpener()
+        self.assertRaises(trajtracker.ValueError, lambda: SessionFileWriter("stam", mode="r", open_file=opener))
+        self.assertRaises(trajtracker.ValueError, lambda: SessionFileWriter("stam", flush_policy=FlushPolicy.EveryNTrials, open_file=opener))
+        self.assertRaises(trajtracker.ValueError, lambda: SessionFileWriter("stam", flush_policy=FlushPolicy.EveryNBytes, flush_interval=0, open_file=opener))
+        self.assertRaises(trajtracker.TypeError, lambda: SessionFileWriter("stam", flush_policy="x", open_file=opener))
+
+
+if __name__ == '__main__':
+    unittest.main()
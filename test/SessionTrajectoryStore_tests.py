@@ -0,0 +1,115 @@
+from __future__ import division
+
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+import trajtracker
+from trajtracker.misc import SessionTrajectoryStore
+
+
+def trajectory(trial_num, n_rows=3):
+    return [(trial_num, i, i / 10) for i in range(n_rows)]
+
+
+class SessionTrajectoryStoreTests(unittest.TestCase):
+
+    #------------------------------------------------------------------
+    def test_in_memory(self):
+        with SessionTrajectoryStore(max_trials_in_memory=5) as store:
+            store.add_trial(1, trajectory(1))
+            store.add_trial(2, trajectory(2, 2))
+
+            self.assertEqual(2, len(store))
+            self.assertEqual(2, store.n_trials_in_memory)
+            self.assertTrue(1 in store)
+            self.assertFalse(3 in store)
+            self.assertEqual(trajectory(2, 2), [tuple(row) for row in store.get_trial(2).tolist()])
+            self.assertFalse(store.get_trial(2).flags.writeable)
+
+
+    #------------------------------------------------------------------
+    def test_data_is_copied(self):
+        with SessionTrajectoryStore() as store:
+            xyt = np.array(trajectory(1))
+            store.add_trial(1, xyt)
+            xyt[0, 0] = 100
+            self.assertEqual(1, store.get_trial(1)[0, 0])
+
+
+    #------------------------------------------------------------------
+    def test_spill(self):
+        with SessionTrajectoryStore(max_trials_in_memory=2) as store:
+            for trial_num in range(1, 6):
+                store.add_trial(trial_num, trajectory(trial_num, trial_num))
+
+            self.assertEqual(5, len(store))
+            self.assertEqual(2, store.n_trials_in_memory)
+            for trial_num in range(1, 6):
+                self.assertEqual(trajectory(trial_num, trial_num), [tuple(row) for row in store.get_trial(trial_num).tolist()])
+
+            spill_filename = store._spill_filename
+            self.assertTrue(os.path.exists(spill_filename))
+
+        self.assertFalse(os.path.exists(spill_filename))
+
+
+    #------------------------------------------------------------------
+    def test_spill_to_given_file(self):
+        tmpdir = tempfile.mkdtemp()
+        try:
+            filename = os.path.join(tmpdir, "spill.bin")
+            store = SessionTrajectoryStore(max_trials_in_memory=0, spill_filename=filename)
+            store.add_trial(1, trajectory(1))
+            store.add_trial(2, [])
+            self.assertEqual(0, store.n_trials_in_memory)
+            self.assertEqual(0, len(store.get_trial(2)))
+            self.assertEqual(1, store.get_trial(1)[0, 0])
+            store.close()
+            self.assertTrue(os.path.exists(filename))
+        finally:
+            shutil.rmtree(tmpdir)
+
+
+    #------------------------------------------------------------------
+    def test_replace_trial(self):
+        with SessionTrajectoryStore(max_trials_in_memory=1) as store:
+            store.add_trial(1, trajectory(1))
+            store.add_trial(2, trajectory(2))
+            store.add_trial(1, trajectory(10))
+            self.assertEqual(2, len(store))
+            self.assertEqual(10, store.get_trial(1)[0, 0])
+            self.assertEqual(2, store.get_trial(2)[0, 0])
+
+
+    #------------------------------------------------------------------
+    def test_get_trials_and_to_array(self):
+        with SessionTrajectoryStore(max_trials_in_memory=2) as store:
+            for trial_num in (3, 1, 4, 2):
+                store.add_trial(trial_num, trajectory(trial_num, 2))
+
+            self.assertEqual([2, 3], list(store.get_trials(2, 3).keys()))
+
+            data = store.to_array()
+            self.assertEqual((8, 4), data.shape)
+            self.assertEqual([1, 1, 2, 2, 3, 3, 4, 4], list(data[:, 0]))
+            self.assertEqual([1, 1, 2, 2, 3, 3, 4, 4], list(data[:, 1]))
+            self.assertEqual([0, 0.1] * 4, list(data[:, 3]))
+
+
+    #------------------------------------------------------------------
+    def test_errors(self):
+        store = SessionTrajectoryStore()
+        self.assertRaises(trajtracker.ValueError, lambda: store.get_trial(1))
+        self.assertRaises(trajtracker.TypeError, lambda: store.add_trial("a", []))
+        store.close()
+        store.close()
+        self.assertRaises(trajtracker.InvalidStateError, lambda: store.add_trial(1, []))
+        self.assertRaises(trajtracker.ValueError, lambda: SessionTrajectoryStore(max_trials_in_memory=-1))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,48 @@
+import os
+import time
+import unittest
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+
+import trajtracker
+from trajtracker.io import ThreadSafeMouse, BackgroundMouseSampler
+
+
+class ThreadSafeMouseTests(unittest.TestCase):
+
+    def setUp(self):
+        pygame.display.init()
+        pygame.display.set_mode((200, 100))
+
+    def tearDown(self):
+        pygame.display.quit()
+
+
+    #------------------------------------------------------------------
+    def test_position(self):
+        #-- With the dummy video driver, pygame's mouse is always at the top-left corner
+        self.assertEqual((0, 0), pygame.mouse.get_pos())
+        self.assertEqual((-100, 50), ThreadSafeMouse().position)
+
+
+    #------------------------------------------------------------------
+    def test_sampled_in_background(self):
+        sampler = BackgroundMouseSampler(ThreadSafeMouse(), rate=500)
+        with sampler:
+            time.sleep(0.05)
+        samples = sampler.drain()
+        self.assertGreater(len(samples), 0)
+        self.assertTrue((samples[:, 0] == -100).all())
+        self.assertTrue((samples[:, 1] == 50).all())
+
+
+    #------------------------------------------------------------------
+    def test_no_display(self):
+        pygame.display.quit()
+        self.assertRaises(trajtracker.InvalidStateError, ThreadSafeMouse)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+import unittest
+
+import numpy as np
+
+import trajtracker
+from trajtracker.misc import TrajectoryBuffer
+
+
+class TrajectoryBufferTests(unittest.TestCase):
+
+    #------------------------------------------------------------------
+    def test_append(self):
+        buf = TrajectoryBuffer()
+        buf.append(1, 2.5, 0.1)
+        buf.append(3.5, 4, 0.2)
+
+        self.assertEqual(2, len(buf))
+        self.assertEqual([(1, 2.5, 0.1), (3.5, 4, 0.2)], buf.get_xyt())
+        self.assertTrue(isinstance(buf.get_xyt()[0][0], int))
+        self.assertTrue(isinstance(buf.get_xyt()[1][0], float))
+        self.assertTrue(isinstance(buf.get_xyt()[1][1], int))
+
+
+    #------------------------------------------------------------------
+    def test_grow(self):
+        buf = TrajectoryBuffer(initial_capacity=2)
+        for i in range(5):
+            buf.append(i, i * 2, i / 10.0)
+
+        self.assertEqual(8, buf.capacity)
+        self.assertEqual(5, len(buf))
+        self.assertEqual((4, 8, 0.4), buf.get_xyt()[4])
+        self.assertEqual([1, 2, 0.1], list(buf.xyt[1]))
+
+
+    #------------------------------------------------------------------
+    def test_clear(self):
+        buf = TrajectoryBuffer(initial_capacity=2)
+        buf.append(1, 1, 0.1)
+        buf.append(2, 2, 0.2)
+        buf.append(3, 3, 0.3)
+        buf.clear()
+
+        self.assertEqual(0, len(buf))
+        self.assertEqual([], buf.get_xyt())
+        self.assertEqual((0, 3), buf.xyt.shape)
+        self.assertEqual(4, buf.capacity)
+
+
+    #------------------------------------------------------------------
+    def test_xyt_is_readonly_view(self):
+        buf = TrajectoryBuffer()
+        buf.append(1, 2, 0.1)
+
+        xyt = buf.xyt
+        self.assertEqual((1, 3), xyt.shape)
+        self.assertEqual(np.float64, xyt.dtype)
+        self.assertFalse(xyt.flags.writeable)
+        self.assertFalse(xyt.flags.owndata)
+
+
+    #------------------------------------------------------------------
+    def test_invalid_capacity(self):
+        self.assertRaises(trajtracker.TypeError, lambda: TrajectoryBuffer(initial_capacity=1.5))
+        self.assertRaises(trajtracker.ValueError, lambda: TrajectoryBuffer(initial_capacity=0))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,105 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import trajtracker
+from trajtracker.io import TrajectoryJournal
+
+
+class TrajectoryJournalTests(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.filename = os.path.join(self.tmpdir, "journal.bin")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+
+    #------------------------------------------------------------------
+    def test_recover_unsaved_trial(self):
+        journal = TrajectoryJournal(self.filename, capacity=10)
+        journal.begin_trial()
+        journal.append(1, 2, 0.1)
+        journal.append(3, 4, 0.2)
+        #-- simulate a crash: the journal is not closed
+
+        last_saved_trial, xyt, n_lost = TrajectoryJournal.recover(self.filename)
+        self.assertEqual(-1, last_saved_trial)
+        self.assertEqual([[1, 2, 0.1], [3, 4, 0.2]], xyt.tolist())
+        self.assertEqual(0, n_lost)
+
+
+    #------------------------------------------------------------------
+    def test_nothing_to_recover(self):
+        journal = TrajectoryJournal(self.filename, capacity=10)
+        self.assertIsNone(TrajectoryJournal.recover(self.filename))
+
+        journal.begin_trial()
+        journal.append(1, 2, 0.1)
+        journal.trial_saved(5)
+        journal.close()
+        self.assertIsNone(TrajectoryJournal.recover(self.filename))
+
+
+    #------------------------------------------------------------------
+    def test_begin_trial_discards_previous_samples(self):
+        journal = TrajectoryJournal(self.filename, capacity=10)
+        journal.begin_trial()
+        journal.append(1, 2, 0.1)
+        journal.trial_saved(1)
+        journal.begin_trial()
+        journal.append(5, 6, 0.3)
+        self.assertEqual(1, journal.n_samples)
+
+        last_saved_trial, xyt, n_lost = TrajectoryJournal.recover(self.filename)
+        self.assertEqual(1, last_saved_trial)
+        self.assertEqual([[5, 6, 0.3]], xyt.tolist())
+
+
+    #------------------------------------------------------------------
+    def test_ring_overflow(self):
+        journal = TrajectoryJournal(self.filename, capacity=3, sync_interval=2)
+        journal.begin_trial()
+        for i in range(5):
+            journal.append(i, i, i)
+
+        last_saved_trial, xyt, n_lost = TrajectoryJournal.recover(self.filename)
+        self.assertEqual([2, 3, 4], list(xyt[:, 0]))
+        self.assertEqual(2, n_lost)
+
+
+    #------------------------------------------------------------------
+    def test_unsaved_file_is_not_overwritten(self):
+        journal = TrajectoryJournal(self.filename, capacity=10)
+        journal.begin_trial()
+        journal.append(1, 2, 0.1)
+        journal.close()
+
+        self.assertRaises(trajtracker.InvalidStateError, lambda: TrajectoryJournal(self.filename))
+        TrajectoryJournal(self.filename, overwrite_unsaved=True).close()
+        self.assertIsNone(TrajectoryJournal.recover(self.filename))
+
+
+    #------------------------------------------------------------------
+    def test_invalid_file(self):
+        with open(self.filename, "w") as fh:
+            fh.write("x" * 100)
+        self.assertRaises(trajtracker.BadFormatError, lambda: TrajectoryJournal.recover(self.filename))
+
+    def test_closed(self):
+        journal = TrajectoryJournal(self.filename, capacity=10)
+        journal.close()
+        journal.close()
+        self.assertTrue(journal.closed)
+        self.assertRaises(trajtracker.InvalidStateError, lambda: journal.begin_trial())
+
+    def test_invalid_args(self):
+        self.assertRaises(trajtracker.TypeError, lambda: TrajectoryJournal(self.filename, capacity=1.5))
+        self.assertRaises(trajtracker.ValueError, lambda: TrajectoryJournal(self.filename, capacity=0))
+        self.assertRaises(trajtracker.ValueError, lambda: TrajectoryJournal(self.filename, sync_interval=0))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,116 @@
+import unittest
+
+from expyriment.misc import geometry
+
+import trajtracker
+from trajtracker.movement import TrajectoryPipeline, TrajectoryTracker, DirectionMonitor
+from trajtracker.validators import InstantaneousSpeedValidator, NCurvesValidator, ValidationAxis
+
+
+class RecordingStage(object):
+
+    def __init__(self, result=None):
+        self.calls = []
+        self.result = result
+        self.n_resets = 0
+
+    def reset(self, time0=None):
+        self.n_resets += 1
+
+    def update_xyt(self, position, time_in_trial, time_in_session=None):
+        self.calls.append((position, time_in_trial, time_in_session))
+        return self.result
+
+
+class TrajectoryPipelineTests(unittest.TestCase):
+
+    #------------------------------------------------------------------
+    def test_dispatch(self):
+        tracker = TrajectoryTracker(enabled=True)
+        stage = RecordingStage()
+        pipeline = TrajectoryPipeline([tracker, DirectionMonitor(), stage])
+
+        self.assertIsNone(pipeline.update_xyt([1, 2], 0.1))
+        self.assertIsNone(pipeline.update_xyt(geometry.XYPoint(3, 4), 0.2, 5.2))
+
+        self.assertEqual([(1, 2, 0.1), (3, 4, 0.2)], tracker.get_xyt())
+        self.assertEqual([((1, 2), 0.1, None), ((3, 4), 0.2, 5.2)], stage.calls)
+
+        pipeline.reset()
+        self.assertEqual(1, stage.n_resets)
+        self.assertEqual([], tracker.get_xyt())
+
+    def test_first_error_wins(self):
+        validator = InstantaneousSpeedValidator(axis=ValidationAxis.y, max_speed=10)
+        stage = RecordingStage()
+        pipeline = TrajectoryPipeline([validator, stage])
+
+        self.assertIsNone(pipeline.update_xyt((0, 0), 0))
+        err = pipeline.update_xyt((0, 100), 1)
+        self.assertEqual(InstantaneousSpeedValidator.err_too_fast, err.err_code)
+        self.assertEqual(1, len(stage.calls))
+
+    def test_validates_sample(self):
+        stage = RecordingStage()
+        pipeline = TrajectoryPipeline([stage])
+        self.assertRaises(trajtracker.TypeError, lambda: pipeline.update_xyt((0, "a"), 0))
+        self.assertRaises(trajtracker.ValueError, lambda: pipeline.update_xyt((0, 0), -1))
+        self.assertEqual([], stage.calls)
+
+    def test_stages_do_not_validate_again(self):
+        pipeline = TrajectoryPipeline([TrajectoryTracker(enabled=True), DirectionMonitor(), NCurvesValidator(max_curves_per_trial=5),
+                                       InstantaneousSpeedValidator(axis=ValidationAxis.y, max_speed=1000)])
+
+        validate = trajtracker._utils.update_xyt_validate_and_log
+        validated = []
+        trajtracker._utils.update_xyt_validate_and_log = lambda obj, *args: validated.append(obj) or validate(obj, *args)
+        try:
+            pipeline.update_xyt((0, 0), 0)
+            pipeline.update_xyt((0, 5), 0.1)
+        finally:
+            trajtracker._utils.update_xyt_validate_and_log = validate
+
+        self.assertEqual([pipeline, pipeline], validated)
+
+
+    def test_subclass_override_is_called(self):
+
+        class CountingTracker(TrajectoryTracker):
+            n_calls = 0
+
+            def update_xyt(self, position, time_in_trial, time_in_session=None):
+                self.n_calls += 1
+                return super(CountingTracker, self).update_xyt(position, time_in_trial, time_in_session)
+
+        tracker = CountingTracker(enabled=True)
+        pipeline = TrajectoryPipeline([tracker])
+        pipeline.update_xyt((0, 0), 0)
+        pipeline.update_xyt((0, 1), 0.1)
+        self.assertEqual(2, tracker.n_calls)
+        self.assertEqual([(0, 0, 0), (0, 1, 0.1)], tracker.get_xyt())
+
+
+    #------------------------------------------------------------------
+    def test_timing(self):
+        pipeline = TrajectoryPipeline([RecordingStage(), RecordingStage()], record_timing=True)
+        pipeline.add_stage(RecordingStage(), name="last")
+        pipeline.update_xyt((0, 0), 0)
+        pipeline.update_xyt((0, 1), 0.1)
+
+        timing = pipeline.get_timing()
+        self.assertEqual(["RecordingStage", "RecordingStage_2", "last"], list(timing.keys()))
+        self.assertEqual(2, timing["last"]["n_calls"])
+        self.assertGreaterEqual(timing["last"]["max_time"], timing["last"]["mean_time"])
+
+        pipeline.reset_timing()
+        self.assertEqual(0, pipeline.get_timing()["last"]["n_calls"])
+
+    def test_invalid_stage(self):
+        pipeline = TrajectoryPipeline()
+        self.assertRaises(trajtracker.TypeError, lambda: pipeline.add_stage(5))
+        pipeline.add_stage(RecordingStage(), "a")
+        self.assertRaises(trajtracker.ValueError, lambda: pipeline.add_stage(RecordingStage(), "a"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+import unittest
+
+import trajtracker
+from trajtracker.misc import TrajectoryResampler
+
+
+class TrajectoryResamplerTests(unittest.TestCase):
+
+    def _resample(self, resampler, samples):
+        out = []
+        for x, y, t in samples:
+            resampler.add_sample(x, y, t, lambda *p: out.append(p))
+        return out
+
+    def assertSamplesEqual(self, expected, actual):
+        self.assertEqual(len(expected), len(actual))
+        for e, a in zip(expected, actual):
+            for ev, av in zip(e, a):
+                self.assertAlmostEqual(ev, av)
+
+
+    #------------------------------------------------------------------
+    def test_interpolate(self):
+        resampler = TrajectoryResampler(10)
+        out = self._resample(resampler, [(0, 0, 0), (10, 20, 0.25), (20, 20, 0.35)])
+        self.assertSamplesEqual([(0, 0, 0), (4, 8, 0.1), (8, 16, 0.2), (15, 20, 0.3)], out)
+
+
+    #------------------------------------------------------------------
+    def test_irregular_intervals(self):
+        resampler = TrajectoryResampler(100)
+        out = self._resample(resampler, [(0, 0, 1.0), (1, 0, 1.003), (2, 0, 1.004), (5, 0, 1.034)])
+        self.assertSamplesEqual([(0, 0, 1.0), (2.6, 0, 1.01), (3.6, 0, 1.02), (4.6, 0, 1.03)], out)
+
+
+    #------------------------------------------------------------------
+    def test_no_output_before_next_sample(self):
+        resampler = TrajectoryResampler(10)
+        self.assertEqual(1, resampler.add_sample(0, 0, 0, lambda *p: None))
+        self.assertEqual(0, resampler.add_sample(1, 1, 0.05, lambda *p: None))
+        self.assertEqual(1, resampler.add_sample(1, 1, 0.1, lambda *p: None))
+
+
+    #------------------------------------------------------------------
+    def test_reset(self):
+        resampler = TrajectoryResampler(10)
+        self._resample(resampler, [(0, 0, 0), (10, 10, 1)])
+        resampler.reset()
+        out = self._resample(resampler, [(5, 5, 3), (6, 6, 3.1)])
+        self.assertSamplesEqual([(5, 5, 3), (6, 6, 3.1)], out)
+
+
+    #------------------------------------------------------------------
+    def test_invalid_rate(self):
+        self.assertRaises(trajtracker.TypeError, lambda: TrajectoryResampler("a"))
+        self.assertRaises(trajtracker.ValueError, lambda: TrajectoryResampler(0))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,9 +1,14 @@
+import os
+import shutil
+import tempfile
 import unittest
 
 import xml.etree.ElementTree as ET
 
 import trajtracker
 from trajtracker.movement import TrajectoryTracker
+from trajtracker.misc import SessionTrajectoryStore
+from trajtracker.io import SessionFileWriter, BinaryTrajectoryReader, TrajectoryJournal, CompressedTrajectoryFormat
 from ttrk_testing import DummyFileHandle
 
 
@@ -45,6 +50,232 @@ class TrajectoryTrackerTestCase(unittest.TestCase):
         self.assertEqual((13,3.5,0.3), xyt[1])
 
 
+    #------------------------------------------------------------------
+    def test_save_simplified(self):
+
+        ttrk = TrajectoryTrackerForTesting(enabled=True)
+        ttrk.init_output_file("stam", xy_precision=1, time_precision=1)
+
+        ttrk.update_xyt((0, 0), 0.1)
+        ttrk.update_xyt((1, 1.1), 0.2)
+        ttrk.update_xyt((2, 2), 0.3)
+        ttrk.update_xyt((2, 5), 0.4)
+        self.assertEqual(3, ttrk.save_to_file(1, simplify_max_error=0.5))
+
+        self.assertEqual("trial,time,x,y\n1,0.1,0,0\n1,0.3,2,2\n1,0.4,2,5\n", ttrk._file_data.data)
+        self.assertEqual(4, len(ttrk.get_xyt()))
+
+
+    #------------------------------------------------------------------
+    def test_save_mixed_int_float(self):
+
+        ttrk = TrajectoryTrackerForTesting(enabled=True)
+        ttrk.init_output_file("stam", xy_precision=2, time_precision=1)
+
+        ttrk.update_xyt((1, 2), 0.1)
+        ttrk.update_xyt((1.5, 2), 0.2)
+        ttrk.update_xyt((3, 2.25), 0.3)
+        ttrk.update_xyt((4.125, 5.5), 0.45)
+        ttrk.save_to_file(3)
+        ttrk.reset()
+        ttrk.save_to_file(4)
+
+        self.assertEqual("trial,time,x,y\n3,0.1,1,2\n3,0.2,1.50,2\n3,0.3,3,2.25\n3,0.5,4.12,5.50\n", ttrk._file_data.data)
+
+
+    #------------------------------------------------------------------
+    def test_trial_store(self):
+
+        ttrk = TrajectoryTrackerForTesting(enabled=True)
+        ttrk.init_output_file("stam")
+        store = SessionTrajectoryStore()
+        ttrk.add_trial_store(store)
+        self.assertEqual((store,), ttrk.trial_stores)
+
+        ttrk.update_xyt((0, 0), 0.1)
+        ttrk.update_xyt((1, 1.1), 0.2)
+        ttrk.update_xyt((2, 2), 0.3)
+        ttrk.save_to_file(1, simplify_max_error=1)
+        ttrk.reset()
+
+        self.assertEqual([[0, 0, 0.1], [1, 1.1, 0.2], [2, 2, 0.3]], store.get_trial(1).tolist())
+
+        self.assertRaises(trajtracker.TypeError, lambda: ttrk.add_trial_store("a"))
+
+
+    #------------------------------------------------------------------
+    def test_get_xyt_array(self):
+
+        ttrk = TrajectoryTrackerForTesting(initial_capacity=2)
+        ttrk.enabled = True
+
+        ttrk.update_xyt((1, 1.5), 0.1)
+        ttrk.update_xyt((2, 2.5), 0.2)
+        ttrk.update_xyt((3, 3.5), 0.3)
+
+        xyt = ttrk.get_xyt_array()
+        self.assertEqual((3, 3), xyt.shape)
+        self.assertEqual([3, 3.5, 0.3], list(xyt[2]))
+        self.assertEqual([(1, 1.5, 0.1), (2, 2.5, 0.2), (3, 3.5, 0.3)], ttrk.get_xyt())
+
+        ttrk.reset()
+        self.assertEqual((0, 3), ttrk.get_xyt_array().shape)
+
+
+    #------------------------------------------------------------------
+    def test_binary_format(self):
+
+        tmpdir = tempfile.mkdtemp()
+        try:
+            filename = os.path.join(tmpdir, "traj.bin")
+
+            ttrk = TrajectoryTracker(enabled=True)
+            ttrk.init_output_file(filename, xy_precision=0, file_format=TrajectoryTracker.FileFormat.Binary)
+            ttrk.update_xyt((1, 2), 0.1)
+            ttrk.update_xyt((3, 4), 0.2)
+            ttrk.save_to_file(7)
+            ttrk.close_output_file()
+
+            with BinaryTrajectoryReader(filename) as reader:
+                self.assertEqual([7], reader.trial_nums)
+                times, x, y = reader.get_trial(7)
+                self.assertEqual([0.1, 0.2], list(times))
+                self.assertEqual([1, 3], list(x))
+                self.assertEqual([2, 4], list(y))
+
+        finally:
+            shutil.rmtree(tmpdir)
+
+
+    #------------------------------------------------------------------
+    def test_compressed_format(self):
+
+        tmpdir = tempfile.mkdtemp()
+        try:
+            filename = os.path.join(tmpdir, "traj.bin")
+
+            ttrk = TrajectoryTracker(enabled=True)
+            ttrk.init_output_file(filename, xy_precision=1, file_format=TrajectoryTracker.FileFormat.Compressed)
+            ttrk.update_xyt((1, 2.5), 0.1)
+            ttrk.update_xyt((3, 4), 0.2)
+            ttrk.save_to_file(7)
+            ttrk.close_output_file()
+
+            trials = list(CompressedTrajectoryFormat.read_file(filename))
+            self.assertEqual(1, len(trials))
+            trial_num, times, x, y = trials[0]
+            self.assertEqual(7, trial_num)
+            self.assertEqual([0.1, 0.2], list(times))
+            self.assertEqual([1, 3], list(x))
+            self.assertEqual([2.5, 4], list(y))
+
+        finally:
+            shutil.rmtree(tmpdir)
+
+
+    #------------------------------------------------------------------
+    def test_journal(self):
+
+        tmpdir = tempfile.mkdtemp()
+        try:
+            journal_file = os.path.join(tmpdir, "journal.bin")
+
+            ttrk = TrajectoryTrackerForTesting(enabled=True)
+            ttrk.init_output_file("stam")
+            ttrk.update_xyt((1, 2), 0.1)
+            ttrk.init_journal(journal_file)
+            ttrk.update_xyt((3, 4), 0.2)
+            self.assertEqual([[1, 2, 0.1], [3, 4, 0.2]], TrajectoryJournal.recover(journal_file)[1].tolist())
+
+            ttrk.save_to_file(1)
+            self.assertIsNone(TrajectoryJournal.recover(journal_file))
+
+            ttrk.reset()
+            ttrk.update_xyt((5, 6), 0.1)
+            last_saved_trial, xyt, n_lost = TrajectoryJournal.recover(journal_file)
+            self.assertEqual(1, last_saved_trial)
+            self.assertEqual([[5, 6, 0.1]], xyt.tolist())
+
+            ttrk.close_journal()
+            ttrk.update_xyt((7, 8), 0.2)
+            self.assertEqual(1, len(TrajectoryJournal.recover(journal_file)[1]))
+
+        finally:
+            shutil.rmtree(tmpdir)
+
+
+    #------------------------------------------------------------------
+    def test_journal_with_delayed_flush(self):
+
+        for save_in_background in False, True:
+            for flush_policy, flush_interval in (SessionFileWriter.FlushPolicy.OnClose, None), \
+                                                (SessionFileWriter.FlushPolicy.EveryNTrials, 2):
+                tmpdir = tempfile.mkdtemp()
+                try:
+                    journal_file = os.path.join(tmpdir, "journal.bin")
+
+                    ttrk = TrajectoryTrackerForTesting(enabled=True)
+                    ttrk.init_output_file("stam", xy_precision=1, time_precision=1, flush_policy=flush_policy,
+                                          flush_interval=flush_interval, save_in_background=save_in_background)
+                    ttrk.init_journal(journal_file)
+                    ttrk.update_xyt((1, 2), 0.1)
+                    ttrk.save_to_file(1)
+
+                    #-- The trial is not in the file yet, so it's still in the journal
+                    if save_in_background:
+                        ttrk._background_writer._queue.join()
+                    self.assertEqual("trial,time,x,y\n", ttrk._file_data.data)
+                    last_saved_trial, xyt, n_lost = TrajectoryJournal.recover(journal_file)
+                    self.assertEqual(-1, last_saved_trial)
+                    self.assertEqual([[1, 2, 0.1]], xyt.tolist())
+
+                    #-- Starting the next trial writes the previous trial to the file before discarding its samples
+                    ttrk.reset()
+                    self.assertEqual("trial,time,x,y\n1,0.1,1,2\n", ttrk._file_data.data)
+                    ttrk.update_xyt((3, 4), 0.1)
+                    last_saved_trial, xyt, n_lost = TrajectoryJournal.recover(journal_file)
+                    self.assertEqual(1, last_saved_trial)
+                    self.assertEqual([[3, 4, 0.1]], xyt.tolist())
+
+                    ttrk.save_to_file(2)
+                    ttrk.close_output_file()
+                    self.assertIsNone(TrajectoryJournal.recover(journal_file))
+                    ttrk.close_journal()
+
+                finally:
+                    shutil.rmtree(tmpdir)
+
+
+    #------------------------------------------------------------------
+    def test_resample(self):
+
+        ttrk = TrajectoryTrackerForTesting(enabled=True, resample_rate=10, keep_raw=True)
+        ttrk.init_output_file("stam", xy_precision=1, time_precision=1)
+
+        ttrk.update_xyt((0, 0), 0)
+        ttrk.update_xyt((0, 0), 0.05)
+        ttrk.update_xyt((10, 20), 0.25)
+        ttrk.save_to_file(1)
+
+        self.assertEqual("trial,time,x,y\n1,0.0,0,0\n1,0.1,2.5,5.0\n1,0.2,7.5,15.0\n", ttrk._file_data.data)
+        self.assertEqual(3, len(ttrk.get_raw_xyt_array()))
+
+        ttrk.reset()
+        self.assertEqual(0, len(ttrk.get_xyt_array()))
+        self.assertEqual(0, len(ttrk.get_raw_xyt_array()))
+
+        ttrk.keep_raw = False
+        self.assertRaises(trajtracker.InvalidStateError, lambda: ttrk.get_raw_xyt_array())
+
+    def test_set_resample_rate(self):
+        ttrk = TrajectoryTracker()
+        self.assertIsNone(ttrk.resample_rate)
+        ttrk.resample_rate = 100
+        self.assertEqual(100, ttrk.resample_rate)
+        self.assertRaises(trajtracker.ValueError, lambda: setattr(ttrk, "resample_rate", -1))
+        self.assertRaises(trajtracker.TypeError, lambda: setattr(ttrk, "resample_rate", "a"))
+
+
     #------------------------------------------------------------------
     def test_track_active_inactive(self):
 
@@ -102,6 +333,88 @@ class TrajectoryTrackerTestCase(unittest.TestCase):
         self.assertEqual("trial,time,x,y\n2,0.1,1,1\n2,0.2,1,1\n", ttrk._file_data.data)
 
 
+    #------------------------------------------------------------------
+    def test_file_remains_open(self):
+
+        ttrk = TrajectoryTrackerForTesting()
+        ttrk.enabled = True
+        ttrk.init_output_file("stam", xy_precision=1, time_precision=1,
+                              flush_policy=SessionFileWriter.FlushPolicy.EveryNTrials, flush_interval=2)
+        fh = ttrk._file_data
+
+        ttrk.update_xyt((1, 1), 0.1)
+        ttrk.save_to_file(1)
+        self.assertEqual("trial,time,x,y\n", fh.data)
+
+        ttrk.save_to_file(2)
+        self.assertEqual("trial,time,x,y\n1,0.1,1,1\n2,0.1,1,1\n", fh.data)
+
+        ttrk.save_to_file(3)
+        ttrk.close_output_file()
+        self.assertEqual("trial,time,x,y\n1,0.1,1,1\n2,0.1,1,1\n3,0.1,1,1\n", fh.data)
+        self.assertRaises(trajtracker.InvalidStateError, lambda: ttrk.save_to_file(4))
+
+
+    #------------------------------------------------------------------
+    def test_save_in_background(self):
+
+        ttrk = TrajectoryTrackerForTesting()
+        ttrk.enabled = True
+        ttrk.init_output_file("stam", xy_precision=1, time_precision=1, save_in_background=True)
+
+        ttrk.update_xyt((1, 1.5), 0.1)
+        self.assertEqual(1, ttrk.save_to_file(1))
+
+        #-- The saved data is a snapshot: later changes to the trajectory should not affect it
+        ttrk.reset()
+        ttrk.update_xyt((2, 2.5), 0.2)
+        ttrk.save_to_file(2)
+
+        ttrk.flush_output_file()
+        self.assertEqual("trial,time,x,y\n1,0.1,1,1.5\n2,0.2,2,2.5\n", ttrk._file_data.data)
+
+        ttrk.close_output_file()
+
+
+    #------------------------------------------------------------------
+    def test_close_in_background_without_flush(self):
+
+        ttrk = TrajectoryTrackerForTesting()
+        ttrk.enabled = True
+        ttrk.init_output_file("stam", xy_precision=1, time_precision=1, save_in_background=True,
+                              flush_policy=SessionFileWriter.FlushPolicy.OnClose)
+
+        for trial_num in range(1, 6):
+            ttrk.reset()
+            ttrk.update_xyt((trial_num, 1.5), 0.1)
+            ttrk.save_to_file(trial_num)
+
+        #-- Closing writes all queued trials
+        ttrk.close_output_file()
+        self.assertEqual("trial,time,x,y\n" + "".join("{:},0.1,{:},1.5\n".format(i, i) for i in range(1, 6)),
+                         ttrk._file_data.data)
+
+
+    #------------------------------------------------------------------
+    def test_reinit_in_background(self):
+
+        ttrk = TrajectoryTrackerForTesting()
+        ttrk.enabled = True
+        ttrk.init_output_file("stam", xy_precision=1, time_precision=1, save_in_background=True,
+                              flush_policy=SessionFileWriter.FlushPolicy.OnClose)
+        ttrk.update_xyt((1, 1.5), 0.1)
+        ttrk.save_to_file(1)
+        first_file = ttrk._file_data
+
+        #-- The queued trial is written to the first file, with the first file's precision
+        ttrk.init_output_file("stam2", xy_precision=3, time_precision=3, save_in_background=True)
+        self.assertEqual("trial,time,x,y\n1,0.1,1,1.5\n", first_file.data)
+
+        ttrk.save_to_file(2)
+        ttrk.close_output_file()
+        self.assertEqual("trial,time,x,y\n2,0.100,1,1.500\n", ttrk._file_data.data)
+
+
     #------------------------------------------------------------------
     def test_non_numeric_time(self):
         ttrk = TrajectoryTrackerForTesting()
@@ -0,0 +1,127 @@
+import os
+import shutil
+import tempfile
+import unittest
+from collections import OrderedDict
+
+import numpy as np
+
+import trajtracker
+from trajtracker.io import TrialResultsWriter, SessionFileWriter
+from trajtracker.validators import InstantaneousSpeedValidator, ValidationAxis, ExperimentError, collect_validator_outcomes
+
+
+class TrialResultsWriterTests(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.filename = os.path.join(self.tmpdir, "trials.csv")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def _read(self):
+        with open(self.filename) as fh:
+            return fh.read().splitlines()
+
+
+    #------------------------------------------------------------------
+    def test_schema_from_first_trial(self):
+        writer = TrialResultsWriter(self.filename, float_precision=2)
+        writer.write_trial(OrderedDict([("trial", 1), ("response", 3.14159), ("ok", True), ("msg", 'a,"b"')]))
+        writer.write_trial(dict(trial=np.int64(2), ok=False))
+        self.assertEqual(["trial", "response", "ok", "msg"], writer.columns)
+        writer.close()
+
+        self.assertEqual(['trial,response,ok,msg', '1,3.14,1,"a,""b"""', '2,,0,'], self._read())
+
+    def test_invalid_result_name(self):
+        writer = TrialResultsWriter(self.filename, columns=["trial", "rt"])
+        self.assertRaises(trajtracker.ValueError, lambda: writer.write_trial(dict(trial=1, response=2)))
+        writer.close()
+
+    def test_invalid_columns(self):
+        self.assertRaises(trajtracker.ValueError, lambda: TrialResultsWriter(self.filename, columns=["a", "a"]))
+
+
+    #------------------------------------------------------------------
+    def test_batched_flush(self):
+        writer = TrialResultsWriter(self.filename, columns=["trial"], flush_interval=3)
+        writer.write_trial(dict(trial=1))
+        writer.write_trial(dict(trial=2))
+        self.assertEqual([], self._read())
+
+        writer.write_trial(dict(trial=3))
+        self.assertEqual(["trial", "1", "2", "3"], self._read())
+
+        writer.write_trial(dict(trial=4))
+        writer.close()
+        self.assertEqual(["trial", "1", "2", "3", "4"], self._read())
+
+    def test_flush_every_trial(self):
+        writer = TrialResultsWriter(self.filename, flush_policy=SessionFileWriter.FlushPolicy.EveryTrial)
+        writer.write_trial(dict(trial=1))
+        self.assertEqual(["trial", "1"], self._read())
+        writer.close()
+
+
+    #------------------------------------------------------------------
+    def test_validator_outcomes(self):
+        slow1 = InstantaneousSpeedValidator(axis=ValidationAxis.y, min_speed=1)
+        slow2 = InstantaneousSpeedValidator(axis=ValidationAxis.y, min_speed=10)
+        fast = InstantaneousSpeedValidator(axis=ValidationAxis.y, max_speed=100)
+
+        for v in slow1, slow2, fast:
+            v.update_xyt((0, 0), 0)
+
+        outcomes = collect_validator_outcomes([slow1, slow2, fast], (0, 5), 1)
+        self.assertEqual(["InstantaneousSpeedValidator_1", "InstantaneousSpeedValidator_2", "InstantaneousSpeedValidator_3"],
+                         list(outcomes.keys()))
+        self.assertIsNone(outcomes["InstantaneousSpeedValidator_1"])
+        self.assertIsInstance(outcomes["InstantaneousSpeedValidator_2"], ExperimentError)
+        self.assertIsNone(outcomes["InstantaneousSpeedValidator_3"])
+
+        outcomes = collect_validator_outcomes(OrderedDict([("speed", slow2)]), (0, 6), 2)
+        with TrialResultsWriter(self.filename) as writer:
+            writer.write_trial(outcomes)
+        self.assertEqual(["speed", InstantaneousSpeedValidator.err_too_slow], self._read())
+
+    #------------------------------------------------------------------
+    def test_validator_outcomes_instead_of_loop(self):
+
+        def create_validators():
+            return [InstantaneousSpeedValidator(axis=ValidationAxis.y, max_speed=100, calculation_interval=0),
+                    InstantaneousSpeedValidator(axis=ValidationAxis.y, min_speed=20, calculation_interval=0, grace_period=0.25)]
+
+        samples = [((0, 0), 0), ((0, 5), 0.1), ((0, 10), 0.2), ((0, 11), 0.3), ((0, 40), 0.4)]
+
+        #-- The frame loop: call the validators in order, stop at the first error
+        loop_validators = create_validators()
+        loop_errors = []
+        for position, t in samples:
+            err = None
+            for v in loop_validators:
+                err = v.update_xyt(position, t)
+                if err is not None:
+                    break
+            loop_errors.append(None if err is None else err.err_code)
+
+        #-- The same loop with collect_validator_outcomes(), which is called once per sample
+        validators = create_validators()
+        errors = []
+        for position, t in samples:
+            outcomes = collect_validator_outcomes(validators, position, t)
+            err = next((e for e in outcomes.values() if e is not None), None)
+            errors.append(None if err is None else err.err_code)
+
+        self.assertEqual([None, None, None, InstantaneousSpeedValidator.err_too_slow, InstantaneousSpeedValidator.err_too_fast],
+                         loop_errors)
+        self.assertEqual(loop_errors, errors)
+
+        #-- Each validator was fed each sample exactly once
+        self.assertEqual(InstantaneousSpeedValidator.err_too_fast, outcomes["InstantaneousSpeedValidator_1"].err_code)
+        self.assertIsNone(outcomes["InstantaneousSpeedValidator_2"])
+
+
+if __name__ == '__main__':
+    unittest.main()
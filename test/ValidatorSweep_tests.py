@@ -0,0 +1,117 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+import trajtracker
+from trajtracker.validators import ValidatorSweep, MovementAngleValidator, FingerLiftedValidator
+
+
+#------------------------------------------
+def random_trials(n_trials, seed=0):
+    rand = np.random.RandomState(seed)
+    trials = []
+    for _ in range(n_trials):
+        n = rand.randint(5, 40)
+        times = 0.01 * np.arange(1, n + 1)
+        trials.append((times, rand.randint(-3, 4, n).cumsum(), rand.randint(-1, 4, n).cumsum()))
+    return trials
+
+
+class ValidatorSweepTests(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    #------------------------------------------------------------------
+    def expected_counts(self, configuration, trials):
+        validator = MovementAngleValidator(grace_period=0.05, **configuration)
+        counts = {}
+        for times, x, y in trials:
+            i, err = validator.validate_trajectory(times, x, y)
+            if err is not None:
+                counts[err.err_code] = counts.get(err.err_code, 0) + 1
+        return counts
+
+    #------------------------------------------------------------------
+    def test_grid(self):
+        configurations = ValidatorSweep.grid(min_angle=[-60, -45], max_angle=[45, 60, 90])
+        self.assertEqual(6, len(configurations))
+        self.assertIn(dict(min_angle=-45, max_angle=90), configurations)
+        self.assertRaises(trajtracker.TypeError, lambda: ValidatorSweep.grid(min_angle=[]))
+
+    #------------------------------------------------------------------
+    def test_results(self):
+        trials = random_trials(30)
+        configurations = ValidatorSweep.grid(min_angle=[-90, -45, -20], max_angle=[20, 45, 90])
+
+        for max_workers in 1, 3:
+            sweep = ValidatorSweep(MovementAngleValidator, configurations, fixed_args=dict(grace_period=0.05),
+                                   max_workers=max_workers, tmp_dir=self.tmpdir)
+            results = sweep.run(trials)
+
+            self.assertEqual(len(configurations), len(results))
+            for configuration, result in zip(configurations, results):
+                expected = self.expected_counts(configuration, trials)
+                self.assertEqual(configuration, result.configuration)
+                self.assertEqual(30, result.n_trials)
+                self.assertEqual(expected, dict(result.error_counts))
+                self.assertEqual(sum(expected.values()), result.n_rejected)
+                self.assertAlmostEqual(result.n_rejected / 30, result.rejection_rate)
+                for code, n in expected.items():
+                    self.assertAlmostEqual(n / 30, result.error_rates[code])
+
+            #-- The memory-mapped files were deleted
+            self.assertEqual([], os.listdir(self.tmpdir))
+
+    #------------------------------------------------------------------
+    def test_rejection_rate_decreases_with_wider_range(self):
+        trials = random_trials(30, seed=1)
+        configurations = [dict(min_angle=-a, max_angle=a) for a in (15, 30, 60, 90)]
+        results = ValidatorSweep(MovementAngleValidator, configurations, max_workers=2).run(trials)
+        rates = [r.rejection_rate for r in results]
+        self.assertEqual(sorted(rates, reverse=True), rates)
+
+    #------------------------------------------------------------------
+    def test_keeps_dtype(self):
+        trials = [(times.astype(np.float32), x.astype(np.int16), y.astype(np.int16)) for times, x, y in random_trials(10, seed=2)]
+        configurations = [dict(min_angle=-45, max_angle=45)]
+        sweep = ValidatorSweep(MovementAngleValidator, configurations, fixed_args=dict(grace_period=0.05), max_workers=1)
+
+        times, x, y, offsets = sweep._create_corpus(trials)
+        self.assertEqual(np.float32, times.dtype)
+        self.assertEqual(np.int16, x.dtype)
+        self.assertEqual(np.int16, y.dtype)
+
+        self.assertEqual(self.expected_counts(configurations[0], trials), dict(sweep.run(trials)[0].error_counts))
+
+    #------------------------------------------------------------------
+    def test_no_trials(self):
+        results = ValidatorSweep(MovementAngleValidator, [dict(min_angle=-45)], max_workers=1).run([])
+        self.assertEqual(0, results[0].n_trials)
+        self.assertIsNone(results[0].rejection_rate)
+
+    #------------------------------------------------------------------
+    def test_invalid_args(self):
+        self.assertRaises(trajtracker.TypeError, lambda: ValidatorSweep(1, [dict()]))
+        self.assertRaises(trajtracker.TypeError, lambda: ValidatorSweep(MovementAngleValidator, []))
+        self.assertRaises(trajtracker.TypeError, lambda: ValidatorSweep(MovementAngleValidator, [1]))
+        self.assertRaises(trajtracker.ValueError, lambda: ValidatorSweep(MovementAngleValidator, [dict()], max_workers=0))
+
+        sweep = ValidatorSweep(MovementAngleValidator, [dict(min_angle=-45)], max_workers=1)
+        self.assertRaises(trajtracker.TypeError, lambda: sweep.run([(1, 2)]))
+        self.assertRaises(trajtracker.ValueError, lambda: sweep.run([([0, 1], [0, 1], [0])]))
+
+    #------------------------------------------------------------------
+    def test_validator_without_validate_trajectory(self):
+        sweep = ValidatorSweep(FingerLiftedValidator, [dict()], max_workers=1)
+        self.assertRaises(trajtracker.TypeError, lambda: sweep.run(random_trials(2)))
+
+
+if __name__ == '__main__':
+    unittest.main()
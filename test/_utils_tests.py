@@ -1,5 +1,7 @@
 import unittest
 
+import numpy as np
+
 import trajtracker as ttrk
 # noinspection PyProtectedMember
 import trajtracker._utils as _u
@@ -82,6 +84,27 @@ class _UtilsTests(unittest.TestCase):
         self.assertEqual(False, _u.is_collection(5))
         self.assertEqual(False, _u.is_collection(None))
 
+    def test_is_collection_cached_type(self):
+        self.assertEqual(False, _u.is_collection("ab"))
+        self.assertEqual(False, _u.is_collection("ab"))
+        self.assertEqual(True, _u.is_collection(np.zeros(2)))
+        self.assertEqual(False, _u.is_collection({1, 2}, allow_set=False))
+        self.assertIs(_u.get_type_capabilities([1]), _u.get_type_capabilities([]))
+
+    #------------------------------------------------------------------------------
+    def test_validate_callable(self):
+        _u.validate_attr_type(object(), 'test', len, ttrk.TYPE_CALLABLE)
+        _u.validate_func_arg_type(object(), 'f', 'test', lambda: 0, ttrk.TYPE_CALLABLE)
+        self.assertRaises(ttrk.TypeError, lambda: _u.validate_attr_type(object(), 'test', 5, ttrk.TYPE_CALLABLE))
+        self.assertRaises(ttrk.TypeError, lambda: _u.validate_func_arg_type(object(), 'f', 'test', "x", ttrk.TYPE_CALLABLE))
+
+    def test_validate_func_arg_is_coord_float(self):
+        self.assertEqual([1.5, 2], _u.validate_func_arg_is_coord(object(), 'f', 'test', [1.5, 2], allow_float=True))
+        self.assertEqual((1.5, 2), _u.validate_func_arg_is_coord(object(), 'f', 'test', XYPoint(1.5, 2), allow_float=True))
+        self.assertRaises(ttrk.TypeError, lambda: _u.validate_func_arg_is_coord(object(), 'f', 'test', (1, "x"), allow_float=True))
+        self.assertRaises(ttrk.TypeError, lambda: _u.validate_func_arg_is_coord(object(), 'f', 'test', (1, 2, 3), allow_float=True))
+        self.assertRaises(ttrk.TypeError, lambda: _u.validate_func_arg_is_coord(object(), 'f', 'test', {1, 2}, allow_float=True))
+
     def test_validate_attr_is_collection(self):
         _u.validate_attr_is_collection(object(), 'test', [])
         _u.validate_attr_is_collection(object(), 'test', [1, 2])
@@ -148,5 +171,33 @@ class _UtilsTests(unittest.TestCase):
         self.assertEqual(False, _u.is_whole_number('r'))
         self.assertEqual(False, _u.is_whole_number(None))
 
+
+    #------------------------------------------------------------------------------
+    def test_get_lean_method(self):
+        from trajtracker.movement import TrajectoryTracker
+
+        class OverridesUpdate(TrajectoryTracker):
+            def update_xyt(self, position, time_in_trial, time_in_session=None):
+                return super(OverridesUpdate, self).update_xyt(position, time_in_trial, time_in_session)
+
+        class OverridesImpl(TrajectoryTracker):
+            def _update_xyt_impl(self, position, time_in_trial, time_in_session=None):
+                return super(OverridesImpl, self)._update_xyt_impl(position, time_in_trial, time_in_session)
+
+        self.assertEqual(TrajectoryTracker._update_xyt_impl, _u.get_lean_method(TrajectoryTracker(), "update_xyt").__func__)
+        self.assertEqual(OverridesUpdate.update_xyt, _u.get_lean_method(OverridesUpdate(), "update_xyt").__func__)
+        self.assertEqual(OverridesImpl._update_xyt_impl, _u.get_lean_method(OverridesImpl(), "update_xyt").__func__)
+
+        #-- A method that was not registered
+        obj = XYPoint(1, 2)
+        self.assertEqual(obj.distance, _u.get_lean_method(obj, "distance"))
+
+        #-- The class's method was replaced by the lean method
+        ttrk.env.validate_arguments = False
+        try:
+            self.assertEqual(TrajectoryTracker._update_xyt_impl, _u.get_lean_method(TrajectoryTracker(), "update_xyt").__func__)
+        finally:
+            ttrk.env.validate_arguments = True
+
 if __name__ == '__main__':
     unittest.main()
@@ -4,12 +4,17 @@ class DummyFileHandle(object):
 
     def __init__(self):
         self._data = ""
+        self.n_flushes = 0
 
 
     def write(self, data):
         self._data += data
 
 
+    def flush(self):
+        self.n_flushes += 1
+
+
     def close(self):
         pass
 
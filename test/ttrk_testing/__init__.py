@@ -10,3 +10,4 @@ Dobby tools - utilities for testing
 #  Import the package classes
 from ._DummyFileHandle import DummyFileHandle
 from ._DummyStimulus import DummyStimulus
+from ._validate_trajectory import stream_errors, random_trajectory, assert_same_as_streaming
@@ -0,0 +1,41 @@
+import numpy as np
+
+
+#------------------------------------------
+def stream_errors(validator, times, xs, ys):
+    """ The result of calling validator.update_xyt() for each sample """
+    return [validator.update_xyt((x, y), t) for t, x, y in zip(times, xs, ys)]
+
+
+#------------------------------------------
+def random_trajectory(rand, n, dx=(-2, 3), dy=(0, 4)):
+    """ A random trajectory with n samples: each step moves by a random number of pixels in the range dx / dy """
+    times = [round(t, 4) for t in (0.01 + rand.uniform(0.005, 0.03, n)).cumsum()]
+    xs = rand.randint(dx[0], dx[1], n).cumsum().tolist()
+    ys = rand.randint(dy[0], dy[1], n).cumsum().tolist()
+    return times, xs, ys
+
+
+#------------------------------------------
+def assert_same_as_streaming(test_case, validator, times, xs, ys, reset, **validate_args):
+    """
+    Check that validator.validate_trajectory() returns the same result as calling update_xyt() for each sample.
+
+    :param test_case: The unittest.TestCase
+    :param reset: A function that resets the validator before the samples are streamed
+    :param validate_args: Additional arguments for validate_trajectory()
+    """
+
+    reset()
+    expected = stream_errors(validator, times, xs, ys)
+    mask = validator.validate_trajectory(times, xs, ys, return_mask=True, **validate_args)
+    test_case.assertEqual([e is not None for e in expected], np.asarray(mask).tolist())
+
+    i, err = validator.validate_trajectory(times, xs, ys, **validate_args)
+    failed = [j for j, e in enumerate(expected) if e is not None]
+    if len(failed) == 0:
+        test_case.assertIsNone(i)
+        test_case.assertIsNone(err)
+    else:
+        test_case.assertEqual(failed[0], i)
+        test_case.assertEqual(expected[i].err_code, err.err_code)
@@ -2,6 +2,7 @@ import unittest
 
 import numpy as np
 
+import trajtracker
 import trajtracker.utils as u
 
 
@@ -23,5 +24,71 @@ class UtilsTests(unittest.TestCase):
         self.assertFalse(u.is_rgb([255, -0.5, 255]))
 
 
+    #------------------------------------------------------------------
+    def test_simplify_trajectory_line(self):
+        xyt = [(0, 0, 0), (1, 1.1, 0.1), (2, 1.9, 0.2), (3, 3, 0.3)]
+        self.assertEqual([[0, 0, 0], [3, 3, 0.3]], u.simplify_trajectory(xyt, 0.5).tolist())
+        self.assertEqual([0, 1, 2, 3], list(u.simplify_trajectory(xyt, 0.01, return_indices=True)))
+
+    def test_simplify_trajectory_corner(self):
+        xyt = [(0, 0, 0), (5, 0, 0.1), (10, 0, 0.2), (10, 5, 0.3), (10, 10, 0.4)]
+        self.assertEqual([0, 2, 4], list(u.simplify_trajectory(xyt, 1, return_indices=True)))
+
+    def test_simplify_trajectory_back_and_forth(self):
+        #-- The finger moves forward and returns: the turning point is far from the segment between start and end
+        xyt = [(0, 0, 0), (0, 50, 0.1), (0, 100, 0.2), (0, 50, 0.3), (0, 1, 0.4)]
+        self.assertEqual([0, 2, 4], list(u.simplify_trajectory(xyt, 2, return_indices=True)))
+
+    def test_simplify_trajectory_error_bound(self):
+        rand = np.random.RandomState(0)
+        xy = np.cumsum(rand.uniform(-5, 5, (500, 2)), axis=0)
+        xyt = np.column_stack([xy, np.arange(500) / 60])
+        indices = u.simplify_trajectory(xyt, 3, return_indices=True)
+        self.assertLess(len(indices), 500)
+
+        #-- Each removed point is within max_error from the segment of the retained points around it
+        for first, last in zip(indices[:-1], indices[1:]):
+            a, b = xy[first], xy[last]
+            for p in xy[first + 1:last]:
+                t = np.clip(np.dot(p - a, b - a) / np.dot(b - a, b - a), 0, 1)
+                self.assertLessEqual(np.linalg.norm(p - (a + t * (b - a))), 3 + 1e-9)
+
+    def test_simplify_trajectory_short(self):
+        self.assertEqual(0, len(u.simplify_trajectory(np.zeros((0, 3)), 1)))
+        self.assertEqual([[1, 2, 3]], u.simplify_trajectory([(1, 2, 3)], 1).tolist())
+
+    def test_simplify_trajectory_invalid(self):
+        self.assertRaises(trajtracker.ValueError, lambda: u.simplify_trajectory([(1, 2)], 1))
+        self.assertRaises(trajtracker.ValueError, lambda: u.simplify_trajectory([(1, 2, 3)], -1))
+
+
+    #------------------------------------------------------------------
+    def test_update_xyt_batch(self):
+        from trajtracker.movement import TrajectoryTracker
+        from trajtracker.validators import InstantaneousSpeedValidator, ValidationAxis
+
+        tracker = TrajectoryTracker(enabled=True)
+        validator = InstantaneousSpeedValidator(axis=ValidationAxis.y, max_speed=200)
+
+        err = u.update_xyt_batch([tracker, validator], [(0, 0, 0.01), (0, 1, 0.02), (0, 2, 0.03)])
+        self.assertIsNone(err)
+        self.assertEqual([(0, 0, 0.01), (0, 1, 0.02), (0, 2, 0.03)], tracker.get_xyt())
+
+        #-- Too fast in the 2nd sample: the 3rd sample is not processed
+        err = u.update_xyt_batch([tracker, validator], np.array([(0, 3, 0.04), (0, 10, 0.05), (0, 11, 0.06)]))
+        self.assertEqual(InstantaneousSpeedValidator.err_too_fast, err.err_code)
+        self.assertEqual(5, len(tracker.get_xyt()))
+
+    def test_update_xyt_batch_time_in_session(self):
+        times = []
+
+        class Obj(object):
+            def update_xyt(self, position, time_in_trial, time_in_session=None):
+                times.append((time_in_trial, time_in_session))
+
+        u.update_xyt_batch([Obj()], [(0, 0, 1), (0, 0, 2)], trial_start_time=10)
+        self.assertEqual([(1, 11), (2, 12)], times)
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,61 @@
+#-------------------------------------------------------------------------------------
+#
+# Measure how fast TrajectoryTracker formats a trial's rows for the CSV file:
+# the current (bulk) formatting vs. the previous row-by-row formatting.
+#
+#-------------------------------------------------------------------------------------
+
+from __future__ import division
+
+import timeit
+
+import numpy as np
+
+from trajtracker.movement import TrajectoryTracker
+
+
+n_rows = 3000
+xy_precision = 5
+time_precision = 3
+
+
+#-- The previous implementation: format each row separately
+def format_rows_one_by_one(trial_num, xyt, xy_is_int):
+    lines = []
+    for (x, y, t), (x_is_int, y_is_int) in zip(xyt.tolist(), xy_is_int.tolist()):
+        x = ('%d' % x) if x_is_int else '%.*f' % (xy_precision, x)
+        y = ('%d' % y) if y_is_int else '%.*f' % (xy_precision, y)
+        lines.append("%d,%.*f,%s,%s\n" % (trial_num, time_precision, t, x, y))
+    return "".join(lines)
+
+
+def create_trial(int_coords):
+    tracker = TrajectoryTracker(enabled=True, track_if_no_movement=True)
+    rand = np.random.RandomState(0)
+    for i in range(n_rows):
+        x, y = rand.uniform(-500, 500, 2)
+        if int_coords == "int" or (int_coords == "mixed" and i % 2 == 0):
+            x, y = int(x), int(y)
+        tracker.update_xyt((x, y), i / 60)
+    tracker._xy_precision = xy_precision
+    tracker._time_precision = time_precision
+    return tracker
+
+
+def rows_per_sec(func):
+    return n_rows / min(timeit.repeat(func, number=1, repeat=20))
+
+
+print("Formatting a trial with {:} rows\n".format(n_rows))
+print("{:10s} {:>22s} {:>22s} {:>8s}".format("x,y", "Row by row (rows/s)", "Bulk (rows/s)", "Speedup"))
+
+for coords in "int", "float", "mixed":
+    tracker = create_trial(coords)
+    xyt = tracker._trajectory.xyt
+    xy_is_int = tracker._trajectory.xy_is_int
+
+    assert tracker._format_csv_trial(1, xyt, xy_is_int) == format_rows_one_by_one(1, xyt, xy_is_int)
+
+    before = rows_per_sec(lambda: format_rows_one_by_one(1, xyt, xy_is_int))
+    after = rows_per_sec(lambda: tracker._format_csv_trial(1, xyt, xy_is_int))
+    print("{:10s} {:>22.0f} {:>22.0f} {:>7.1f}x".format(coords, before, after, after / before))
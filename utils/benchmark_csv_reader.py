@@ -0,0 +1,75 @@
+#-------------------------------------------------------------------------------------
+#
+# Measure how fast a trajectory CSV file is read:
+# CSVLoader (csv.DictReader, one dict per row) vs. CSVTrajectoryReader (vectorized parsing).
+#
+#-------------------------------------------------------------------------------------
+
+from __future__ import division
+
+import os
+import shutil
+import tempfile
+import time
+
+import numpy as np
+
+from trajtracker.io import CSVLoader, CSVTrajectoryReader
+
+
+n_trials = 2000
+n_rows_per_trial = 500
+
+
+def create_file(filename):
+    rand = np.random.RandomState(0)
+    with open(filename, "w") as fh:
+        fh.write("trial,time,x,y\n")
+        for trial_num in range(1, n_trials + 1):
+            times = np.arange(n_rows_per_trial) / 60
+            xy = rand.uniform(-500, 500, (n_rows_per_trial, 2))
+            fh.write("".join("%d,%.3f,%.5f,%.5f\n" % (trial_num, t, x, y) for t, (x, y) in zip(times, xy)))
+
+
+def load_with_csv_loader(filename):
+    loader = CSVLoader()
+    for field in "trial", "time", "x", "y":
+        loader.add_field(field, float)
+    rows, fieldnames = loader.load_file(filename)
+    return rows
+
+
+def iterate_trials(filename):
+    n = 0
+    for trial_num, times, x, y in CSVTrajectoryReader(filename).iter_trials():
+        n += 1
+    return n
+
+
+def rows_per_sec(func, filename, repeat=3):
+    durations = []
+    for i in range(repeat):
+        start = time.time()
+        func(filename)
+        durations.append(time.time() - start)
+    return n_trials * n_rows_per_trial / min(durations)
+
+
+tmpdir = tempfile.mkdtemp()
+try:
+    filename = os.path.join(tmpdir, "trajectory.csv")
+    create_file(filename)
+
+    print("Reading {:} trials x {:} rows ({:.1f} MB)\n".format(n_trials, n_rows_per_trial, os.path.getsize(filename) / 2 ** 20))
+    print("{:40s} {:>14s} {:>8s}".format("Method", "rows/s", "Speedup"))
+
+    baseline = rows_per_sec(load_with_csv_loader, filename, repeat=1)
+    print("{:40s} {:>14.0f} {:>7.1f}x".format("CSVLoader.load_file()", baseline, 1))
+
+    for name, func in [("CSVTrajectoryReader.read_all()", lambda f: CSVTrajectoryReader(f).read_all()),
+                       ("CSVTrajectoryReader.iter_trials()", iterate_trials)]:
+        speed = rows_per_sec(func, filename)
+        print("{:40s} {:>14.0f} {:>7.1f}x".format(name, speed, speed / baseline))
+
+finally:
+    shutil.rmtree(tmpdir)
@@ -0,0 +1,67 @@
+#-------------------------------------------------------------------------------------
+#
+# Compare the insert throughput of SQLiteTrialStore with that of TrajectoryTracker's CSV file
+# (rows per second, when saving a session trial by trial).
+#
+#-------------------------------------------------------------------------------------
+
+from __future__ import division
+
+import os
+import shutil
+import tempfile
+import time
+
+import numpy as np
+
+from trajtracker.movement import TrajectoryTracker
+from trajtracker.io import SQLiteTrialStore
+
+
+n_trials = 200
+n_samples_per_trial = 500
+n_rows = n_trials * n_samples_per_trial
+
+rand = np.random.RandomState(1)
+trials = [np.column_stack([np.cumsum(rand.randint(-3, 4, size=(n_samples_per_trial, 2)), axis=0),
+                           np.arange(n_samples_per_trial) / 60])
+          for _ in range(n_trials)]
+
+
+def time_csv(filename):
+    tracker = TrajectoryTracker()
+    tracker.init_output_file(filename)
+    duration = 0
+    for trial_num, xyt in enumerate(trials):
+        tracker.reset()
+        for x, y, t in xyt.tolist():
+            tracker._trajectory.append(x, y, t)
+        t0 = time.time()
+        tracker.save_to_file(trial_num)
+        duration += time.time() - t0
+    t0 = time.time()
+    tracker.close_output_file()
+    return duration + time.time() - t0
+
+
+def time_sqlite(filename):
+    store = SQLiteTrialStore(filename)
+    t0 = time.time()
+    for trial_num, xyt in enumerate(trials):
+        store.add_trial(trial_num, xyt)
+    store.close()
+    return time.time() - t0
+
+
+tmpdir = tempfile.mkdtemp()
+try:
+    print("{:} trials, {:} rows\n".format(n_trials, n_rows))
+    print("{:12s} {:>16s} {:>12s}".format("Store", "Insert (rows/s)", "Size (KB)"))
+
+    for name, func, filename in [("CSV", time_csv, "traj.csv"), ("SQLite", time_sqlite, "session.db")]:
+        filename = os.path.join(tmpdir, filename)
+        duration = func(filename)
+        print("{:12s} {:>16.0f} {:>12.0f}".format(name, n_rows / duration, os.path.getsize(filename) / 1024))
+
+finally:
+    shutil.rmtree(tmpdir)
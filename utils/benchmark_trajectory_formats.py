@@ -0,0 +1,101 @@
+#-------------------------------------------------------------------------------------
+#
+# Compare TrajectoryTracker's output formats (CSV, binary, compressed):
+# file size, encoding time (save_to_file) and decoding time (reading the whole file).
+#
+# The data is a simulated session: trials with a random-walk trajectory sampled at ~60 Hz,
+# with integer (pixel) coordinates.
+#
+#-------------------------------------------------------------------------------------
+
+from __future__ import division
+
+import os
+import shutil
+import tempfile
+import time
+
+import numpy as np
+
+from trajtracker.movement import TrajectoryTracker
+from trajtracker.io import CSVLoader, BinaryTrajectoryReader, CompressedTrajectoryFormat
+
+
+n_trials = 200
+n_samples_per_trial = 500
+
+rand = np.random.RandomState(1)
+trials = []
+for _ in range(n_trials):
+    xy = np.cumsum(rand.randint(-3, 4, size=(n_samples_per_trial, 2)), axis=0)
+    times = np.cumsum(1 / 60 + rand.uniform(-0.002, 0.002, n_samples_per_trial))
+    trials.append([(int(x), int(y), t) for (x, y), t in zip(xy, times)])
+
+n_rows = n_trials * n_samples_per_trial
+
+
+def write_session(filename, file_format):
+    tracker = TrajectoryTracker(enabled=True, track_if_no_movement=True, initial_capacity=n_samples_per_trial)
+    tracker.init_output_file(filename, file_format=file_format)
+    t0 = time.time()
+    for trial_num, trial in enumerate(trials):
+        tracker.reset()
+        for x, y, t in trial:
+            tracker.update_xyt((x, y), t)
+        tracker.save_to_file(trial_num)
+    tracker.close_output_file()
+    return time.time() - t0
+
+
+def read_csv(filename):
+    loader = CSVLoader()
+    for fld in "trial", "time", "x", "y":
+        loader.add_field(fld, float)
+    rows, fieldnames = loader.load_file(filename)
+    return len(rows)
+
+
+def read_binary(filename):
+    with BinaryTrajectoryReader(filename) as reader:
+        return sum(len(times) for trial_num, times, x, y in reader.iter_trials())
+
+
+def read_compressed(filename):
+    return sum(len(times) for trial_num, times, x, y in CompressedTrajectoryFormat.read_file(filename))
+
+
+def write_time_without_saving():
+    tracker = TrajectoryTracker(enabled=True, track_if_no_movement=True, initial_capacity=n_samples_per_trial)
+    t0 = time.time()
+    for trial in trials:
+        tracker.reset()
+        for x, y, t in trial:
+            tracker.update_xyt((x, y), t)
+    return time.time() - t0
+
+
+tmpdir = tempfile.mkdtemp()
+try:
+    tracking_time = write_time_without_saving()
+
+    print("{:} trials, {:} rows\n".format(n_trials, n_rows))
+    print("{:12s} {:>10s} {:>16s} {:>16s}".format("Format", "Size (KB)", "Encode (rows/s)", "Decode (rows/s)"))
+
+    for name, file_format, reader in [("CSV", TrajectoryTracker.FileFormat.CSV, read_csv),
+                                      ("Binary", TrajectoryTracker.FileFormat.Binary, read_binary),
+                                      ("Compressed", TrajectoryTracker.FileFormat.Compressed, read_compressed)]:
+
+        filename = os.path.join(tmpdir, name)
+
+        encode_time = write_session(filename, file_format) - tracking_time
+
+        t0 = time.time()
+        n_read = reader(filename)
+        decode_time = time.time() - t0
+        assert n_read == n_rows
+
+        print("{:12s} {:>10.0f} {:>16.0f} {:>16.0f}".format(name, os.path.getsize(filename) / 1024,
+                                                             n_rows / encode_time, n_rows / decode_time))
+
+finally:
+    shutil.rmtree(tmpdir)
@@ -0,0 +1,58 @@
+#-------------------------------------------------------------------------------------
+#
+# Measure the per-sample overhead of TrajectoryTracker's journal mode:
+# the time of TrajectoryTracker.update_xyt() with and without a journal, and the time of
+# TrajectoryJournal.append() alone.
+#
+# At 1000 Hz, there is 1 ms per sample; the journal should take a tiny fraction of it.
+#
+#-------------------------------------------------------------------------------------
+
+import os
+import tempfile
+import timeit
+
+from trajtracker.movement import TrajectoryTracker
+from trajtracker.io import TrajectoryJournal
+
+
+n_samples = 100000
+
+tmpdir = tempfile.mkdtemp()
+journal_file = os.path.join(tmpdir, "journal.bin")
+
+
+def run_tracker(tracker):
+    tracker.reset()
+    for i in range(n_samples):
+        tracker.update_xyt((i % 500, i % 300), i / 1000)
+
+
+def per_sample_usec(func):
+    return min(timeit.repeat(func, number=1, repeat=3)) / n_samples * 1e6
+
+
+tracker = TrajectoryTracker(enabled=True, initial_capacity=n_samples)
+t_without = per_sample_usec(lambda: run_tracker(tracker))
+
+tracker.init_journal(journal_file, capacity=n_samples, overwrite_unsaved=True)
+t_with = per_sample_usec(lambda: run_tracker(tracker))
+tracker.close_journal()
+
+journal = TrajectoryJournal(journal_file, capacity=n_samples, overwrite_unsaved=True)
+journal.begin_trial()
+t_append = per_sample_usec(lambda: [journal.append(i, i, i / 1000) for i in range(n_samples)])
+journal.close()
+
+journal = TrajectoryJournal(journal_file, capacity=n_samples, sync_interval=100, overwrite_unsaved=True)
+journal.begin_trial()
+t_append_sync = per_sample_usec(lambda: [journal.append(i, i, i / 1000) for i in range(n_samples)])
+journal.close()
+
+os.remove(journal_file)
+os.rmdir(tmpdir)
+
+print("update_xyt() without journal:        {:.2f} usec/sample".format(t_without))
+print("update_xyt() with journal:           {:.2f} usec/sample".format(t_with))
+print("TrajectoryJournal.append():          {:.2f} usec/sample".format(t_append))
+print("append() with sync every 100 samples: {:.2f} usec/sample".format(t_append_sync))
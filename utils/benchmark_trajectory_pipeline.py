@@ -0,0 +1,52 @@
+#-------------------------------------------------------------------------------------
+#
+# Measure the per-sample cost of sending samples to several trajectory-sensitive objects:
+# calling update_xyt() of each object vs. TrajectoryPipeline (with and without timing).
+#
+#-------------------------------------------------------------------------------------
+
+from __future__ import division
+
+import timeit
+
+from trajtracker.movement import TrajectoryPipeline, TrajectoryTracker, DirectionMonitor, SpeedMonitor
+from trajtracker.validators import InstantaneousSpeedValidator, NCurvesValidator, MovementAngleValidator, ValidationAxis
+
+
+n_samples = 2000
+
+
+def create_objects():
+    return [TrajectoryTracker(enabled=True), SpeedMonitor(0.05), DirectionMonitor(),
+            InstantaneousSpeedValidator(axis=ValidationAxis.y, max_speed=100000),
+            NCurvesValidator(max_curves_per_trial=1000),
+            MovementAngleValidator(min_angle=-90, max_angle=90)]
+
+
+def run_objects_loop():
+    objects = create_objects()
+    for i in range(n_samples):
+        position = (i % 7, i)
+        for obj in objects:
+            obj.update_xyt(position, i / 1000)
+
+
+def run_pipeline(record_timing):
+    pipeline = TrajectoryPipeline(create_objects(), record_timing=record_timing)
+    for i in range(n_samples):
+        pipeline.update_xyt((i % 7, i), i / 1000)
+
+
+def usec_per_sample(func):
+    return min(timeit.repeat(func, number=1, repeat=10)) / n_samples * 1e6
+
+
+before = usec_per_sample(run_objects_loop)
+after = usec_per_sample(lambda: run_pipeline(False))
+with_timing = usec_per_sample(lambda: run_pipeline(True))
+
+print("Sending {:} samples to 6 objects\n".format(n_samples))
+print("{:40s} {:>12s}".format("Method", "us/sample"))
+print("{:40s} {:>12.1f}".format("update_xyt() of each object", before))
+print("{:40s} {:>12.1f}   ({:+.0f}%)".format("TrajectoryPipeline", after, (after / before - 1) * 100))
+print("{:40s} {:>12.1f}".format("TrajectoryPipeline with timing", with_timing))
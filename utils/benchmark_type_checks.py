@@ -0,0 +1,55 @@
+#-------------------------------------------------------------------------------------
+#
+# Measure the cost of the argument-validation helpers in trajtracker._utils:
+# update_xyt_validate_and_log() (called by update_xyt() of each trajectory-sensitive object),
+# and the collection / callable / coordinate / RGB checks.
+#
+# Each check is measured with the type-capabilities cache (the normal case), and without it: the cache
+# is cleared before each call, so the capabilities of each type are computed on every call. The checks
+# that existed before the cache computed only some of the capabilities (with dir()), so the uncached
+# times are an upper bound of their cost.
+#
+#-------------------------------------------------------------------------------------
+
+from __future__ import division
+
+import timeit
+
+import trajtracker as ttrk
+# noinspection PyProtectedMember
+import trajtracker._utils as _u
+from trajtracker.movement import TrajectoryTracker
+
+
+n_calls = 100000
+
+obj = TrajectoryTracker()
+
+checks = [
+    ("update_xyt_validate_and_log()", lambda: _u.update_xyt_validate_and_log(obj, (3, 4.5), 1.25, 2.5)),
+    ("is_collection()", lambda: _u.is_collection([1, 2])),
+    ("is_coord()", lambda: _u.is_coord((3, 4))),
+    ("validate_func_arg_type(callable)", lambda: _u.validate_func_arg_type(obj, "f", "a", len, ttrk.TYPE_CALLABLE)),
+    ("validate_attr_rgb()", lambda: _u.validate_attr_rgb(obj, "a", (255, 0, 0))),
+]
+
+
+def ns_per_call(func):
+    return min(timeit.repeat(func, number=n_calls, repeat=5)) / n_calls * 1e9
+
+
+def uncached(func):
+    def run():
+        _u._type_capabilities.clear()
+        func()
+    return run
+
+
+#-- The cost of clearing the cache is subtracted from the uncached times
+clear_cost = ns_per_call(_u._type_capabilities.clear)
+
+print("{:40s} {:>12s} {:>12s} {:>10s}".format("Check", "cached ns", "uncached ns", "speedup"))
+for name, func in checks:
+    cached_ns = ns_per_call(func)
+    uncached_ns = ns_per_call(uncached(func)) - clear_cost
+    print("{:40s} {:>12.0f} {:>12.0f} {:>9.1f}x".format(name, cached_ns, uncached_ns, uncached_ns / cached_ns))
@@ -0,0 +1,48 @@
+#-------------------------------------------------------------------------------------
+#
+# Measure the per-frame cost of the trajectory-sensitive objects with and without
+# argument validation (trajtracker.env.validate_arguments)
+#
+#-------------------------------------------------------------------------------------
+
+from __future__ import division
+
+import timeit
+
+import trajtracker
+from trajtracker.movement import TrajectoryTracker, DirectionMonitor, SpeedMonitor
+from trajtracker.validators import InstantaneousSpeedValidator, NCurvesValidator, MovementAngleValidator, ValidationAxis
+
+
+n_frames = 2000
+
+
+def create_objects():
+    return [TrajectoryTracker(enabled=True), SpeedMonitor(0.05), DirectionMonitor(),
+            InstantaneousSpeedValidator(axis=ValidationAxis.y, max_speed=100000),
+            NCurvesValidator(max_curves_per_trial=1000),
+            MovementAngleValidator(min_angle=-90, max_angle=90)]
+
+
+def run_frames():
+    objects = create_objects()
+    for i in range(n_frames):
+        position = (i % 7, i)
+        for obj in objects:
+            obj.update_xyt(position, i / 1000)
+
+
+def usec_per_frame():
+    return min(timeit.repeat(run_frames, number=1, repeat=10)) / n_frames * 1e6
+
+
+trajtracker.env.validate_arguments = True
+with_validation = usec_per_frame()
+
+trajtracker.env.validate_arguments = False
+without_validation = usec_per_frame()
+
+print("{:} frames, 6 objects per frame\n".format(n_frames))
+print("{:40s} {:>12s}".format("validate_arguments", "us/frame"))
+print("{:40s} {:>12.1f}".format("True", with_validation))
+print("{:40s} {:>12.1f}   ({:.0f}% faster)".format("False", without_validation, (with_validation / without_validation - 1) * 100))
@@ -0,0 +1,53 @@
+#-------------------------------------------------------------------------------------
+#
+# Compare the two ways of validating a recorded trajectory: calling update_xyt() for
+# each sample (as during the experiment), and calling validate_trajectory() once.
+#
+#-------------------------------------------------------------------------------------
+
+from __future__ import division
+
+import timeit
+
+import numpy as np
+
+from trajtracker.validators import InstantaneousSpeedValidator, GlobalSpeedValidator, MovementAngleValidator, \
+    NCurvesValidator, MoveByGradientValidator
+
+
+n_samples = 2000
+n_repeats = 5
+
+rand = np.random.RandomState(0)
+times = (0.01 * np.arange(1, n_samples + 1)).tolist()
+xs = rand.randint(-1, 2, n_samples).cumsum().tolist()
+ys = rand.randint(0, 3, n_samples).cumsum().tolist()
+
+
+def validate_streaming(validator, reset, vx, vy):
+    reset()
+    for t, x, y in zip(times, vx, vy):
+        validator.update_xyt((x, y), t)
+
+
+speed = InstantaneousSpeedValidator(min_speed=1, max_speed=1000, calculation_interval=0.05)
+global_speed = GlobalSpeedValidator(origin_coord=0, end_coord=4000, max_movement_time=30)
+angle = MovementAngleValidator(min_angle=-90, max_angle=90, calc_angle_interval=5)
+curves = NCurvesValidator(max_curves_per_trial=1000)
+gradient = MoveByGradientValidator([[(0, 0, i) for i in range(256)]] * 3, cyclic=True, max_valid_back_movement=5)
+gradient_xs = [x % 256 - 128 for x in xs]
+
+validators = [
+    ("InstantaneousSpeedValidator", speed, lambda: speed.reset(0), xs, ys),
+    ("GlobalSpeedValidator", global_speed, lambda: global_speed.movement_started(times[0]), xs, ys),
+    ("MovementAngleValidator", angle, lambda: angle.reset(0), xs, ys),
+    ("NCurvesValidator", curves, lambda: curves.reset(0), xs, ys),
+    ("MoveByGradientValidator", gradient, lambda: gradient.reset(0), gradient_xs, [0] * n_samples),
+]
+
+print("Trajectory with {:} samples".format(n_samples))
+print("{:30s} {:>14s} {:>14s}".format("Validator", "update_xyt ms", "batch ms"))
+for name, validator, reset, vx, vy in validators:
+    t_stream = min(timeit.repeat(lambda: validate_streaming(validator, reset, vx, vy), number=1, repeat=n_repeats))
+    t_batch = min(timeit.repeat(lambda: validator.validate_trajectory(times, vx, vy), number=1, repeat=n_repeats))
+    print("{:30s} {:>14.2f} {:>14.2f}".format(name, t_stream * 1000, t_batch * 1000))